@@ -0,0 +1,134 @@
+# config/layout.py
+import logging
+from types import MappingProxyType
+from typing import Any, Dict, Iterable, List, Mapping, NamedTuple, Optional, Tuple
+
+log = logging.getLogger("bongo.config.layout")
+
+# Bump whenever the serialized form below changes, so stale caches are ignored.
+LAYOUT_FORMAT_VERSION = 1
+
+PCA9685_CHANNELS = 16
+
+
+class CompiledLayout(NamedTuple):
+    """
+    An immutable, pre-validated view of the LED hardware layout.
+
+    LEDs are addressed by a flat index (row-major order of their coordinates).
+    The per-LED tuples below are all indexed by that flat index.
+    """
+    rows: int
+    cols: int
+    coords: Tuple[Tuple[int, int], ...]      # flat index -> (row, col)
+    led_types: Tuple[str, ...]               # flat index -> 'pca9685' | 'gpio'
+    addresses: Tuple[Optional[int], ...]     # flat index -> PCA9685 address (None for gpio)
+    channels: Tuple[int, ...]                # flat index -> PCA9685 channel or GPIO pin
+    boards: Tuple[int, ...]                  # sorted unique PCA9685 addresses
+    board_leds: Tuple[Tuple[int, ...], ...]  # per board (same order as boards), its flat indices
+    board_channels: Tuple[Tuple[int, ...], ...]  # per board, the channel of each of those LEDs
+    gpio_pins: Tuple[int, ...]               # all GPIO pins in use
+    index: Mapping[Tuple[int, int], int]     # (row, col) -> flat index
+
+    @property
+    def num_leds(self) -> int:
+        return len(self.coords)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serializes the layout's source columns (the rest is derived on load)."""
+        return {
+            "version": LAYOUT_FORMAT_VERSION,
+            "coords": [list(c) for c in self.coords],
+            "led_types": list(self.led_types),
+            "addresses": list(self.addresses),
+            "channels": list(self.channels),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "CompiledLayout":
+        """Rebuilds a layout written by to_dict() without re-validating it."""
+        if data.get("version") != LAYOUT_FORMAT_VERSION:
+            raise ValueError(f"Unsupported layout format version: {data.get('version')}")
+        return _build([tuple(c) for c in data["coords"]], data["led_types"],
+                      data["addresses"], data["channels"])
+
+
+def _build(coords: List[Tuple[int, int]], led_types: List[str],
+           addresses: List[Optional[int]], channels: List[int]) -> CompiledLayout:
+    board_map: Dict[int, List[int]] = {}
+    gpio_pins = []
+    for i, (led_type, addr, chan) in enumerate(zip(led_types, addresses, channels)):
+        if led_type == "pca9685":
+            board_map.setdefault(addr, []).append(i)
+        else:
+            gpio_pins.append(chan)
+    boards = tuple(sorted(board_map))
+    return CompiledLayout(
+        rows=max((r for r, _ in coords), default=-1) + 1,
+        cols=max((c for _, c in coords), default=-1) + 1,
+        coords=tuple(coords),
+        led_types=tuple(led_types),
+        addresses=tuple(addresses),
+        channels=tuple(channels),
+        boards=boards,
+        board_leds=tuple(tuple(board_map[b]) for b in boards),
+        board_channels=tuple(tuple(channels[i] for i in board_map[b]) for b in boards),
+        gpio_pins=tuple(gpio_pins),
+        index=MappingProxyType({coord: i for i, coord in enumerate(coords)}),
+    )
+
+
+def compile_layout(led_config: Iterable[Dict[str, Any]],
+                   led_types: Optional[Iterable[str]] = None) -> CompiledLayout:
+    """
+    Validates the 'leds' section of a configuration once and compiles it.
+
+    Accepts both the file format ('address'/'pin') and the LEDMatrix format
+    ('controller_address'/'led_channel') for PCA9685 entries.
+
+    Args:
+        led_config: The list of LED entries.
+        led_types: If given, only entries of these types are kept.
+
+    Raises:
+        ValueError: If an entry is incomplete, out of range or a duplicate.
+    """
+    wanted = set(led_types) if led_types is not None else None
+    entries = {}
+    used_outputs = set()
+    for entry in led_config:
+        r, c, led_type = entry.get("row"), entry.get("col"), entry.get("type")
+        if r is None or c is None or led_type is None:
+            raise ValueError(f"Config entry is missing 'row', 'col', or 'type': {entry}")
+        if wanted is not None and led_type not in wanted:
+            continue
+
+        if led_type == "pca9685":
+            addr = entry.get("controller_address", entry.get("address"))
+            chan = entry.get("led_channel", entry.get("pin"))
+            if addr is None or chan is None:
+                raise ValueError(f"PCA9685 entry is missing an address or channel: {entry}")
+            if not (0 <= chan < PCA9685_CHANNELS):
+                raise ValueError(f"PCA9685 channel must be between 0 and 15: {entry}")
+            output = ("pca9685", addr, chan)
+        elif led_type == "gpio":
+            addr, chan = None, entry.get("pin")
+            if chan is None:
+                raise ValueError(f"GPIO entry is missing 'pin': {entry}")
+            output = ("gpio", chan)
+        else:
+            log.warning(f"Skipping unknown LED type '{led_type}' for ({r},{c})")
+            continue
+
+        if (r, c) in entries:
+            raise ValueError(f"Duplicate LED coordinates ({r},{c}) in configuration.")
+        if output in used_outputs:
+            raise ValueError(f"Hardware output {output} is assigned to more than one LED.")
+        used_outputs.add(output)
+        entries[(r, c)] = (led_type, addr, chan)
+
+    coords = sorted(entries)
+    return _build(coords,
+                  [entries[k][0] for k in coords],
+                  [entries[k][1] for k in coords],
+                  [entries[k][2] for k in coords])
@@ -1,6 +1,14 @@
 # config/loader.py
+import hashlib
 import json
-from typing import Dict, List, Any
+import logging
+import os
+from typing import Dict, List, Any, Iterable, Optional
+
+from config.layout import CompiledLayout, LAYOUT_FORMAT_VERSION, compile_layout
+
+log = logging.getLogger("bongo.config.loader")
+
 
 class ConfigLoader:
     """Handles loading of the matrix hardware configuration."""
@@ -10,6 +18,8 @@ class ConfigLoader:
         Initializes the loader, optionally with pre-existing config data.
         """
         self._config = config_data if config_data else {}
+        self._filepath: Optional[str] = None
+        self._source_hash: Optional[str] = None
 
     def load_from_file(self, filepath: str) -> None:
         """
@@ -19,8 +29,11 @@ class ConfigLoader:
             filepath: The path to the JSON configuration file.
         """
         try:
-            with open(filepath, 'r') as f:
-                self._config = json.load(f)
+            with open(filepath, 'rb') as f:
+                raw = f.read()
+            self._config = json.loads(raw)
+            self._filepath = filepath
+            self._source_hash = hashlib.sha256(raw).hexdigest()
         except FileNotFoundError:
             # Handle error appropriately
             print(f"Error: Configuration file not found at {filepath}")
@@ -43,3 +56,133 @@ class ConfigLoader:
         """
         return self._config.get('logging', {})
 
+    def get_metrics_config(self) -> Dict[str, Any]:
+        """
+        Returns the optional 'metrics' section of the configuration, e.g.
+        {"textfile": "/var/lib/node_exporter/bongo.prom", "interval": 10,
+         "socket": "/tmp/bongo-metrics.sock"}.
+        Returns an empty dictionary (metrics disabled) if it's not present.
+        """
+        return self._config.get('metrics', {})
+
+    def get_tracing_config(self) -> Dict[str, Any]:
+        """
+        Returns the optional 'tracing' section of the configuration, e.g.
+        {"enabled": true, "capacity": 65536, "dump_dir": "/tmp",
+         "dump_on_overrun": true, "trace_gc": true}.
+        Returns an empty dictionary (tracing disabled) if it's not present.
+        """
+        return self._config.get('tracing', {})
+
+    def get_gc_config(self) -> Dict[str, Any]:
+        """
+        Returns the optional 'gc' section of the configuration, e.g.
+        {"pause_free": true, "full_gap": 0.005}.
+        Returns an empty dictionary (normal automatic collection) if it's not present.
+        """
+        return self._config.get('gc', {})
+
+    def get_schedule_config(self) -> Dict[str, Any]:
+        """
+        Returns the optional 'schedule' section of the configuration, e.g.
+        {"timing_wheel": true, "load_ahead": 300}.
+        Returns an empty dictionary (heap scheduling) if it's not present.
+        """
+        return self._config.get('schedule', {})
+
+    def get_render_ahead_config(self) -> Dict[str, Any]:
+        """
+        Returns the optional 'render_ahead' section of the configuration, e.g.
+        {"frames": 4}.
+        Returns an empty dictionary (frames rendered just in time) if it's not present.
+        """
+        return self._config.get('render_ahead', {})
+
+    def get_render_pool_config(self) -> Dict[str, Any]:
+        """
+        Returns the optional 'render_pool' section of the configuration, e.g.
+        {"workers": 3, "max_layers": 3}.
+        Returns an empty dictionary (shaders rendered in-process) if it's not present.
+        """
+        return self._config.get('render_pool', {})
+
+    def get_framebuffer_input_config(self) -> Dict[str, Any]:
+        """
+        Returns the optional 'framebuffer_input' section of the configuration, e.g.
+        {"name": "bongo", "format": "uint16", "layer": "external", "opacity": 0.8,
+         "blend": "max", "stale_after": 1.0}.
+        Returns an empty dictionary (no external frames) if it's not present.
+        """
+        return self._config.get('framebuffer_input', {})
+
+    def get_dmx_input_config(self) -> Dict[str, Any]:
+        """
+        Returns the optional 'dmx_input' section of the configuration, e.g.
+        {"protocol": "artnet", "port": 6454, "start_universe": 0, "channels_per_led": 1,
+         "layer": "desk", "opacity": 1.0, "blend": "max", "stale_after": 2.0}.
+        Returns an empty dictionary (no DMX input) if it's not present.
+        """
+        return self._config.get('dmx_input', {})
+
+    def get_control_config(self) -> Dict[str, Any]:
+        """
+        Returns the optional 'control' section of the configuration, e.g.
+        {"socket": "/tmp/bongo-control.sock"} or {"enabled": false}.
+        Returns an empty dictionary (control socket at the default path) if it's not present.
+        """
+        return self._config.get('control', {})
+
+    def get_time_sync_config(self) -> Dict[str, Any]:
+        """
+        Returns the optional 'time_sync' section of the configuration, e.g.
+        {"role": "leader", "port": 9740, "show": "chase", "start_in": 2.0,
+         "show_params": {"delay": 0.3}} on one node and
+        {"role": "follower", "leader": "10.0.0.10", "show": "chase"} on the others.
+        Returns an empty dictionary (this node plays on its own clock) if it's not present.
+        """
+        return self._config.get('time_sync', {})
+
+    def get_compiled_layout(self, led_types: Optional[Iterable[str]] = None,
+                            cache_dir: Optional[str] = None) -> CompiledLayout:
+        """
+        Returns the validated, compiled hardware layout for the 'leds' section.
+
+        The layout is cached on disk, keyed by a hash of the configuration file
+        (and the requested led_types), so only the first startup after a config
+        change pays for validation.
+
+        Args:
+            led_types: If given, only LEDs of these types are included.
+            cache_dir: Where to keep cached layouts. Defaults to a '.cache'
+                       directory next to the loaded configuration file. When no
+                       file was loaded (in-memory config), caching is skipped.
+        """
+        types_key = ",".join(sorted(led_types)) if led_types is not None else "*"
+        if cache_dir is None and self._filepath is not None:
+            cache_dir = os.path.join(os.path.dirname(os.path.abspath(self._filepath)), ".cache")
+        if cache_dir is None or self._source_hash is None:
+            return compile_layout(self.get_led_config(), led_types)
+
+        key = hashlib.sha256(
+            f"{self._source_hash}|{types_key}|v{LAYOUT_FORMAT_VERSION}".encode()
+        ).hexdigest()[:32]
+        cache_path = os.path.join(cache_dir, f"layout-{key}.json")
+
+        try:
+            with open(cache_path, 'r') as f:
+                return CompiledLayout.from_dict(json.load(f))
+        except FileNotFoundError:
+            pass
+        except (ValueError, KeyError, TypeError) as e:
+            log.warning(f"Ignoring unreadable layout cache '{cache_path}': {e}")
+
+        layout = compile_layout(self.get_led_config(), led_types)
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump(layout.to_dict(), f)
+            os.replace(tmp_path, cache_path)
+        except OSError as e:
+            log.warning(f"Could not write layout cache '{cache_path}': {e}")
+        return layout
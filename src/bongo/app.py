@@ -3,7 +3,6 @@ import os
 import sys
 import time
 import logging
-from bongo.patterns.builtin_patterns import create_fade_all_pattern
 
 # --- Setup Python Path ---
 project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -20,11 +19,209 @@ from bongo.matrix.matrix import LEDMatrix
 from config.loader import ConfigLoader
 from bongo.utils.logger import setup_logging
 from bongo.operations.animation_manager import AnimationManager
+from bongo.operations.runner import AnimationRunner
 
 # --- Constants ---
 PRODUCTION_CONFIG_PATH = os.path.join(project_root, "config", "production_config.json")
 
 
+def _start_metrics(metrics_config, log):
+    """Creates RenderMetrics and starts the configured exporters, if any."""
+    if not metrics_config:
+        return None, []
+    from bongo.utils.metrics import RenderMetrics, PrometheusTextfileExporter, UnixSocketExporter
+
+    metrics = RenderMetrics()
+    exporters = []
+    if metrics_config.get("textfile"):
+        exporters.append(PrometheusTextfileExporter(
+            metrics.registry, metrics_config["textfile"], metrics_config.get("interval", 10.0)))
+    if metrics_config.get("socket"):
+        exporters.append(UnixSocketExporter(metrics.registry, metrics_config["socket"]))
+    for exporter in exporters:
+        exporter.start()
+    log.info(f"Metrics enabled with {len(exporters)} exporter(s).")
+    return metrics, exporters
+
+
+def _start_tracing(tracing_config, log):
+    """Enables the frame tracer (dumped on SIGUSR1 or on overrun) if configured."""
+    if not tracing_config.get("enabled"):
+        return
+    from bongo.utils import tracing
+
+    tracer = tracing.enable_tracing(
+        capacity=tracing_config.get("capacity", 65536),
+        dump_dir=tracing_config.get("dump_dir", "."),
+        dump_on_overrun=tracing_config.get("dump_on_overrun", False),
+    )
+    tracer.trace_gc(tracing_config.get("trace_gc", True))
+    tracing.install_signal_handler()
+    log.info(f"Frame tracing enabled (capacity {tracer.capacity}); send SIGUSR1 to dump.")
+
+
+def _create_gc_controller(gc_config, metrics):
+    """Returns a GCController if the pause-free GC mode is configured, else None."""
+    if not gc_config.get("pause_free"):
+        return None
+    from bongo.utils.gc_control import GCController
+
+    return GCController(metrics=metrics, full_gap=gc_config.get("full_gap", 0.005))
+
+
+def _create_timing_wheel(schedule_config, fps: int = 60):
+    """Returns a TimingWheel if configured for large preloaded schedules, else None."""
+    if not schedule_config.get("timing_wheel"):
+        return None
+    from bongo.operations.timing_wheel import TimingWheel
+
+    return TimingWheel(tick_seconds=1 / fps, load_ahead=schedule_config.get("load_ahead"))
+
+
+def _create_render_pool(render_pool_config, matrix):
+    """Returns a ShaderRenderPool if multi-process shader rendering is configured, else None."""
+    if not render_pool_config:
+        return None
+    from bongo.operations.render_pool import ShaderRenderPool
+
+    return ShaderRenderPool(matrix, workers=render_pool_config.get("workers"),
+                            max_layers=render_pool_config.get("max_layers", 3))
+
+
+def _start_framebuffer_input(framebuffer_config, animation_manager, log):
+    """
+    Shows frames written by external processes into a shared-memory
+    framebuffer, if configured: on the base layer, or on its own layer.
+    Returns the SharedFramebuffer (or None).
+    """
+    if not framebuffer_config.get("name"):
+        return None
+    from bongo.ingest.shared_framebuffer import (FORMAT_FLOAT32, FORMAT_UINT16, FramebufferShader,
+                                                 SharedFramebuffer)
+
+    matrix = animation_manager.matrix
+    pixel_format = FORMAT_UINT16 if framebuffer_config.get("format") == "uint16" else FORMAT_FLOAT32
+    framebuffer = SharedFramebuffer.open(framebuffer_config["name"], matrix.rows, matrix.cols, pixel_format)
+    layer = framebuffer_config.get("layer")
+    if layer:
+        animation_manager.add_layer(layer, opacity=framebuffer_config.get("opacity", 1.0),
+                                    blend=framebuffer_config.get("blend", "normal"))
+    animation_manager.add_shader(FramebufferShader(framebuffer, stale_after=framebuffer_config.get("stale_after")),
+                                 layer=layer)
+    log.info(f"Reading external frames from '{framebuffer.path}' ({framebuffer.rows}x{framebuffer.cols}).")
+    return framebuffer
+
+
+def _start_dmx_input(dmx_config, animation_manager):
+    """
+    Receives Art-Net or E1.31 universes, mapped linearly onto the matrix, if
+    configured. Returns the running DMXReceiver (or None).
+    """
+    if not dmx_config.get("protocol"):
+        return None
+    from bongo.ingest.dmx_receiver import DMXMapping, DMXReceiver, DMXShader
+
+    protocol = dmx_config["protocol"]
+    mapping = DMXMapping.linear(animation_manager.matrix.coordinate_grid(),
+                                start_universe=dmx_config.get("start_universe", 1 if protocol == "e131" else 0),
+                                channels_per_led=dmx_config.get("channels_per_led", 1),
+                                leds_per_universe=dmx_config.get("leds_per_universe"))
+    receiver = DMXReceiver(mapping, protocol=protocol, host=dmx_config.get("host", "0.0.0.0"),
+                           port=dmx_config.get("port"), multicast=dmx_config.get("multicast", False))
+    layer = dmx_config.get("layer")
+    if layer:
+        animation_manager.add_layer(layer, opacity=dmx_config.get("opacity", 1.0),
+                                    blend=dmx_config.get("blend", "normal"))
+    animation_manager.add_shader(DMXShader(receiver, stale_after=dmx_config.get("stale_after")), layer=layer)
+    receiver.start()
+    return receiver
+
+
+def _start_control_server(control_config, animation_manager, runner, gc_controller, log):
+    """
+    Serves the control socket that manual_cli.py and other local tools talk to,
+    unless disabled. Returns the running ControlServer (or None).
+    """
+    if not control_config.get("enabled", True):
+        return None
+    from bongo.control.server import DEFAULT_SOCKET_PATH, ControlServer
+
+    server = ControlServer(animation_manager, path=control_config.get("socket", DEFAULT_SOCKET_PATH), runner=runner,
+                           gc_controller=gc_controller)
+    try:
+        server.start()
+    except OSError as e:
+        log.error(f"Could not open the control socket at '{server.path}': {e}")
+        return None
+    return server
+
+
+def _start_time_sync(sync_config, animation_manager, gc_controller, log):
+    """
+    Joins the configured group of nodes as leader or follower. The leader
+    announces the configured show; every node loads it for the announced
+    start (see _load_show()). Returns the running TimeSyncLeader /
+    TimeSyncFollower (or None).
+    """
+    role = sync_config.get("role")
+    if not role:
+        return None
+    from bongo.sync.time_sync import DEFAULT_PORT, TimeSyncFollower, TimeSyncLeader
+
+    port = sync_config.get("port", DEFAULT_PORT)
+    params = sync_config.get("show_params", {})
+    if role == "leader":
+        node = TimeSyncLeader(host=sync_config.get("host", "0.0.0.0"), port=port)
+        node.start()
+        show = sync_config.get("show", "chase")
+        _load_show(animation_manager, show, node.announce_show(show, sync_config.get("start_in", 2.0)), params,
+                   gc_controller)
+    elif role == "follower":
+        node = TimeSyncFollower(sync_config["leader"], port=port, interval=sync_config.get("interval", 0.5),
+                                on_show=lambda name, start: _load_show(animation_manager, name, start, params,
+                                                                       gc_controller))
+        node.start()
+        log.info(f"Following time sync leader {sync_config['leader']}:{port}; waiting for a show.")
+    else:
+        log.error(f"Unknown time sync role '{role}'; expected 'leader' or 'follower'.")
+        return None
+    return node
+
+
+def _load_show(animation_manager, name, start_time_base, params, gc_controller=None):
+    """
+    Replaces whatever is playing with built-in pattern `name` over every LED,
+    starting at start_time_base. Every node of a synchronized group runs this
+    with the same arguments when the leader announces the show. In
+    GC-pause-free mode the heap is frozen again once the show is loaded.
+    """
+    from bongo.patterns import builtin_patterns
+
+    factory = getattr(builtin_patterns, f"create_{name}_batch")
+    batch = factory(list(animation_manager.matrix.coordinate_grid().coords), start_time_base=start_time_base,
+                    **params)
+
+    def load():
+        animation_manager.clear_operations()
+        animation_manager.add_batch(batch)
+    animation_manager.call_soon(load)
+    if gc_controller is not None:
+        gc_controller.freeze_soon(animation_manager)
+
+
+def _create_runner(animation_manager, render_ahead_config, gc_controller, fps: int = 60, timebase=None):
+    """
+    Returns a RenderAheadRunner if render-ahead is configured, else an
+    AnimationRunner (locked to `timebase`, if given).
+    """
+    frames = render_ahead_config.get("frames")
+    if not frames or timebase is not None:
+        return AnimationRunner(animation_manager, fps=fps, gc_controller=gc_controller, timebase=timebase)
+    from bongo.operations.render_ahead import RenderAheadRunner
+
+    return RenderAheadRunner(animation_manager, fps=fps, frames_ahead=frames, gc_controller=gc_controller)
+
+
 def main():
     """Main application entry point for the Bongo LED system."""
 
@@ -42,21 +239,14 @@ def main():
     log.info("🚀 Bongo Application Starting...")
 
     try:
-        full_led_config = loader.get_led_config()
-        pca_led_config = []
-        for item in full_led_config:
-            if item.get("type") == "pca9685":
-                new_item = item.copy()
-                if 'address' in new_item: new_item['controller_address'] = new_item.pop('address')
-                if 'pin' in new_item: new_item['led_channel'] = new_item.pop('pin')
-                pca_led_config.append(new_item)
-
-        if not pca_led_config:
+        layout = loader.get_compiled_layout(led_types=("pca9685",))
+
+        if not layout.num_leds:
             log.warning("No LEDs of type 'pca9685' found in the configuration.")
             return
 
-        controller_addresses = list(set(item['controller_address'] for item in pca_led_config))
-        log.info(f"Found {len(pca_led_config)} PCA9685 LEDs and {len(controller_addresses)} unique controllers.")
+        controller_addresses = list(layout.boards)
+        log.info(f"Found {layout.num_leds} PCA9685 LEDs and {len(controller_addresses)} unique controllers.")
 
     except Exception as e:
         log.critical("FATAL ERROR: Could not parse LED configuration.", exc_info=True)
@@ -64,15 +254,26 @@ def main():
 
     try:
         hw_manager = HardwareManager(addresses=controller_addresses)
-        matrix = LEDMatrix(config=pca_led_config, hardware_manager=hw_manager)
+        matrix = LEDMatrix.from_layout(layout, hardware_manager=hw_manager)
         log.info(f"Hardware initialized. Matrix created with {matrix.rows} rows and {matrix.cols} columns.")
     except Exception as e:
         log.critical("FATAL ERROR: Could not initialize hardware or create matrix.", exc_info=True)
         return
 
-    # 5. Initialize the AnimationManager
-    animation_manager = AnimationManager(matrix=matrix)
+    # 5. Initialize the AnimationManager (with telemetry if configured)
+    metrics, exporters = _start_metrics(loader.get_metrics_config(), log)
+    _start_tracing(loader.get_tracing_config(), log)
+    render_pool = _create_render_pool(loader.get_render_pool_config(), matrix)
+    animation_manager = AnimationManager(matrix=matrix, metrics=metrics,
+                                         timing_wheel=_create_timing_wheel(loader.get_schedule_config()),
+                                         render_pool=render_pool)
     log.info("AnimationManager initialized.")
+    framebuffer = _start_framebuffer_input(loader.get_framebuffer_input_config(), animation_manager, log)
+    dmx_receiver = _start_dmx_input(loader.get_dmx_input_config(), animation_manager)
+    # Created now so later pattern loads can re-freeze the heap; enabled before the main loop.
+    gc_controller = _create_gc_controller(loader.get_gc_config(), metrics)
+    # With a 'time_sync' section the leader's announced show replaces the demo chase below.
+    time_sync = _start_time_sync(loader.get_time_sync_config(), animation_manager, gc_controller, log)
 
 
 
@@ -114,7 +315,7 @@ def main():
 
     all_led_coords = list(matrix.leds.keys())
 
-    if all_led_coords:
+    if all_led_coords and time_sync is None:
         from bongo.patterns.builtin_patterns import create_chase_pattern
 
         # Use all LEDs but with faster timing
@@ -165,26 +366,38 @@ def main():
     #     log.info(f"Time until first operation: {first_op.pixel_op.start_time - time.monotonic():.2f}s")
 
 
-    # 7. Start the main application loop.
+    # 7. Start the main application loop. The runner renders at 60 FPS while
+    # operations are active and sleeps until the next scheduled one otherwise.
+    # In pause-free GC mode everything loaded so far is frozen first. With a
+    # 'render_ahead' section, frames are rendered a few frames ahead instead.
+    if gc_controller is not None:
+        gc_controller.enable()
     log.info("Entering main loop...")
+    timebase = time_sync.clock if time_sync is not None else None
+    if timebase is not None and loader.get_render_ahead_config().get("frames"):
+        log.warning("Render-ahead is not available with time sync; rendering just in time.")
+    runner = _create_runner(animation_manager, loader.get_render_ahead_config(), gc_controller, timebase=timebase)
+    control_server = _start_control_server(loader.get_control_config(), animation_manager, runner, gc_controller, log)
     try:
-        frame_count = 0
-        while True:
-            animation_manager.tick()
-
-            # Much less frequent logging to reduce overhead
-            if frame_count % 600 == 0:  # Every 10 seconds instead of 5
-                active_ops = len(animation_manager.operations)
-                log.info(f"Frame {frame_count}: {active_ops} active operations")
-                print(f"Frame {frame_count}: {active_ops} active operations")       # !!!!!!!!!!!!!!!!
-
-            frame_count += 1
-            time.sleep(1 / 60)
+        runner.run()
 
     except KeyboardInterrupt:
         print()  # Newline after ^C
         log.info("Caught Ctrl+C. Initiating shutdown sequence.")
+        log.info(f"Rendered {runner.frame_count} frames, idle {runner.idle_percentage:.1f}% of the time.")
     finally:
+        if control_server is not None:
+            control_server.stop()
+        for exporter in exporters:
+            exporter.stop()
+        if render_pool is not None:
+            render_pool.close()
+        if framebuffer is not None:
+            framebuffer.close()
+        if dmx_receiver is not None:
+            dmx_receiver.close()
+        if time_sync is not None:
+            time_sync.close()
         # 8. Gracefully shut down the hardware.
         if 'matrix' in locals():
             log.info("Shutting down matrix and turning off all LEDs...")
@@ -0,0 +1,51 @@
+# src/bongo/control/client.py
+"""A client for the app's control socket (see bongo.control.server for the protocol)."""
+import socket
+
+from .server import DEFAULT_SOCKET_PATH, ControlError
+
+
+class ControlClient:
+    """One connection to a running app's ControlServer."""
+
+    def __init__(self, path: str = DEFAULT_SOCKET_PATH, timeout: float = 5.0):
+        """
+        Raises:
+            OSError: If no app is listening on `path`.
+        """
+        self.path = path
+        self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._sock.settimeout(timeout)
+        try:
+            self._sock.connect(path)
+        except OSError:
+            self._sock.close()
+            raise
+        self._replies = self._sock.makefile("rb")
+
+    def request(self, line: str) -> str:
+        """
+        Sends one request line and returns the reply's payload ("" for a bare "ok").
+
+        Raises:
+            ControlError: If the app answered with an error.
+            ConnectionError: If the app closed the connection.
+        """
+        self._sock.sendall(line.strip().encode() + b"\n")
+        reply = self._replies.readline().decode().rstrip("\n")
+        if not reply:
+            raise ConnectionError("The app closed the control connection.")
+        status, _, payload = reply.partition(" ")
+        if status != "ok":
+            raise ControlError(payload)
+        return payload
+
+    def close(self):
+        self._replies.close()
+        self._sock.close()
+
+    def __enter__(self) -> "ControlClient":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
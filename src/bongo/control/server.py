@@ -0,0 +1,328 @@
+# src/bongo/control/server.py
+"""
+A Unix-domain-socket control plane for the running app.
+
+Tools such as manual_cli.py talk to the app over a local stream socket
+instead of opening the PCA9685 boards themselves. The protocol is
+line-based UTF-8: each request is one line, and each reply is one line,
+either "ok" followed by an optional payload or "error" followed by a message.
+
+    ping                          -> ok pong
+    set ROW COL LEVEL             LEVEL is 0.0-1.0; values above 1 are read as 0-255
+    fill LEVEL
+    clear                         stop every pattern and turn all LEDs off
+    raw CHANNEL DUTY [ADDRESS]    write a PCA9685 channel's 16-bit duty cycle
+    pattern NAME [KEY=VALUE ...]  start a built-in pattern or library shader -> ok ID
+                                  (keys: the pattern's parameters, plus layer= and,
+                                  for shaders, duration=)
+    stop [ID]                     stop one pattern, or all of them
+    stats                         -> ok {JSON counters}
+    trace on|off|dump             debug logging on/off, or dump the frame trace -> ok PATH
+    sync                          reply once everything sent before it has been applied
+
+Commands that change what is shown are queued with
+AnimationManager.call_soon() and applied on the render thread at the next
+frame boundary; the reply is sent as soon as the command is queued, so a
+round trip costs well under a millisecond. Send "sync" to wait until they
+have been applied.
+"""
+import inspect
+import json
+import logging
+import os
+import socket
+import threading
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+from typing import Callable, Dict, List, Optional
+
+from bongo.operations.animation_manager import AnimationManager, PatternHandle
+from bongo.utils import tracing
+
+log = logging.getLogger("bongo.control")
+
+DEFAULT_SOCKET_PATH = "/tmp/bongo-control.sock"
+_BUILTIN_PATTERNS = ("chase", "fade_all", "wave_row")
+_NUMERIC_ANNOTATIONS = (int, float, Optional[int], Optional[float])
+
+
+class ControlError(ValueError):
+    """A control request that can't be carried out; its message is sent back to the client."""
+
+
+def _number(text: str) -> float:
+    try:
+        return float(text)
+    except ValueError:
+        raise ControlError(f"'{text}' is not a number") from None
+
+
+def _integer(text: str) -> int:
+    try:
+        return int(text, 0)
+    except ValueError:
+        raise ControlError(f"'{text}' is not an integer") from None
+
+
+def _level(text: str) -> float:
+    level = _number(text)
+    if not 0.0 <= level <= 255.0:
+        raise ControlError(f"level {text} is out of range (0.0-1.0 or 0-255)")
+    return level
+
+
+def _check_shader_params(func: Callable, params: dict):
+    """Rejects parameters a shader function doesn't take, or text where it expects a number."""
+    signature = inspect.signature(func)
+    try:
+        signature.bind(None, None, 0.0, **params)
+    except TypeError as e:
+        raise ControlError(str(e)) from None
+    for key, value in params.items():
+        if isinstance(value, str) and signature.parameters[key].annotation in _NUMERIC_ANNOTATIONS:
+            raise ControlError(f"{key} must be a number, got '{value}'")
+
+
+class ControlServer:
+    """Serves control requests for an AnimationManager on a Unix socket."""
+
+    def __init__(self, animation_manager: AnimationManager, path: str = DEFAULT_SOCKET_PATH, runner=None,
+                 gc_controller=None):
+        """
+        Args:
+            animation_manager: The manager (and, through it, the matrix) to control.
+            path: Filesystem path of the socket; a stale socket there is replaced.
+            runner: Optional AnimationRunner or RenderAheadRunner, for frame
+                    counts in 'stats'.
+            gc_controller: Optional GCController; the heap is frozen again
+                           after each pattern started with 'pattern'.
+        """
+        self.animation_manager = animation_manager
+        self.matrix = animation_manager.matrix
+        self.path = path
+        self.runner = runner
+        self.gc_controller = gc_controller
+        self.patterns: Dict[int, PatternHandle] = {}
+        self._next_pattern = 1
+        self._patterns_lock = threading.Lock()
+        self._commands: Dict[str, Callable[[List[str]], str]] = {
+            "ping": self._ping, "set": self._set, "fill": self._fill, "clear": self._clear,
+            "raw": self._raw, "pattern": self._pattern, "stop": self._stop, "stats": self._stats,
+            "trace": self._trace, "sync": self._sync,
+        }
+        self._sock: Optional[socket.socket] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = threading.Event()
+
+    # --- Socket handling --------------------------------------------------------
+
+    def start(self):
+        """Starts accepting clients on a background thread."""
+        if self._thread is not None:
+            return
+        if os.path.exists(self.path):
+            os.unlink(self.path)  # left behind by an earlier run
+        self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._sock.bind(self.path)
+        self._sock.listen()
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._accept, name="bongo-control", daemon=True)
+        self._thread.start()
+        log.info(f"Control socket listening on {self.path}.")
+
+    def stop(self):
+        self._stopping.set()
+        if self._sock is not None:
+            try:
+                self._sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            self._sock.close()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        try:
+            os.unlink(self.path)
+        except FileNotFoundError:
+            pass
+
+    def _accept(self):
+        while not self._stopping.is_set():
+            try:
+                conn, _ = self._sock.accept()
+            except OSError:
+                break
+            threading.Thread(target=self._serve, args=(conn,), name="bongo-control-client", daemon=True).start()
+
+    def _serve(self, conn: socket.socket):
+        with conn, conn.makefile("rb") as lines:
+            for line in lines:
+                reply = self.handle(line.decode("utf-8", "replace"))
+                try:
+                    conn.sendall(reply.encode() + b"\n")
+                except OSError:
+                    break
+
+    # --- Commands ---------------------------------------------------------------
+
+    def handle(self, line: str) -> str:
+        """Carries out one request line and returns the reply line (without the newline)."""
+        parts = line.split()
+        if not parts:
+            return "error empty request"
+        command = self._commands.get(parts[0].lower())
+        if command is None:
+            return f"error unknown command '{parts[0]}'"
+        try:
+            result = command(parts[1:])
+        except ControlError as e:
+            return f"error {e}"
+        except Exception as e:
+            log.error("Control command %r failed.", line.strip(), exc_info=True)
+            return f"error {type(e).__name__}: {e}"
+        return "ok" if not result else f"ok {result}"
+
+    def _expect(self, args: List[str], low: int, high: int, usage: str):
+        if not low <= len(args) <= high:
+            raise ControlError(f"usage: {usage}")
+
+    def _ping(self, args):
+        return "pong"
+
+    def _set(self, args):
+        self._expect(args, 3, 3, "set ROW COL LEVEL")
+        row, col, level = _integer(args[0]), _integer(args[1]), _level(args[2])
+        if self.matrix.get_led(row, col) is None:
+            raise ControlError(f"no LED at ({row}, {col})")
+        self.animation_manager.call_soon(lambda: self.matrix.set_pixel(row, col, level))
+
+    def _fill(self, args):
+        self._expect(args, 1, 1, "fill LEVEL")
+        level = _level(args[0])
+        self.animation_manager.call_soon(lambda: self.matrix.fill(level))
+
+    def _clear(self, args):
+        self._expect(args, 0, 0, "clear")
+        manager = self.animation_manager
+
+        def clear():
+            manager.clear_operations()
+            self.matrix.clear()
+        manager.call_soon(clear)
+
+    def _raw(self, args):
+        self._expect(args, 2, 3, "raw CHANNEL DUTY [ADDRESS]")
+        channel, duty = _integer(args[0]), _integer(args[1])
+        if not 0 <= duty <= 0xFFFF:
+            raise ControlError("duty must be 0-65535")
+        hardware = self.matrix.hardware_manager
+        addresses = list(getattr(hardware, "controllers", {}))
+        address = _integer(args[2]) if len(args) == 3 else (addresses[0] if addresses else None)
+        controller = hardware.get_controller(address) if address is not None else None
+        if controller is None:
+            raise ControlError("no PCA9685 controller found")
+        if not 0 <= channel < len(controller.channels):
+            raise ControlError(f"channel must be 0-{len(controller.channels) - 1}")
+
+        def write():
+            controller.channels[channel].duty_cycle = duty
+        self.animation_manager.call_soon(write)
+
+    def _pattern(self, args):
+        if not args:
+            raise ControlError("usage: pattern NAME [KEY=VALUE ...]")
+        name, options = args[0], {}
+        for arg in args[1:]:
+            key, sep, value = arg.partition("=")
+            if not sep:
+                raise ControlError(f"expected KEY=VALUE, got '{arg}'")
+            try:
+                options[key] = float(value)
+            except ValueError:
+                options[key] = value
+        layer = options.pop("layer", None)
+        manager = self.animation_manager
+        if name in _BUILTIN_PATTERNS:
+            from bongo.patterns import builtin_patterns
+
+            factory = getattr(builtin_patterns, f"create_{name}_batch")
+            coords = list(self.matrix.coordinate_grid().coords)
+            try:
+                handle = manager.add_batch(factory(coords, **options), layer=layer)
+            except TypeError as e:
+                raise ControlError(str(e)) from None
+        else:
+            from bongo.patterns.shaders import SHADER_LIBRARY, Shader
+
+            if name not in SHADER_LIBRARY:
+                raise ControlError(f"unknown pattern '{name}'; try one of "
+                                   f"{', '.join(_BUILTIN_PATTERNS + tuple(sorted(SHADER_LIBRARY)))}")
+            duration = options.pop("duration", None)
+            blend = options.pop("blend", "replace")
+            brightness = options.pop("brightness", 1.0)
+            _check_shader_params(SHADER_LIBRARY[name], options)
+            try:
+                shader = Shader.from_library(name, brightness=brightness, blend=blend, **options)
+            except (TypeError, ValueError) as e:
+                raise ControlError(str(e)) from None
+            handle = manager.add_shader(shader, duration=duration, layer=layer)
+        if self.gc_controller is not None:
+            self.gc_controller.freeze_soon(manager)
+        with self._patterns_lock:
+            self.patterns = {pattern_id: h for pattern_id, h in self.patterns.items() if not h.done}
+            pattern_id = self._next_pattern
+            self._next_pattern += 1
+            self.patterns[pattern_id] = handle
+        return str(pattern_id)
+
+    def _stop(self, args):
+        self._expect(args, 0, 1, "stop [ID]")
+        manager = self.animation_manager
+        if not args:
+            manager.call_soon(manager.clear_operations)
+            return None
+        pattern_id = _integer(args[0])
+        with self._patterns_lock:
+            handle = self.patterns.pop(pattern_id, None)
+        if handle is None:
+            raise ControlError(f"no running pattern {pattern_id}")
+        manager.call_soon(lambda: manager.cancel_pattern(handle))
+
+    def _stats(self, args):
+        manager = self.animation_manager
+        with self._patterns_lock:
+            running = sorted(pattern_id for pattern_id, h in self.patterns.items() if not h.done)
+        stats = {
+            "operations": manager.operation_count,
+            "scheduled_operations": manager.scheduled_count,
+            "pending_submissions": manager.pending_submissions,
+            "batches": len(manager.batches),
+            "shaders": len(manager.shaders),
+            "layers": list(manager.layers),
+            "patterns": running,
+        }
+        if self.runner is not None:
+            stats["frames"] = self.runner.frame_count
+            stats["idle_percentage"] = round(self.runner.idle_percentage, 1)
+        return json.dumps(stats, separators=(",", ":"))
+
+    def _trace(self, args):
+        self._expect(args, 1, 1, "trace on|off|dump")
+        mode = args[0].lower()
+        if mode in ("on", "off"):
+            logging.getLogger("bongo").setLevel(logging.DEBUG if mode == "on" else logging.INFO)
+            log.info(f"Trace logging set to {mode.upper()}.")
+            return None
+        if mode == "dump":
+            tracer = tracing.get_tracer()
+            if tracer is None:
+                raise ControlError("frame tracing is not enabled")
+            return tracer.dump_async("control")
+        raise ControlError("usage: trace on|off|dump")
+
+    def _sync(self, args, timeout: float = 2.0):
+        applied = Future()
+        self.animation_manager.call_soon(lambda: applied.set_result(None))
+        try:
+            applied.result(timeout)
+        except FutureTimeout:
+            raise ControlError("the render loop did not reach a frame boundary in time") from None
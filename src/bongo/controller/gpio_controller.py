@@ -2,32 +2,40 @@
 import logging
 
 # --- For handling real vs. mock environments ---
-try:
-    import RPi.GPIO as GPIO
+# Placeholder used when RPi.GPIO cannot be imported (non-Pi environments).
+class _PlaceholderGPIO:
+    BCM = 0
+    OUT = 0
+    HIGH = 1
+    LOW = 0
 
-    IS_REAL_HARDWARE = True
-except (ImportError, RuntimeError):
-    # Define a placeholder class for non-Pi environments
-    class GPIO:
-        BCM = 0
-        OUT = 0
-        HIGH = 1
-        LOW = 0
+    @staticmethod
+    def setmode(mode): pass
 
-        @staticmethod
-        def setmode(mode): pass
+    @staticmethod
+    def setup(pin, mode): pass
 
-        @staticmethod
-        def setup(pin, mode): pass
+    @staticmethod
+    def output(pin, value): pass
 
-        @staticmethod
-        def output(pin, value): pass
+    @staticmethod
+    def cleanup(): pass
 
-        @staticmethod
-        def cleanup(): pass
 
+_GPIO = None
+
+
+def _gpio():
+    """Imports RPi.GPIO on first use, falling back to a placeholder off-Pi."""
+    global _GPIO
+    if _GPIO is None:
+        try:
+            import RPi.GPIO as GPIO
+            _GPIO = GPIO
+        except (ImportError, RuntimeError):
+            _GPIO = _PlaceholderGPIO
+    return _GPIO
 
-    IS_REAL_HARDWARE = False
 
 log = logging.getLogger("bongo.gpio_controller")
 
@@ -66,14 +74,20 @@ class GPIOLEDController:
         self.current_brightness = max(0.0, min(1.0, brightness_norm))
 
         # Simple on/off logic based on brightness
+        GPIO = _gpio()
         output_state = GPIO.HIGH if self.current_brightness > 0 else GPIO.LOW
 
         try:
-            log.debug(f"Setting GPIO pin {self.pin} to state {'HIGH' if output_state else 'LOW'}")
+            # Called every frame: let logging format the message only if DEBUG is on.
+            log.debug("Setting GPIO pin %s to state %s", self.pin, "HIGH" if output_state else "LOW")
             GPIO.output(self.pin, output_state)
         except Exception as e:
             log.error(f"Failed to set state for GPIO pin {self.pin}: {e}", exc_info=True)
 
+    def set_duty_cycle(self, duty_cycle: int):
+        """Fixed-point equivalent of set_brightness(): any non-zero duty turns the LED on."""
+        self.set_brightness(1.0 if duty_cycle > 0 else 0.0)
+
     def get_pixel(self) -> int:
         """Returns brightness on a 0-255 scale."""
         return 255 if self.current_brightness > 0 else 0
@@ -1,17 +1,19 @@
 # src/bongo/controller/hybrid_controller.py
 import logging
-from unittest.mock import MagicMock
-import time
-
-try:
-    from adafruit_pca9685 import PCA9685
-    IS_REAL_HARDWARE = True
-except (NotImplementedError, ModuleNotFoundError):
-    class PCA9685: pass
-    IS_REAL_HARDWARE = False
+import sys
 
 logger = logging.getLogger("bongo.hybrid_controller")
 
+
+def _pca9685_class():
+    """
+    Returns the adafruit PCA9685 class if that library has already been imported
+    (by the HardwareManager), otherwise None. A controller can only be a real
+    PCA9685 if the library is loaded, so this never triggers the import itself.
+    """
+    module = sys.modules.get("adafruit_pca9685")
+    return getattr(module, "PCA9685", None) if module is not None else None
+
 class HybridLEDController:
     """
     Controls a single Black & White (monochromatic) LED connected to a PCA9685 controller.
@@ -36,11 +38,13 @@ class HybridLEDController:
             return
         self.current_brightness = max(0.0, min(1.0, brightness_norm))
         try:
-            if IS_REAL_HARDWARE and isinstance(self.controller, PCA9685):
+            pca_class = _pca9685_class()
+            if pca_class is not None and isinstance(self.controller, pca_class):
                 duty_cycle = self._calculate_duty_cycle(self.current_brightness)
                 # print(f"set_brightness with channel: {self.led_channel} controller: {self.controller}")
                 self.controller.channels[self.led_channel].duty_cycle = duty_cycle
-            elif isinstance(self.controller, MagicMock):
+            elif hasattr(self.controller, "set_pwm"):
+                # Mock / legacy controllers expose the 12-bit set_pwm API.
                 pwm_val = int(self.current_brightness * 4095)
                 self.controller.set_pwm(self.led_channel, 0, pwm_val)
             else:
@@ -48,6 +52,26 @@ class HybridLEDController:
         except Exception as e:
             logger.error(f"Failed to set brightness for channel {self.led_channel}: {e}")
 
+    def set_duty_cycle(self, duty_cycle: int):
+        """
+        Writes a precomputed 16-bit duty cycle (0-65535) directly, skipping the
+        float clamping and conversion of set_brightness(). Used by the
+        AnimationManager's fixed-point path.
+        """
+        if self.controller is None:
+            return
+        self.current_brightness = duty_cycle / 65535
+        try:
+            pca_class = _pca9685_class()
+            if pca_class is not None and isinstance(self.controller, pca_class):
+                self.controller.channels[self.led_channel].duty_cycle = duty_cycle
+            elif hasattr(self.controller, "set_pwm"):
+                self.controller.set_pwm(self.led_channel, 0, duty_cycle >> 4)
+            else:
+                logger.warning(f"Controller of type {type(self.controller)} is not recognized. Doing nothing.")
+        except Exception as e:
+            logger.error(f"Failed to set duty cycle for channel {self.led_channel}: {e}")
+
     def get_pixel(self) -> int:
         return int(round(self.current_brightness * 255))
 
@@ -1,4 +1,7 @@
 # mock_hal.py
+import logging
+
+log = logging.getLogger("bongo.mock_hal")
 
 class MockPixelController:
     def __init__(self, *args, **kwargs):
@@ -6,7 +9,7 @@ class MockPixelController:
 
     def set_pixel(self, brightness: float):         # Deprecate
         self._pixel_state = brightness
-        print(f"[MOCK] Pixel set with  brightness {brightness:.2f}")
+        log.debug("[MOCK] Pixel set with brightness %.2f", brightness)
 
     def get_pixel(self):         # Deprecate
         return self._pixel_state
@@ -16,7 +19,7 @@ class MockPixelController:
 
     def set_brightness(self, value: float):
         self._pixel_state = value
-        print(f"[MOCK] Fallback brightness set to {value:.2f}")
+        log.debug("[MOCK] Fallback brightness set to %.2f", value)
 
     def get_brightness(self):
         return self._pixel_state
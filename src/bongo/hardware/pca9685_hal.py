@@ -1,14 +1,24 @@
 # new-bongo/src/bongo/hardware/pca9685_hal.py
 
-import board
-import busio
-from adafruit_pca9685 import PCA9685
+import logging
+
 from bongo.interfaces.hardware import IPixelController
 from typing import Dict, Tuple, List, Optional
 
 # Dictionary to hold PCA9685 instances by their I2C address
 # This ensures that only one instance of a PCA9685 board is created per address.
-_pca_boards: Dict[int, PCA9685] = {}
+_pca_boards: Dict[int, "PCA9685"] = {}
+
+log = logging.getLogger("bongo.pca9685_hal")
+
+
+def __getattr__(name):
+    # board/busio/adafruit_pca9685 are only imported when a board is actually
+    # initialized; `from ...pca9685_hal import PCA9685` still works on demand.
+    if name == "PCA9685":
+        from adafruit_pca9685 import PCA9685
+        return PCA9685
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 class PCA9685PixelController(IPixelController):
@@ -41,6 +51,10 @@ class PCA9685PixelController(IPixelController):
     def _initialize_board(self):
         global _pca_boards
         if self._i2c_address not in _pca_boards:
+            import board
+            import busio
+            from adafruit_pca9685 import PCA9685
+
             i2c = busio.I2C(board.SCL, board.SDA)
             pca = PCA9685(i2c, address=self._i2c_address)
             pca.frequency = self._pwm_frequency
@@ -95,7 +109,7 @@ class PCA9685PixelController(IPixelController):
         pwm_value = int(brightness * 0xFFFF)  # 0xFFFF is 65535
 
         # Set the PWM duty cycle for the specific channel
-        print(f"set channel {channel_index} to {pwm_value}")
+        log.debug("set channel %d to %d", channel_index, pwm_value)
         self._pca.channels[channel_index].duty_cycle = pwm_value
         # print(f"PCA9685: Set ({row},{col}) channel {channel_index} to PWM {pwm_value} (brightness {brightness:.2f})") # Debug
 
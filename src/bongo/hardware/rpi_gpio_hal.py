@@ -1,18 +1,32 @@
+import logging
 import sys
 from typing import List, Dict, Tuple, Any
 
-try:
-    import RPi.GPIO as GPIO
-    RPi_GPIO_AVAILABLE = True
-    print("Raspberry Pi GPIO available")
-except RuntimeError:
-    RPi_GPIO_AVAILABLE = False
-    print("Raspberry Pi GPIO not available")
-
 from bongo.interfaces.hardware import IPixelController
 
+# RPi.GPIO is imported on first use (see _load_gpio), not at module import time.
+GPIO = None
+RPi_GPIO_AVAILABLE = None
+
 _pwm_objects: Dict[int, Any] = {}
 
+log = logging.getLogger("bongo.rpi_gpio_hal")
+
+
+def _load_gpio() -> bool:
+    """Imports RPi.GPIO once and records whether it is available."""
+    global GPIO, RPi_GPIO_AVAILABLE
+    if RPi_GPIO_AVAILABLE is None:
+        try:
+            import RPi.GPIO as _GPIO
+            GPIO = _GPIO
+            RPi_GPIO_AVAILABLE = True
+            print("Raspberry Pi GPIO available")
+        except (ImportError, RuntimeError):
+            RPi_GPIO_AVAILABLE = False
+            print("Raspberry Pi GPIO not available")
+    return RPi_GPIO_AVAILABLE
+
 
 class RPiGPIOPixelController(IPixelController):
     """
@@ -21,7 +35,7 @@ class RPiGPIOPixelController(IPixelController):
     """
 
     def __init__(self, rows: int, cols: int, gpio_pins: List[int], frequency: int = 1000):
-        if not RPi_GPIO_AVAILABLE:
+        if not _load_gpio():
             raise RuntimeError("RPi.GPIO library not available. Cannot initialize RPiGPIOPixelController.")
 
         if not isinstance(rows, int) or rows <= 0:
@@ -77,7 +91,7 @@ class RPiGPIOPixelController(IPixelController):
 
     def set_pixel(self, row: int, col: int, r: int, g: int, b: int, brightness: float) -> None:
         if not RPi_GPIO_AVAILABLE:
-            print("RPi.GPIO not available, skipping set_pixel.")
+            log.debug("RPi.GPIO not available, skipping set_pixel.")
             return
 
         if not (0 <= row < self._rows and 0 <= col < self._cols):
@@ -94,7 +108,7 @@ class RPiGPIOPixelController(IPixelController):
             raise RuntimeError(f"PWM object for GPIO pin {gpio_pin} not initialized.")
 
         duty_cycle = brightness * 100
-        print(f"Set duty cycle for pin {gpio_pin} to {duty_cycle}%.")
+        log.debug("Set duty cycle for pin %d to %s%%.", gpio_pin, duty_cycle)
         _pwm_objects[gpio_pin].ChangeDutyCycle(duty_cycle)
 
     def clear(self) -> None:
@@ -3,24 +3,38 @@ import logging
 from typing import Dict, List
 
 # --- For handling real vs. mock environments ---
-try:
-    import board
-    import busio
-    from adafruit_pca9685 import PCA9685
-    import RPi.GPIO as GPIO
-    IS_PI = True
-except (NotImplementedError, ModuleNotFoundError, RuntimeError):
-    print("⚠️  Could not import hardware libraries. Assuming not on a Raspberry Pi.")
-    class PCA9685: pass
-    class GPIO:
-        BCM = 0; OUT = 0
-        @staticmethod
-        def setmode(mode): pass
-        @staticmethod
-        def setup(pin, mode): pass
-        @staticmethod
-        def cleanup(): pass
-    IS_PI = False
+# The hardware libraries are imported lazily, the first time a HardwareManager
+# needs them, so importing this module (and bongo.app) stays cheap.
+_hardware_libs = None
+
+
+def load_hardware_libraries():
+    """
+    Imports board, busio, adafruit_pca9685 and RPi.GPIO on first use.
+
+    Returns:
+        A dict with the 'board', 'busio', 'PCA9685' and 'GPIO' entries, or None
+        if the libraries are unavailable (i.e. not running on a Raspberry Pi).
+        The result is cached, so the import cost is paid at most once.
+    """
+    global _hardware_libs
+    if _hardware_libs is None:
+        try:
+            import board
+            import busio
+            from adafruit_pca9685 import PCA9685
+            import RPi.GPIO as GPIO
+            _hardware_libs = {"board": board, "busio": busio, "PCA9685": PCA9685, "GPIO": GPIO}
+        except (NotImplementedError, ModuleNotFoundError, RuntimeError):
+            print("⚠️  Could not import hardware libraries. Assuming not on a Raspberry Pi.")
+            _hardware_libs = {}
+    return _hardware_libs or None
+
+
+def is_pi() -> bool:
+    """Returns True if the real hardware libraries could be imported."""
+    return load_hardware_libraries() is not None
+
 
 log = logging.getLogger("bongo.hardware_manager")
 
@@ -39,11 +53,13 @@ class HardwareManager:
         """
         log.info("Initializing HardwareManager...")
         self.i2c_bus = None
-        self.controllers: Dict[int, PCA9685] = {}
+        self.controllers: Dict[int, "PCA9685"] = {}
 
-        if not IS_PI:
+        libs = load_hardware_libraries()
+        if libs is None:
             log.warning("Not on a Pi. Skipping real hardware setup.")
             return
+        board, busio, PCA9685, GPIO = libs["board"], libs["busio"], libs["PCA9685"], libs["GPIO"]
 
         # --- Setup I2C and PCA9685 Controllers ---
         if addresses:
@@ -76,7 +92,7 @@ class HardwareManager:
                 log.critical(f"Failed to configure GPIO pins: {e}", exc_info=True)
                 raise
 
-    def get_controller(self, address: int) -> PCA9685:
+    def get_controller(self, address: int) -> "PCA9685":
         """Retrieves a pre-initialized PCA9685 controller instance."""
         controller = self.controllers.get(address)
         if controller is None:
@@ -85,6 +101,7 @@ class HardwareManager:
 
     def cleanup(self):
         """Cleans up all hardware resources."""
-        if IS_PI:
+        libs = load_hardware_libraries()
+        if libs is not None:
             log.info("Cleaning up GPIO resources...")
-            GPIO.cleanup()
+            libs["GPIO"].cleanup()
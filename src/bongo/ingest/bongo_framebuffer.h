@@ -0,0 +1,51 @@
+/*
+ * bongo_framebuffer.h - layout of a bongo shared-memory framebuffer.
+ *
+ * External producers write brightness frames into a memory-mapped file
+ * (by default /dev/shm/<name>, i.e. shm_open("/<name>", ...)), which the
+ * bongo render loop reads every frame (see shared_framebuffer.py).
+ *
+ * The file is a 64-byte header followed by rows * cols pixels, row-major:
+ * the LED at (row, col) is pixel row * cols + col. All fields are
+ * little-endian. Pixels outside the matrix are ignored; LEDs outside the
+ * framebuffer stay dark.
+ *
+ * Writing a frame (seqlock; the reader never blocks the writer):
+ *
+ *     uint64_t seq = __atomic_load_n(&fb->sequence, __ATOMIC_RELAXED) | 1;
+ *     __atomic_store_n(&fb->sequence, seq, __ATOMIC_RELAXED);     // odd: writing
+ *     __atomic_thread_fence(__ATOMIC_RELEASE);
+ *     memcpy(BONGO_FB_PIXELS(fb), frame, rows * cols * pixel_size);
+ *     fb->timestamp_ns = now_ns;                                  // CLOCK_MONOTONIC
+ *     __atomic_store_n(&fb->sequence, seq + 1, __ATOMIC_RELEASE); // even: complete
+ *
+ * Only one process may write a framebuffer at a time.
+ */
+#ifndef BONGO_FRAMEBUFFER_H
+#define BONGO_FRAMEBUFFER_H
+
+#include <stdint.h>
+
+#define BONGO_FB_MAGIC   0x42464742u /* "BGFB" */
+#define BONGO_FB_VERSION 1u
+
+enum bongo_fb_format {
+    BONGO_FB_FLOAT32 = 1, /* float, brightness 0.0-1.0 */
+    BONGO_FB_UINT16 = 2   /* uint16_t, PWM duty 0-65535 */
+};
+
+struct bongo_fb_header {
+    uint32_t magic;        /*  0: BONGO_FB_MAGIC */
+    uint16_t version;      /*  4: BONGO_FB_VERSION */
+    uint16_t format;       /*  6: enum bongo_fb_format */
+    uint32_t rows;         /*  8 */
+    uint32_t cols;         /* 12 */
+    uint64_t sequence;     /* 16: seqlock counter, odd while a frame is written */
+    uint64_t timestamp_ns; /* 24: CLOCK_MONOTONIC time of the newest frame */
+    uint8_t reserved[32];  /* 32: zero */
+};                         /* 64 bytes */
+
+#define BONGO_FB_HEADER_SIZE 64u
+#define BONGO_FB_PIXELS(fb) ((void *)((uint8_t *)(fb) + BONGO_FB_HEADER_SIZE))
+
+#endif /* BONGO_FRAMEBUFFER_H */
@@ -0,0 +1,397 @@
+# src/bongo/ingest/dmx_receiver.py
+"""
+DMX-over-UDP input: Art-Net and E1.31 (sACN) universes mapped onto the matrix.
+
+Lighting desks and media servers send DMX512 universes over UDP. A
+DMXReceiver listens on a port, receives every packet with recv_into() into
+one preallocated buffer, and writes the channels of each known universe
+straight into a frame of brightness values in coordinate_grid() order,
+through a DMXMapping compiled once into per-universe index arrays (so a
+packet costs a header parse and one vectorized gather).
+
+A frame is complete when every mapped universe has arrived since the last
+one, or when the sender emits a sync packet (ArtSync / E1.31 universe sync).
+Complete frames are handed to the render loop by triple buffering: the
+receiver fills a back buffer and swaps it with the "ready" one; acquire()
+swaps "ready" with the front buffer the render loop reads. Neither side
+waits for the other beyond an index swap, and the receiver never writes the
+buffer being read. After each publish the receiver copies the frame into its
+new back buffer, so a frame published without some universe (a lost packet
+before a sync) shows that universe's latest values.
+
+DMXShader shows the frames like any other shader (on the base layer or a
+named layer). Channels are 8-bit, or 16-bit (coarse, fine) with
+channels_per_led=2.
+"""
+import logging
+import socket
+import struct
+import threading
+import time
+from typing import Dict, Iterable, Optional, Tuple
+
+import numpy as np
+
+from bongo.patterns.shaders import Shader
+
+log = logging.getLogger("bongo.dmx")
+
+ARTNET_PORT = 6454
+E131_PORT = 5568
+DMX_CHANNELS = 512
+
+_ARTNET_ID = b"Art-Net\x00"
+_ARTNET_OP_DMX = 0x5000
+_ARTNET_OP_SYNC = 0x5200
+_ARTNET_DATA = 18
+
+_E131_ID = b"ASC-E1.17\x00\x00\x00"
+_E131_ROOT_DATA = 0x00000004
+_E131_ROOT_EXTENDED = 0x00000008
+_E131_FRAMING_DMP = 0x00000002
+_E131_EXTENDED_SYNC = 0x00000001
+_E131_OPTION_PREVIEW = 0x80
+_E131_DATA = 126
+
+_DATA_OFFSETS = {"artnet": _ARTNET_DATA, "e131": _E131_DATA}
+_SYNC = -1
+
+
+class _UniverseTable:
+    """One universe's compiled slice of a mapping, sorted by the last channel each LED needs."""
+
+    __slots__ = ("leds", "coarse", "fine", "needed")
+
+    def __init__(self, leds, coarse, fine, needed):
+        self.leds = leds
+        self.coarse = coarse
+        self.fine = fine
+        self.needed = needed
+
+
+class DMXMapping:
+    """Which DMX universe and channel drive each LED of a coordinate grid."""
+
+    def __init__(self, size: int, entries: Iterable[Tuple[int, int, int]], channels_per_led: int = 1):
+        """
+        Args:
+            size: Number of entries in the coordinate grid.
+            entries: (grid index, universe, first channel) triples; channels
+                     count from 1 as on a lighting desk.
+            channels_per_led: 1 for 8-bit LEDs, 2 for 16-bit (coarse, fine).
+
+        Raises:
+            ValueError: If a channel doesn't fit in its universe.
+        """
+        if channels_per_led not in (1, 2):
+            raise ValueError("channels_per_led must be 1 or 2.")
+        self.size = size
+        self.channels_per_led = channels_per_led
+        self.universes: Dict[int, list] = {}
+        for led, universe, channel in entries:
+            if not 1 <= channel <= DMX_CHANNELS - channels_per_led + 1:
+                raise ValueError(f"Channel {channel} of universe {universe} is out of range.")
+            self.universes.setdefault(universe, []).append((led, channel))
+
+    @classmethod
+    def linear(cls, grid, start_universe: int = 0, channels_per_led: int = 1,
+               leds_per_universe: Optional[int] = None) -> "DMXMapping":
+        """
+        Maps the LEDs in coordinate_grid() order onto consecutive channels,
+        moving to the next universe after leds_per_universe LEDs (as many as fit
+        by default).
+        """
+        per_universe = leds_per_universe or DMX_CHANNELS // channels_per_led
+        return cls(len(grid), ((i, start_universe + i // per_universe, 1 + (i % per_universe) * channels_per_led)
+                               for i in range(len(grid))), channels_per_led)
+
+    @classmethod
+    def from_coords(cls, grid, assignments: Dict[Tuple[int, int], Tuple[int, int]],
+                    channels_per_led: int = 1) -> "DMXMapping":
+        """Maps {(row, col): (universe, channel)}; coordinates without an LED are skipped."""
+        positions = grid.positions
+        return cls(len(grid), ((positions[coords], universe, channel)
+                               for coords, (universe, channel) in assignments.items() if coords in positions),
+                   channels_per_led)
+
+    def compile(self, data_offset: int) -> Dict[int, _UniverseTable]:
+        """Precomputes, per universe, the packet offsets of each LED's channels."""
+        tables = {}
+        for universe, members in self.universes.items():
+            members = sorted(members, key=lambda member: member[1])
+            leds = np.array([led for led, _ in members], dtype=np.intp)
+            coarse = np.array([data_offset + channel - 1 for _, channel in members], dtype=np.intp)
+            fine = coarse + 1 if self.channels_per_led == 2 else None
+            needed = np.array([channel - 1 + self.channels_per_led for _, channel in members], dtype=np.intp)
+            tables[universe] = _UniverseTable(leds, coarse, fine, needed)
+        return tables
+
+
+def parse_artnet(packet: memoryview, length: int):
+    """Returns (universe, sequence, data length) of an ArtDmx packet, _SYNC for ArtSync, else None."""
+    if length < 10 or packet[:8] != _ARTNET_ID:
+        return None
+    opcode = packet[8] | packet[9] << 8
+    if opcode == _ARTNET_OP_SYNC:
+        return _SYNC
+    if opcode != _ARTNET_OP_DMX or length < _ARTNET_DATA:
+        return None
+    universe = packet[14] | (packet[15] & 0x7F) << 8
+    data_length = min(packet[16] << 8 | packet[17], length - _ARTNET_DATA)
+    return universe, packet[12], data_length
+
+
+def parse_e131(packet: memoryview, length: int):
+    """Returns (universe, sequence, data length) of an E1.31 data packet, _SYNC for a sync packet, else None."""
+    if length < 49 or packet[4:16] != _E131_ID:
+        return None
+    root_vector, = struct.unpack_from(">I", packet, 18)
+    if root_vector == _E131_ROOT_EXTENDED:
+        framing_vector, = struct.unpack_from(">I", packet, 40)
+        return _SYNC if framing_vector == _E131_EXTENDED_SYNC else None
+    if root_vector != _E131_ROOT_DATA or length < _E131_DATA:
+        return None
+    framing_vector, = struct.unpack_from(">I", packet, 40)
+    if framing_vector != _E131_FRAMING_DMP or packet[112] & _E131_OPTION_PREVIEW or packet[125] != 0:
+        return None  # preview data, or a non-zero (non-dimmer) start code
+    universe, = struct.unpack_from(">H", packet, 113)
+    count, = struct.unpack_from(">H", packet, 123)
+    if count < 1:
+        return None  # the count includes the start code; 0 is malformed
+    return universe, packet[111], min(count - 1, length - _E131_DATA)
+
+
+def artnet_packet(universe: int, data: bytes, sequence: int = 0) -> bytes:
+    """Builds an ArtDmx packet (for senders, tests and benchmarks)."""
+    data = bytes(data) + (b"\x00" if len(data) % 2 else b"")  # Art-Net lengths are even
+    return (_ARTNET_ID + struct.pack("<H", _ARTNET_OP_DMX) + struct.pack(">H", 14)
+            + bytes((sequence, 0, universe & 0xFF, universe >> 8 & 0x7F)) + struct.pack(">H", len(data)) + data)
+
+
+def artnet_sync() -> bytes:
+    """Builds an ArtSync packet."""
+    return _ARTNET_ID + struct.pack("<H", _ARTNET_OP_SYNC) + struct.pack(">H", 14) + b"\x00\x00"
+
+
+def e131_packet(universe: int, data: bytes, sequence: int = 0, source: str = "bongo",
+                priority: int = 100, cid: bytes = bytes(16)) -> bytes:
+    """Builds an E1.31 data packet (for senders, tests and benchmarks)."""
+    data = bytes(data)
+    dmp = struct.pack(">HBBHHH", 0x7000 | (10 + len(data) + 1), 0x02, 0xA1, 0, 1, len(data) + 1) + b"\x00" + data
+    framing = (struct.pack(">HI", 0x7000 | (77 + len(dmp)), _E131_FRAMING_DMP)
+               + source.encode()[:63].ljust(64, b"\x00")
+               + struct.pack(">BHBBH", priority, 0, sequence, 0, universe) + dmp)
+    return (struct.pack(">HH", 0x0010, 0) + _E131_ID
+            + struct.pack(">HI", 0x7000 | (22 + len(framing)), _E131_ROOT_DATA) + cid + framing)
+
+
+def e131_sync(sync_universe: int, sequence: int = 0, cid: bytes = bytes(16)) -> bytes:
+    """Builds an E1.31 universe synchronization packet."""
+    framing = struct.pack(">HIBH2x", 0x7000 | 11, _E131_EXTENDED_SYNC, sequence, sync_universe)
+    return (struct.pack(">HH", 0x0010, 0) + _E131_ID
+            + struct.pack(">HI", 0x7000 | (22 + len(framing)), _E131_ROOT_EXTENDED) + cid + framing)
+
+
+class DMXReceiver:
+    """Receives DMX universes over UDP into triple-buffered brightness frames."""
+
+    def __init__(self, mapping: DMXMapping, protocol: str = "artnet", host: str = "0.0.0.0",
+                 port: Optional[int] = None, multicast: bool = False):
+        """
+        Args:
+            mapping: Which universes and channels drive which LEDs.
+            protocol: 'artnet' or 'e131'.
+            host: Address to listen on.
+            port: UDP port (default: 6454 for Art-Net, 5568 for E1.31; 0 picks a free one).
+            multicast: For E1.31, also join each mapped universe's multicast group.
+        """
+        if protocol not in _DATA_OFFSETS:
+            raise ValueError(f"Unknown DMX protocol '{protocol}'. Expected 'artnet' or 'e131'.")
+        self.protocol = protocol
+        self._parse = parse_artnet if protocol == "artnet" else parse_e131
+        self._tables = mapping.compile(_DATA_OFFSETS[protocol])
+        self._scale = 1.0 / 0xFFFF if mapping.channels_per_led == 2 else 1.0 / 0xFF
+        self._universes = len(self._tables)
+        self._received = set()
+        self._sequences: Dict[int, int] = {}
+        # back: being filled; ready: the newest complete frame; front: the render loop's.
+        self._back, self._ready, self._front = (np.zeros(mapping.size) for _ in range(3))
+        self._fresh = False
+        self._swap = threading.Lock()
+
+        self._buffer = bytearray(1500)
+        self._view = memoryview(self._buffer)
+        self._bytes = np.frombuffer(self._buffer, dtype=np.uint8)
+
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.sock.bind((host, E131_PORT if port is None and protocol == "e131" else
+                        ARTNET_PORT if port is None else port))
+        if multicast and protocol == "e131":
+            for universe in self._tables:
+                group = socket.inet_aton(f"239.255.{universe >> 8 & 0xFF}.{universe & 0xFF}")
+                self.sock.setsockopt(socket.IPPROTO_IP, socket.IP_ADD_MEMBERSHIP,
+                                     group + socket.inet_aton("0.0.0.0"))
+        self.address = self.sock.getsockname()
+
+        self.packets = 0
+        self.frames = 0
+        self.ignored = 0
+        self.out_of_order = 0
+        self.last_frame_at: Optional[float] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = threading.Event()
+
+    def handle_packet(self, length: int):
+        """Applies the packet of `length` bytes sitting in the receive buffer."""
+        self.packets += 1
+        header = self._parse(self._view, length)
+        if header is None:
+            self.ignored += 1
+            return
+        if header == _SYNC:
+            if self._received:
+                self._publish()
+            return
+        universe, sequence, data_length = header
+        table = self._tables.get(universe)
+        if table is None:
+            self.ignored += 1
+            return
+        if sequence:
+            last = self._sequences.get(universe)
+            # Out of order if within the 20 packets before the last one (E1.31 6.7.2).
+            if last is not None and -20 < ((sequence - last + 128) & 0xFF) - 128 <= 0:
+                self.out_of_order += 1
+                return
+            self._sequences[universe] = sequence
+        count = int(np.searchsorted(table.needed, data_length, side="right"))
+        if count == len(table.leds):
+            leds, coarse, fine = table.leds, table.coarse, table.fine
+        else:
+            leds, coarse = table.leds[:count], table.coarse[:count]
+            fine = None if table.fine is None else table.fine[:count]
+        packet = self._bytes
+        values = packet[coarse] if fine is None else (packet[coarse].astype(np.uint16) << 8) | packet[fine]
+        self._back[leds] = values * self._scale
+        self._received.add(universe)
+        if len(self._received) == self._universes:
+            self._publish()
+
+    def _publish(self):
+        self._received.clear()
+        with self._swap:
+            self._back, self._ready = self._ready, self._back
+            self._fresh = True
+            published = self._ready
+        # The new back buffer holds an older frame; start the next one from
+        # this one, so universes missing from it (a dropped packet before a
+        # sync) keep their latest values. The render loop only ever reads
+        # `published`, so this copy needs no lock.
+        np.copyto(self._back, published)
+        self.frames += 1
+        self.last_frame_at = time.monotonic()
+
+    def acquire(self) -> Optional[np.ndarray]:
+        """
+        Returns the newest complete frame (brightness values in
+        coordinate_grid() order), or None before the first one. The array
+        stays valid and unchanged until the next acquire() call.
+        """
+        with self._swap:
+            if self._fresh:
+                self._front, self._ready = self._ready, self._front
+                self._fresh = False
+        return self._front if self.frames else None
+
+    def poll(self) -> int:
+        """Handles every packet already waiting on the socket, without blocking; returns how many."""
+        handled = 0
+        sock = self.sock
+        sock.setblocking(False)
+        try:
+            while True:
+                try:
+                    length = sock.recv_into(self._buffer)
+                except (BlockingIOError, InterruptedError):
+                    return handled
+                self.handle_packet(length)
+                handled += 1
+        finally:
+            sock.setblocking(True)
+
+    def start(self):
+        """Receives packets on a background thread until stop()."""
+        if self._thread is not None:
+            return
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._serve, name="bongo-dmx", daemon=True)
+        self._thread.start()
+        log.info(f"Receiving {self.protocol} on {self.address[0]}:{self.address[1]} "
+                 f"({self._universes} universes).")
+
+    def _serve(self):
+        sock = self.sock
+        sock.settimeout(0.25)
+        buffer = self._buffer
+        while not self._stopping.is_set():
+            try:
+                length = sock.recv_into(buffer)
+            except socket.timeout:
+                continue
+            except OSError:
+                if self._stopping.is_set():
+                    break
+                raise
+            try:
+                self.handle_packet(length)
+            except Exception:
+                log.error("Failed to apply a DMX packet.", exc_info=True)
+
+    def stop(self):
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def close(self):
+        self.stop()
+        self.sock.close()
+
+
+class DMXShader(Shader):
+    """
+    A Shader that shows a DMXReceiver's newest complete frame; add it with
+    AnimationManager.add_shader(), on a layer or as the base.
+    """
+
+    def __init__(self, receiver: DMXReceiver, brightness: float = 1.0, blend: str = "replace",
+                 name: Optional[str] = None, stale_after: Optional[float] = None):
+        """
+        Args:
+            receiver: The receiver to read.
+            brightness: Scale applied to the frames (0.0 to 1.0).
+            blend: How the frames combine with shaders added before this one.
+            name: Used in logs and traces; defaults to the protocol.
+            stale_after: If set, the shader goes dark when no frame has
+                         arrived for this many seconds.
+        """
+        super().__init__(None, None, brightness, blend, name or f"dmx:{receiver.protocol}")
+        self.receiver = receiver
+        self.stale_after = stale_after
+
+    def bind(self, grid) -> "DMXShader":
+        return self
+
+    def __reduce__(self):
+        raise TypeError("DMXShader reads its receiver's buffers in the render process and can't be pickled.")
+
+    def evaluate(self, grid, t: float) -> np.ndarray:
+        receiver = self.receiver
+        frame = receiver.acquire()
+        if frame is None or (self.stale_after is not None
+                             and time.monotonic() - receiver.last_frame_at > self.stale_after):
+            return np.zeros(len(grid), dtype=np.float64)
+        if self.brightness != 1.0:
+            return frame * self.brightness
+        return frame
@@ -0,0 +1,254 @@
+# src/bongo/ingest/shared_framebuffer.py
+"""
+A shared-memory framebuffer that external processes write frames into.
+
+Other programs (a visualizer, a sensor-fusion job, anything that can map a
+file) publish whole brightness frames through a memory-mapped file, by
+default under /dev/shm. The render loop picks up the newest complete frame
+every tick through a FramebufferShader, so the frames composite like any
+other shader: as the base layer (the sole source, if nothing else runs) or
+on a named layer with its own opacity and blend mode.
+
+Layout (little-endian; bongo_framebuffer.h next to this module is the C
+version):
+
+    offset  size  field
+         0     4  magic       0x42464742 ("BGFB")
+         4     2  version     1
+         6     2  format      1 = float32 brightness 0.0-1.0, 2 = uint16 duty 0-65535
+         8     4  rows
+        12     4  cols
+        16     8  sequence    seqlock counter: odd while a frame is being written
+        24     8  timestamp   the writer's CLOCK_MONOTONIC time of the frame, in ns
+        32    32  reserved
+        64     -  pixels      rows * cols values, row-major: (r, c) is at r * cols + c
+
+Writers increment `sequence` to an odd value, write the pixels (and
+timestamp), then increment it to the next even value. Readers copy the
+pixels between two reads of `sequence` and discard the copy if the two
+differ or are odd, so they never use a torn frame, and neither side ever
+waits for the other. A reader that keeps losing the race reuses the frame it
+had.
+"""
+import logging
+import mmap
+import os
+import tempfile
+import time
+from typing import Optional
+
+import numpy as np
+
+from bongo.patterns.shaders import Shader
+
+log = logging.getLogger("bongo.shared_framebuffer")
+
+MAGIC = 0x42464742
+VERSION = 1
+FORMAT_FLOAT32 = 1
+FORMAT_UINT16 = 2
+HEADER_SIZE = 64
+_DTYPES = {FORMAT_FLOAT32: np.dtype("<f4"), FORMAT_UINT16: np.dtype("<u2")}
+_HEADER = np.dtype([("magic", "<u4"), ("version", "<u2"), ("format", "<u2"), ("rows", "<u4"),
+                    ("cols", "<u4"), ("sequence", "<u8"), ("timestamp", "<u8"), ("reserved", "V32")])
+
+
+def framebuffer_path(name: str) -> str:
+    """Maps a bare name to a file under /dev/shm (or the temp directory); paths are kept as given."""
+    if os.sep in name:
+        return name
+    directory = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+    return os.path.join(directory, name)
+
+
+class SharedFramebuffer:
+    """A memory-mapped framebuffer with a seqlock header (see the module docstring)."""
+
+    def __init__(self, path: str, writable: bool = False):
+        """
+        Maps an existing framebuffer. Use create() or open() to make one.
+
+        Raises:
+            ValueError: If the file is not a framebuffer this version understands.
+        """
+        self.path = framebuffer_path(path)
+        with open(self.path, "r+b" if writable else "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_WRITE if writable else mmap.ACCESS_READ)
+        try:
+            if len(self._mmap) < HEADER_SIZE:
+                raise ValueError(f"'{self.path}' is too small to be a framebuffer.")
+            header = np.frombuffer(self._mmap[:HEADER_SIZE], dtype=_HEADER)[0]  # a copy
+            if header["magic"] != MAGIC:
+                raise ValueError(f"'{self.path}' is not a bongo framebuffer (bad magic).")
+            if header["version"] != VERSION:
+                raise ValueError(f"'{self.path}' has framebuffer version {header['version']}, expected {VERSION}.")
+            if header["format"] not in _DTYPES:
+                raise ValueError(f"'{self.path}' has unknown pixel format {header['format']}.")
+            self.format = int(header["format"])
+            self.rows = int(header["rows"])
+            self.cols = int(header["cols"])
+            dtype = _DTYPES[self.format]
+            if len(self._mmap) < HEADER_SIZE + self.rows * self.cols * dtype.itemsize:
+                raise ValueError(f"'{self.path}' is smaller than its {self.rows}x{self.cols} header says.")
+        except BaseException:
+            self._mmap.close()
+            raise
+        self.writable = writable
+        self._sequence = np.frombuffer(self._mmap, dtype="<u8", count=1, offset=16)
+        self._timestamp = np.frombuffer(self._mmap, dtype="<u8", count=1, offset=24)
+        self.pixels = np.frombuffer(self._mmap, dtype=dtype, count=self.rows * self.cols, offset=HEADER_SIZE)
+        self._scale = 1.0 / 0xFFFF if self.format == FORMAT_UINT16 else None
+        self.last_sequence = 0
+        self.torn_reads = 0
+
+    @classmethod
+    def create(cls, path: str, rows: int, cols: int, pixel_format: int = FORMAT_FLOAT32) -> "SharedFramebuffer":
+        """Creates (or truncates) a framebuffer file and maps it for writing."""
+        if pixel_format not in _DTYPES:
+            raise ValueError(f"Unknown pixel format {pixel_format}.")
+        if rows < 1 or cols < 1:
+            raise ValueError("A framebuffer needs at least one row and one column.")
+        path = framebuffer_path(path)
+        header = np.zeros(1, dtype=_HEADER)
+        header[0] = (MAGIC, VERSION, pixel_format, rows, cols, 0, 0, b"")
+        with open(path, "wb") as f:
+            f.write(header.tobytes())
+            f.truncate(HEADER_SIZE + rows * cols * _DTYPES[pixel_format].itemsize)
+        return cls(path, writable=True)
+
+    @classmethod
+    def open(cls, path: str, rows: int, cols: int, pixel_format: int = FORMAT_FLOAT32) -> "SharedFramebuffer":
+        """
+        Maps the framebuffer at `path` if one exists there, or creates it.
+
+        Raises:
+            ValueError: If the existing framebuffer has a different shape or
+                        pixel format.
+        """
+        if not os.path.exists(framebuffer_path(path)):
+            return cls.create(path, rows, cols, pixel_format)
+        framebuffer = cls(path)
+        if (framebuffer.rows, framebuffer.cols, framebuffer.format) != (rows, cols, pixel_format):
+            found = (framebuffer.rows, framebuffer.cols, framebuffer.format)
+            framebuffer.close()
+            raise ValueError(f"'{framebuffer.path}' is {found[0]}x{found[1]} in pixel format {found[2]}, "
+                             f"expected {rows}x{cols} in pixel format {pixel_format}.")
+        return framebuffer
+
+    @property
+    def sequence(self) -> int:
+        return int(self._sequence[0])
+
+    @property
+    def timestamp_ns(self) -> int:
+        """The writer's CLOCK_MONOTONIC time of the newest frame, in nanoseconds."""
+        return int(self._timestamp[0])
+
+    def write(self, values, timestamp_ns: Optional[int] = None):
+        """
+        Publishes a frame: rows * cols values (any shape with that many
+        elements) in the buffer's format.
+        """
+        if not self.writable:
+            raise RuntimeError(f"Framebuffer '{self.path}' is mapped read-only.")
+        sequence = int(self._sequence[0]) | 1
+        self._sequence[0] = sequence
+        self.pixels[:] = np.ravel(values)
+        self._timestamp[0] = time.monotonic_ns() if timestamp_ns is None else timestamp_ns
+        self._sequence[0] = sequence + 1
+
+    def read_into(self, out: np.ndarray, retries: int = 3) -> bool:
+        """
+        Copies the newest complete frame into `out` (rows * cols float64
+        brightness values), if there is one that hasn't been read yet.
+
+        Returns:
+            True if `out` now holds a new frame; False if there is no new
+            frame, or every attempt raced with the writer (`out` is untouched
+            or must be discarded by the caller in that case).
+        """
+        for _ in range(retries):
+            before = int(self._sequence[0])
+            if before & 1:
+                continue
+            if before == self.last_sequence:
+                return False
+            if self._scale is None:
+                np.copyto(out, self.pixels)
+            else:
+                np.multiply(self.pixels, self._scale, out=out)
+            if int(self._sequence[0]) == before:
+                self.last_sequence = before
+                return True
+        self.torn_reads += 1
+        return False
+
+    def close(self):
+        self.pixels = self._sequence = self._timestamp = None
+        self._mmap.close()
+
+    def unlink(self):
+        """Removes the framebuffer file (mapped copies stay valid until closed)."""
+        try:
+            os.unlink(self.path)
+        except FileNotFoundError:
+            pass
+
+
+class FramebufferShader(Shader):
+    """
+    A Shader that shows the newest frame of a SharedFramebuffer; add it with
+    AnimationManager.add_shader(), on a layer or as the base.
+
+    It reads shared memory on the render loop's process, so it is never sent
+    to render-pool workers (a ShaderRenderPool renders it in-process).
+    """
+
+    def __init__(self, framebuffer: SharedFramebuffer, brightness: float = 1.0, blend: str = "replace",
+                 name: Optional[str] = None, stale_after: Optional[float] = None):
+        """
+        Args:
+            framebuffer: The framebuffer to read.
+            brightness: Scale applied to the frames (0.0 to 1.0).
+            blend: How the frames combine with shaders added before this one.
+            name: Used in logs and traces; defaults to the framebuffer's path.
+            stale_after: If set, the shader goes dark when the writer hasn't
+                         published a frame for this many seconds.
+        """
+        super().__init__(None, None, brightness, blend, name or f"framebuffer:{framebuffer.path}")
+        self.framebuffer = framebuffer
+        self.stale_after = stale_after
+        self._staging = np.zeros(framebuffer.rows * framebuffer.cols, dtype=np.float64)
+        # The last good frame, plus a trailing 0.0 for LEDs outside the buffer.
+        self._frame = np.zeros(len(self._staging) + 1, dtype=np.float64)
+        self._received_at: Optional[float] = None
+        self._gather_grid = None
+        self._gather = None
+
+    def bind(self, grid) -> "FramebufferShader":
+        return self
+
+    def __reduce__(self):
+        raise TypeError("FramebufferShader reads shared memory in the render process and can't be pickled.")
+
+    def _positions(self, grid) -> np.ndarray:
+        """Each grid entry's offset into the framebuffer (or the trailing 0.0)."""
+        if self._gather_grid is not grid:
+            rows, cols = self.framebuffer.rows, self.framebuffer.cols
+            inside = (grid.rows < rows) & (grid.cols < cols)
+            self._gather = np.where(inside, grid.rows * cols + grid.cols, rows * cols).astype(np.intp)
+            self._gather_grid = grid
+        return self._gather
+
+    def evaluate(self, grid, t: float) -> np.ndarray:
+        now = time.monotonic()
+        if self.framebuffer.read_into(self._staging):
+            self._frame[:-1] = self._staging
+            self._received_at = now
+        if self._received_at is None or (self.stale_after is not None
+                                         and now - self._received_at > self.stale_after):
+            return np.zeros(len(grid), dtype=np.float64)
+        values = self._frame[self._positions(grid)]
+        if self.brightness != 1.0:
+            values *= self.brightness
+        return np.clip(values, 0.0, 1.0, out=values)
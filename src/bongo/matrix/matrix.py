@@ -1,6 +1,6 @@
 # src/bongo/matrix/matrix.py
 import logging
-from typing import List, Dict, Optional, Tuple, Union
+from typing import Any, List, Dict, NamedTuple, Optional, Tuple, Union
 
 # Corrected relative imports
 from ..controller.hybrid_controller import HybridLEDController
@@ -11,6 +11,28 @@ log = logging.getLogger("bongo.matrix")
 AnyLEDController = Union[HybridLEDController, GPIOLEDController]
 
 
+class CoordinateGrid(NamedTuple):
+    """
+    The matrix's LED positions as NumPy arrays, for vectorized patterns.
+
+    Entry i of every array describes the LED at coords[i]; LEDs are ordered by
+    (row, col). x is the column and y the row; nx and ny are the same scaled
+    to 0.0-1.0 across the matrix. positions maps (row, col) to its entry.
+    """
+    coords: Tuple[Tuple[int, int], ...]
+    rows: Any
+    cols: Any
+    x: Any
+    y: Any
+    nx: Any
+    ny: Any
+    index: Any
+    positions: Dict[Tuple[int, int], int]
+
+    def __len__(self) -> int:
+        return len(self.coords)
+
+
 class LEDMatrix:
     """
     Represents and controls a 2D matrix of LEDs of mixed types.
@@ -20,9 +42,13 @@ class LEDMatrix:
 
     def __init__(self, config: List[Dict], hardware_manager):
         self.leds: Dict[Tuple[int, int], AnyLEDController] = {}
+        # PCA9685 address driving each LED (None for GPIO LEDs), for telemetry.
+        self.led_boards: Dict[Tuple[int, int], Optional[int]] = {}
         self.rows: int = 0
         self.cols: int = 0
         self.hardware_manager = hardware_manager
+        self.layout = None
+        self._grid: Optional[CoordinateGrid] = None
 
         if not config:
             return
@@ -39,11 +65,13 @@ class LEDMatrix:
                     raise ValueError(f"PCA9685 entry is missing 'controller_address' or 'led_channel': {entry}")
                 pca_controller = self.hardware_manager.get_controller(addr)
                 led_controller = HybridLEDController(led_channel=chan, pca_controller=pca_controller)
+                self.led_boards[(r, c)] = addr
             elif led_type == "gpio":
                 pin = entry.get("pin")
                 if pin is None:
                     raise ValueError(f"GPIO entry is missing 'pin': {entry}")
                 led_controller = GPIOLEDController(pin=pin)
+                self.led_boards[(r, c)] = None
             else:
                 log.warning(f"Skipping unknown LED type '{led_type}' for ({r},{c})")
                 continue
@@ -54,6 +82,28 @@ class LEDMatrix:
         self.rows = max_row + 1
         self.cols = max_col + 1
 
+    @classmethod
+    def from_layout(cls, layout, hardware_manager) -> "LEDMatrix":
+        """
+        Builds a matrix from a CompiledLayout (see config.layout).
+
+        The layout has already been validated when it was compiled, so no
+        per-entry checks are repeated here.
+        """
+        matrix = cls(config=[], hardware_manager=hardware_manager)
+        matrix.layout = layout
+        boards = {addr: hardware_manager.get_controller(addr) for addr in layout.boards}
+        for coords, led_type, addr, chan in zip(layout.coords, layout.led_types,
+                                                layout.addresses, layout.channels):
+            if led_type == "pca9685":
+                matrix.leds[coords] = HybridLEDController(led_channel=chan, pca_controller=boards[addr])
+            else:
+                matrix.leds[coords] = GPIOLEDController(pin=chan)
+            matrix.led_boards[coords] = addr
+        matrix.rows = layout.rows
+        matrix.cols = layout.cols
+        return matrix
+
     def _normalize_brightness(self, value: float) -> float:
         return value / 255.0 if value > 1.0 else value
 
@@ -63,6 +113,31 @@ class LEDMatrix:
         result =  self.leds.get((row, col))
         return result
 
+    def board_of(self, row: int, col: int) -> Optional[int]:
+        """Returns the PCA9685 address driving the LED, or None for GPIO LEDs."""
+        return self.led_boards.get((row, col))
+
+    def coordinate_grid(self) -> CoordinateGrid:
+        """
+        Returns the (cached) CoordinateGrid of this matrix's LEDs. It is built
+        on first use, so matrices that never run a shader never import NumPy.
+        """
+        if self._grid is None or len(self._grid) != len(self.leds):
+            import numpy as np
+
+            coords = tuple(sorted(self.leds))
+            rows = np.array([r for r, _ in coords], dtype=np.int32)
+            cols = np.array([c for _, c in coords], dtype=np.int32)
+            x = cols.astype(np.float64)
+            y = rows.astype(np.float64)
+            self._grid = CoordinateGrid(
+                coords=coords, rows=rows, cols=cols, x=x, y=y,
+                nx=x / max(self.cols - 1, 1), ny=y / max(self.rows - 1, 1),
+                index=np.arange(len(coords)),
+                positions={coords: i for i, coords in enumerate(coords)},
+            )
+        return self._grid
+
     def set_pixel(self, row: int, col: int, brightness: float):
         led = self.get_led(row, col)
         if led:
@@ -1,9 +1,87 @@
 # src/bongo/operations/animation_manager.py
+import heapq
+import itertools
+import logging
+import math
+import threading
 import time
-from typing import List
+from collections import deque
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, Union
 
 # Import LEDPixelOperation, as it's the data object we'll be managing.
+from .compositor import Layer, LayerOutput, composite_layers, find_layer
+from .fixed_point import DUTY_MAX, SLOPE_BITS, DutyFrame, compile_operation, to_duty
 from .led_operation import LEDPixelOperation
+from ..utils import tracing
+
+log = logging.getLogger("bongo.animation_manager")
+
+
+class PatternHandle:
+    """
+    Tracks a group of operations submitted together (usually one pattern).
+
+    The handle is finished once every one of its operations has completed or
+    been cleared from the manager. Completion can be observed with
+    add_done_callback(), waited for from a thread with wait(), or awaited from
+    asyncio code (`await handle`).
+    """
+
+    def __init__(self, operation_count: int):
+        self._remaining = operation_count
+        self._callbacks: List[Callable[["PatternHandle"], None]] = []
+        self._lock = threading.Lock()
+        self._done_event = threading.Event()
+        if operation_count == 0:
+            self._done_event.set()
+
+    @property
+    def done(self) -> bool:
+        return self._done_event.is_set()
+
+    @property
+    def remaining(self) -> int:
+        """Number of this pattern's operations that have not finished yet."""
+        return self._remaining
+
+    def add_done_callback(self, callback: Callable[["PatternHandle"], None]):
+        """
+        Registers callback(handle) to run when the pattern finishes. It runs on
+        the thread that calls AnimationManager.tick(), or immediately if the
+        pattern has already finished.
+        """
+        with self._lock:
+            if not self.done:
+                self._callbacks.append(callback)
+                return
+        callback(self)
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Blocks until the pattern finishes. Returns False on timeout."""
+        return self._done_event.wait(timeout)
+
+    def __await__(self):
+        import asyncio
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+
+        def _resolve(handle):
+            if not future.done():
+                future.set_result(handle)
+
+        self.add_done_callback(lambda handle: loop.call_soon_threadsafe(_resolve, handle))
+        return future.__await__()
+
+    def _operation_finished(self, count: int = 1):
+        with self._lock:
+            self._remaining -= count
+            if self._remaining > 0 or self.done:
+                return
+            self._done_event.set()
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            callback(self)
 
 
 class _ManagedOperation:
@@ -11,8 +89,9 @@ class _ManagedOperation:
     An internal wrapper class for managing a single active LEDPixelOperation.
 
     This class binds a time-based LEDPixelOperation to a specific coordinate
-    on the matrix and provides the .update() method that the AnimationManager's
-    tick() loop requires.
+    on the matrix (and, optionally, to the PatternHandle it was submitted
+    with). The AnimationManager's tick() evaluates the wrapped operation and
+    writes the result to the LED at (row, col).
 
     It is assumed that this class has a narrow responsibility and will only be
     instantiated by the AnimationManager. If other parts of the application
@@ -21,98 +100,1117 @@ class _ManagedOperation:
     to a standalone module.
     """
 
-    def __init__(self, row: int, col: int, pixel_op: LEDPixelOperation, matrix):
+    def __init__(self, row: int, col: int, pixel_op: LEDPixelOperation, matrix,
+                 handle: Optional[PatternHandle] = None, layer: Optional[Layer] = None):
+        self.matrix = matrix
+        self.bind(row, col, pixel_op, handle, layer)
+
+    def bind(self, row: int, col: int, pixel_op: LEDPixelOperation,
+             handle: Optional[PatternHandle] = None, layer: Optional[Layer] = None):
+        """(Re)binds this wrapper; the manager reuses retired wrappers this way."""
         self.row = row
         self.col = col
         self.pixel_op = pixel_op
-        self.matrix = matrix
+        self.handle = handle
+        self.layer = layer
+        # Integer parameters for the fixed-point path (see fixed_point.py).
+        self.fixed = None
+        # Whether it waits in the schedule (heap or timing wheel) rather than
+        # in self.operations; set by whichever path admits it.
+        self.scheduled = False
         # Set the start time on the underlying pixel operation when it's
         # officially managed and added to the timeline.
-        if self.pixel_op.start_time is None:
-            self.pixel_op.start_time = time.monotonic()
+        if pixel_op.start_time is None:
+            pixel_op.start_time = time.monotonic()
 
-    def update(self, time_now: float) -> bool:
-        """
-        Updates the associated LED's brightness based on the current time.
 
-        This method performs the core logic of the animation loop for one pixel:
-        1. Calculates the desired brightness from the LEDPixelOperation.
-        2. Retrieves the specific LED controller from the matrix.
-        3. Sets the brightness on that hardware controller.
+class _ManagedBatch:
+    """
+    An internal wrapper that tracks an admitted OperationBatch.
+
+    The batch is sorted by start time when it is admitted, so the operations
+    that have started are always a prefix of the arrays; `alive` marks which
+    of them have not completed yet.
+    """
 
-        Args:
-            time_now: The current monotonic time.
+    def __init__(self, batch, handle: Optional[PatternHandle] = None, layer: Optional[Layer] = None):
+        # NumPy is already loaded by whoever built the batch; importing it
+        # here keeps it out of the manager's (and bongo.app's) import time.
+        import numpy as np
 
-        Returns:
-            True if the underlying LEDPixelOperation has completed, False otherwise.
-        """
-        # 1. Calculate the desired brightness
-        brightness = self.pixel_op.get_brightness(time_now)
+        order = batch.start_times.argsort(kind="stable")
+        self.batch = batch.take(order)
+        self.handle = handle
+        self.layer = layer
+        self.alive = np.ones(len(self.batch), dtype=bool)
+        self.remaining = len(self.batch)
+        self.started = 0
 
-        # 2. Get the specific LED controller
-        led = self.matrix.get_led(self.row, self.col)
+    def next_start(self) -> Optional[float]:
+        if self.started < len(self.batch):
+            return float(self.batch.start_times[self.started])
+        return None
 
-        # 3. Set the brightness on the hardware controller
-        if led:
-            led.set_brightness(brightness)
-            # print(f"DEBUG: Set LED ({self.row},{self.col}) brightness to {brightness:.3f}")   # !!!!!!!!!!
-        else:
-            print(f"ERROR: No LED found at ({self.row},{self.col})")                        # !!!!!!!!!!
 
-        # 4. Return whether the operation is completed
-        return self.pixel_op.is_completed(time_now)
+class _ManagedShader:
+    """An internal wrapper that schedules a Shader (see bongo.patterns.shaders)."""
+
+    def __init__(self, shader, start_time: float, duration: Optional[float],
+                 handle: Optional[PatternHandle] = None, layer: Optional[Layer] = None):
+        self.shader = shader
+        self.start_time = start_time
+        self.end_time = float("inf") if duration is None else start_time + duration
+        self.handle = handle
+        self.layer = layer
+        # Set once the shader has raised, so the error is logged only once.
+        self.failed = False
+
+
+class _FrameCallback:
+    """A callable submitted with call_soon(), run when submissions are admitted."""
+
+    __slots__ = ("callback",)
+
+    def __init__(self, callback: Callable[[], None]):
+        self.callback = callback
 
 
 class AnimationManager:
     """Manages and executes multiple LED operations over time on an LED matrix."""
 
-    def __init__(self, matrix):
+    def __init__(self, matrix, metrics=None, pool=None, timing_wheel=None, fixed_point: bool = False,
+                 render_pool=None):
         """
         Initializes the AnimationManager.
 
         Args:
             matrix: An LEDMatrix instance (or a compatible mock) that the manager
                     will control.
+            metrics: Optional bongo.utils.metrics.RenderMetrics to record
+                     per-phase tick timings, hardware writes and queue depths.
+            pool: Optional OperationPool. Completed and cleared operations are
+                  released to it for the pattern generators to reuse.
+            timing_wheel: Optional TimingWheel that holds future operations
+                          instead of the heap, for very large schedules (see
+                          bongo.operations.timing_wheel and add_schedule_source()).
+            fixed_point: Evaluate plain LEDPixelOperations in integer fixed
+                         point and write 16-bit duty cycles straight to the
+                         controllers (see bongo.operations.fixed_point). The
+                         matrix's LEDs must all exist when the manager is created.
+            render_pool: Optional ShaderRenderPool that evaluates shaders in
+                         worker processes (see bongo.operations.render_pool).
         """
         self.matrix = matrix
+        self.metrics = metrics
+        self.pool = pool
+        self.timing_wheel = timing_wheel
+        self.render_pool = render_pool
+        self._render_pool_failed = False
+        self._duty_frame: Optional[DutyFrame] = DutyFrame(matrix) if fixed_point else None
+        # Admitted columnar OperationBatches, evaluated after self.operations.
+        self.batches: List[_ManagedBatch] = []
+        # Admitted shaders, composited underneath everything else on their layer.
+        self.shaders: List[_ManagedShader] = []
+        # Named layers composited over the base layer (see add_layer()).
+        self.layers: Dict[str, Layer] = {}
+        # Retired _ManagedOperation wrappers, reused by add_operation().
+        self._free_managed: List[_ManagedOperation] = []
+        self.managed_allocations: int = 0
+        # Operations that have started (or are due) and are evaluated each tick.
         self.operations: List[_ManagedOperation] = []
+        # Operations whose start_time is still in the future, as a min-heap of
+        # (start_time, sequence, managed_op). tick() only looks at the head.
+        # Unused when a timing wheel is configured.
+        self._scheduled: List[Tuple[float, int, _ManagedOperation]] = []
+        self._sequence = itertools.count()
+        # Index of the active and scheduled operations by LED and by pattern,
+        # kept up to date as operations are added and retired so cancel(),
+        # replace() and cancel_pattern() only touch the operations involved.
+        # The inner dicts are insertion-ordered sets.
+        self._by_led: Dict[Tuple[int, int], Dict[_ManagedOperation, None]] = {}
+        self._by_handle: Dict[PatternHandle, Dict[_ManagedOperation, None]] = {}
+        # Cancelled wrappers still sitting in self.operations / self._scheduled;
+        # they are dropped lazily by the next tick (or promotion).
+        self._cancelled_active = 0
+        self._cancelled_scheduled = 0
+        # Called (from the submitting thread) whenever work is submitted, so an
+        # idle runner can wake up immediately.
+        self._wakeup_listeners: List[Callable[[], None]] = []
+        # Operations submitted from other threads. Producers only ever append
+        # and tick() only ever pops, both of which are atomic on a deque, so
+        # neither side takes a lock or waits for the other.
+        self._submissions = deque()
+        # The earliest timestamp whose frame has changed since the last
+        # take_invalidation() (-inf for changes that aren't tied to a start
+        # time), for the render-ahead runner.
+        self._changed_from: Optional[float] = None
 
-    def add_operation(self, row: int, col: int, pixel_op: LEDPixelOperation):
+    def add_operation(self, row: int, col: int, pixel_op: LEDPixelOperation,
+                      handle: Optional[PatternHandle] = None, layer: Union[str, Layer, None] = None):
         """
         Adds a new LED animation to be managed.
 
         This method takes the animation details (a LEDPixelOperation) and the
         target coordinates, wraps them in a _ManagedOperation object, and adds
-        it to the active operations list.
+        it to the active operations list, or to the schedule if its start_time
+        is still in the future.
 
         Args:
             row: The row of the target LED.
             col: The column of the target LED.
             pixel_op: The LEDPixelOperation describing the animation.
+            handle: The PatternHandle this operation belongs to, if any.
+            layer: The name of the layer to draw on (default: the base layer).
+        """
+        layer = self._resolve_layer(layer)
+        if self._free_managed:
+            managed_op = self._free_managed.pop()
+            managed_op.bind(row, col, pixel_op, handle, layer)
+        else:
+            managed_op = _ManagedOperation(row, col, pixel_op, self.matrix, handle, layer)
+            self.managed_allocations += 1
+        self._by_led.setdefault((row, col), {})[managed_op] = None
+        if self._duty_frame is not None and layer is None:
+            managed_op.fixed = compile_operation(pixel_op, self._duty_frame.positions.get((row, col)))
+        if handle is not None:
+            self._by_handle.setdefault(handle, {})[managed_op] = None
+        changed_from = self._changed_from
+        if changed_from is None or pixel_op.start_time < changed_from:
+            self._changed_from = pixel_op.start_time
+        managed_op.scheduled = pixel_op.start_time > time.monotonic()
+        if managed_op.scheduled:
+            if self.timing_wheel is not None:
+                self.timing_wheel.insert(pixel_op.start_time, managed_op, next(self._sequence))
+            else:
+                heapq.heappush(self._scheduled, (pixel_op.start_time, next(self._sequence), managed_op))
+        else:
+            self.operations.append(managed_op)
+
+    def submit(self, row: int, col: int, pixel_op: LEDPixelOperation, layer: Optional[str] = None):
+        """
+        Thread-safe version of add_operation().
+
+        The operation is queued and admitted at the start of the next tick(),
+        so this can be called from any thread (network handlers, CLIs, sensor
+        callbacks) while the render loop is running.
+        """
+        self._submissions.append((None, (((row, col), pixel_op),), self._resolve_layer(layer)))
+        self._notify_wakeup()
+
+    def add_operations(self, pattern_operations: Iterable[Tuple[Tuple[int, int], LEDPixelOperation]],
+                       layer: Optional[str] = None) -> PatternHandle:
+        """
+        Thread-safe bulk submission of a whole pattern.
+
+        Accepts the list of ((row, col), LEDPixelOperation) tuples produced by
+        the pattern generators. The pattern is queued as a single entry, so the
+        render loop admits all of its operations in the same tick. `layer`
+        names the layer to draw on (default: the base layer).
+
+        Returns:
+            A PatternHandle that finishes when all of the operations have.
+        """
+        layer = self._resolve_layer(layer)
+        batch = tuple(pattern_operations)
+        handle = PatternHandle(len(batch))
+        self._submissions.append((handle, batch, layer))
+        self._notify_wakeup()
+        return handle
+
+    def call_soon(self, callback: Callable[[], None]):
+        """
+        Thread-safe: runs callback() on the render thread at the next frame
+        boundary, in order with the operations submitted around it.
+
+        Use it for anything that must not race with rendering, e.g. writing
+        to the matrix directly or cancelling patterns from another thread.
+        Exceptions are logged, not raised.
+        """
+        self._submissions.append((None, _FrameCallback(callback), None))
+        self._notify_wakeup()
+
+    def add_layered_operations(self, parts: Iterable[Tuple[Optional[str], Iterable]]) -> PatternHandle:
+        """
+        Thread-safe submission of one pattern spread over several layers.
+
+        Args:
+            parts: (layer name, pattern operations) pairs.
+
+        Returns:
+            A single PatternHandle that finishes when every part has.
+        """
+        parts = [(self._resolve_layer(layer), tuple(ops)) for layer, ops in parts]
+        handle = PatternHandle(sum(len(ops) for _, ops in parts))
+        for layer, ops in parts:
+            self._submissions.append((handle, ops, layer))
+        self._notify_wakeup()
+        return handle
+
+    def add_batch(self, batch, layer: Optional[str] = None) -> PatternHandle:
+        """
+        Thread-safe submission of a columnar OperationBatch.
+
+        The batch is evaluated with array operations rather than being expanded
+        into per-LED objects. Its operations are composited after the
+        individual operations; within the batch, when several operations on
+        one LED overlap, the one that started last wins.
+
+        Returns:
+            A PatternHandle that finishes when all of the batch's operations have.
+        """
+        layer = self._resolve_layer(layer)
+        handle = PatternHandle(len(batch))
+        self._submissions.append((handle, batch, layer))
+        self._notify_wakeup()
+        return handle
+
+    def add_shader(self, shader, start_time: Optional[float] = None,
+                   duration: Optional[float] = None, layer: Optional[str] = None) -> PatternHandle:
+        """
+        Thread-safe submission of a procedural Shader.
+
+        The shader is evaluated once per frame over the matrix's coordinate
+        grid from start_time (default: now) for `duration` seconds, or until
+        the manager is cleared if duration is None. Shaders are composited in
+        the order they were added, using each shader's blend mode, and then
+        operations and batches are drawn on top.
+
+        Returns:
+            A PatternHandle that finishes when the shader's duration is over.
+        """
+        layer = self._resolve_layer(layer)
+        if start_time is None:
+            start_time = time.monotonic()
+        handle = PatternHandle(1)
+        self._submissions.append((handle, _ManagedShader(shader, start_time, duration, handle, layer), layer))
+        self._notify_wakeup()
+        return handle
+
+    def add_schedule_source(self, pattern_operations: Iterable[Tuple[Tuple[int, int], LEDPixelOperation]],
+                            layer: Optional[str] = None):
+        """
+        Adds a lazily loaded schedule to the timing wheel.
+
+        pattern_operations is an iterable (typically a generator) of
+        ((row, col), LEDPixelOperation) tuples in start-time order. It is only
+        read as far as the wheel's load_ahead window in front of the current
+        time, so hours of effects can be preloaded without materializing them.
+        Operations still in the source are not yet visible to cancel() or
+        operations_at(), and have no PatternHandle. Must be called from the
+        thread that calls tick().
+
+        Raises:
+            RuntimeError: If the manager has no timing wheel.
+        """
+        if self.timing_wheel is None:
+            raise RuntimeError("Schedule sources need an AnimationManager created with a timing_wheel.")
+        layer = self._resolve_layer(layer)
+        self.timing_wheel.add_source(
+            (pixel_op.start_time, self._source_operation(coords, pixel_op, layer))
+            for coords, pixel_op in pattern_operations)
+        self._notify_wakeup()
+
+    def _source_operation(self, coords, pixel_op, layer):
+        """Wraps and indexes an operation as the timing wheel loads it from a source."""
+        if self._free_managed:
+            managed_op = self._free_managed.pop()
+            managed_op.bind(coords[0], coords[1], pixel_op, None, layer)
+        else:
+            managed_op = _ManagedOperation(coords[0], coords[1], pixel_op, self.matrix, None, layer)
+            self.managed_allocations += 1
+        self._by_led.setdefault(coords, {})[managed_op] = None
+        if self._duty_frame is not None and layer is None:
+            managed_op.fixed = compile_operation(pixel_op, self._duty_frame.positions.get(coords))
+        managed_op.scheduled = True
+        return managed_op
+
+    def add_layer(self, name: str, opacity: float = 1.0, blend: str = "normal",
+                  z: Optional[int] = None) -> Layer:
+        """
+        Creates a named layer that content can be submitted to (layer=name).
+
+        Layers are composited over the base layer in z order (by default, in
+        the order they were created) with their own opacity and blend mode;
+        see bongo.operations.compositor. A layer's opacity and blend can be
+        changed later with set_layer().
+        """
+        if name == "base" or name in self.layers:
+            raise ValueError(f"Layer '{name}' already exists.")
+        layer = Layer(name, len(self.layers) + 1 if z is None else z, opacity, blend)
+        self.layers[name] = layer
+        self._changed()
+        return layer
+
+    def set_layer(self, name: str, opacity: Optional[float] = None, blend: Optional[str] = None):
+        """Changes a layer's opacity and/or blend mode; takes effect on the next tick."""
+        layer = find_layer(self.layers, name)
+        if layer is None:
+            raise ValueError("The base layer has no opacity or blend mode.")
+        new = Layer(name, layer.z, layer.opacity if opacity is None else opacity,
+                    layer.blend if blend is None else blend)
+        layer.opacity, layer.blend = new.opacity, new.blend
+        self._changed()
+
+    def _resolve_layer(self, layer) -> Optional[Layer]:
+        if layer is None or isinstance(layer, Layer):
+            return layer
+        return find_layer(self.layers, layer)
+
+    def operations_at(self, row: int, col: int) -> List[LEDPixelOperation]:
+        """The active and scheduled operations on one LED, in the order they were added."""
+        return [managed.pixel_op for managed in self._by_led.get((row, col), ())]
+
+    def cancel(self, row: int, col: int) -> int:
+        """
+        Cancels every active and scheduled operation on one LED.
+
+        The LED keeps its last written brightness. Cancelled operations count
+        as finished for their PatternHandles. Like add_operation(), this must
+        be called from the thread that calls tick(); submissions still queued
+        from other threads are admitted first so they can be cancelled too.
+        Columnar batches and shaders are not indexed per LED; cancel them with
+        cancel_pattern().
+
+        Returns:
+            The number of operations cancelled.
+        """
+        if self._submissions:
+            self._drain_submissions()
+        managed_ops = self._by_led.get((row, col))
+        if not managed_ops:
+            return 0
+        return self._cancel(list(managed_ops))
+
+    def replace(self, row: int, col: int, pixel_op: LEDPixelOperation,
+                layer: Optional[str] = None):
         """
-        managed_op = _ManagedOperation(row, col, pixel_op, self.matrix)
-        self.operations.append(managed_op)
+        Cancels whatever one LED is doing and starts pixel_op on it instead
+        (same threading rules as cancel()).
+        """
+        self.cancel(row, col)
+        self.add_operation(row, col, pixel_op, layer=layer)
+
+    def cancel_pattern(self, handle: PatternHandle) -> int:
+        """
+        Cancels every remaining operation of a pattern submitted with
+        add_operations(), add_batch(), add_shader() or add_layered_operations(),
+        and finishes its handle (same threading rules as cancel()).
+
+        Returns:
+            The number of operations cancelled.
+        """
+        if self._submissions:
+            self._drain_submissions()
+        count = 0
+        managed_ops = self._by_handle.get(handle)
+        if managed_ops:
+            count += self._cancel(list(managed_ops))
+        if any(managed.handle is handle for managed in self.batches):
+            self._changed()
+            kept = []
+            for managed in self.batches:
+                if managed.handle is handle:
+                    count += managed.remaining
+                    handle._operation_finished(managed.remaining)
+                else:
+                    kept.append(managed)
+            self.batches = kept
+        if any(managed.handle is handle for managed in self.shaders):
+            self._changed()
+            kept = []
+            for managed in self.shaders:
+                if managed.handle is handle:
+                    count += 1
+                    handle._operation_finished()
+                else:
+                    kept.append(managed)
+            self.shaders = kept
+        return count
+
+    def _cancel(self, managed_ops: List[_ManagedOperation]) -> int:
+        """
+        Cancels operations in place. The wrappers stay in self.operations or
+        self._scheduled (removing them there would cost O(total operations))
+        with pixel_op set to None, and are dropped by the next tick.
+        """
+        self._changed()
+        pool = self.pool
+        for op in managed_ops:
+            handle = op.handle
+            self._unindex(op)
+            if op.scheduled:
+                self._cancelled_scheduled += 1
+            else:
+                self._cancelled_active += 1
+            if pool is not None:
+                pool.release(op.pixel_op)
+            op.pixel_op = None
+            op.handle = None
+            op.fixed = None
+            if handle is not None:
+                handle._operation_finished()
+        return len(managed_ops)
+
+    def _unindex(self, op: _ManagedOperation):
+        coords = (op.row, op.col)
+        led_ops = self._by_led[coords]
+        del led_ops[op]
+        if not led_ops:
+            del self._by_led[coords]
+        if op.handle is not None:
+            handle_ops = self._by_handle[op.handle]
+            del handle_ops[op]
+            if not handle_ops:
+                del self._by_handle[op.handle]
+
+    def _changed(self, from_time: float = -math.inf):
+        """Records that frames from from_time on have changed (see take_invalidation())."""
+        if self._changed_from is None or from_time < self._changed_from:
+            self._changed_from = from_time
+
+    @property
+    def pending_submissions(self) -> int:
+        """Number of submitted batches not yet admitted by tick()."""
+        return len(self._submissions)
+
+    @property
+    def scheduled_count(self) -> int:
+        """Number of operations waiting for their start_time (not counting unread schedule sources)."""
+        held = len(self._scheduled) if self.timing_wheel is None else len(self.timing_wheel)
+        return held - self._cancelled_scheduled
+
+    @property
+    def operation_count(self) -> int:
+        """Total number of admitted operations, active and scheduled."""
+        return (len(self.operations) - self._cancelled_active + self.scheduled_count + len(self.shaders)
+                + sum(managed.remaining for managed in self.batches))
+
+    def add_wakeup_listener(self, listener: Callable[[], None]):
+        """
+        Registers listener() to be called whenever work is submitted. It runs
+        on the submitting thread and must not block.
+        """
+        self._wakeup_listeners.append(listener)
+
+    def remove_wakeup_listener(self, listener: Callable[[], None]):
+        if listener in self._wakeup_listeners:
+            self._wakeup_listeners.remove(listener)
+
+    def _notify_wakeup(self):
+        for listener in self._wakeup_listeners:
+            listener()
+
+    def seconds_until_work(self, time_now: float = None) -> Optional[float]:
+        """
+        How long the render loop can sleep before tick() has anything to do.
+
+        Returns:
+            0.0 if operations are active or submissions are waiting, the time
+            until the earliest scheduled start_time (or the end of a gap in an
+            envelope, see bongo.operations.envelope_operation) otherwise, or
+            None if there is nothing at all (sleep until the next submission).
+        """
+        if self._submissions:
+            return 0.0
+        if time_now is None:
+            time_now = time.monotonic()
+        if self.timing_wheel is not None:
+            starts = [self.timing_wheel.next_start()]
+        else:
+            starts = [self._scheduled[0][0]] if self._scheduled else []
+        for op in self.operations:
+            idle_until = getattr(op.pixel_op, "idle_until", None)
+            resume = idle_until(time_now) if idle_until is not None else None
+            if resume is None:
+                return 0.0
+            starts.append(resume)
+        for managed in self.shaders:
+            if managed.start_time <= time_now:
+                return 0.0
+            starts.append(managed.start_time)
+        for managed in self.batches:
+            if managed.alive[:managed.started].any():
+                return 0.0
+            starts.append(managed.next_start())
+        starts = [start for start in starts if start is not None]
+        if not starts:
+            return None
+        return max(0.0, min(starts) - time_now)
+
+    def _drain_submissions(self):
+        """Admits everything submitted since the last tick."""
+        submissions = self._submissions
+        while submissions:
+            try:
+                handle, batch, layer = submissions.popleft()
+            except IndexError:
+                break
+            if isinstance(batch, _ManagedShader):
+                self.shaders.append(batch)
+                self._changed(batch.start_time)
+                continue
+            if isinstance(batch, _FrameCallback):
+                # A callback can do anything (cancel, write to the matrix).
+                self._changed()
+                try:
+                    batch.callback()
+                except Exception:
+                    log.error("Frame callback %r failed.", batch.callback, exc_info=True)
+                continue
+            if not isinstance(batch, tuple):  # an OperationBatch from add_batch()
+                if len(batch):
+                    managed = _ManagedBatch(batch, handle, layer)
+                    self.batches.append(managed)
+                    self._changed(managed.next_start())
+                continue
+            for coords, pixel_op in batch:
+                self.add_operation(coords[0], coords[1], pixel_op, handle, layer)
 
     def tick(self, time_now: float = None):
         """
         Advances the animation timeline by one step.
 
         This method should be called repeatedly in the main application loop.
-        It iterates through all active operations, updates their corresponding
-        LED's brightness, and removes any operations that have completed.
+        It first admits any operations queued by submit()/add_operations() and
+        promotes scheduled operations whose start_time has arrived. The frame
+        is then produced in three phases: evaluate (compute each active
+        operation's brightness and retire completed ones), composite (merge
+        the results into one frame) and flush (write it to the LEDs).
+        Columnar batches (add_batch) are evaluated with array operations
+        after the individual operations.
 
         Args:
             time_now: The current monotonic time. If None, time.monotonic() will be used.
         """
+        metrics = self.metrics
+        tracer = tracing.get_tracer()
+        timed = metrics is not None or tracer is not None
+        started = time.perf_counter_ns() if timed else 0
+
+        time_now = self._advance(time_now)
+        if self._duty_frame is not None:
+            evaluated_at, composited_at = self._render_fixed(time_now, timed)
+            # 3. Flush: write the duty cycles to the hardware.
+            self._flush_duty(self._duty_frame.touched)
+        else:
+            frame, evaluated_at, composited_at = self._render(time_now, timed)
+            # 3. Flush: write the frame to the hardware.
+            self._flush(frame)
+
+        if not timed:
+            return
+        flushed_at = time.perf_counter_ns()
+        self._record_tick(metrics, tracer, started, evaluated_at, composited_at, flushed_at)
+
+    def admit_submissions(self):
+        """Admits queued submissions now, without rendering."""
+        if self._submissions:
+            self._drain_submissions()
+
+    def take_invalidation(self) -> Optional[float]:
+        """
+        The earliest timestamp whose frame has changed since the last call,
+        or None if nothing has.
+
+        Adding operations, batches or shaders changes the frames from their
+        start time on; cancelling, replacing or clearing anything, changing
+        a layer and running a call_soon() callback change every frame (-inf).
+        The render-ahead runner (bongo.operations.render_ahead) renders its
+        buffered frames again from this timestamp on.
+        """
+        changed_from = self._changed_from
+        self._changed_from = None
+        return changed_from
+
+    def render_frame(self, time_now: float, previous: float = -math.inf):
+        """
+        Renders the frame for time_now without writing it to the hardware.
+
+        Used by the render-ahead runner (bongo.operations.render_ahead), which
+        renders frames for successive future timestamps, plays them later
+        with play_frame(), and renders buffered frames again when
+        take_invalidation() reports a change. So that it can, nothing is
+        retired here: completed operations (and batches and shaders) are
+        skipped in later frames, and retired, with their handles finished,
+        by retire_shown() once the frame they completed in has been played.
+
+        Args:
+            time_now: The timestamp to render.
+            previous: The timestamp of the frame rendered before this one.
+                      Operations that had completed by then showed their
+                      final level in that frame and are not drawn.
+
+        Returns:
+            An opaque frame for play_frame(): a {(row, col): brightness}
+            dict, or {position: duty} for fixed_point managers.
+        """
+        time_now = self._advance(time_now)
+        if self._duty_frame is not None:
+            self._render_fixed(time_now, False, previous)
+            duty = self._duty_frame.duty
+            return {position: duty[position] for position in self._duty_frame.touched}
+        return self._render(time_now, False, previous)[0]
+
+    def retire_shown(self, shown_until: float):
+        """
+        Retires what completed by shown_until, the timestamp of the last
+        frame played, for managers driven with render_frame().
+        """
+        finished = [op for op in self.operations if op.pixel_op is None or op.pixel_op.is_completed(shown_until)]
+        if finished:
+            self._retire(finished)
+        if self.batches:
+            retired = False
+            for managed in self.batches:
+                batch = managed.batch
+                started = int(batch.start_times.searchsorted(shown_until, side="right"))
+                active = managed.alive[:started].nonzero()[0]
+                if active.size:
+                    done = active[batch.completed_at(shown_until, active)]
+                    retired = self._retire_batch_operations(managed, done) or retired
+            if retired:
+                self.batches = [managed for managed in self.batches if managed.remaining]
+        if self.shaders:
+            self._expire_shaders(shown_until)
+
+    def play_frame(self, frame):
+        """Writes a frame from render_frame() to the hardware."""
+        metrics = self.metrics
+        if metrics is not None:
+            started = time.perf_counter_ns()
+        if self._duty_frame is not None:
+            self._flush_duty(list(frame.items()))
+        else:
+            self._flush(frame)
+        if metrics is not None:
+            metrics.flush_seconds.observe((time.perf_counter_ns() - started) / 1e9)
+            metrics.frames.inc()
+            metrics.active_operations.set(len(self.operations))
+
+    def _advance(self, time_now: Optional[float]) -> float:
+        """Admits queued submissions and promotes scheduled operations that are now due."""
+        if self._submissions:
+            self._drain_submissions()
+
         if time_now is None:
             time_now = time.monotonic()
 
-        # Iterate over a copy of the list to safely remove items
-        for op in self.operations[:]:
-            done = op.update(time_now)
-            if done:
-                self.operations.remove(op)
+        # Promote scheduled operations that are now due.
+        if self.timing_wheel is not None:
+            for op in self.timing_wheel.advance(time_now):
+                self._promote(op)
+        else:
+            scheduled = self._scheduled
+            while scheduled and scheduled[0][0] <= time_now:
+                self._promote(heapq.heappop(scheduled)[2])
+        return time_now
+
+    def _render(self, time_now: float, timed: bool, previous: Optional[float] = None):
+        """
+        The evaluate and composite phases of tick().
+
+        With `previous` (render_frame()), completed operations are kept and
+        skipped from the frame after `previous` on, and operations promoted
+        for a later frame are skipped, so buffered frames can be rendered
+        again; otherwise completed operations are retired.
+
+        Returns:
+            (frame, evaluated_at, composited_at): the {(row, col): brightness}
+            frame and the phase end times (perf_counter_ns, 0 if not timed).
+        """
+        evaluated_at = composited_at = 0
+        # 1. Evaluate: compute every active operation's brightness. Output
+        # for named layers is collected per layer; layers that produce
+        # nothing this frame never appear in layer_outputs.
+        evaluated = []
+        finished = []
+        layer_outputs = {}
+        ahead = previous is not None
+        for op in self.operations:
+            pixel_op = op.pixel_op
+            if pixel_op is None:  # cancelled since the last tick
+                finished.append(op)
+                continue
+            if ahead and (pixel_op.start_time > time_now or pixel_op.is_completed(previous)):
+                continue
+            brightness = pixel_op.get_brightness(time_now)
+            if brightness is None:  # an envelope in a gap draws nothing
+                pass
+            elif op.layer is None:
+                evaluated.append((op.row, op.col, brightness))
+            else:
+                self._layer_output(layer_outputs, op.layer).points.append((op.row, op.col, brightness))
+            if not ahead and pixel_op.is_completed(time_now):
+                finished.append(op)
+        if finished:
+            self._retire(finished)
+        batch_results = self._evaluate_batches(time_now, layer_outputs, previous) if self.batches else ()
+        background, layer_shaders = (self._evaluate_shaders(time_now, retire=not ahead) if self.shaders
+                                     else (None, None))
+        if timed:
+            evaluated_at = time.perf_counter_ns()
+
+        # 2. Composite: build the frame. Shaders form the background; when
+        # several operations target the same LED, the one added last wins.
+        frame = {}
+        if background is not None:
+            frame.update(zip(self.matrix.coordinate_grid().coords, background.tolist()))
+        for row, col, brightness in evaluated:
+            frame[(row, col)] = brightness
+        for rows, cols, values in batch_results:
+            for coords, brightness in zip(zip(rows, cols), values):
+                frame[coords] = brightness
+        if layer_outputs or layer_shaders:
+            frame = composite_layers(frame, layer_outputs, layer_shaders or {},
+                                     self.matrix.coordinate_grid())
+        if timed:
+            composited_at = time.perf_counter_ns()
+
+        return frame, evaluated_at, composited_at
+
+    def _record_tick(self, metrics, tracer, started, evaluated_at, composited_at, flushed_at):
+        if tracer is not None:
+            tracer.record("evaluate", "tick", started, evaluated_at)
+            tracer.record("composite", "tick", evaluated_at, composited_at)
+            tracer.record("flush", "tick", composited_at, flushed_at)
+            tracer.record("AnimationManager.tick", "tick", started, flushed_at)
+        if metrics is not None:
+            metrics.evaluate_seconds.observe((evaluated_at - started) / 1e9)
+            metrics.composite_seconds.observe((composited_at - evaluated_at) / 1e9)
+            metrics.flush_seconds.observe((flushed_at - composited_at) / 1e9)
+            metrics.total_seconds.observe((flushed_at - started) / 1e9)
+            metrics.frames.inc()
+            metrics.active_operations.set(len(self.operations))
+            metrics.scheduled_operations.set(self.scheduled_count)
+            metrics.submission_queue_depth.set(len(self._submissions))
+
+    def _render_fixed(self, time_now: float, timed: bool, previous: Optional[float] = None):
+        """
+        _render() for fixed_point managers: the same phases, writing 16-bit
+        duty cycles into the DutyFrame instead of building a float frame.
+        Shaders are evaluated first, since they are written underneath
+        everything. `previous` is as for _render().
+
+        Returns:
+            (evaluated_at, composited_at), as for _render().
+        """
+        evaluated_at = composited_at = 0
+        frame = self._duty_frame
+        frame.reset()
+        layer_outputs = {}
+        layer_shaders = None
+        ahead = previous is not None
+        if self.shaders:
+            background, layer_shaders = self._evaluate_shaders(time_now, retire=not ahead)
+            if background is not None:
+                frame.set_all(background)
+
+        # 1. Evaluate: integer operations write their duty straight into the
+        # buffer (in order, so the one added last wins); the rest fall back
+        # to float and are converted once.
+        time_us = round(time_now * 1_000_000)
+        previous_us = round(previous * 1_000_000) if ahead and previous != -math.inf else None
+        duty, written, touched = frame.duty, frame.written, frame.touched
+        finished = []
+        for op in self.operations:
+            fixed = op.fixed
+            if fixed is None:
+                pixel_op = op.pixel_op
+                if pixel_op is None:  # cancelled since the last tick
+                    finished.append(op)
+                    continue
+                if ahead and (pixel_op.start_time > time_now or pixel_op.is_completed(previous)):
+                    continue
+                brightness = pixel_op.get_brightness(time_now)
+                if brightness is None:  # an envelope in a gap draws nothing
+                    pass
+                elif op.layer is None:
+                    frame.set_brightness((op.row, op.col), brightness)
+                else:
+                    self._layer_output(layer_outputs, op.layer).points.append((op.row, op.col, brightness))
+                if not ahead and pixel_op.is_completed(time_now):
+                    finished.append(op)
+                continue
+            position, start, ramp_end, hold_end, end, initial, target, final, ramp_slope, fade_slope = fixed
+            if ahead and (time_us < start or (previous_us is not None and previous_us >= end)):
+                continue
+            if time_us >= end:
+                value = final
+                if not ahead:
+                    finished.append(op)
+            elif time_us >= hold_end:
+                value = target + ((time_us - hold_end) * fade_slope >> SLOPE_BITS)
+            elif time_us >= ramp_end:
+                value = target
+            elif time_us >= start:
+                value = initial + ((time_us - start) * ramp_slope >> SLOPE_BITS)
+            else:
+                value = initial
+            duty[position] = value
+            if not written[position]:
+                written[position] = 1
+                touched.append(position)
+        if finished:
+            self._retire(finished)
+        batch_results = self._evaluate_batches(time_now, layer_outputs, previous) if self.batches else ()
+        if timed:
+            evaluated_at = time.perf_counter_ns()
+
+        # 2. Composite: batches over operations, then named layers.
+        for rows, cols, values in batch_results:
+            for coords, brightness in zip(zip(rows, cols), values):
+                frame.set_brightness(coords, brightness)
+        if layer_outputs or layer_shaders:
+            composited = composite_layers(frame.brightness_items(), layer_outputs, layer_shaders or {},
+                                          self.matrix.coordinate_grid())
+            for coords, brightness in composited.items():
+                frame.set_brightness(coords, brightness)
+        if timed:
+            composited_at = time.perf_counter_ns()
+        return evaluated_at, composited_at
+
+    def _flush_duty(self, duties):
+        """Writes (position, duty) pairs, or the DutyFrame's touched positions, to the controllers."""
+        tracer = tracing.get_tracer()
+        if tracer is None:
+            self._write_duty(duties)
+            return
+        by_board = {}
+        board_of = self.matrix.board_of
+        coords = self._duty_frame.coords
+        for entry in duties:
+            position = entry if isinstance(entry, int) else entry[0]
+            row, col = coords[position]
+            by_board.setdefault(board_of(row, col), []).append(entry)
+        for board, entries in by_board.items():
+            start = tracer.now()
+            self._write_duty(entries)
+            label = hex(board) if isinstance(board, int) else "gpio"
+            tracer.record(f"flush board {label}", "flush", start, tracer.now())
+
+    def _write_duty(self, duties):
+        frame = self._duty_frame
+        writers = frame.writers
+        if duties and isinstance(duties[0], int):  # positions into the DutyFrame
+            duty = frame.duty
+            for position in duties:
+                writers[position](duty[position])
+            positions = duties
+        else:
+            for position, value in duties:
+                writers[position](value)
+            positions = [position for position, _ in duties]
+        metrics = self.metrics
+        if metrics is not None:
+            board_of = self.matrix.board_of
+            for position in positions:
+                metrics.record_board_write(board_of(*frame.coords[position]))
+
+    def _promote(self, op: _ManagedOperation):
+        if op.pixel_op is None:  # cancelled while scheduled
+            self._cancelled_scheduled -= 1
+            self._free_managed.append(op)
+            return
+        op.scheduled = False
+        self.operations.append(op)
+
+    @staticmethod
+    def _layer_output(layer_outputs, layer: Layer) -> LayerOutput:
+        output = layer_outputs.get(layer)
+        if output is None:
+            output = layer_outputs[layer] = LayerOutput(layer)
+        return output
+
+    def _evaluate_batches(self, time_now: float, layer_outputs, previous: Optional[float] = None):
+        """
+        Evaluates every admitted batch's started, unfinished operations.
+        `previous` is as for _render().
+
+        Returns:
+            A list of (rows, cols, brightness) lists, one per base-layer batch
+            with output. Output for named layers goes into layer_outputs.
+        """
+        results = []
+        retired = False
+        for managed in self.batches:
+            batch = managed.batch
+            managed.started = int(batch.start_times.searchsorted(time_now, side="right"))
+            active = managed.alive[:managed.started].nonzero()[0]
+            if previous is not None and active.size:
+                active = active[~batch.completed_at(previous, active)]
+            if not active.size:
+                continue
+            brightness = batch.brightness_at(time_now, active)
+            output = (batch.rows[active].tolist(), batch.cols[active].tolist(), brightness.tolist())
+            if managed.layer is None:
+                results.append(output)
+            else:
+                self._layer_output(layer_outputs, managed.layer).arrays.append(output)
+
+            if previous is None:
+                done = active[batch.completed_at(time_now, active)]
+                retired = self._retire_batch_operations(managed, done) or retired
+        if retired:
+            self.batches = [managed for managed in self.batches if managed.remaining]
+        return results
+
+    @staticmethod
+    def _retire_batch_operations(managed: _ManagedBatch, done) -> bool:
+        """Marks a batch's completed operations (indices) dead; True if none are left."""
+        if not done.size:
+            return False
+        managed.alive[done] = False
+        managed.remaining -= done.size
+        if managed.handle is not None:
+            managed.handle._operation_finished(int(done.size))
+        return managed.remaining == 0
+
+    def _evaluate_shaders(self, time_now: float, retire: bool = True):
+        """
+        Evaluates and blends the active shaders over the coordinate grid.
+        Shaders whose duration is over are dropped if `retire` is True.
+
+        Returns:
+            (background, layer_shaders): the base layer's blended shader output
+            as an array in coordinate_grid() order (None if no base shader is
+            active), and {Layer: array} for shaders on named layers.
+        """
+        render_pool = self.render_pool
+        grid = self.matrix.coordinate_grid() if render_pool is None else None
+        result = None
+        layer_shaders = {}
+        active = []
+        expired = False
+        for managed in self.shaders:
+            if managed.start_time > time_now:
+                continue
+            if time_now >= managed.end_time:
+                expired = True
+                continue
+            shader = managed.shader
+            if render_pool is not None:
+                active.append((managed.layer, shader, time_now - managed.start_time))
+                continue
+            try:
+                values = shader.evaluate(grid, time_now - managed.start_time)
+            except Exception:
+                if not managed.failed:
+                    managed.failed = True
+                    log.error("Shader %r failed; skipping it.", shader, exc_info=True)
+                continue
+            if managed.layer is None:
+                result = shader.composite(result, values)
+            else:
+                layer_shaders[managed.layer] = shader.composite(layer_shaders.get(managed.layer), values)
+        if active:
+            try:
+                result, layer_shaders = render_pool.evaluate(active)
+            except Exception:
+                if not self._render_pool_failed:
+                    self._render_pool_failed = True
+                    log.error("The render pool failed to evaluate the shaders; skipping them.", exc_info=True)
+        if expired and retire:
+            self._expire_shaders(time_now)
+        return result, layer_shaders
+
+    def _expire_shaders(self, time_now: float):
+        """Drops the shaders whose duration is over by time_now and finishes their handles."""
+        active = []
+        for managed in self.shaders:
+            if time_now < managed.end_time:
+                active.append(managed)
+            elif managed.handle is not None:
+                managed.handle._operation_finished()
+        self.shaders = active
+
+    def _retire(self, finished: List[_ManagedOperation]):
+        """Removes completed (or cancelled) operations and notifies their pattern handles."""
+        done = set(map(id, finished))
+        self.operations[:] = [op for op in self.operations if id(op) not in done]
+        for op in finished:
+            if op.pixel_op is None:
+                self._cancelled_active -= 1
+                continue
+            self._unindex(op)
+            if op.handle is not None:
+                op.handle._operation_finished()
+        self._recycle(finished)
+
+    def _recycle(self, managed_ops: Iterable[_ManagedOperation]):
+        """Returns retired wrappers to the free list and their operations to the pool."""
+        pool = self.pool
+        free = self._free_managed
+        for op in managed_ops:
+            if pool is not None:
+                pool.release(op.pixel_op)
+            op.pixel_op = None
+            op.handle = None
+            op.fixed = None
+            free.append(op)
+
+    def _flush(self, frame):
+        """Writes {(row, col): brightness} to the LED controllers."""
+        tracer = tracing.get_tracer()
+        if tracer is None:
+            self._write_leds(frame.items())
+            return
+
+        # When tracing, write board by board so each board's I2C traffic
+        # shows up as its own span.
+        by_board = {}
+        board_of = self.matrix.board_of
+        for coords, brightness in frame.items():
+            by_board.setdefault(board_of(coords[0], coords[1]), []).append((coords, brightness))
+        for board, writes in by_board.items():
+            start = tracer.now()
+            self._write_leds(writes)
+            label = hex(board) if isinstance(board, int) else "gpio"
+            tracer.record(f"flush board {label}", "flush", start, tracer.now())
+
+    def _write_leds(self, writes):
+        matrix = self.matrix
+        metrics = self.metrics
+        for (row, col), brightness in writes:
+            led = matrix.get_led(row, col)
+            if led is None:
+                log.error("No LED found at (%d,%d)", row, col)
+                continue
+            led.set_brightness(brightness)
+            if metrics is not None:
+                metrics.record_board_write(matrix.board_of(row, col))
 
     def clear_operations(self):
-        """Removes all active operations from the manager."""
+        """Removes all active and queued operations from the manager."""
+        cleared = []
+        callbacks = []
+        while self._submissions:
+            try:
+                entry = self._submissions.popleft()
+            except IndexError:
+                break
+            handle, batch, layer = entry
+            if isinstance(batch, _FrameCallback):
+                callbacks.append(entry)  # not operations: still run at the frame boundary
+            elif handle is not None:
+                cleared.append((handle, handle.remaining))
+        self._submissions.extendleft(reversed(callbacks))
+        dropped = self.operations + [entry[2] for entry in self._scheduled]
+        if self.timing_wheel is not None:
+            dropped += self.timing_wheel.clear()
+        cleared.extend((op.handle, 1) for op in dropped if op.handle is not None)
+        cleared.extend((managed.handle, managed.remaining) for managed in self.batches
+                       if managed.handle is not None)
+        cleared.extend((managed.handle, 1) for managed in self.shaders if managed.handle is not None)
         self.operations.clear()
+        self._scheduled.clear()
+        self._by_led.clear()
+        self._by_handle.clear()
+        self._cancelled_active = self._cancelled_scheduled = 0
+        self.batches.clear()
+        self.shaders.clear()
+        self._recycle(dropped)
+        self._changed()
+        # Patterns whose operations were dropped count as finished, so nobody
+        # waiting on their handles is left hanging.
+        for handle, count in cleared:
+            handle._operation_finished(count)
@@ -0,0 +1,113 @@
+# src/bongo/operations/async_runner.py
+"""
+An asyncio-native runtime for the AnimationManager.
+
+Instead of the blocking `while True: tick(); sleep()` loop, AsyncAnimationRunner
+drives frames from an async FrameClock and runs each tick (which performs the
+blocking I2C writes) on a single-thread executor. The event loop stays free
+for control sockets, timers and other tasks, and those tasks feed the
+animation through the thread-safe AnimationManager.submit()/add_operations().
+Like AnimationRunner, it goes idle while nothing is active and is woken by the
+next scheduled start_time or by a submission.
+"""
+import asyncio
+import logging
+import time
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Optional
+
+from .animation_manager import AnimationManager
+from .frame_clock import FrameClock
+from .runner import IdleTracker, collect_between_frames, record_frame_stats
+
+log = logging.getLogger("bongo.async_runner")
+
+
+class AsyncAnimationRunner:
+    """Runs an AnimationManager's frames on an asyncio event loop."""
+
+    def __init__(self, animation_manager: AnimationManager, fps: float = 60.0,
+                 executor: Optional[Executor] = None, gc_controller=None):
+        """
+        Args:
+            animation_manager: The manager to tick.
+            fps: The target frame rate.
+            executor: Where ticks (and therefore hardware writes) are run. It
+                      must execute one call at a time. Defaults to a private
+                      single-thread executor that is shut down when run() exits.
+            gc_controller: Optional GCController, as for AnimationRunner.
+        """
+        self.animation_manager = animation_manager
+        self.clock = FrameClock(fps)
+        self.idle = IdleTracker()
+        self.frame_count: int = 0
+        self._executor = executor
+        self._owns_executor = executor is None
+        self.gc_controller = gc_controller
+        self._stopping: Optional[asyncio.Event] = None
+        self._wakeup: Optional[asyncio.Event] = None
+
+    @property
+    def idle_percentage(self) -> float:
+        return self.idle.idle_percentage()
+
+    async def _wait_until_work(self) -> bool:
+        """Sleeps while the manager has nothing to do. Returns True if it slept."""
+        self._wakeup.clear()
+        delay = self.animation_manager.seconds_until_work()
+        if delay is not None and delay <= self.clock.period:
+            return False
+
+        started = time.monotonic()
+        if self.gc_controller is not None and self.gc_controller.enabled:
+            self.gc_controller.collect_in_gap(float("inf") if delay is None else delay)
+            if delay is not None:
+                delay = max(0.0, delay - (time.monotonic() - started))
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+        except asyncio.TimeoutError:
+            pass
+        self.idle.record_idle(time.monotonic() - started)
+        self.clock.reset()
+        return True
+
+    async def run(self, max_frames: Optional[int] = None):
+        """
+        Drives frames until stop() is called (or max_frames have been rendered).
+        """
+        loop = asyncio.get_running_loop()
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="bongo-render")
+        self._stopping = asyncio.Event()
+        self._wakeup = asyncio.Event()
+        wake = lambda: loop.call_soon_threadsafe(self._wakeup.set)
+        self.animation_manager.add_wakeup_listener(wake)
+        self.clock.reset()
+        self.idle.start()
+        log.info(f"Async animation runner started at {1.0 / self.clock.period:.0f} FPS.")
+        try:
+            while not self._stopping.is_set():
+                if await self._wait_until_work():
+                    continue
+                frame_time = await self.clock.next_frame()
+                if self._stopping.is_set():
+                    break
+                await loop.run_in_executor(self._executor, self.animation_manager.tick, frame_time)
+                self.frame_count += 1
+                record_frame_stats(self.animation_manager, self.idle, self.clock, frame_time)
+                collect_between_frames(self.gc_controller, self.clock)
+                if max_frames is not None and self.frame_count >= max_frames:
+                    break
+        finally:
+            self.animation_manager.remove_wakeup_listener(wake)
+            if self._owns_executor:
+                self._executor.shutdown(wait=True)
+                self._executor = None
+            log.info(f"Async animation runner stopped after {self.frame_count} frames "
+                     f"({self.clock.dropped_frames} dropped, idle {self.idle_percentage:.1f}%).")
+
+    def stop(self):
+        """Asks run() to return after the current frame. Call from the loop thread."""
+        if self._stopping is not None:
+            self._stopping.set()
+            self._wakeup.set()
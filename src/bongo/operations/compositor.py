@@ -0,0 +1,170 @@
+# src/bongo/operations/compositor.py
+"""
+Layered compositing for the AnimationManager.
+
+Everything submitted without a layer is drawn on the base layer, exactly as
+before: shaders as the background, then operations and batches, last added
+wins. Content can also be submitted to a named Layer (see
+AnimationManager.add_layer()). Each layer has its own brightness buffer over the
+matrix's coordinate grid, an opacity and a blend mode. Once per tick, the
+layers that produced any output are blended over the base layer in z order
+with array operations, and the result is flushed as one frame, so every LED is
+written at most once however many layers cover it.
+
+Layers with no active content produce no output and are skipped entirely.
+Where a layer covers an LED that nothing below it covers, it is blended over
+0.0 (off).
+"""
+import logging
+from typing import Dict, Optional, Set, Tuple
+
+log = logging.getLogger("bongo.compositor")
+
+BLEND_MODES = ("normal", "add", "max", "multiply", "screen")
+
+# Coordinates already reported as missing from the grid, so each is logged once.
+_reported_missing: Set[Tuple[int, int]] = set()
+
+
+def _known(positions, coords_list):
+    """Filters out coordinates that have no LED in the grid, logging each one once."""
+    known = [coords for coords in coords_list if coords in positions]
+    if len(known) != len(coords_list):
+        for coords in coords_list:
+            if coords not in positions and coords not in _reported_missing:
+                _reported_missing.add(coords)
+                log.error("No LED found at (%d,%d)", *coords)
+    return known
+
+
+class Layer:
+    """A named compositing layer."""
+
+    def __init__(self, name: str, z: int, opacity: float = 1.0, blend: str = "normal"):
+        """
+        Args:
+            name: Used to address the layer when submitting content.
+            z: Stacking order; higher layers are drawn on top. The base layer is 0.
+            opacity: 0.0 (invisible) to 1.0 (fully applied).
+            blend: One of BLEND_MODES.
+        """
+        self.name = name
+        self.z = z
+        self.opacity = opacity
+        self.blend = blend
+        self.validate()
+        # Per-frame buffers over the coordinate grid, allocated on first use.
+        self.values = None
+        self.covered = None
+
+    def validate(self):
+        if not (0.0 <= self.opacity <= 1.0):
+            raise ValueError("Layer opacity must be between 0.0 and 1.0")
+        if self.blend not in BLEND_MODES:
+            raise ValueError(f"Unknown blend mode '{self.blend}'. Expected one of {BLEND_MODES}.")
+
+    def __repr__(self) -> str:
+        return f"Layer({self.name!r}, z={self.z}, opacity={self.opacity}, blend={self.blend})"
+
+
+def _blend(np, mode: str, below, above):
+    if mode == "normal":
+        return above
+    if mode == "add":
+        return np.minimum(below + above, 1.0)
+    if mode == "max":
+        return np.maximum(below, above)
+    if mode == "multiply":
+        return below * above
+    return 1.0 - (1.0 - below) * (1.0 - above)  # screen
+
+
+class LayerOutput:
+    """Collects one layer's output for a single tick."""
+    __slots__ = ("layer", "points", "arrays")
+
+    def __init__(self, layer: Layer):
+        self.layer = layer
+        self.points = []   # (row, col, brightness) from operations
+        self.arrays = []   # (rows, cols, values) lists from batches
+        # Full-grid arrays from shaders are blended straight into the buffer.
+
+
+def composite_layers(base_frame: Dict, outputs: Dict[Layer, LayerOutput], shader_outputs: Dict,
+                     grid) -> Dict:
+    """
+    Blends the layers that produced output over the base frame.
+
+    Args:
+        base_frame: {(row, col): brightness} of the base layer.
+        outputs: Per-layer operation and batch output.
+        shader_outputs: {Layer: full-grid array} of blended shader output.
+        grid: The matrix's CoordinateGrid.
+
+    Returns:
+        The composited {(row, col): brightness} frame.
+    """
+    import numpy as np
+
+    count = len(grid)
+    positions = grid.positions
+    result = np.zeros(count)
+    covered = np.zeros(count, dtype=bool)
+    if base_frame:
+        known = _known(positions, list(base_frame))
+        index = np.fromiter((positions[coords] for coords in known), dtype=np.intp, count=len(known))
+        result[index] = np.fromiter((base_frame[coords] for coords in known), dtype=np.float64, count=len(known))
+        covered[index] = True
+
+    layers = sorted(set(outputs) | set(shader_outputs), key=lambda layer: layer.z)
+    for layer in layers:
+        if layer.opacity == 0.0:
+            continue
+        if layer.values is None or layer.values.shape[0] != count:
+            layer.values = np.zeros(count)
+            layer.covered = np.zeros(count, dtype=bool)
+        values, mask = layer.values, layer.covered
+        mask[:] = False
+        shader_values = shader_outputs.get(layer)
+        if shader_values is not None:
+            values[:] = shader_values
+            mask[:] = True
+        output = outputs.get(layer)
+        if output is not None:
+            for row, col, brightness in output.points:
+                i = positions.get((row, col))
+                if i is None:
+                    _known(positions, [(row, col)])
+                    continue
+                values[i] = brightness
+                mask[i] = True
+            for rows, cols, array_values in output.arrays:
+                wanted = list(zip(rows, cols))
+                index = [positions.get(coords) for coords in wanted]
+                if None in index:
+                    _known(positions, wanted)
+                    keep = [i is not None for i in index]
+                    index = [i for i in index if i is not None]
+                    array_values = np.asarray(array_values)[keep]
+                values[index] = array_values
+                mask[index] = True
+
+        below = result[mask]
+        blended = _blend(np, layer.blend, below, values[mask])
+        if layer.opacity < 1.0:
+            blended = below + (blended - below) * layer.opacity
+        result[mask] = blended
+        covered |= mask
+
+    coords = grid.coords
+    return {coords[i]: value for i, value in zip(covered.nonzero()[0].tolist(), result[covered].tolist())}
+
+
+def find_layer(layers: Dict[str, Layer], name: Optional[str]) -> Optional[Layer]:
+    """Resolves a layer name (None or 'base' is the base layer, returned as None)."""
+    if name is None or name == "base":
+        return None
+    try:
+        return layers[name]
+    except KeyError:
+        raise ValueError(f"Unknown layer '{name}'. Create it with add_layer() first.") from None
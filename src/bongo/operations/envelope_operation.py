@@ -0,0 +1,249 @@
+# src/bongo/operations/envelope_operation.py
+"""
+Multi-segment brightness envelopes.
+
+LEDPixelOperation describes one linear ramp/hold/fade. EnvelopeOperation
+describes an arbitrary sequence of segments, each easing from the previous
+level (or an explicit start level) to a target over a duration, so a pulse
+train, a heartbeat or an ease-in-out breath is a single operation instead of a
+chain of them.
+
+Evaluation finds the current segment by bisecting precomputed cumulative end
+offsets (O(log segments)) and shapes its progress with a precomputed easing
+lookup table. EnvelopeOperation has the same interface the AnimationManager
+uses for LEDPixelOperation (start_time, total_duration, get_brightness(),
+is_completed(), is_active), so it can be submitted anywhere one can.
+
+A segment whose target is None is a gap: the envelope draws nothing while it
+plays (get_brightness() returns None), so the LED shows whatever else is drawn
+on it, exactly as if no operation were active. The segment after a gap must
+give its start level. bongo.patterns.coalesce uses gaps to fuse a pattern's
+separate operations on one LED into one envelope.
+"""
+import math
+from bisect import bisect_right
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence
+
+from .led_operation import LEDPixelOperation
+
+# Samples per easing lookup table; values in between are interpolated.
+EASING_TABLE_SIZE = 256
+
+
+def _ease_in_out_quadratic(p: float) -> float:
+    return 2 * p * p if p < 0.5 else 1 - (-2 * p + 2) ** 2 / 2
+
+
+def _ease_in_out_cubic(p: float) -> float:
+    return 4 * p * p * p if p < 0.5 else 1 - (-2 * p + 2) ** 3 / 2
+
+
+def _ease_in_out_sine(p: float) -> float:
+    return -(math.cos(math.pi * p) - 1) / 2
+
+
+EASING_FUNCTIONS: Dict[str, Callable[[float], float]] = {
+    "linear": lambda p: p,
+    "quadratic": _ease_in_out_quadratic,
+    "cubic": _ease_in_out_cubic,
+    "sine": _ease_in_out_sine,
+    # Jumps to the target as soon as the segment starts.
+    "step": lambda p: 1.0 if p > 0 else 0.0,
+}
+
+EASING_TABLES: Dict[str, List[float]] = {
+    name: [func(i / (EASING_TABLE_SIZE - 1)) for i in range(EASING_TABLE_SIZE)]
+    for name, func in EASING_FUNCTIONS.items()
+}
+
+
+def ease(easing: str, progress: float) -> float:
+    """Looks up an eased 0.0-1.0 progress value in the easing's table."""
+    if easing == "linear":
+        return progress
+    if easing == "step":
+        return 1.0 if progress > 0 else 0.0
+    table = EASING_TABLES[easing]
+    position = progress * (EASING_TABLE_SIZE - 1)
+    index = int(position)
+    if index >= EASING_TABLE_SIZE - 1:
+        return table[-1]
+    low = table[index]
+    return low + (table[index + 1] - low) * (position - index)
+
+
+class EnvelopeSegment(NamedTuple):
+    """
+    One piece of an envelope.
+
+    Attributes:
+        duration: Length of the segment in seconds.
+        target: Brightness reached at the end of the segment; None for a gap
+                (see the module docstring).
+        easing: One of EASING_FUNCTIONS ('linear', 'quadratic', 'cubic', 'sine', 'step').
+        start: Brightness at the start of the segment; None continues from
+               where the previous segment ended.
+    """
+    duration: float
+    target: Optional[float]
+    easing: str = "linear"
+    start: Optional[float] = None
+
+
+class EnvelopeOperation:
+    """An LED animation made of any number of eased segments."""
+
+    def __init__(self, segments: Sequence[EnvelopeSegment], start_time: Optional[float] = None,
+                 initial_brightness: float = 0.0):
+        """
+        Args:
+            segments: The segments, in order. Tuples are accepted too.
+            start_time: The monotonic time when the envelope begins.
+            initial_brightness: The level before the envelope starts, and the
+                                level the first segment starts from.
+        """
+        if not segments:
+            raise ValueError("An envelope needs at least one segment.")
+        if not (0.0 <= initial_brightness <= 1.0):
+            raise ValueError("Initial brightness must be between 0.0 and 1.0")
+
+        self.segments = tuple(EnvelopeSegment(*segment) for segment in segments)
+        self.start_time: Optional[float] = start_time
+        self.initial_brightness = initial_brightness
+        self.is_active: bool = True
+
+        ends, levels = [], []
+        offset, level = 0.0, initial_brightness
+        after_gap = False
+        for segment in self.segments:
+            if segment.duration < 0:
+                raise ValueError("Segment durations cannot be negative.")
+            if segment.easing not in EASING_FUNCTIONS:
+                raise ValueError(f"Unknown easing '{segment.easing}'. "
+                                 f"Expected one of {sorted(EASING_FUNCTIONS)}.")
+            for value in (segment.target, segment.start):
+                if value is not None and not (0.0 <= value <= 1.0):
+                    raise ValueError("Segment brightness must be between 0.0 and 1.0")
+            if after_gap and segment.start is None:
+                raise ValueError("A segment after a gap needs a start level.")
+            if segment.start is not None:
+                level = segment.start
+            offset += segment.duration
+            ends.append(offset)
+            levels.append(level)
+            after_gap = segment.target is None
+            if not after_gap:
+                level = segment.target
+        if after_gap:
+            raise ValueError("An envelope can't end with a gap.")
+        # _ends[i] is segment i's end offset; _levels[i] its start level (for
+        # a gap, the level the segment before it ended at).
+        self._ends = ends
+        self._levels = levels
+        self.final_brightness = level
+        self.total_duration: float = offset
+        # Elapsed time of the last get_brightness() call, for gaps.
+        self._last_elapsed = -math.inf
+
+    @classmethod
+    def from_pixel_operation(cls, op: LEDPixelOperation) -> "EnvelopeOperation":
+        """Builds the envelope equivalent of a ramp/hold/fade LEDPixelOperation."""
+        return cls(pixel_operation_segments(op), op.start_time, op.initial_brightness)
+
+    def get_brightness(self, current_time: float) -> Optional[float]:
+        """
+        Calculates the brightness at current_time.
+
+        Args:
+            current_time: The current monotonic time.
+
+        Returns:
+            The calculated brightness (0.0 to 1.0), or None during a gap.
+        """
+        if self.start_time is None:
+            return self.initial_brightness
+        elapsed = current_time - self.start_time
+        if elapsed < 0:
+            return self.initial_brightness
+        if elapsed >= self.total_duration - 1e-9:
+            self.is_active = False
+            return self.final_brightness
+
+        index = bisect_right(self._ends, elapsed)
+        segment = self.segments[index]
+        segment_start = self._ends[index - 1] if index else 0.0
+        start_level = self._levels[index]
+        if segment.target is None:
+            shown = self._last_elapsed >= segment_start - 1e-9
+            self._last_elapsed = elapsed
+            # A separate operation before the gap would still show its final
+            # level in the first frame after it ends.
+            return None if shown else start_level
+        self._last_elapsed = elapsed
+        progress = (elapsed - segment_start) / segment.duration
+        return start_level + (segment.target - start_level) * ease(segment.easing, min(1.0, progress))
+
+    def idle_until(self, current_time: float) -> Optional[float]:
+        """
+        The time the gap playing at current_time ends, or None if the
+        envelope isn't in a gap (it draws nothing until then, so the render
+        loop may sleep).
+        """
+        if self.start_time is None:
+            return None
+        elapsed = current_time - self.start_time
+        if elapsed < 0 or elapsed >= self.total_duration:
+            return None
+        index = bisect_right(self._ends, elapsed)
+        if self.segments[index].target is not None:
+            return None
+        segment_start = self._ends[index - 1] if index else 0.0
+        if self._last_elapsed < segment_start - 1e-9:
+            return None  # the level before the gap hasn't been shown yet
+        return self.start_time + self._ends[index]
+
+    def is_completed(self, current_time: float) -> bool:
+        """Checks if the envelope has completed its full duration."""
+        if self.start_time is None:
+            return False
+        return current_time >= (self.start_time + self.total_duration - 1e-9)
+
+    def __repr__(self) -> str:
+        start_time_str = f"{self.start_time:.2f}s" if self.start_time is not None else "None"
+        return (f"EnvelopeOperation(start_time={start_time_str}, segments={len(self.segments)}, "
+                f"duration={self.total_duration:.2f}s)")
+
+
+def pixel_operation_segments(op: LEDPixelOperation) -> List[EnvelopeSegment]:
+    """The segments that reproduce a LEDPixelOperation's ramp/hold/fade envelope."""
+    segments = [EnvelopeSegment(op.ramp_duration, op.target_brightness, "linear", op.initial_brightness),
+                EnvelopeSegment(op.hold_duration, op.target_brightness)]
+    if op.fade_duration > 0:
+        segments.append(EnvelopeSegment(op.fade_duration, op.initial_brightness))
+    return segments
+
+
+def pulse_train(count: int, on_time: float, off_time: float, brightness: float = 1.0,
+                rise: float = 0.0, fall: float = 0.0, easing: str = "linear",
+                start_time: Optional[float] = None) -> EnvelopeOperation:
+    """`count` pulses (rise, on, fall, off) as a single envelope."""
+    segments = []
+    for _ in range(count):
+        segments += [EnvelopeSegment(rise, brightness, easing), EnvelopeSegment(on_time, brightness),
+                     EnvelopeSegment(fall, 0.0, easing), EnvelopeSegment(off_time, 0.0)]
+    return EnvelopeOperation(segments, start_time)
+
+
+def heartbeat(period: float = 1.0, brightness: float = 1.0, beats: int = 1,
+              start_time: Optional[float] = None) -> EnvelopeOperation:
+    """A 'lub-dub' double pulse per period, repeated `beats` times."""
+    segments = []
+    for _ in range(beats):
+        segments += [
+            EnvelopeSegment(0.06 * period, brightness, "quadratic"),
+            EnvelopeSegment(0.10 * period, 0.2 * brightness, "sine"),
+            EnvelopeSegment(0.06 * period, 0.8 * brightness, "quadratic"),
+            EnvelopeSegment(0.18 * period, 0.0, "sine"),
+            EnvelopeSegment(0.60 * period, 0.0),
+        ]
+    return EnvelopeOperation(segments, start_time)
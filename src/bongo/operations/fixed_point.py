@@ -0,0 +1,150 @@
+# src/bongo/operations/fixed_point.py
+"""
+Fixed-point evaluation of LEDPixelOperations straight to PWM duty cycles.
+
+In the float pipeline, every LED costs a get_brightness() call that clamps its
+result, then a float frame entry, then a set_brightness() that clamps again
+and multiplies into an int duty cycle. When an AnimationManager is created
+with fixed_point=True, each plain LEDPixelOperation is instead compiled once,
+when it is admitted, into integers:
+
+- times in microseconds (start, end of ramp, end of hold, end of fade);
+- 16-bit duty levels (0-65535) for its initial and target brightness;
+- ramp and fade slopes in duty units per microsecond, as fixed-point numbers
+  with SLOPE_BITS fraction bits, truncated towards zero so interpolation never
+  overshoots its end level.
+
+Each frame, the manager evaluates those with integer arithmetic only and
+writes the results into a DutyFrame: a uint16 buffer over the matrix's LEDs.
+The flush hands the duty values to the controllers' set_duty_cycle(). Other
+operation types (envelopes, layered content) and batch and shader output still
+evaluate in float, and are converted once when they are written into the
+buffer.
+"""
+import logging
+from array import array
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .led_operation import LEDPixelOperation
+
+log = logging.getLogger("bongo.fixed_point")
+
+DUTY_MAX = 0xFFFF
+# Fraction bits of the per-microsecond slopes: sub-count accuracy for ramps
+# and fades of up to about 70 minutes.
+SLOPE_BITS = 32
+
+# (position, start, ramp_end, hold_end, end, initial, target, final, ramp_slope, fade_slope)
+FixedParams = Tuple[int, int, int, int, int, int, int, int, int, int]
+
+
+def to_duty(brightness: float) -> int:
+    """Converts a 0.0-1.0 brightness to a 16-bit duty cycle (rounded, clamped)."""
+    if brightness <= 0.0:
+        return 0
+    if brightness >= 1.0:
+        return DUTY_MAX
+    return int(brightness * DUTY_MAX + 0.5)
+
+
+def _slope(delta: int, duration_us: int) -> int:
+    if duration_us <= 0:
+        return 0
+    magnitude = (abs(delta) << SLOPE_BITS) // duration_us
+    return magnitude if delta >= 0 else -magnitude
+
+
+def compile_operation(pixel_op, position: Optional[int]) -> Optional[FixedParams]:
+    """
+    Precomputes the integer parameters of a plain LEDPixelOperation that has a
+    start time. Returns None for anything that must be evaluated in float.
+    """
+    if type(pixel_op) is not LEDPixelOperation or position is None or pixel_op.start_time is None:
+        return None
+    start = round(pixel_op.start_time * 1_000_000)
+    ramp_us = round(pixel_op.ramp_duration * 1_000_000)
+    hold_us = round(pixel_op.hold_duration * 1_000_000)
+    fade_us = round(pixel_op.fade_duration * 1_000_000)
+    initial = to_duty(pixel_op.initial_brightness)
+    target = to_duty(pixel_op.target_brightness)
+    ramp_end = start + ramp_us
+    hold_end = ramp_end + hold_us
+    end = hold_end + fade_us
+    final = initial if fade_us > 0 else target
+    return (position, start, ramp_end, hold_end, end, initial, target, final,
+            _slope(target - initial, ramp_us), _slope(initial - target, fade_us))
+
+
+def duty_at(params: FixedParams, time_us: int) -> int:
+    """Evaluates compiled parameters at time_us (the manager inlines this)."""
+    _, start, ramp_end, hold_end, end, initial, target, final, ramp_slope, fade_slope = params
+    if time_us >= end:
+        return final
+    if time_us >= hold_end:
+        return target + ((time_us - hold_end) * fade_slope >> SLOPE_BITS)
+    if time_us >= ramp_end:
+        return target
+    if time_us >= start:
+        return initial + ((time_us - start) * ramp_slope >> SLOPE_BITS)
+    return initial
+
+
+def _duty_writer(led) -> Callable[[int], None]:
+    set_duty_cycle = getattr(led, "set_duty_cycle", None)
+    if set_duty_cycle is not None:
+        return set_duty_cycle
+    set_brightness = led.set_brightness
+    return lambda duty: set_brightness(duty / DUTY_MAX)
+
+
+class DutyFrame:
+    """
+    A uint16 duty-cycle buffer over a matrix's LEDs (in coordinate_grid()
+    order), plus the positions written during the current frame.
+    """
+
+    def __init__(self, matrix):
+        coords = tuple(sorted(matrix.leds))
+        self.coords = coords
+        self.positions: Dict[Tuple[int, int], int] = {c: i for i, c in enumerate(coords)}
+        self.duty = array("H", bytes(2 * len(coords)))
+        self.written = bytearray(len(coords))
+        self.touched: List[int] = []
+        self.writers = [_duty_writer(matrix.leds[c]) for c in coords]
+
+    def __len__(self) -> int:
+        return len(self.coords)
+
+    def set(self, position: int, duty: int):
+        self.duty[position] = duty
+        if not self.written[position]:
+            self.written[position] = 1
+            self.touched.append(position)
+
+    def set_brightness(self, coords: Tuple[int, int], brightness: float):
+        position = self.positions.get(coords)
+        if position is None:
+            log.error("No LED found at (%d,%d)", coords[0], coords[1])
+            return
+        self.set(position, to_duty(brightness))
+
+    def set_all(self, brightness):
+        """Writes a full-grid brightness array (e.g. shader output)."""
+        import numpy as np
+
+        duties = np.rint(np.clip(brightness, 0.0, 1.0) * DUTY_MAX).astype(np.uint16)
+        np.frombuffer(self.duty, dtype=np.uint16)[:] = duties
+        if len(self.touched) != len(self.coords):
+            self.touched = list(range(len(self.coords)))
+            self.written[:] = b"\x01" * len(self.coords)
+
+    def brightness_items(self) -> Dict[Tuple[int, int], float]:
+        """The frame written so far as {(row, col): brightness}, for float compositing."""
+        coords, duty = self.coords, self.duty
+        return {coords[i]: duty[i] / DUTY_MAX for i in self.touched}
+
+    def reset(self):
+        written = self.written
+        for position in self.touched:
+            written[position] = 0
+        self.touched = []
@@ -0,0 +1,105 @@
+# src/bongo/operations/frame_clock.py
+import math
+import time
+from typing import Optional, Tuple
+
+
+class FrameClock:
+    """
+    An async frame clock that yields fixed-rate frame deadlines.
+
+    Deadlines are computed from the start time (start + n * period) rather than
+    by sleeping one period after each frame, so per-frame latency does not
+    accumulate as drift. If the caller falls more than a frame behind, the
+    missed deadlines are skipped and counted in `dropped_frames`.
+
+    With a `timebase` (a bongo.sync.time_sync.ClockModel), deadlines are
+    multiples of the period in the timebase's leader time instead, so every
+    node synchronized to the same leader renders the same instants, and the
+    returned frame times are the timebase's render times.
+    """
+
+    def __init__(self, fps: float = 60.0, timebase=None):
+        if fps <= 0:
+            raise ValueError("fps must be positive.")
+        self.period: float = 1.0 / fps
+        self.dropped_frames: int = 0
+        self.timebase = timebase
+        self._next_deadline: Optional[float] = None
+        self._next_index: Optional[int] = None
+
+    def reset(self):
+        """
+        Restarts the clock; the next frame is due immediately (with a
+        timebase, at the next point on the leader's frame grid).
+        """
+        self._next_deadline = None
+        self._next_index = None
+
+    def _advance(self, now: float) -> Tuple[float, float]:
+        """
+        Returns (when to wake, frame time) for the next frame, skipping any
+        deadlines that are already missed.
+        """
+        if self.timebase is not None:
+            return self._advance_on_grid(now)
+        if self._next_deadline is None:
+            self._next_deadline = now
+        elif now - self._next_deadline > self.period:
+            missed = int((now - self._next_deadline) / self.period)
+            self.dropped_frames += missed
+            self._next_deadline += missed * self.period
+        deadline = self._next_deadline
+        self._next_deadline = deadline + self.period
+        return deadline, deadline
+
+    def _advance_on_grid(self, now: float) -> Tuple[float, float]:
+        timebase = self.timebase
+        leader_now = timebase.to_leader(now)
+        if self._next_index is None:
+            self._next_index = math.ceil(leader_now / self.period)
+        elif leader_now - self._next_index * self.period > self.period:
+            missed = int((leader_now - self._next_index * self.period) / self.period)
+            self.dropped_frames += missed
+            self._next_index += missed
+        leader_deadline = self._next_index * self.period
+        self._next_index += 1
+        return timebase.to_local(leader_deadline), timebase.render_time(leader_deadline)
+
+    def time_until_next_frame(self, now: float = None) -> float:
+        """Seconds left before the next deadline (0.0 if it is due or unset)."""
+        if self.timebase is not None:
+            if self._next_index is None:
+                return 0.0
+            deadline = self.timebase.to_local(self._next_index * self.period)
+        elif self._next_deadline is None:
+            return 0.0
+        else:
+            deadline = self._next_deadline
+        now = time.monotonic() if now is None else now
+        return max(0.0, deadline - now)
+
+    def wait_next_frame(self) -> float:
+        """
+        Blocks until the next frame deadline and returns it (monotonic time,
+        or render time with a timebase).
+        """
+        wake_at, frame_time = self._advance(time.monotonic())
+        delay = wake_at - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+        return frame_time
+
+    async def next_frame(self) -> float:
+        """
+        Sleeps until the next frame deadline and returns it (monotonic time,
+        or render time with a timebase).
+        """
+        # Imported here so the blocking runner (and bongo.app) never pays for asyncio.
+        import asyncio
+
+        wake_at, frame_time = self._advance(time.monotonic())
+        delay = wake_at - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return frame_time
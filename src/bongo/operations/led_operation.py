@@ -57,6 +57,26 @@ class LEDPixelOperation:
             initial_brightness: The brightness level from which the ramp-up begins
                                 and to which the fade-down returns.
         """
+        self.reset(target_brightness, ramp_duration, hold_duration, fade_duration,
+                   start_time, initial_brightness)
+
+    def reset(
+            self,
+            target_brightness: float,
+            ramp_duration: float,
+            hold_duration: float,
+            fade_duration: float,
+            start_time: Optional[float] = None,
+            initial_brightness: float = 0.5
+    ) -> "LEDPixelOperation":
+        """
+        Re-initializes this operation in place with new parameters, so a
+        retired operation can be reused (see OperationPool) instead of
+        allocating a new one. Takes the same arguments as __init__.
+
+        Returns:
+            self, for chaining.
+        """
         if not (0.0 <= target_brightness <= 1.0):
             raise ValueError("Target brightness must be between 0.0 and 1.0")
         if not (0.0 <= initial_brightness <= 1.0):
@@ -78,6 +98,7 @@ class LEDPixelOperation:
 
         self.total_duration: float = self.fade_end_time_offset
         self.is_active: bool = True
+        return self
 
     def get_brightness(self, current_time: float) -> float:
         """
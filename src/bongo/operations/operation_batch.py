@@ -0,0 +1,160 @@
+# src/bongo/operations/operation_batch.py
+"""
+Columnar LED operations.
+
+An OperationBatch describes many ramp/hold/fade envelopes at once: one NumPy
+array per LEDPixelOperation field instead of one Python object per LED. The
+columnar pattern generators (e.g. create_chase_batch) build batches with
+vectorized arithmetic, and AnimationManager.add_batch() evaluates them the same
+way, so a 64x64 wave never creates 4096 operation objects.
+
+The envelope maths matches LEDPixelOperation.get_brightness() exactly.
+"""
+from typing import Iterable, List, Sequence, Tuple
+
+import numpy as np
+
+from .led_operation import LEDPixelOperation
+
+_EPSILON = 1e-9
+
+
+class OperationBatch:
+    """A set of single-LED envelopes stored as parallel NumPy arrays."""
+
+    __slots__ = ("rows", "cols", "start_times", "target_brightness", "initial_brightness",
+                 "ramp_durations", "hold_durations", "fade_durations")
+
+    def __init__(self, rows, cols, start_times, target_brightness, ramp_durations,
+                 hold_durations, fade_durations, initial_brightness=0.5):
+        """
+        Args:
+            rows, cols: LED coordinates, one entry per operation.
+            start_times: Monotonic start time of each operation.
+            target_brightness, ramp_durations, hold_durations, fade_durations,
+            initial_brightness: As for LEDPixelOperation. Each may be a scalar,
+                                which is broadcast to every operation.
+        """
+        self.rows = np.asarray(rows, dtype=np.int32)
+        count = self.rows.shape[0]
+
+        def column(values):
+            return np.ascontiguousarray(np.broadcast_to(np.asarray(values, dtype=np.float64), (count,)))
+
+        self.cols = np.asarray(cols, dtype=np.int32)
+        self.start_times = column(start_times)
+        self.target_brightness = column(target_brightness)
+        self.initial_brightness = column(initial_brightness)
+        self.ramp_durations = column(ramp_durations)
+        self.hold_durations = column(hold_durations)
+        self.fade_durations = column(fade_durations)
+
+        if self.cols.shape != self.rows.shape:
+            raise ValueError("rows and cols must have the same length.")
+        for name in ("target_brightness", "initial_brightness"):
+            values = getattr(self, name)
+            if values.size and (values.min() < 0.0 or values.max() > 1.0):
+                raise ValueError(f"{name} must be between 0.0 and 1.0")
+        for name in ("ramp_durations", "hold_durations", "fade_durations"):
+            if getattr(self, name).size and getattr(self, name).min() < 0:
+                raise ValueError("Durations (ramp, hold, fade) cannot be negative.")
+
+    # --- Construction ------------------------------------------------------
+    @classmethod
+    def from_coords(cls, led_coords: Sequence[Tuple[int, int]], start_times, target_brightness,
+                    ramp_durations, hold_durations, fade_durations,
+                    initial_brightness=0.5) -> "OperationBatch":
+        """Builds a batch from a list of (row, col) tuples."""
+        coords = np.asarray(led_coords, dtype=np.int32).reshape(-1, 2)
+        return cls(coords[:, 0], coords[:, 1], start_times, target_brightness, ramp_durations,
+                   hold_durations, fade_durations, initial_brightness)
+
+    @classmethod
+    def from_operations(cls, pattern_operations: Iterable[Tuple[Tuple[int, int], LEDPixelOperation]]
+                        ) -> "OperationBatch":
+        """Converts a list of ((row, col), LEDPixelOperation) tuples into a batch."""
+        ops = list(pattern_operations)
+        return cls.from_coords(
+            [coords for coords, _ in ops],
+            [op.start_time for _, op in ops],
+            [op.target_brightness for _, op in ops],
+            [op.ramp_duration for _, op in ops],
+            [op.hold_duration for _, op in ops],
+            [op.fade_duration for _, op in ops],
+            [op.initial_brightness for _, op in ops],
+        )
+
+    @classmethod
+    def concatenate(cls, batches: Sequence["OperationBatch"]) -> "OperationBatch":
+        """Joins several batches into one, keeping their order."""
+        return cls(*(np.concatenate([getattr(b, name) for b in batches]) for name in (
+            "rows", "cols", "start_times", "target_brightness", "ramp_durations",
+            "hold_durations", "fade_durations", "initial_brightness")))
+
+    def take(self, indices) -> "OperationBatch":
+        """Returns a new batch with the operations at `indices` (an index array or mask)."""
+        return OperationBatch(self.rows[indices], self.cols[indices], self.start_times[indices],
+                              self.target_brightness[indices], self.ramp_durations[indices],
+                              self.hold_durations[indices], self.fade_durations[indices],
+                              self.initial_brightness[indices])
+
+    def to_operations(self) -> List[Tuple[Tuple[int, int], LEDPixelOperation]]:
+        """Expands the batch into ((row, col), LEDPixelOperation) tuples."""
+        return [((row, col), LEDPixelOperation(target, ramp, hold, fade, start, initial))
+                for row, col, start, target, ramp, hold, fade, initial in zip(
+                    self.rows.tolist(), self.cols.tolist(), self.start_times.tolist(),
+                    self.target_brightness.tolist(), self.ramp_durations.tolist(),
+                    self.hold_durations.tolist(), self.fade_durations.tolist(),
+                    self.initial_brightness.tolist())]
+
+    # --- Evaluation --------------------------------------------------------
+    def __len__(self) -> int:
+        return self.rows.shape[0]
+
+    @property
+    def total_durations(self) -> np.ndarray:
+        return self.ramp_durations + self.hold_durations + self.fade_durations
+
+    @property
+    def end_times(self) -> np.ndarray:
+        return self.start_times + self.total_durations
+
+    def brightness_at(self, time_now: float, indices=slice(None)) -> np.ndarray:
+        """
+        Evaluates the envelopes at `indices` (all by default) at time_now,
+        mirroring LEDPixelOperation.get_brightness().
+        """
+        start = self.start_times[indices]
+        target = self.target_brightness[indices]
+        initial = self.initial_brightness[indices]
+        ramp = self.ramp_durations[indices]
+        hold = self.hold_durations[indices]
+        fade = self.fade_durations[indices]
+
+        elapsed = time_now - start
+        hold_end = ramp + hold
+        fade_end = hold_end + fade
+        delta = target - initial
+        with np.errstate(divide="ignore", invalid="ignore"):
+            ramp_progress = np.clip(np.where(ramp > 0, elapsed / ramp, 1.0), 0.0, 1.0)
+            fade_progress = np.clip(np.where(fade > 0, (elapsed - hold_end) / fade, 0.0), 0.0, 1.0)
+
+        brightness = np.select(
+            [elapsed < -_EPSILON,
+             elapsed >= fade_end - _EPSILON,
+             elapsed >= hold_end - _EPSILON,
+             elapsed >= ramp - _EPSILON],
+            [initial,
+             np.where(fade > 0, initial, target),
+             target - delta * fade_progress,
+             target],
+            default=initial + delta * ramp_progress,
+        )
+        return np.clip(brightness, 0.0, 1.0)
+
+    def completed_at(self, time_now: float, indices=slice(None)) -> np.ndarray:
+        """Boolean mask of the envelopes at `indices` that have finished by time_now."""
+        return time_now >= self.end_times[indices] - _EPSILON
+
+    def __repr__(self) -> str:
+        return f"OperationBatch({len(self)} operations)"
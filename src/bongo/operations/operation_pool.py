@@ -0,0 +1,72 @@
+# src/bongo/operations/operation_pool.py
+"""
+A free list of LEDPixelOperation objects.
+
+Looping shows regenerate the same patterns over and over, and every cycle used
+to allocate a fresh LEDPixelOperation per LED. With a pool, the generators in
+bongo.patterns.builtin_patterns take operations from the pool (pool=...) and an
+AnimationManager created with the same pool hands each operation back once it
+has completed, so a steady-state loop reuses the previous cycle's objects.
+
+Ownership: once an operation from (or handed to) a pooled AnimationManager has
+completed or been cleared, the manager releases it and it may be reset for a
+new pattern at any time. Callers must not keep references to such operations.
+"""
+from collections import deque
+
+from .led_operation import LEDPixelOperation
+
+
+class OperationPool:
+    """Recycles retired LEDPixelOperation objects."""
+
+    def __init__(self, max_size: int = 65536):
+        """
+        Args:
+            max_size: Maximum number of idle operations kept. Operations
+                      released while the pool is full are left to the GC.
+        """
+        self.max_size = max_size
+        # acquire() may run on a pattern-building thread while the render
+        # thread releases; deque append/pop are atomic, so no lock is needed.
+        self._free = deque()
+        # Allocation counters.
+        self.created: int = 0   # new LEDPixelOperation objects allocated
+        self.reused: int = 0    # acquisitions served from the free list
+        self.released: int = 0  # operations returned to the free list
+        self.dropped: int = 0   # operations released while the pool was full
+
+    def acquire(self, target_brightness: float, ramp_duration: float, hold_duration: float,
+                fade_duration: float, start_time: float = None,
+                initial_brightness: float = 0.5) -> LEDPixelOperation:
+        """
+        Returns an operation initialized with the given parameters (the same
+        arguments as LEDPixelOperation), reusing a released one if available.
+        """
+        try:
+            op = self._free.pop()
+        except IndexError:
+            self.created += 1
+            return LEDPixelOperation(target_brightness, ramp_duration, hold_duration,
+                                     fade_duration, start_time, initial_brightness)
+        self.reused += 1
+        return op.reset(target_brightness, ramp_duration, hold_duration,
+                        fade_duration, start_time, initial_brightness)
+
+    def release(self, op: LEDPixelOperation):
+        """Returns a finished operation to the pool."""
+        if type(op) is not LEDPixelOperation:
+            return  # e.g. an EnvelopeOperation; only plain operations are pooled
+        if len(self._free) >= self.max_size:
+            self.dropped += 1
+            return
+        self.released += 1
+        self._free.append(op)
+
+    def __len__(self) -> int:
+        """Number of idle operations available for reuse."""
+        return len(self._free)
+
+    def stats(self) -> dict:
+        return {"created": self.created, "reused": self.reused, "released": self.released,
+                "dropped": self.dropped, "free": len(self._free)}
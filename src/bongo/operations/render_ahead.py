@@ -0,0 +1,282 @@
+# src/bongo/operations/render_ahead.py
+"""
+Render-ahead playback: frames are computed before they are due.
+
+AnimationRunner computes each frame just in time, so one slow tick (a GC
+pause, a large pattern load) is a visible stutter. RenderAheadRunner splits
+the loop in two:
+
+- a producer thread renders frames for future timestamps (up to
+  frames_ahead frames ahead of the output) into a fixed FrameRing, using
+  AnimationManager.render_frame();
+- the output loop (on the thread that calls run()) plays each frame at its
+  exact deadline with AnimationManager.play_frame().
+
+A stall on the producer shorter than the buffered frames is absorbed by the
+ring. When anything changes while frames are buffered (a submission, a
+cancellation, a call_soon() callback; see
+AnimationManager.take_invalidation()), the buffered frames from the earliest
+affected timestamp on are discarded and rendered again, so interactive input
+and "stop" still show up on the next frame played. The manager only retires
+operations, and finishes their pattern handles, once the frame they
+complete in has been played (AnimationManager.retire_shown()), so frames can
+always be rendered again.
+"""
+import logging
+import math
+import threading
+import time
+from typing import List, Optional, Tuple
+
+from .animation_manager import AnimationManager
+from .runner import IdleTracker
+
+log = logging.getLogger("bongo.render_ahead")
+
+
+class FrameRing:
+    """
+    A fixed-capacity ring of (timestamp, frame) slots, filled by the producer
+    and drained by the output loop. Guard every call with `condition`.
+    """
+
+    def __init__(self, capacity: int):
+        if capacity < 1:
+            raise ValueError("A frame ring needs at least one slot.")
+        self.capacity = capacity
+        self.condition = threading.Condition()
+        self._slots: List[Optional[Tuple[float, dict]]] = [None] * capacity
+        self._head = 0
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def full(self) -> bool:
+        return self._count == self.capacity
+
+    def push(self, timestamp: float, frame):
+        if self.full:
+            raise IndexError("Frame ring is full.")
+        self._slots[(self._head + self._count) % self.capacity] = (timestamp, frame)
+        self._count += 1
+
+    def peek(self) -> Optional[Tuple[float, dict]]:
+        return self._slots[self._head] if self._count else None
+
+    def pop(self) -> Tuple[float, dict]:
+        if not self._count:
+            raise IndexError("Frame ring is empty.")
+        entry = self._slots[self._head]
+        self._slots[self._head] = None
+        self._head = (self._head + 1) % self.capacity
+        self._count -= 1
+        return entry
+
+    def pending(self) -> List[Tuple[float, dict]]:
+        """The buffered frames, oldest first."""
+        return [self._slots[(self._head + i) % self.capacity] for i in range(self._count)]
+
+    def discard_from(self, timestamp: float) -> Optional[float]:
+        """
+        Drops the frames at or after timestamp (from the newest end).
+
+        Returns:
+            The earliest dropped frame's timestamp, or None if none was.
+        """
+        dropped = None
+        while self._count:
+            index = (self._head + self._count - 1) % self.capacity
+            if self._slots[index][0] < timestamp:
+                break
+            dropped = self._slots[index][0]
+            self._slots[index] = None
+            self._count -= 1
+        return dropped
+
+    def last(self) -> Optional[Tuple[float, dict]]:
+        """The newest buffered frame."""
+        return self._slots[(self._head + self._count - 1) % self.capacity] if self._count else None
+
+    def clear(self):
+        while self._count:
+            self.pop()
+
+
+class RenderAheadRunner:
+    """Plays an AnimationManager's frames from a render-ahead ring buffer."""
+
+    def __init__(self, animation_manager: AnimationManager, fps: float = 60.0, frames_ahead: int = 4,
+                 status_interval: Optional[float] = 10.0, gc_controller=None):
+        """
+        Args:
+            animation_manager: The manager to render. Only the producer thread
+                               calls into it (other threads keep using the
+                               thread-safe submission API).
+            fps: The output frame rate.
+            frames_ahead: Ring capacity: how many frames may be rendered
+                          ahead of the output (and the longest stall, in
+                          frames, that stays invisible).
+            status_interval: Seconds between status log lines (None disables them).
+            gc_controller: Optional GCController; collections run on the
+                           output thread in the gaps before frame deadlines.
+        """
+        if fps <= 0:
+            raise ValueError("fps must be positive.")
+        self.animation_manager = animation_manager
+        self.period = 1.0 / fps
+        self.ring = FrameRing(frames_ahead)
+        self.idle = IdleTracker()
+        self.frame_count: int = 0
+        self.late_frames: int = 0
+        self.status_interval = status_interval
+        self.gc_controller = gc_controller
+        self._produce = threading.Event()
+        self._stopping = threading.Event()
+        # Timestamp of the last frame taken from the ring (played or skipped).
+        self._shown_until: Optional[float] = None
+
+    @property
+    def idle_percentage(self) -> float:
+        return self.idle.idle_percentage()
+
+    def stop(self):
+        """Asks run() to return. Safe to call from any thread or signal handler."""
+        self._stopping.set()
+        self._produce.set()
+        with self.ring.condition:
+            self.ring.condition.notify_all()
+
+    def run(self, max_frames: Optional[int] = None):
+        """Plays frames until stop() is called (or max_frames have been played)."""
+        manager = self.animation_manager
+        manager.add_wakeup_listener(self._produce.set)
+        self._stopping.clear()
+        self.ring.clear()
+        self._shown_until = None
+        self.idle.start()
+        producer = threading.Thread(target=self._produce_frames, name="bongo-render-ahead", daemon=True)
+        producer.start()
+        next_status = time.monotonic() + self.status_interval if self.status_interval else None
+        log.info(f"Render-ahead runner started at {1.0 / self.period:.0f} FPS, "
+                 f"{self.ring.capacity} frames ahead.")
+        try:
+            while not self._stopping.is_set():
+                entry = self._next_due_frame()
+                if entry is None:
+                    continue
+                timestamp, frame = entry
+                manager.play_frame(frame)
+                self.frame_count += 1
+                self._collect_garbage()
+
+                if next_status is not None and timestamp >= next_status:
+                    next_status = timestamp + self.status_interval
+                    self.log_status()
+                if max_frames is not None and self.frame_count >= max_frames:
+                    break
+        finally:
+            self.stop()
+            producer.join()
+            manager.remove_wakeup_listener(self._produce.set)
+
+    def _next_due_frame(self) -> Optional[Tuple[float, dict]]:
+        """Waits for the oldest buffered frame's deadline and takes it from the ring."""
+        ring = self.ring
+        with ring.condition:
+            while not len(ring) and not self._stopping.is_set():
+                ring.condition.wait()
+            entry = ring.peek()
+        if entry is None:
+            return None
+        # Sleep outside the lock: buffered frames can still be rendered again meanwhile.
+        delay = entry[0] - time.monotonic()
+        if delay > 0 and self._stopping.wait(delay):
+            return None
+        with ring.condition:
+            if ring.peek() is not entry:
+                return None  # rendered again while we slept; wait for the new frame
+            ring.pop()
+            self._shown_until = entry[0]
+        self._produce.set()
+        if time.monotonic() - entry[0] > self.period:
+            # The output itself fell behind; skip to the frames still on time.
+            self.late_frames += 1
+            metrics = self.animation_manager.metrics
+            if metrics is not None:
+                metrics.frame_overruns.inc()
+            return None
+        return entry
+
+    def _collect_garbage(self):
+        gc_controller = self.gc_controller
+        if gc_controller is None or not gc_controller.enabled:
+            return
+        with self.ring.condition:
+            upcoming = self.ring.peek()
+        gap = self.period if upcoming is None else upcoming[0] - time.monotonic()
+        gc_controller.collect_in_gap(gap)
+
+    def _produce_frames(self):
+        manager = self.animation_manager
+        ring = self.ring
+        period = self.period
+        next_time = time.monotonic()
+        previous = -math.inf
+        try:
+            while not self._stopping.is_set():
+                self._produce.clear()
+                manager.admit_submissions()
+                changed_from = manager.take_invalidation()
+                with ring.condition:
+                    if changed_from is not None:
+                        dropped = ring.discard_from(changed_from)
+                        if dropped is not None:
+                            next_time = dropped
+                            last = ring.last()
+                            if last is not None:
+                                previous = last[0]
+                            elif self._shown_until is not None:
+                                previous = self._shown_until
+                            else:
+                                previous = -math.inf
+                    shown_until = self._shown_until
+                    full = ring.full
+                if shown_until is not None:
+                    manager.retire_shown(shown_until)
+                if full:
+                    self._produce.wait(period)
+                    continue
+
+                now = time.monotonic()
+                if next_time < now - period:
+                    next_time = now  # fell behind (or was idle): restart the timeline
+                delay = manager.seconds_until_work(next_time)
+                if delay is None or delay > period:
+                    self._sleep_until_work(None if delay is None else next_time + delay - now)
+                    continue
+
+                frame = manager.render_frame(next_time, previous)
+                with ring.condition:
+                    ring.push(next_time, frame)
+                    ring.condition.notify()
+                previous = next_time
+                next_time += period
+        except Exception:
+            log.critical("Render-ahead producer failed.", exc_info=True)
+            self.stop()
+
+    def _sleep_until_work(self, delay: Optional[float]):
+        started = time.monotonic()
+        self._produce.wait(delay)
+        self.idle.record_idle(time.monotonic() - started)
+        metrics = self.animation_manager.metrics
+        if metrics is not None:
+            metrics.idle_percentage.set(self.idle.idle_percentage())
+
+    def log_status(self):
+        manager = self.animation_manager
+        log.info(f"Frame {self.frame_count}: {len(manager.operations)} active, "
+                 f"{manager.scheduled_count} scheduled operations, {len(self.ring)} frames buffered, "
+                 f"{self.late_frames} late, idle {self.idle_percentage:.1f}%")
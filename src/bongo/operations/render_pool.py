@@ -0,0 +1,262 @@
+# src/bongo/operations/render_pool.py
+"""
+Multi-process shader rendering.
+
+NumPy shaders (bongo.patterns.shaders) run on the render loop's core, which
+caps how much procedural content fits in a 60 FPS frame. A ShaderRenderPool
+splits the matrix's coordinate grid into shards, one per worker process (by
+PCA9685 board when the matrix knows its boards, otherwise in bands of rows),
+and evaluates the active shaders in all shards in parallel:
+
+- the workers write straight into a multiprocessing.shared_memory buffer of
+  float64 brightness values, one row ("slot") for the base layer and one for
+  each named layer that has shaders;
+- each frame, the main process sends every worker the shader times over its
+  pipe and waits for all of them to answer, so a frame is never read while a
+  worker is still writing it (and no worker runs ahead);
+- the main process only composites the result and flushes to the hardware.
+
+Pass the pool to AnimationManager(render_pool=...); close() it when done.
+Shaders are sent to the workers by pickling them when the set of active
+shaders changes, so their functions must be importable (the built-in library
+and expression shaders are); a frame with an unpicklable shader is rendered
+in the main process instead.
+"""
+import logging
+import multiprocessing
+import pickle
+import signal
+import traceback
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from bongo.matrix.matrix import CoordinateGrid
+
+log = logging.getLogger("bongo.render_pool")
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    """Attaches to the pool's buffer without taking over its cleanup (the pool unlinks it)."""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        # Python < 3.13 registers the name again, with the resource tracker
+        # the workers share with the pool; its unlink() unregisters it.
+        return shared_memory.SharedMemory(name=name)
+
+
+def _worker_main(conn, shm_name: str, slots: int, size: int, grid: CoordinateGrid):
+    """Worker process loop: evaluates the active shaders over one shard per frame."""
+    signal.signal(signal.SIGINT, signal.SIG_IGN)  # the main process handles Ctrl+C
+    shm = _attach(shm_name)
+    out = np.ndarray((slots, size), dtype=np.float64, buffer=shm.buf)
+    index = grid.index
+    shaders: List[Tuple[int, object]] = []
+    try:
+        while True:
+            message = conn.recv()
+            if message is None:
+                break
+            update, times = message
+            if update is not None:
+                shaders = update
+            try:
+                results = {}
+                for (slot, shader), t in zip(shaders, times):
+                    results[slot] = shader.composite(results.get(slot), shader.evaluate(grid, t))
+                for slot, values in results.items():
+                    out[slot, index] = values
+                conn.send(None)
+            except Exception:
+                conn.send(traceback.format_exc())
+    finally:
+        del out
+        shm.close()
+
+
+def _shard_grid(grid: CoordinateGrid, index: np.ndarray) -> CoordinateGrid:
+    coords = tuple(grid.coords[i] for i in index)
+    return CoordinateGrid(coords=coords, rows=grid.rows[index], cols=grid.cols[index],
+                          x=grid.x[index], y=grid.y[index], nx=grid.nx[index], ny=grid.ny[index],
+                          index=grid.index[index], positions={c: i for i, c in enumerate(coords)})
+
+
+def shard_indices(matrix, grid: CoordinateGrid, workers: int) -> List[np.ndarray]:
+    """
+    Splits the grid's entries into at most `workers` shards: whole PCA9685
+    boards, balanced by LED count, if the matrix has at least as many boards
+    as workers; otherwise contiguous bands (in row order).
+    """
+    boards: Dict[Optional[int], List[int]] = {}
+    led_boards = getattr(matrix, "led_boards", None) or {}
+    for i, coords in enumerate(grid.coords):
+        boards.setdefault(led_boards.get(coords), []).append(i)
+    if None not in boards and len(boards) >= workers:
+        shards = [[] for _ in range(workers)]
+        for members in sorted(boards.values(), key=len, reverse=True):
+            min(shards, key=len).extend(members)
+        return [np.array(sorted(shard), dtype=np.intp) for shard in shards if shard]
+    return [shard for shard in np.array_split(np.arange(len(grid), dtype=np.intp), workers) if len(shard)]
+
+
+def _same_shaders(a: List[Tuple[int, object]], b: List[Tuple[int, object]]) -> bool:
+    """Whether two (slot, shader) lists hold the same shader objects in the same slots."""
+    return len(a) == len(b) and all(x[0] == y[0] and x[1] is y[1] for x, y in zip(a, b))
+
+
+class ShaderRenderPool:
+    """Evaluates shaders over a matrix's coordinate grid in worker processes."""
+
+    def __init__(self, matrix, workers: Optional[int] = None, max_layers: int = 3,
+                 start_method: Optional[str] = None):
+        """
+        Args:
+            matrix: The LEDMatrix whose coordinate grid is rendered. Its LEDs
+                    must all exist when the pool is created.
+            workers: Number of worker processes (default: one per CPU core,
+                     leaving one for the render loop).
+            max_layers: Named layers with shaders that can be rendered in the
+                        workers; a frame with more is rendered in the main process.
+            start_method: multiprocessing start method ('fork', 'spawn', ...);
+                          the platform default if None.
+        """
+        if workers is None:
+            workers = max(1, (multiprocessing.cpu_count() or 2) - 1)
+        if workers < 1:
+            raise ValueError("A render pool needs at least one worker.")
+        self.grid = matrix.coordinate_grid()
+        self.slots = 1 + max_layers
+        size = len(self.grid)
+        self._shm = shared_memory.SharedMemory(create=True, size=max(8 * self.slots * size, 8))
+        self._out = np.ndarray((self.slots, size), dtype=np.float64, buffer=self._shm.buf)
+        self._sent: List[Tuple[int, object]] = []
+        self._unsendable: Optional[List[Tuple[int, object]]] = None
+        self._closed = False
+        self._warned = False
+        context = multiprocessing.get_context(start_method)
+        self._workers = []
+        self._conns = []
+        try:
+            for index in shard_indices(matrix, self.grid, workers):
+                parent_conn, child_conn = context.Pipe()
+                process = context.Process(
+                    target=_worker_main, name="bongo-render-worker", daemon=True,
+                    args=(child_conn, self._shm.name, self.slots, size, _shard_grid(self.grid, index)))
+                process.start()
+                child_conn.close()
+                self._workers.append(process)
+                self._conns.append(parent_conn)
+        except BaseException:
+            self.close()
+            raise
+        log.info(f"Render pool started: {len(self._workers)} workers over {size} LEDs.")
+
+    @property
+    def workers(self) -> int:
+        return len(self._workers)
+
+    def evaluate(self, active: Sequence[Tuple[Optional[object], object, float]]):
+        """
+        Evaluates one frame of shaders.
+
+        Args:
+            active: (layer, shader, t) for every active shader, in compositing
+                    order; layer is None for the base layer and t is the
+                    shader's own elapsed time.
+
+        Returns:
+            (background, layer_shaders), as AnimationManager._evaluate_shaders():
+            the base layer's blended output in coordinate_grid() order (None if
+            it has no shaders) and {layer: array} for the named layers.
+        """
+        if self._closed:
+            raise RuntimeError("Render pool is closed.")
+        slot_of = {None: 0}
+        for layer, _, _ in active:
+            if layer not in slot_of:
+                slot_of[layer] = len(slot_of)
+        update = self._update([(slot_of[layer], shader) for layer, shader, _ in active], len(slot_of))
+        if update is False:
+            return self._evaluate_locally(active)
+
+        times = [t for _, _, t in active]
+        for conn in self._conns:
+            conn.send((update, times))
+        errors = [reply for reply in (conn.recv() for conn in self._conns) if reply is not None]
+        if errors:
+            raise RuntimeError(f"Shader evaluation failed in a render worker:\n{errors[0]}")
+
+        out = self._out
+        used = set(slot_of[layer] for layer, _, _ in active)
+        background = out[0].copy() if 0 in used else None
+        layer_shaders = {layer: out[slot].copy() for layer, slot in slot_of.items()
+                         if layer is not None and slot in used}
+        return background, layer_shaders
+
+    def _update(self, shaders: List[Tuple[int, object]], slots: int):
+        """
+        Returns the shader list to send if it changed since the last frame,
+        None if it didn't, or False if this frame can't run in the workers.
+        """
+        if _same_shaders(self._sent, shaders):
+            return None
+        # A list that couldn't be sent is remembered like a sent one, so it
+        # isn't bound and pickled again every frame.
+        if self._unsendable is not None and _same_shaders(self._unsendable, shaders):
+            return False
+        if slots > self.slots:
+            return self._cannot_send(shaders, f"{slots - 1} layers have shaders (max_layers is {self.slots - 1})")
+        bound = [(slot, shader.bind(self.grid)) for slot, shader in shaders]
+        try:
+            pickle.dumps(bound)
+        except Exception as e:
+            return self._cannot_send(shaders, f"a shader can't be sent to the workers ({e})")
+        self._sent = shaders
+        self._unsendable = None
+        return bound
+
+    def _cannot_send(self, shaders: List[Tuple[int, object]], reason: str):
+        self._unsendable = shaders
+        if not self._warned:
+            log.warning("Rendering shaders in the main process: %s.", reason)
+            self._warned = True
+        return False
+
+    def _evaluate_locally(self, active):
+        background = None
+        layer_shaders = {}
+        for layer, shader, t in active:
+            values = shader.evaluate(self.grid, t)
+            if layer is None:
+                background = shader.composite(background, values)
+            else:
+                layer_shaders[layer] = shader.composite(layer_shaders.get(layer), values)
+        return background, layer_shaders
+
+    def close(self):
+        """Stops the workers and releases the shared buffer."""
+        if self._closed:
+            return
+        self._closed = True
+        for conn in self._conns:
+            try:
+                conn.send(None)
+            except (BrokenPipeError, OSError):
+                pass
+        for process in self._workers:
+            process.join(timeout=2.0)
+            if process.is_alive():
+                process.terminate()
+        for conn in self._conns:
+            conn.close()
+        del self._out
+        self._shm.close()
+        self._shm.unlink()
+
+    def __enter__(self) -> "ShaderRenderPool":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,162 @@
+# src/bongo/operations/runner.py
+"""
+The blocking render loop used by bongo.app.
+
+AnimationRunner ticks an AnimationManager at a fixed frame rate while there is
+work to do. When nothing is active it goes idle: it sleeps until the next
+scheduled start_time, or indefinitely if nothing is scheduled, and wakes up
+immediately when new work is submitted through AnimationManager.submit() or
+add_operations().
+"""
+import logging
+import threading
+import time
+from typing import Optional
+
+from .animation_manager import AnimationManager
+from .frame_clock import FrameClock
+from ..utils import tracing
+
+log = logging.getLogger("bongo.runner")
+
+
+class IdleTracker:
+    """Accumulates how much wall-clock time a runner has spent idle."""
+
+    def __init__(self):
+        self.idle_seconds: float = 0.0
+        self._started_at: Optional[float] = None
+
+    def start(self, now: float = None):
+        self._started_at = time.monotonic() if now is None else now
+        self.idle_seconds = 0.0
+
+    def record_idle(self, seconds: float):
+        self.idle_seconds += seconds
+
+    def idle_percentage(self, now: float = None) -> float:
+        """Share of the time since start() spent idle, from 0.0 to 100.0."""
+        if self._started_at is None:
+            return 0.0
+        elapsed = (time.monotonic() if now is None else now) - self._started_at
+        if elapsed <= 0:
+            return 0.0
+        return min(100.0, 100.0 * self.idle_seconds / elapsed)
+
+
+def collect_between_frames(gc_controller, clock: FrameClock):
+    """Lets a GCController use what is left of the current frame period."""
+    if gc_controller is not None and gc_controller.enabled:
+        gc_controller.collect_in_gap(clock.time_until_next_frame())
+
+
+def record_frame_stats(manager: AnimationManager, idle: IdleTracker, clock: FrameClock, frame_time: float):
+    """Records overruns and the idle share after a frame, if metrics or tracing are on."""
+    metrics = manager.metrics
+    tracer = tracing.get_tracer()
+    if metrics is None and tracer is None:
+        return
+    now = time.monotonic()
+    overrun = now - frame_time > clock.period
+    if metrics is not None:
+        if overrun:
+            metrics.frame_overruns.inc()
+        metrics.idle_percentage.set(idle.idle_percentage(now))
+    if overrun and tracer is not None:
+        tracer.note_overrun(frame_time, now - frame_time)
+
+
+class AnimationRunner:
+    """Runs an AnimationManager's frames on the calling thread."""
+
+    def __init__(self, animation_manager: AnimationManager, fps: float = 60.0,
+                 status_interval: Optional[float] = 10.0, gc_controller=None, timebase=None):
+        """
+        Args:
+            animation_manager: The manager to tick.
+            fps: The target frame rate while operations are active.
+            status_interval: Seconds between status log lines (None disables them).
+            gc_controller: Optional GCController; when enabled, garbage is
+                           collected only in the gaps between frames and while idle.
+            timebase: Optional ClockModel from bongo.sync.time_sync; frames are
+                      then rendered in lockstep with the other synchronized nodes.
+        """
+        self.animation_manager = animation_manager
+        self.clock = FrameClock(fps, timebase)
+        self.idle = IdleTracker()
+        self.frame_count: int = 0
+        self.status_interval = status_interval
+        self.gc_controller = gc_controller
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+
+    @property
+    def idle_percentage(self) -> float:
+        return self.idle.idle_percentage()
+
+    def stop(self):
+        """Asks run() to return. Safe to call from any thread or signal handler."""
+        self._stopping.set()
+        self._wakeup.set()
+
+    def _wait_until_work(self) -> bool:
+        """
+        Sleeps while the manager has nothing to do. Returns True if it slept.
+        """
+        manager = self.animation_manager
+        # Clear first: a submission landing after this point sets the event
+        # again, so the wait below can never miss it.
+        self._wakeup.clear()
+        delay = manager.seconds_until_work()
+        if delay is not None and delay <= self.clock.period:
+            return False
+
+        started = time.monotonic()
+        if self.gc_controller is not None and self.gc_controller.enabled:
+            self.gc_controller.collect_in_gap(float("inf") if delay is None else delay)
+            if delay is not None:
+                delay = max(0.0, delay - (time.monotonic() - started))
+        self._wakeup.wait(delay)
+        self.idle.record_idle(time.monotonic() - started)
+        if manager.metrics is not None:
+            manager.metrics.idle_percentage.set(self.idle.idle_percentage())
+        # Start a fresh frame sequence instead of "catching up" on the frames
+        # that fell inside the idle period.
+        self.clock.reset()
+        return True
+
+    def run(self, max_frames: Optional[int] = None):
+        """
+        Drives frames until stop() is called (or max_frames have been rendered).
+        """
+        manager = self.animation_manager
+        manager.add_wakeup_listener(self._wakeup.set)
+        self._stopping.clear()
+        self.clock.reset()
+        self.idle.start()
+        next_status = time.monotonic() + self.status_interval if self.status_interval else None
+        log.info(f"Animation runner started at {1.0 / self.clock.period:.0f} FPS.")
+        try:
+            while not self._stopping.is_set():
+                if self._wait_until_work():
+                    continue
+
+                frame_time = self.clock.wait_next_frame()
+                manager.tick(frame_time)
+                self.frame_count += 1
+                record_frame_stats(manager, self.idle, self.clock, frame_time)
+                collect_between_frames(self.gc_controller, self.clock)
+
+                if next_status is not None and frame_time >= next_status:
+                    next_status = frame_time + self.status_interval
+                    self.log_status()
+                if max_frames is not None and self.frame_count >= max_frames:
+                    break
+        finally:
+            manager.remove_wakeup_listener(self._wakeup.set)
+
+    def log_status(self):
+        manager = self.animation_manager
+        log.info(f"Frame {self.frame_count}: {len(manager.operations)} active, "
+                 f"{manager.scheduled_count} scheduled operations, "
+                 f"idle {self.idle_percentage:.1f}%")
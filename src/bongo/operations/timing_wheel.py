@@ -0,0 +1,252 @@
+# src/bongo/operations/timing_wheel.py
+"""
+A hierarchical timing wheel for very large future schedules.
+
+The AnimationManager's default schedule is a heap: O(log n) per insert and
+promotion, and every scheduled operation lives in memory. An all-day
+installation that preloads hours of effects has millions of them. A
+TimingWheel (AnimationManager(timing_wheel=...)) replaces the heap:
+
+- Time is divided into frames of tick_seconds. Level 0 has one bucket per
+  frame; each higher level has buckets spanning a whole turn of the level
+  below (with the default 256/64/64 slots at 60 fps: 4.3 s, 4.6 min and
+  4.9 h). Inserting appends to one bucket, O(1).
+- As time advances, a higher-level bucket is redistributed ("cascaded") into
+  the level below when its turn comes, so every entry moves at most once per
+  level: promotion is amortized O(1). Runs of empty frames are skipped
+  without being visited.
+- Entries further out than the top level wait in a small overflow heap.
+- Schedule sources (add_source) are iterables in start-time order, such as a
+  generator reading a show file. They are pulled lazily, only as far as
+  load_ahead seconds in front of the current time, so a day-long schedule is
+  never materialized at once.
+
+Entries are released no earlier than their start time and, within a frame,
+in (start_time, sequence) order, exactly as the heap releases them.
+"""
+import heapq
+import time
+from itertools import count
+from typing import Any, Iterable, List, Optional, Sequence, Tuple
+
+# Slots per level: frames per level-0 turn, then turns per level-1 slot, ...
+DEFAULT_SLOTS = (256, 64, 64)
+
+
+class TimingWheel:
+    """Schedules items by start time in frame-granular hierarchical buckets."""
+
+    def __init__(self, tick_seconds: float = 1 / 60, slots: Sequence[int] = DEFAULT_SLOTS,
+                 origin: Optional[float] = None, load_ahead: Optional[float] = None):
+        """
+        Args:
+            tick_seconds: Frame length; the granularity of the level-0 buckets.
+            slots: Number of buckets per level, lowest level first.
+            origin: Monotonic time of frame 0 (default: now).
+            load_ahead: How far ahead of the current time (in seconds) sources
+                        are pulled. Defaults to the span of the two lowest
+                        levels (about 4.6 minutes at the defaults).
+        """
+        if tick_seconds <= 0:
+            raise ValueError("tick_seconds must be positive.")
+        if not slots or any(n < 2 for n in slots):
+            raise ValueError("Every level needs at least two slots.")
+        self.tick_seconds = tick_seconds
+        self.origin = time.monotonic() if origin is None else origin
+        self._slots = tuple(slots)
+        # _spans[level] = frames covered by one bucket of that level;
+        # _spans[-1] = frames covered by the whole wheel.
+        spans = [1]
+        for n in self._slots:
+            spans.append(spans[-1] * n)
+        self._spans = spans
+        self.load_ahead = (spans[min(2, len(self._slots))] * tick_seconds
+                           if load_ahead is None else load_ahead)
+        self._levels: List[List[list]] = [[[] for _ in range(n)] for n in self._slots]
+        self._counts = [0] * len(self._slots)
+        self._overflow: List[Tuple[int, float, int, Any]] = []
+        # Released from their bucket but not yet at their exact start time.
+        self._due: List[Tuple[float, int, Any]] = []
+        # The last frame whose bucket has been released.
+        self._frame = 0
+        # Lazily pulled sources: heap of (next start, order, entry, iterator).
+        self._sources: List[Tuple[float, int, Tuple[float, Any], Any]] = []
+        self._source_order = count()
+        self._sequence = count()
+
+    def __len__(self) -> int:
+        """Number of entries held (not counting entries still in their sources)."""
+        return sum(self._counts) + len(self._overflow) + len(self._due)
+
+    @property
+    def has_sources(self) -> bool:
+        return bool(self._sources)
+
+    def frame_of(self, start_time: float) -> int:
+        return int((start_time - self.origin) // self.tick_seconds)
+
+    def insert(self, start_time: float, item: Any, sequence: Optional[int] = None):
+        """Schedules item to be released once time reaches start_time."""
+        if sequence is None:
+            sequence = next(self._sequence)
+        self._place(self.frame_of(start_time), (start_time, sequence, item))
+
+    def _place(self, frame: int, entry: Tuple[float, int, Any]):
+        now = self._frame
+        if frame <= now:
+            self._due.append(entry)
+            return
+        spans = self._spans
+        for level, n in enumerate(self._slots):
+            # The lowest level at which frame and now share every higher digit.
+            if frame // spans[level + 1] == now // spans[level + 1]:
+                self._levels[level][(frame // spans[level]) % n].append((frame, entry))
+                self._counts[level] += 1
+                return
+        heapq.heappush(self._overflow, (frame, entry[0], entry[1], entry[2]))
+
+    def add_source(self, source: Iterable[Tuple[float, Any]]):
+        """
+        Adds a lazily pulled schedule: an iterable of (start_time, item) pairs
+        in non-decreasing start time order.
+        """
+        iterator = iter(source)
+        self._push_source(iterator)
+
+    def _push_source(self, iterator):
+        for entry in iterator:
+            heapq.heappush(self._sources, (entry[0], next(self._source_order), entry, iterator))
+            return
+
+    def _load_sources(self, until: float):
+        sources = self._sources
+        while sources and sources[0][0] <= until:
+            _, _, (start_time, item), iterator = heapq.heappop(sources)
+            self.insert(start_time, item)
+            # Keep pulling this source while it stays within the horizon.
+            for start_time, item in iterator:
+                if start_time > until:
+                    heapq.heappush(sources, (start_time, next(self._source_order), (start_time, item), iterator))
+                    break
+                self.insert(start_time, item)
+
+    def advance(self, time_now: float) -> List[Any]:
+        """
+        Advances the wheel to time_now.
+
+        Returns:
+            The items whose start time has arrived, in (start_time, sequence) order.
+        """
+        if self._sources:
+            self._load_sources(time_now + self.load_ahead)
+        target = self.frame_of(time_now)
+        if target > self._frame:
+            self._advance_to(target)
+        due = self._due
+        if not due:
+            return []
+        if len(due) > 1:
+            due.sort(key=_entry_key)
+        if due[-1][0] <= time_now:
+            self._due = []
+            return [entry[2] for entry in due]
+        ready = 0
+        while due[ready][0] <= time_now:
+            ready += 1
+        self._due = due[ready:]
+        return [entry[2] for entry in due[:ready]]
+
+    def _advance_to(self, target: int):
+        counts = self._counts
+        spans = self._spans
+        levels = len(self._slots)
+        while self._frame < target:
+            # While levels below `empty` hold nothing, nothing happens until
+            # the digit of level `empty` changes: jump straight there.
+            empty = 0
+            while empty < levels and counts[empty] == 0:
+                empty += 1
+            if empty:
+                span = spans[empty]
+                last_quiet = (self._frame // span + 1) * span - 1
+                if last_quiet >= target:
+                    self._frame = target
+                    return
+                if last_quiet > self._frame:
+                    self._frame = last_quiet
+            self._step()
+
+    def _step(self):
+        """Moves to the next frame, cascading higher levels and releasing level 0."""
+        frame = self._frame = self._frame + 1
+        spans = self._spans
+        top = len(self._slots)
+        if frame % spans[top] == 0:
+            overflow = self._overflow
+            while overflow and overflow[0][0] // spans[top] == frame // spans[top]:
+                entry_frame, start_time, sequence, item = heapq.heappop(overflow)
+                self._place(entry_frame, (start_time, sequence, item))
+        # Cascade from the highest level whose digit changed down to level 1.
+        for level in range(top - 1, 0, -1):
+            if frame % spans[level]:
+                continue
+            slot = (frame // spans[level]) % self._slots[level]
+            bucket = self._levels[level][slot]
+            if bucket:
+                self._levels[level][slot] = []
+                self._counts[level] -= len(bucket)
+                for entry_frame, entry in bucket:
+                    self._place(entry_frame, entry)
+        bucket = self._levels[0][frame % self._slots[0]]
+        if bucket:
+            self._levels[0][frame % self._slots[0]] = []
+            self._counts[0] -= len(bucket)
+            self._due.extend(entry for _, entry in bucket)
+
+    def next_start(self) -> Optional[float]:
+        """
+        A lower bound on when advance() will next release something: exact for
+        entries within the lowest level, otherwise the start of the bucket that
+        will be cascaded next. None if the wheel and its sources are empty.
+        """
+        candidates = []
+        if self._due:
+            candidates.append(min(entry[0] for entry in self._due))
+        elif self._counts[0]:
+            n = self._slots[0]
+            for offset in range(1, n + 1):
+                bucket = self._levels[0][(self._frame + offset) % n]
+                if bucket:
+                    candidates.append(min(entry[0] for _, entry in bucket))
+                    break
+        else:
+            for level in range(1, len(self._slots)):
+                if self._counts[level]:
+                    span = self._spans[level]
+                    next_bucket = (self._frame // span + 1) * span
+                    candidates.append(self.origin + next_bucket * self.tick_seconds)
+                    break
+            else:
+                if self._overflow:
+                    candidates.append(self._overflow[0][1])
+        if self._sources:
+            candidates.append(self._sources[0][0])
+        return min(candidates) if candidates else None
+
+    def clear(self) -> List[Any]:
+        """Removes and returns every held item. Sources are dropped unread."""
+        items = [entry[2] for entry in self._due]
+        for level, buckets in enumerate(self._levels):
+            for slot, bucket in enumerate(buckets):
+                items.extend(entry[2] for _, entry in bucket)
+                buckets[slot] = []
+            self._counts[level] = 0
+        items.extend(entry[3] for entry in self._overflow)
+        self._due = []
+        self._overflow = []
+        self._sources = []
+        return items
+
+
+def _entry_key(entry: Tuple[float, int, Any]) -> Tuple[float, int]:
+    return entry[0], entry[1]
@@ -1,18 +1,27 @@
 # src/bongo/patterns/builtin_patterns.py
 import time
-from typing import List, Tuple
+from typing import List, Optional, Tuple
+
+import numpy as np
+
 from bongo.operations.led_operation import LEDPixelOperation
+from bongo.operations.operation_batch import OperationBatch
+from bongo.operations.operation_pool import OperationPool
+from bongo.utils.tracing import trace_calls
 
 
+@trace_calls("pattern")
 def create_chase_pattern(
         led_coords: List[Tuple[int, int]],
         delay: float = 0.1,
         brightness: float = 1.0,
         hold_time: float = 0.05,
-        start_time_base: float = None
+        start_time_base: float = None,
+        pool: Optional[OperationPool] = None
 ) -> List[Tuple[Tuple[int, int], LEDPixelOperation]]:
     """
     Creates a chase pattern where LEDs light up in sequence.
+    If a pool is given, the operations are taken from it.
     """
     # If no start time provided, use current time
     if start_time_base is None:
@@ -20,6 +29,7 @@ def create_chase_pattern(
 
     # print(f"DEBUG: Creating chase pattern, start_time_base = {start_time_base}")
 
+    make_op = pool.acquire if pool is not None else LEDPixelOperation
     operations = []
 
     for i, coords in enumerate(led_coords):
@@ -28,7 +38,7 @@ def create_chase_pattern(
 
         # print(f"DEBUG: LED {i} at {coords} -> start_time = {led_start_time} (offset: {i * delay})")
 
-        pixel_op = LEDPixelOperation(
+        pixel_op = make_op(
             target_brightness=brightness,
             ramp_duration=0.02,  # Quick ramp up
             hold_duration=hold_time,
@@ -42,23 +52,27 @@ def create_chase_pattern(
     return operations
 
 
+@trace_calls("pattern")
 def create_fade_all_pattern(
         led_coords: List[Tuple[int, int]],
         fade_up_duration: float = 0.5,
         hold_duration: float = 1.0,
         fade_down_duration: float = 0.5,
         brightness: float = 1.0,
-        start_time_base: float = None
+        start_time_base: float = None,
+        pool: Optional[OperationPool] = None
 ) -> List[Tuple[Tuple[int, int], LEDPixelOperation]]:
     """
     Creates a pattern where all LEDs fade up and down together.
+    If a pool is given, the operations are taken from it.
     """
     if start_time_base is None:
         start_time_base = time.monotonic()
 
+    make_op = pool.acquire if pool is not None else LEDPixelOperation
     operations = []
     for coords in led_coords:
-        pixel_op = LEDPixelOperation(
+        pixel_op = make_op(
             target_brightness=brightness,
             ramp_duration=fade_up_duration,
             hold_duration=hold_duration,
@@ -70,15 +84,18 @@ def create_fade_all_pattern(
     return operations
 
 
+@trace_calls("pattern")
 def create_wave_row_pattern(
         led_coords: List[Tuple[int, int]],
         row_delay: float = 0.1,
         brightness: float = 1.0,
         hold_time: float = 0.2,
-        start_time_base: float = None
+        start_time_base: float = None,
+        pool: Optional[OperationPool] = None
 ) -> List[Tuple[Tuple[int, int], LEDPixelOperation]]:
     """
     Creates a wave pattern that moves row by row.
+    If a pool is given, the operations are taken from it.
     """
     if start_time_base is None:
         start_time_base = time.monotonic()
@@ -91,13 +108,14 @@ def create_wave_row_pattern(
             rows[row] = []
         rows[row].append(coords)
 
+    make_op = pool.acquire if pool is not None else LEDPixelOperation
     operations = []
     for row_num in sorted(rows.keys()):
         row_coords = rows[row_num]
         start_time = start_time_base + (row_num * row_delay)
 
         for coords in row_coords:
-            pixel_op = LEDPixelOperation(
+            pixel_op = make_op(
                 target_brightness=brightness,
                 ramp_duration=0.05,
                 hold_duration=hold_time,
@@ -106,4 +124,67 @@ def create_wave_row_pattern(
             )
             operations.append((coords, pixel_op))
 
-    return operations
\ No newline at end of file
+    return operations
+
+# --- Columnar forms ---------------------------------------------------------
+# Each generator above has a *_batch twin with the same parameters that
+# returns a single OperationBatch (for AnimationManager.add_batch) instead of a
+# list of per-LED operations. Start times are computed with array arithmetic.
+
+@trace_calls("pattern")
+def create_chase_batch(
+        led_coords: List[Tuple[int, int]],
+        delay: float = 0.1,
+        brightness: float = 1.0,
+        hold_time: float = 0.05,
+        start_time_base: float = None
+) -> OperationBatch:
+    """
+    Columnar form of create_chase_pattern.
+    """
+    if start_time_base is None:
+        start_time_base = time.monotonic()
+    start_times = start_time_base + np.arange(len(led_coords)) * delay
+    return OperationBatch.from_coords(led_coords, start_times, brightness,
+                                      ramp_durations=0.02, hold_durations=hold_time,
+                                      fade_durations=0.08, initial_brightness=0.0)
+
+
+@trace_calls("pattern")
+def create_fade_all_batch(
+        led_coords: List[Tuple[int, int]],
+        fade_up_duration: float = 0.5,
+        hold_duration: float = 1.0,
+        fade_down_duration: float = 0.5,
+        brightness: float = 1.0,
+        start_time_base: float = None
+) -> OperationBatch:
+    """
+    Columnar form of create_fade_all_pattern.
+    """
+    if start_time_base is None:
+        start_time_base = time.monotonic()
+    return OperationBatch.from_coords(led_coords, start_time_base, brightness,
+                                      ramp_durations=fade_up_duration, hold_durations=hold_duration,
+                                      fade_durations=fade_down_duration)
+
+
+@trace_calls("pattern")
+def create_wave_row_batch(
+        led_coords: List[Tuple[int, int]],
+        row_delay: float = 0.1,
+        brightness: float = 1.0,
+        hold_time: float = 0.2,
+        start_time_base: float = None
+) -> OperationBatch:
+    """
+    Columnar form of create_wave_row_pattern.
+    """
+    if start_time_base is None:
+        start_time_base = time.monotonic()
+    coords = np.asarray(led_coords, dtype=np.int32).reshape(-1, 2)
+    # Same order as the list form: row by row, keeping each row's input order.
+    coords = coords[np.argsort(coords[:, 0], kind="stable")]
+    start_times = start_time_base + coords[:, 0] * row_delay
+    return OperationBatch(coords[:, 0], coords[:, 1], start_times, brightness,
+                          ramp_durations=0.05, hold_durations=hold_time, fade_durations=0.1)
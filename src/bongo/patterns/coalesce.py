@@ -0,0 +1,128 @@
+# src/bongo/patterns/coalesce.py
+"""
+Load-time coalescing of the operations a pattern puts on the same LED.
+
+Sequential and repeating compositions give each LED a series of operations,
+one after another. Each of them used to be scheduled, wrapped, evaluated and
+retired on its own. coalesce_operations() fuses each LED's series into one
+EnvelopeOperation, in which each original operation becomes its own
+segments, starting from its own initial brightness.
+
+The time between two operations becomes a gap segment, during which the
+envelope draws nothing: the LED shows whatever else is drawn on it, and the
+render loop can sleep, exactly as with the separate operations. LEDs whose
+operations overlap are left untouched, because their result depends on
+"last added wins" compositing.
+"""
+import logging
+from typing import Iterable, List, NamedTuple, Optional, Tuple
+
+from bongo.operations.envelope_operation import EnvelopeOperation, EnvelopeSegment, pixel_operation_segments
+from bongo.operations.led_operation import LEDPixelOperation
+
+log = logging.getLogger("bongo.coalesce")
+
+PatternOperations = List[Tuple[Tuple[int, int], object]]
+
+
+class CoalesceReport(NamedTuple):
+    """What a coalescing pass did."""
+    input_operations: int
+    output_operations: int
+    fused_leds: int
+
+    @property
+    def eliminated(self) -> int:
+        return self.input_operations - self.output_operations
+
+
+def _segments_of(op) -> Optional[List[EnvelopeSegment]]:
+    """The segments reproducing `op` from its own start level, or None if it can't be fused."""
+    if type(op) is LEDPixelOperation:
+        return pixel_operation_segments(op)
+    if isinstance(op, EnvelopeOperation):
+        first = op.segments[0]
+        if first.start is None:
+            first = first._replace(start=op.initial_brightness)
+        return [first, *op.segments[1:]]
+    return None
+
+
+# Operations closer than this are back to back; no gap segment between them.
+_CONTIGUOUS = 1e-9
+
+
+def _fuse(ops) -> Optional[EnvelopeOperation]:
+    """
+    Fuses start-ordered operations on one LED into one envelope, or returns
+    None if any of them overlap or can't be fused.
+    """
+    segments = []
+    end = None
+    for op in ops:
+        op_segments = _segments_of(op)
+        if op_segments is None or op.start_time is None:
+            return None
+        if end is not None:
+            gap = op.start_time - end
+            if gap < -_CONTIGUOUS:
+                return None
+            if gap > _CONTIGUOUS:
+                segments.append(EnvelopeSegment(gap, None))
+        segments.extend(op_segments)
+        end = op.start_time + op.total_duration
+    first = ops[0]
+    return EnvelopeOperation(segments, first.start_time, first.initial_brightness)
+
+
+def coalesce_operations(pattern_operations: Iterable[Tuple[Tuple[int, int], object]],
+                        pool=None) -> Tuple[PatternOperations, CoalesceReport]:
+    """
+    Fuses the operations that target the same LED.
+
+    Args:
+        pattern_operations: ((row, col), operation) tuples, as produced by the
+                            pattern generators and PatternOrchestrator.
+        pool: Optional OperationPool that absorbed LEDPixelOperations are
+              released to.
+
+    Returns:
+        (operations, report). Each fused envelope takes the list position of
+        its LED's first operation; everything else keeps its order.
+    """
+    operations = list(pattern_operations)
+    by_led = {}
+    for position, (coords, op) in enumerate(operations):
+        by_led.setdefault(coords, []).append(position)
+
+    # Position of each LED's first operation -> its envelope; absorbed positions -> None.
+    replaced = {}
+    for coords, positions in by_led.items():
+        if len(positions) < 2:
+            continue
+        ordered = sorted(positions, key=lambda i: (operations[i][1].start_time is None,
+                                                   operations[i][1].start_time or 0.0, i))
+        envelope = _fuse([operations[i][1] for i in ordered])
+        if envelope is None:
+            continue
+        for position in positions:
+            replaced[position] = None
+        replaced[positions[0]] = envelope
+    fused_leds = sum(envelope is not None for envelope in replaced.values())
+
+    result = []
+    for position, (coords, op) in enumerate(operations):
+        if position not in replaced:
+            result.append((coords, op))
+            continue
+        envelope = replaced[position]
+        if envelope is not None:
+            result.append((coords, envelope))
+        if pool is not None:
+            pool.release(op)
+
+    report = CoalesceReport(len(operations), len(result), fused_leds)
+    if report.eliminated:
+        log.info(f"Coalesced {report.input_operations} operations into {report.output_operations} "
+                 f"({report.eliminated} eliminated across {report.fused_leds} LEDs).")
+    return result, report
@@ -0,0 +1,227 @@
+# src/bongo/patterns/expressions.py
+"""
+A small, safe expression language for shader patterns.
+
+Pattern designers can write a brightness formula instead of Python, e.g.
+
+    brightness = 0.5 + 0.5*sin(2*pi*(t*speed - x/8))
+
+The expression is parsed once with the `ast` module, checked against a
+whitelist (arithmetic, comparisons, `a if cond else b`, and/or/not, and the
+functions in FUNCTIONS), rewritten so conditionals and boolean operators work
+element-wise, and compiled into a function that evaluates over whole NumPy
+arrays. Compiled expressions are cached by their text, and every error
+(syntax, unknown names, disallowed constructs, wrong argument counts) is raised
+as an ExpressionError when the expression is compiled, never while rendering.
+
+Variables:
+    x, y     LED column and row
+    nx, ny   the same, scaled to 0.0-1.0 across the matrix
+    index    the LED's position in LEDMatrix.coordinate_grid() order
+    t        seconds since the pattern started
+plus the constants pi and e and any declared parameters.
+"""
+import ast
+import functools
+import re
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+
+from bongo.patterns.shaders import Shader
+
+VARIABLES = ("x", "y", "nx", "ny", "index", "t")
+CONSTANTS = {"pi": np.pi, "e": np.e}
+
+
+def _fract(value):
+    return np.mod(value, 1.0)
+
+
+def _clip(value, low=0.0, high=1.0):
+    return np.clip(value, low, high)
+
+
+def _where(condition, if_true, if_false):
+    return np.where(condition, if_true, if_false)
+
+
+FUNCTIONS = {
+    "sin": np.sin, "cos": np.cos, "tan": np.tan,
+    "asin": np.arcsin, "acos": np.arccos, "atan": np.arctan, "atan2": np.arctan2,
+    "sqrt": np.sqrt, "exp": np.exp, "log": np.log, "abs": np.abs,
+    "floor": np.floor, "ceil": np.ceil, "round": np.rint, "sign": np.sign,
+    "min": np.minimum, "max": np.maximum, "mod": np.mod, "hypot": np.hypot,
+    "clip": _clip, "fract": _fract, "where": _where,
+    "_and": np.logical_and, "_or": np.logical_or, "_not": np.logical_not,
+}
+
+# (minimum, maximum) argument counts. Checked at compile time: NumPy ufuncs
+# would otherwise treat an extra argument as an output array and write into it.
+_ARITY = {name: (func.nin, func.nin) for name, func in FUNCTIONS.items() if isinstance(func, np.ufunc)}
+_ARITY.update({"clip": (1, 3), "fract": (1, 1), "where": (3, 3)})
+
+_ALLOWED_NODES = (
+    ast.Expression, ast.BinOp, ast.UnaryOp, ast.Compare, ast.IfExp, ast.BoolOp, ast.Call,
+    ast.Name, ast.Load, ast.Constant,
+    ast.Add, ast.Sub, ast.Mult, ast.Div, ast.FloorDiv, ast.Mod, ast.Pow,
+    ast.USub, ast.UAdd, ast.Not, ast.And, ast.Or,
+    ast.Lt, ast.LtE, ast.Gt, ast.GtE, ast.Eq, ast.NotEq,
+)
+
+_ASSIGNMENT_PREFIX = re.compile(r"^\s*brightness\s*=(?!=)")
+
+
+class ExpressionError(ValueError):
+    """Raised when an expression cannot be compiled."""
+
+    def __init__(self, expression: str, message: str, node: Optional[ast.AST] = None):
+        where = f" (column {node.col_offset + 1})" if node is not None and hasattr(node, "col_offset") else ""
+        super().__init__(f"Invalid expression '{expression}'{where}: {message}")
+        self.expression = expression
+
+
+class _Vectorize(ast.NodeTransformer):
+    """Rewrites scalar-only constructs into their element-wise equivalents."""
+
+    def visit_Constant(self, node):
+        # Floats only: integer powers of literals could otherwise build huge ints.
+        return ast.copy_location(ast.Constant(value=float(node.value)), node)
+
+    def visit_IfExp(self, node):
+        self.generic_visit(node)
+        return self._call("where", [node.test, node.body, node.orelse], node)
+
+    def visit_BoolOp(self, node):
+        self.generic_visit(node)
+        func = "_and" if isinstance(node.op, ast.And) else "_or"
+        result = node.values[0]
+        for value in node.values[1:]:
+            result = self._call(func, [result, value], node)
+        return result
+
+    def visit_UnaryOp(self, node):
+        self.generic_visit(node)
+        if isinstance(node.op, ast.Not):
+            return self._call("_not", [node.operand], node)
+        return node
+
+    def visit_Compare(self, node):
+        self.generic_visit(node)
+        if len(node.ops) == 1:
+            return node
+        # a < b < c  ->  (a < b) and (b < c), element-wise.
+        parts, left = [], node.left
+        for op, right in zip(node.ops, node.comparators):
+            parts.append(ast.Compare(left=left, ops=[op], comparators=[right]))
+            left = right
+        result = parts[0]
+        for part in parts[1:]:
+            result = self._call("_and", [result, part], node)
+        return result
+
+    @staticmethod
+    def _call(name, args, node):
+        return ast.copy_location(ast.Call(func=ast.Name(id=name, ctx=ast.Load()), args=args, keywords=[]), node)
+
+
+class CompiledExpression:
+    """An expression compiled to a NumPy-vectorized callable."""
+
+    def __init__(self, text: str, code, parameters: Iterable[str]):
+        self.text = text
+        self.parameters = tuple(parameters)
+        self._code = code
+
+    def __call__(self, x, y, t, nx=None, ny=None, index=None, **params):
+        """Evaluates the expression; returns an array (or scalar) of brightness values."""
+        # Scalars as NumPy floats, so 1/t or t**400 give inf under errstate
+        # instead of raising like plain Python floats do.
+        params = {name: np.float64(value) if isinstance(value, (int, float)) else value
+                  for name, value in params.items()}
+        namespace = {"__builtins__": {}, **CONSTANTS, **FUNCTIONS, **params,
+                     "x": x, "y": y, "t": np.float64(t),
+                     "nx": x if nx is None else nx, "ny": y if ny is None else ny,
+                     "index": np.arange(np.shape(x)[0]) if index is None else index}
+        with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+            return eval(self._code, namespace)
+
+    def __reduce__(self):
+        # Code objects don't pickle; recompile (from the cache) on the other side.
+        return compile_expression, (self.text, self.parameters)
+
+    def __repr__(self) -> str:
+        return f"CompiledExpression({self.text!r})"
+
+
+def compile_expression(text: str, parameters: Iterable[str] = ()) -> CompiledExpression:
+    """
+    Compiles `text` (optionally prefixed with "brightness =") into a
+    CompiledExpression. `parameters` names the extra variables it may use.
+    Results are cached by expression text and parameter names.
+
+    Raises:
+        ExpressionError: If the expression is invalid.
+    """
+    return _compile_cached(text, tuple(sorted(parameters)))
+
+
+@functools.lru_cache(maxsize=256)
+def _compile_cached(text: str, parameters: tuple) -> CompiledExpression:
+    source = _ASSIGNMENT_PREFIX.sub("", text, count=1).strip()
+    if not source:
+        raise ExpressionError(text, "expression is empty")
+    try:
+        tree = ast.parse(source, mode="eval")
+    except SyntaxError as e:
+        raise ExpressionError(text, e.msg) from None
+
+    known = set(VARIABLES) | set(CONSTANTS) | set(parameters)
+    call_targets = {id(node.func) for node in ast.walk(tree) if isinstance(node, ast.Call)}
+    for node in ast.walk(tree):
+        if not isinstance(node, _ALLOWED_NODES):
+            raise ExpressionError(text, f"'{type(node).__name__}' is not allowed", node)
+        if isinstance(node, ast.Call):
+            if not isinstance(node.func, ast.Name) or node.func.id not in FUNCTIONS or node.func.id.startswith("_"):
+                raise ExpressionError(text, f"unknown function '{ast.unparse(node.func)}'", node)
+            if node.keywords:
+                raise ExpressionError(text, "keyword arguments are not supported", node)
+            low, high = _ARITY[node.func.id]
+            if not low <= len(node.args) <= high:
+                expected = low if low == high else f"{low} to {high}"
+                raise ExpressionError(text, f"{node.func.id}() takes {expected} argument(s), "
+                                            f"got {len(node.args)}", node)
+        elif isinstance(node, ast.Name) and node.id not in known and id(node) not in call_targets:
+            raise ExpressionError(text, f"unknown name '{node.id}'", node)
+        elif isinstance(node, ast.Constant) and not isinstance(node.value, (int, float)):
+            raise ExpressionError(text, f"unsupported constant {node.value!r}", node)
+
+    tree = ast.fix_missing_locations(_Vectorize().visit(tree))
+    compiled = CompiledExpression(text, compile(tree, "<expression>", "eval"), parameters)
+
+    # Evaluate once on a tiny grid so argument-count and type errors surface now.
+    sample = np.zeros(2)
+    try:
+        result = compiled(sample, sample, 0.0, **{name: 1.0 for name in parameters})
+        np.broadcast_to(np.asarray(result, dtype=np.float64), sample.shape)
+    except (TypeError, ValueError, ArithmeticError) as e:
+        raise ExpressionError(text, str(e)) from None
+    return compiled
+
+
+class ExpressionShader(Shader):
+    """A Shader whose function is a compiled expression."""
+
+    def __init__(self, expression: str, params: Optional[Dict[str, float]] = None,
+                 brightness: float = 1.0, blend: str = "replace", name: Optional[str] = None):
+        params = dict(params or {})
+        compiled = compile_expression(expression, params)
+        super().__init__(compiled, params, brightness, blend, name or expression)
+        self.expression = expression
+
+    def evaluate(self, grid, t: float) -> np.ndarray:
+        values = self.func(grid.x, grid.y, t, nx=grid.nx, ny=grid.ny, index=grid.index, **self.params)
+        values = np.broadcast_to(np.asarray(values, dtype=np.float64), grid.x.shape)
+        if self.brightness != 1.0:
+            values = values * self.brightness
+        return np.clip(np.nan_to_num(values), 0.0, 1.0)
@@ -15,3 +15,43 @@ def load_pattern(file_path):
         raise ValueError("Invalid pattern file: must contain a list of 'steps'.")
 
     return data["steps"], data.get("loop", False)
+
+
+def load_shader(file_path):
+    """
+    Loads a shader pattern definition and returns (shader, duration).
+
+    The file either names a built-in shader or gives an expression:
+        {"type": "shader", "shader": "plasma", "params": {"scale": 3}}
+        {"type": "shader", "expression": "brightness = 0.5 + 0.5*sin(t - x/8)",
+         "params": {}, "brightness": 1.0, "blend": "replace", "duration": null}
+    Expressions are compiled here, so a bad formula fails at load time.
+    """
+    from bongo.patterns.expressions import ExpressionError, ExpressionShader
+    from bongo.patterns.shaders import Shader
+
+    if not os.path.exists(file_path):
+        raise FileNotFoundError(f"Pattern file '{file_path}' does not exist.")
+
+    with open(file_path, 'r') as f:
+        data = json.load(f)
+
+    if data.get("type") != "shader":
+        raise ValueError(f"Invalid shader file '{file_path}': 'type' must be 'shader'.")
+
+    options = {
+        "brightness": data.get("brightness", 1.0),
+        "blend": data.get("blend", "replace"),
+    }
+    params = data.get("params", {})
+    try:
+        if "expression" in data:
+            shader = ExpressionShader(data["expression"], params, name=data.get("name"), **options)
+        elif "shader" in data:
+            shader = Shader.from_library(data["shader"], **options, **params)
+        else:
+            raise ValueError("it needs an 'expression' or a 'shader' name.")
+    except (ExpressionError, ValueError, TypeError) as e:
+        raise ValueError(f"Invalid shader file '{file_path}': {e}") from None
+
+    return shader, data.get("duration")
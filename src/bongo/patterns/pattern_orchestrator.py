@@ -1,8 +1,31 @@
 # src/bongo/patterns/pattern_orchestrator.py
 import time
-from typing import List, Tuple, Callable
+from typing import Callable, List, NamedTuple, Optional, Sequence, Tuple
 from bongo.operations.led_operation import LEDPixelOperation
-from bongo.operations.animation_manager import AnimationManager
+from bongo.operations.animation_manager import AnimationManager, PatternHandle
+from bongo.patterns.coalesce import CoalesceReport, coalesce_operations
+from bongo.utils.tracing import trace_calls
+
+
+class PatternLayer(NamedTuple):
+    """One layer of a LayeredPattern."""
+    name: str
+    opacity: float
+    blend: str
+    operations: List[Tuple[Tuple[int, int], LEDPixelOperation]]
+
+
+class LayeredPattern(list):
+    """
+    The result of compose_layered(): a flat list of every layer's operations
+    (so it can be used like any other pattern) that also remembers which
+    operations belong to which layer, in `layers`. load_pattern() and play()
+    submit each layer to its own compositing layer.
+    """
+
+    def __init__(self, layers: Sequence[PatternLayer]):
+        super().__init__(entry for layer in layers for entry in layer.operations)
+        self.layers = list(layers)
 
 
 class PatternOrchestrator:
@@ -12,12 +35,62 @@ class PatternOrchestrator:
 
     def __init__(self, animation_manager: AnimationManager):
         self.animation_manager = animation_manager
+        # Result of the most recent coalescing pass (see bongo.patterns.coalesce).
+        self.last_coalesce_report: Optional[CoalesceReport] = None
+
+    def _prepare(self, pattern_operations, coalesce: bool):
+        if not coalesce:
+            return pattern_operations
+        pattern_operations, self.last_coalesce_report = coalesce_operations(
+            pattern_operations, pool=getattr(self.animation_manager, "pool", None))
+        return pattern_operations
+
+    def _setup_layers(self, pattern: LayeredPattern):
+        """Creates (or updates) the manager layers a LayeredPattern draws on."""
+        manager = self.animation_manager
+        for layer in pattern.layers:
+            if layer.name in manager.layers:
+                manager.set_layer(layer.name, opacity=layer.opacity, blend=layer.blend)
+            else:
+                manager.add_layer(layer.name, opacity=layer.opacity, blend=layer.blend)
+
+    def load_pattern(self, pattern_operations: List[Tuple[Tuple[int, int], LEDPixelOperation]],
+                     coalesce: bool = True):
+        """
+        Load a pattern (simple or composed) into the animation manager.
 
-    def load_pattern(self, pattern_operations: List[Tuple[Tuple[int, int], LEDPixelOperation]]):
-        """Load a pattern (simple or composed) into the animation manager."""
-        for coords, pixel_op in pattern_operations:
+        Unless coalesce is False, the operations on each LED are first fused
+        into a single envelope (see bongo.patterns.coalesce); the rendered
+        output is unchanged.
+        A LayeredPattern is loaded layer by layer onto the manager's layers.
+        """
+        if isinstance(pattern_operations, LayeredPattern):
+            self._setup_layers(pattern_operations)
+            for layer in pattern_operations.layers:
+                for coords, pixel_op in self._prepare(layer.operations, coalesce):
+                    self.animation_manager.add_operation(coords[0], coords[1], pixel_op, layer=layer.name)
+            return
+        for coords, pixel_op in self._prepare(pattern_operations, coalesce):
             self.animation_manager.add_operation(coords[0], coords[1], pixel_op)
 
+    def play(self, pattern_operations: List[Tuple[Tuple[int, int], LEDPixelOperation]],
+             coalesce: bool = True) -> PatternHandle:
+        """
+        Submits a pattern to a running animation loop and returns its handle.
+
+        The pattern is queued through the thread-safe submission API, so this
+        may be called from asyncio tasks or other threads while the runner is
+        ticking. The returned handle can be awaited (`await orchestrator.play(ops)`)
+        and resolves once every operation of the pattern has finished. The
+        pattern is coalesced first unless coalesce is False, as in load_pattern().
+        """
+        if isinstance(pattern_operations, LayeredPattern):
+            self._setup_layers(pattern_operations)
+            return self.animation_manager.add_layered_operations(
+                (layer.name, self._prepare(layer.operations, coalesce)) for layer in pattern_operations.layers)
+        return self.animation_manager.add_operations(self._prepare(pattern_operations, coalesce))
+
+    @trace_calls("compose")
     def create_repeating_pattern(self,
                                  pattern_func: Callable,
                                  pattern_args: dict,
@@ -55,6 +128,7 @@ class PatternOrchestrator:
 
         return all_operations
 
+    @trace_calls("compose")
     def compose_sequential(self,
                            patterns: List[Callable],
                            pattern_args: List[dict],
@@ -84,20 +158,39 @@ class PatternOrchestrator:
 
         return composed_operations
 
+    @trace_calls("compose")
     def compose_layered(self,
                         patterns: List[Callable],
-                        pattern_args: List[dict]) -> List[Tuple[Tuple[int, int], LEDPixelOperation]]:
+                        pattern_args: List[dict],
+                        opacities: Optional[List[float]] = None,
+                        blends: Optional[List[str]] = None,
+                        layer_names: Optional[List[str]] = None) -> LayeredPattern:
         """
         Compose multiple patterns to run simultaneously (layered).
-        Note: This requires careful coordination to avoid LED conflicts.
+
+        Each pattern is drawn on its own compositing layer, stacked in the
+        order given (the last pattern on top), so patterns that touch the
+        same LEDs are blended instead of fighting over them.
+
+        Args:
+            patterns: The pattern functions.
+            pattern_args: Arguments for each pattern function.
+            opacities: Per-layer opacity (default 1.0).
+            blends: Per-layer blend mode (default 'normal'); see
+                    bongo.operations.compositor.BLEND_MODES.
+            layer_names: Per-layer names (default 'layer1', 'layer2', ...).
+                         Layers that already exist on the manager are reused.
         """
-        composed_operations = []
+        layers = []
         base_time = time.monotonic() + 0.5  # Start in 0.5 seconds
 
-        for pattern_func, args in zip(patterns, pattern_args):
+        for i, (pattern_func, args) in enumerate(zip(patterns, pattern_args)):
             args_copy = args.copy()  # Don't modify original args
             args_copy['start_time_base'] = base_time
             pattern_ops = pattern_func(**args_copy)
-            composed_operations.extend(pattern_ops)
+            layers.append(PatternLayer(layer_names[i] if layer_names else f"layer{i + 1}",
+                                       opacities[i] if opacities else 1.0,
+                                       blends[i] if blends else "normal",
+                                       list(pattern_ops)))
 
-        return composed_operations
\ No newline at end of file
+        return LayeredPattern(layers)
\ No newline at end of file
@@ -0,0 +1,194 @@
+# src/bongo/patterns/shaders.py
+"""
+Procedural (shader) patterns.
+
+A shader is a vectorized function of LED position and time:
+
+    def my_shader(x, y, t, **params) -> brightness
+
+x and y are NumPy arrays with every LED's column and row (from
+LEDMatrix.coordinate_grid()), t is the number of seconds since the shader
+started, and the result is an array (or scalar) of brightness values from 0.0
+to 1.0. The AnimationManager evaluates active shaders once per frame over the
+whole grid, so a ripple costs the same per frame whether it runs for one second
+or all night, and no LEDPixelOperations are created.
+
+Shaders are submitted with AnimationManager.add_shader(Shader(...)). They are
+composited underneath op-based patterns, so a chase can run on top of a plasma
+background. SHADER_LIBRARY holds the built-in shaders by name.
+
+A shader whose defaults depend on the whole grid (rather than on each LED's
+own position) can expose them as func.grid_defaults(x, y, params) -> dict;
+Shader.bind() uses it before a grid is split across render workers.
+"""
+import copy
+from typing import Callable, Dict, Optional
+
+import numpy as np
+
+TWO_PI = 2.0 * np.pi
+
+
+class Shader:
+    """A shader function bound to its parameters, brightness and blend mode."""
+
+    BLEND_MODES = ("replace", "max", "add", "multiply")
+
+    def __init__(self, func: Callable, params: Optional[dict] = None, brightness: float = 1.0,
+                 blend: str = "replace", name: Optional[str] = None):
+        """
+        Args:
+            func: The shader function, called as func(x, y, t, **params).
+            params: Keyword parameters passed to func.
+            brightness: Scale applied to the shader's output (0.0 to 1.0).
+            blend: How the output combines with shaders added before it:
+                   'replace', 'max', 'add' (clipped) or 'multiply'.
+            name: Used in logs and traces; defaults to the function name.
+        """
+        if blend not in self.BLEND_MODES:
+            raise ValueError(f"Unknown blend mode '{blend}'. Expected one of {self.BLEND_MODES}.")
+        if not (0.0 <= brightness <= 1.0):
+            raise ValueError("Brightness must be between 0.0 and 1.0")
+        self.func = func
+        self.params = dict(params or {})
+        self.brightness = brightness
+        self.blend = blend
+        self.name = name or getattr(func, "__name__", "shader")
+
+    @classmethod
+    def from_library(cls, name: str, brightness: float = 1.0, blend: str = "replace",
+                     **params) -> "Shader":
+        """Creates a Shader from a SHADER_LIBRARY entry."""
+        try:
+            func = SHADER_LIBRARY[name]
+        except KeyError:
+            raise ValueError(f"Unknown shader '{name}'. Available: {sorted(SHADER_LIBRARY)}") from None
+        return cls(func, params, brightness, blend, name)
+
+    def bind(self, grid) -> "Shader":
+        """
+        Returns this shader with its grid-dependent defaults (a ripple's
+        centre, a sweep's span) fixed from the whole grid, so that evaluating
+        it over part of the grid (see bongo.operations.render_pool) gives the
+        same values as evaluating it over all of it.
+        """
+        grid_defaults = getattr(self.func, "grid_defaults", None)
+        if grid_defaults is None:
+            return self
+        params = {**grid_defaults(grid.x, grid.y, self.params), **self.params}
+        bound = copy.copy(self)
+        bound.params = params
+        return bound
+
+    def evaluate(self, grid, t: float) -> np.ndarray:
+        """Returns the shader's brightness for every LED in the grid at time t."""
+        values = np.asarray(self.func(grid.x, grid.y, t, **self.params), dtype=np.float64)
+        values = np.broadcast_to(values, grid.x.shape)
+        if self.brightness != 1.0:
+            values = values * self.brightness
+        return np.clip(values, 0.0, 1.0)
+
+    def composite(self, below: Optional[np.ndarray], values: np.ndarray) -> np.ndarray:
+        """Blends this shader's values over the result of the shaders below it."""
+        if below is None or self.blend == "replace":
+            return values
+        if self.blend == "max":
+            return np.maximum(below, values)
+        if self.blend == "add":
+            return np.minimum(below + values, 1.0)
+        return below * values
+
+    def __repr__(self) -> str:
+        return f"Shader({self.name}, params={self.params}, blend={self.blend})"
+
+
+# --- Built-in shaders ---------------------------------------------------------
+# Distances are in LEDs, speeds in LEDs (or cycles) per second.
+
+def _direction(x, y, angle: float):
+    """Distance of each LED along the direction `angle` (degrees, 0 = +x)."""
+    radians = np.deg2rad(angle)
+    return x * np.cos(radians) + y * np.sin(radians)
+
+
+def solid(x, y, t, level: float = 1.0):
+    """Every LED at the same level."""
+    return level
+
+
+def pulse(x, y, t, period: float = 2.0, low: float = 0.0, high: float = 1.0):
+    """The whole matrix breathing between low and high."""
+    return low + (high - low) * (0.5 - 0.5 * np.cos(TWO_PI * t / period))
+
+
+def wave(x, y, t, angle: float = 0.0, wavelength: float = 8.0, speed: float = 0.5):
+    """A sine wave travelling along `angle`; speed is in wavelengths per second."""
+    return 0.5 + 0.5 * np.sin(TWO_PI * (_direction(x, y, angle) / wavelength - speed * t))
+
+
+def gradient(x, y, t, angle: float = 0.0, wavelength: float = 8.0, speed: float = 0.0):
+    """A linear 0-to-1 ramp along `angle`, repeating every wavelength, optionally scrolling."""
+    return np.mod(_direction(x, y, angle) / wavelength - speed * t, 1.0)
+
+
+def sweep(x, y, t, angle: float = 0.0, width: float = 1.5, speed: float = 4.0,
+          span: Optional[float] = None, origin: Optional[float] = None):
+    """
+    A soft-edged bar sweeping across the matrix and wrapping around. span and
+    origin (where the sweep starts, along `angle`) default to the matrix's extent.
+    """
+    distance = _direction(x, y, angle)
+    if span is None or origin is None:
+        extent = _sweep_extent(x, y, {"angle": angle})
+        span = extent["span"] if span is None else span
+        origin = extent["origin"] if origin is None else origin
+    position = np.mod(speed * t, span + 2 * width) - width + origin
+    return np.clip(1.0 - np.abs(distance - position) / width, 0.0, 1.0)
+
+
+def _sweep_extent(x, y, params):
+    distance = _direction(x, y, params.get("angle", 0.0))
+    if not distance.size:
+        return {"span": 0.0, "origin": 0.0}
+    return {"span": float(distance.max() - distance.min()), "origin": float(distance.min())}
+
+
+def ripple(x, y, t, cx: Optional[float] = None, cy: Optional[float] = None,
+           wavelength: float = 4.0, speed: float = 4.0, decay: float = 0.0):
+    """Concentric rings expanding from (cx, cy), the matrix centre by default."""
+    if cx is None:
+        cx = float(x.max() + x.min()) / 2 if x.size else 0.0
+    if cy is None:
+        cy = float(y.max() + y.min()) / 2 if y.size else 0.0
+    radius = np.hypot(x - cx, y - cy)
+    rings = 0.5 + 0.5 * np.cos(TWO_PI * (radius - speed * t) / wavelength)
+    return rings * np.exp(-decay * radius) if decay else rings
+
+
+def _ripple_centre(x, y, params):
+    return {"cx": float(x.max() + x.min()) / 2 if x.size else 0.0,
+            "cy": float(y.max() + y.min()) / 2 if y.size else 0.0}
+
+
+def plasma(x, y, t, scale: float = 4.0, speed: float = 1.0):
+    """The classic demo-scene plasma: a sum of moving sine fields."""
+    u, v, s = x / scale, y / scale, speed * t
+    total = (np.sin(u + s)
+             + np.sin((v + s) / 2.0)
+             + np.sin((u + v + s) / 2.0)
+             + np.sin(np.sqrt(u * u + v * v + 1.0) + s))
+    return 0.5 + total / 8.0
+
+
+sweep.grid_defaults = _sweep_extent
+ripple.grid_defaults = _ripple_centre
+
+SHADER_LIBRARY: Dict[str, Callable] = {
+    "solid": solid,
+    "pulse": pulse,
+    "wave": wave,
+    "gradient": gradient,
+    "sweep": sweep,
+    "ripple": ripple,
+    "plasma": plasma,
+}
@@ -0,0 +1,475 @@
+# src/bongo/sync/time_sync.py
+"""
+Time synchronization between nodes, so several Pis play one show in lockstep.
+
+One node is the leader; its time.monotonic() is the show's time base. Every
+other node runs a TimeSyncFollower, which exchanges small UDP packets with
+the leader and fits a ClockModel mapping its own monotonic clock onto the
+leader's:
+
+    leader_time = local + offset + skew * (local - reference)
+
+Each exchange is NTP-style: the follower stamps the request when it's sent
+(t1), the leader stamps it when it arrives (t2) and when the reply leaves
+(t3), and the follower stamps the reply when it arrives (t4):
+
+    offset = ((t2 - t1) + (t3 - t4)) / 2        delay = (t4 - t1) - (t3 - t2)
+
+Exchanges that spent longer than usual in a queue have a larger delay and a
+less trustworthy offset, so the fit only uses samples within a little of the
+smallest delay in its window. Offset and skew come from a least-squares line
+through them. On a quiet LAN this is good to well under 100 us.
+
+The ClockModel is the `timebase` of the runner's FrameClock. Frame deadlines
+are laid on one grid in leader time (multiples of the frame period), so every
+node renders the same instants. Each node renders in its own monotonic time
+base ("render time", see ClockModel.render_time()), but it runs at the leader's
+rate, so the skew between crystals doesn't pile up over a long show.
+
+The leader starts a show by announcing its name and start time, in leader
+time, with announce_show(). Followers convert the start into render time and
+pass it to their on_show callback, which loads the same patterns with that
+start_time_base. The leader repeats the announcement every second, so a node
+that starts or restarts late joins the show in phase.
+
+Wire format (big-endian), always starting "BGTS", version, type:
+
+    request  1  sequence u32, t1 i64 ns
+    reply    2  sequence u32, t1 i64, t2 i64, t3 i64 ns
+    show     3  show id u32, start i64 ns (leader clock), name length u16, UTF-8 name
+"""
+import logging
+import select
+import socket
+import struct
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, Optional, Tuple
+
+log = logging.getLogger("bongo.sync")
+
+DEFAULT_PORT = 9740
+MAGIC = b"BGTS"
+VERSION = 1
+REQUEST, REPLY, SHOW = 1, 2, 3
+
+_HEADER = struct.Struct("!4sBB")
+_REQUEST = struct.Struct("!4sBBIq")
+_REPLY = struct.Struct("!4sBBIqqq")
+_SHOW = struct.Struct("!4sBBIqH")
+_MAX_NAME = 255
+
+
+def request_packet(sequence: int, t1: int) -> bytes:
+    return _REQUEST.pack(MAGIC, VERSION, REQUEST, sequence & 0xFFFFFFFF, t1)
+
+
+def reply_packet(sequence: int, t1: int, t2: int, t3: int) -> bytes:
+    return _REPLY.pack(MAGIC, VERSION, REPLY, sequence, t1, t2, t3)
+
+
+def show_packet(show_id: int, start: int, name: str) -> bytes:
+    encoded = name.encode()
+    if len(encoded) > _MAX_NAME:
+        raise ValueError(f"Show names are limited to {_MAX_NAME} bytes.")
+    return _SHOW.pack(MAGIC, VERSION, SHOW, show_id & 0xFFFFFFFF, start, len(encoded)) + encoded
+
+
+def parse_packet(data: bytes) -> Optional[Tuple]:
+    """
+    Returns (REQUEST, sequence, t1), (REPLY, sequence, t1, t2, t3) or
+    (SHOW, show_id, start, name), or None if `data` isn't a valid packet.
+    """
+    if len(data) < _HEADER.size:
+        return None
+    magic, version, kind = _HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        return None
+    if kind == REQUEST and len(data) == _REQUEST.size:
+        return (REQUEST,) + _REQUEST.unpack(data)[3:]
+    if kind == REPLY and len(data) == _REPLY.size:
+        return (REPLY,) + _REPLY.unpack(data)[3:]
+    if kind == SHOW and len(data) >= _SHOW.size:
+        show_id, start, length = _SHOW.unpack_from(data)[3:]
+        if len(data) != _SHOW.size + length:
+            return None
+        try:
+            return SHOW, show_id, start, data[_SHOW.size:].decode()
+        except UnicodeDecodeError:
+            return None
+    return None
+
+
+class ClockModel:
+    """
+    Maps this node's time.monotonic() onto the leader's, as an offset plus a
+    skew (see the module docstring). A fresh model is the identity, which is
+    exactly right on the leader itself.
+    """
+
+    def __init__(self, window: int = 64, min_samples: int = 4, skew_span: float = 2.0,
+                 max_skew: float = 500e-6, step_threshold: float = 0.05):
+        """
+        Args:
+            window: How many recent exchanges the fit uses.
+            min_samples: Exchanges needed before the model counts as locked.
+            skew_span: Seconds the samples must span before skew is estimated
+                       (until then it is taken as zero).
+            max_skew: Largest believable skew; crystals are within +-100 ppm.
+            step_threshold: A sample this far (seconds) from the model's
+                            prediction means the leader restarted or its clock
+                            jumped, and the model starts over.
+        """
+        self.min_samples = min_samples
+        self.skew_span = skew_span
+        self.max_skew = max_skew
+        self.step_threshold = step_threshold
+        self.steps: int = 0
+        self.last_delay: Optional[float] = None
+        self._samples = deque(maxlen=window)  # (local midpoint, offset, delay)
+        # (reference local time, offset at the reference, skew), replaced whole
+        # so the render thread always reads a consistent model.
+        self._model: Tuple[float, float, float] = (0.0, 0.0, 0.0)
+        self._anchor: Optional[float] = None
+        self._locked = False
+
+    @property
+    def locked(self) -> bool:
+        return self._locked
+
+    @property
+    def offset(self) -> float:
+        """The leader's clock minus this node's, in seconds, right now."""
+        now = time.monotonic()
+        return self.to_leader(now) - now
+
+    @property
+    def skew(self) -> float:
+        """How much faster the leader's clock runs than this node's (0.00005 = 50 ppm)."""
+        return self._model[2]
+
+    def to_leader(self, local: float) -> float:
+        reference, offset, skew = self._model
+        return local + offset + skew * (local - reference)
+
+    def to_local(self, leader: float) -> float:
+        reference, offset, skew = self._model
+        return (leader - offset + skew * reference) / (1.0 + skew)
+
+    def reanchor(self):
+        """Makes render time equal this node's monotonic time again, from now on."""
+        now = time.monotonic()
+        self._anchor = self.to_leader(now) - now
+
+    def render_time(self, leader: float) -> float:
+        """
+        The time to render (tick the manager at) for the instant `leader`.
+
+        This is leader time less a constant fixed at the last reanchor(), so it
+        stays close to this node's monotonic time but advances at the
+        leader's rate. Patterns scheduled in render time from a show's start
+        therefore stay in step with the leader for the whole show.
+        """
+        if self._anchor is None:
+            self.reanchor()
+        return leader - self._anchor
+
+    def add_sample(self, t1: float, t2: float, t3: float, t4: float) -> bool:
+        """
+        Adds one exchange (seconds; t1 and t4 local, t2 and t3 leader) and
+        refits the model. Returns False if the sample was unusable.
+        """
+        delay = (t4 - t1) - (t3 - t2)
+        if delay < 0 or t4 < t1:
+            return False
+        offset = ((t2 - t1) + (t3 - t4)) / 2.0
+        midpoint = (t1 + t4) / 2.0
+        if self._locked and abs(midpoint + offset - self.to_leader(midpoint)) > self.step_threshold:
+            log.warning(f"Leader clock moved by {offset - (self.to_leader(midpoint) - midpoint):+.3f}s; "
+                        "resynchronizing.")
+            self._samples.clear()
+            self._locked = False
+            self._anchor = None
+            self.steps += 1
+        self.last_delay = delay
+        self._samples.append((midpoint, offset, delay))
+        self._fit()
+        if not self._locked and len(self._samples) >= self.min_samples:
+            self._locked = True
+            log.info(f"Locked to the leader: offset {self.offset:+.6f}s, round trip {delay * 1e6:.0f} us.")
+        return True
+
+    def _fit(self):
+        samples = self._samples
+        best = min(sample[2] for sample in samples)
+        good = [sample for sample in samples if sample[2] <= 2.0 * best + 100e-6]
+        reference = good[-1][0]
+        skew = 0.0
+        if len(good) >= 3 and good[-1][0] - good[0][0] >= self.skew_span:
+            mean_t = sum(sample[0] for sample in good) / len(good)
+            mean_offset = sum(sample[1] for sample in good) / len(good)
+            variance = sum((sample[0] - mean_t) ** 2 for sample in good)
+            covariance = sum((sample[0] - mean_t) * (sample[1] - mean_offset) for sample in good)
+            skew = max(-self.max_skew, min(self.max_skew, covariance / variance))
+            offset = mean_offset + skew * (reference - mean_t)
+        else:
+            offsets = sorted(sample[1] for sample in good)
+            offset = offsets[len(offsets) // 2]
+        self._model = (reference, offset, skew)
+
+
+class TimeSyncLeader:
+    """Answers followers' time requests and announces show starts."""
+
+    def __init__(self, host: str = "0.0.0.0", port: int = DEFAULT_PORT, announce_interval: float = 1.0,
+                 follower_timeout: float = 10.0, time_source: Callable[[], int] = time.monotonic_ns):
+        """
+        Args:
+            host, port: Where to listen (port 0 picks a free one; see `address`).
+            announce_interval: Seconds between repeats of the current show announcement.
+            follower_timeout: Followers not heard from for this long stop getting announcements.
+            time_source: The leader clock in nanoseconds; tests pass an offset
+                         or skewed clock here to stand in for a second machine.
+        """
+        self.clock = ClockModel()  # the identity: the leader is the time base
+        self.announce_interval = announce_interval
+        self.follower_timeout = follower_timeout
+        self.time_source = time_source
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.sock.bind((host, port))
+        self.address = self.sock.getsockname()
+        self.followers: Dict[Tuple[str, int], float] = {}
+        self.requests = 0
+        self.show_id = 0
+        self._show: Optional[bytes] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = threading.Event()
+
+    def announce_show(self, name: str, start_in: float = 2.0) -> float:
+        """
+        Tells every follower that show `name` starts `start_in` seconds from
+        now, and keeps repeating it for followers that join later.
+
+        Returns:
+            The start time on this node's clock (use it as start_time_base).
+        """
+        start = self.time_source() + int(start_in * 1e9)
+        self.show_id += 1
+        self._show = show_packet(self.show_id, start, name)
+        self._send_show()
+        log.info(f"Announced show '{name}' (#{self.show_id}) to {len(self.followers)} followers, "
+                 f"starting in {start_in:.2f}s.")
+        return time.monotonic() + start_in
+
+    def _send_show(self):
+        if self._show is None:
+            return
+        now = time.monotonic()
+        for address, last_seen in list(self.followers.items()):
+            if now - last_seen > self.follower_timeout:
+                del self.followers[address]
+                continue
+            try:
+                self.sock.sendto(self._show, address)
+            except OSError as e:
+                log.debug(f"Could not send the show to {address}: {e}")
+
+    def handle_packet(self, data: bytes, address, received: int):
+        """Answers one packet that arrived at `received` (leader clock, ns)."""
+        packet = parse_packet(data)
+        if packet is None or packet[0] != REQUEST:
+            return
+        _, sequence, t1 = packet
+        self.sock.sendto(reply_packet(sequence, t1, received, self.time_source()), address)
+        self.requests += 1
+        if address not in self.followers:
+            log.info(f"Follower {address[0]}:{address[1]} joined.")
+            self.followers[address] = time.monotonic()
+            if self._show is not None:
+                self.sock.sendto(self._show, address)
+        else:
+            self.followers[address] = time.monotonic()
+
+    def poll(self, timeout: float = 0.0) -> int:
+        """Handles the packets waiting (for up to `timeout` seconds for the first); returns how many."""
+        handled = 0
+        while select.select([self.sock], [], [], timeout if not handled else 0.0)[0]:
+            try:
+                data, address = self.sock.recvfrom(512)
+            except OSError:
+                break
+            self.handle_packet(data, address, self.time_source())
+            handled += 1
+        return handled
+
+    def start(self):
+        """Serves followers on a background thread until stop()."""
+        if self._thread is not None:
+            return
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._serve, name="bongo-sync-leader", daemon=True)
+        self._thread.start()
+        log.info(f"Time sync leader listening on {self.address[0]}:{self.address[1]}.")
+
+    def _serve(self):
+        next_announce = time.monotonic() + self.announce_interval
+        while not self._stopping.is_set():
+            try:
+                self.poll(timeout=max(0.0, min(0.1, next_announce - time.monotonic())))
+            except OSError:
+                if self._stopping.is_set():
+                    break
+                log.error("Time sync leader failed to answer a request.", exc_info=True)
+            if time.monotonic() >= next_announce:
+                self._send_show()
+                next_announce = time.monotonic() + self.announce_interval
+
+    def stop(self):
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def close(self):
+        self.stop()
+        self.sock.close()
+
+
+class TimeSyncFollower:
+    """Keeps a ClockModel locked to a TimeSyncLeader and receives its show announcements."""
+
+    def __init__(self, leader_host: str, port: int = DEFAULT_PORT, interval: float = 0.5,
+                 on_show: Optional[Callable[[str, float], None]] = None, burst: int = 8,
+                 burst_interval: float = 0.05):
+        """
+        Args:
+            leader_host, port: The leader's address.
+            interval: Seconds between exchanges once locked.
+            on_show: Called as on_show(name, start) on the sync thread when a
+                     new show is announced; `start` is in render time (see
+                     ClockModel.render_time()), ready for start_time_base.
+            burst, burst_interval: The first `burst` exchanges are sent this
+                                   quickly, so the node locks within a second.
+        """
+        self.clock = ClockModel()
+        self.interval = interval
+        self.on_show = on_show
+        self.burst = burst
+        self.burst_interval = burst_interval
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.connect((leader_host, port))  # only the leader's packets are delivered
+        self.requests = 0
+        self.replies = 0
+        self.show_name: Optional[str] = None
+        self.show_start: Optional[float] = None
+        self._show_key: Optional[Tuple[int, int]] = None
+        self._pending_show: Optional[Tuple[int, int, str]] = None
+        self._sent: Dict[int, int] = {}
+        self._sequence = 0
+        self._locked = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = threading.Event()
+
+    def wait_locked(self, timeout: Optional[float] = None) -> bool:
+        """Blocks until the clock model has locked. Returns False on timeout."""
+        return self._locked.wait(timeout)
+
+    def request(self):
+        """Sends one time request to the leader."""
+        self._sequence = (self._sequence + 1) & 0xFFFFFFFF
+        t1 = time.monotonic_ns()
+        self._sent[self._sequence] = t1
+        if len(self._sent) > 16:  # replies that never came
+            del self._sent[next(iter(self._sent))]
+        self.sock.send(request_packet(self._sequence, t1))
+        self.requests += 1
+
+    def handle_packet(self, data: bytes, received: int):
+        """Applies one packet from the leader that arrived at `received` (local clock, ns)."""
+        packet = parse_packet(data)
+        if packet is None:
+            return
+        if packet[0] == REPLY:
+            _, sequence, t1, t2, t3 = packet
+            if self._sent.pop(sequence, None) != t1:
+                return  # a reply to a request we gave up on, or a stray packet
+            self.replies += 1
+            self.clock.add_sample(t1 / 1e9, t2 / 1e9, t3 / 1e9, received / 1e9)
+            if self.clock.locked:
+                self._locked.set()
+                if self._pending_show is not None:
+                    self._start_show(*self._pending_show)
+            else:
+                self._locked.clear()
+        elif packet[0] == SHOW:
+            _, show_id, start, name = packet
+            if self.clock.locked:
+                self._start_show(show_id, start, name)
+            else:
+                self._pending_show = (show_id, start, name)
+
+    def _start_show(self, show_id: int, start: int, name: str):
+        self._pending_show = None
+        if (show_id, start) == self._show_key:
+            return  # a repeat of the current show
+        self._show_key = (show_id, start)
+        self.clock.reanchor()
+        self.show_name = name
+        self.show_start = self.clock.render_time(start / 1e9)
+        log.info(f"Show '{name}' (#{show_id}) starts in {self.show_start - time.monotonic():.3f}s.")
+        if self.on_show is not None:
+            try:
+                self.on_show(name, self.show_start)
+            except Exception:
+                log.error(f"Failed to start show '{name}'.", exc_info=True)
+
+    def poll(self, timeout: float = 0.0) -> int:
+        """Handles the packets waiting (for up to `timeout` seconds for the first); returns how many."""
+        handled = 0
+        while select.select([self.sock], [], [], timeout if not handled else 0.0)[0]:
+            try:
+                data = self.sock.recv(512)
+            except ConnectionRefusedError:
+                break  # the leader isn't up (yet); the next request retries
+            self.handle_packet(data, time.monotonic_ns())
+            handled += 1
+        return handled
+
+    def start(self):
+        """Synchronizes on a background thread until stop()."""
+        if self._thread is not None:
+            return
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._serve, name="bongo-sync-follower", daemon=True)
+        self._thread.start()
+
+    def _serve(self):
+        while not self._stopping.is_set():
+            try:
+                self.request()
+            except OSError as e:
+                log.debug(f"Time request failed: {e}")
+            fast = self.requests <= self.burst or not self.clock.locked
+            deadline = time.monotonic() + (self.burst_interval if fast else self.interval)
+            while not self._stopping.is_set():
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    self.poll(timeout=min(remaining, 0.1))
+                except OSError:
+                    if self._stopping.is_set():
+                        return
+                    log.error("Time sync follower failed to read a packet.", exc_info=True)
+
+    def stop(self):
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def close(self):
+        self.stop()
+        self.sock.close()
@@ -0,0 +1,134 @@
+# src/bongo/utils/gc_control.py
+"""
+Opt-in "pause-free" garbage collection for the render loop.
+
+CPython's cyclic collector runs whenever enough objects have been allocated,
+which during a long show means a generation-2 collection can land in the middle
+of a frame. GCController takes that decision away from the allocator:
+
+- enable() collects once, moves every surviving object (modules, the compiled
+  layout, loaded patterns, ...) into the permanent generation with gc.freeze()
+  so later collections never scan them, and turns automatic collection off.
+- The runners then call collect_in_gap() with the time left before the next
+  frame (or the length of an idle period), and a collection is only run when
+  it fits.
+- freeze() can be called again after loading more patterns or config;
+  freeze_soon() does so on the render thread, once the manager has admitted
+  everything submitted so far (used after show and control-socket loads).
+
+While the mode is enabled, every collection's pause is reported through
+RenderMetrics (when metrics are given), whether it was scheduled here or not.
+"""
+import gc
+import logging
+import time
+from typing import Optional
+
+log = logging.getLogger("bongo.gc")
+
+
+class GCController:
+    """Schedules garbage collection into the gaps between frames."""
+
+    def __init__(self, metrics=None, young_gap: float = 0.001, full_gap: float = 0.005):
+        """
+        Args:
+            metrics: Optional RenderMetrics to report pause times to.
+            young_gap: Minimum gap (seconds) in which to run a generation-0/1 collection.
+            full_gap: Minimum gap (seconds) in which to run a full collection.
+        """
+        self.metrics = metrics
+        self.young_gap = young_gap
+        self.full_gap = full_gap
+        self.enabled: bool = False
+        self.last_pause: float = 0.0
+        self.max_pause: float = 0.0
+        self._collect_started: Optional[float] = None
+        self._was_automatic: bool = gc.isenabled()
+
+    # --- Mode --------------------------------------------------------------
+    def enable(self):
+        """Freezes the startup heap and switches to scheduled collections."""
+        if self.enabled:
+            return
+        self._was_automatic = gc.isenabled()
+        if self._on_gc not in gc.callbacks:
+            gc.callbacks.append(self._on_gc)
+        gc.disable()
+        self.enabled = True
+        self.freeze()
+        log.info(f"GC-pause-free mode enabled ({gc.get_freeze_count()} objects frozen).")
+
+    def disable(self):
+        """Restores automatic collection. Frozen objects stay frozen."""
+        if not self.enabled:
+            return
+        self.enabled = False
+        if self._on_gc in gc.callbacks:
+            gc.callbacks.remove(self._on_gc)
+        if self._was_automatic:
+            gc.enable()
+
+    def freeze(self):
+        """
+        Collects, then moves everything that survived into the permanent
+        generation. Call after loading config or patterns.
+        """
+        gc.collect()
+        gc.freeze()
+        if self.metrics is not None:
+            self.metrics.gc_frozen_objects.set(gc.get_freeze_count())
+
+    def freeze_soon(self, animation_manager):
+        """
+        Freezes at the manager's next frame boundary, after the patterns
+        submitted so far have been admitted. Does nothing unless the mode is
+        enabled by then.
+        """
+        animation_manager.call_soon(self._freeze_if_enabled)
+
+    def _freeze_if_enabled(self):
+        if self.enabled:
+            self.freeze()
+            log.debug(f"Heap frozen after a pattern load ({gc.get_freeze_count()} objects frozen).")
+
+    # --- Scheduling --------------------------------------------------------
+    def collect_in_gap(self, gap: float) -> Optional[int]:
+        """
+        Runs the oldest collection that is due and fits in `gap` seconds.
+
+        A generation is due when its gc.get_count() value has reached the usual
+        gc.get_threshold() value, i.e. when CPython would have collected it
+        automatically. Due collections that don't fit wait for a longer gap.
+
+        Returns:
+            The generation collected, or None if nothing was run.
+        """
+        if not self.enabled:
+            return None
+        young, middle, old = gc.get_count()
+        threshold0, threshold1, threshold2 = gc.get_threshold()
+        if gap >= self.full_gap and old >= threshold2:
+            generation = 2
+        elif gap >= self.young_gap and middle >= threshold1:
+            generation = 1
+        elif gap >= self.young_gap and young >= threshold0:
+            generation = 0
+        else:
+            return None
+        gc.collect(generation)
+        return generation
+
+    # --- Reporting ---------------------------------------------------------
+    def _on_gc(self, phase, info):
+        if phase == "start":
+            self._collect_started = time.perf_counter()
+            return
+        if self._collect_started is None:
+            return
+        pause = time.perf_counter() - self._collect_started
+        self._collect_started = None
+        self.last_pause = pause
+        self.max_pause = max(self.max_pause, pause)
+        if self.metrics is not None:
+            self.metrics.gc_pause_seconds.labels(str(info.get("generation"))).observe(pause)
@@ -1,8 +1,25 @@
 # src/bongo/utils/logger.py
+import atexit
 import logging
+import queue
 import sys
-from logging.handlers import RotatingFileHandler
-from typing import Dict, Any
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Dict, Any, Optional
+
+# The listener that owns the real (console/file) handlers; see setup_logging().
+_listener: Optional[QueueListener] = None
+
+
+class _DeferredQueueHandler(QueueHandler):
+    """
+    A QueueHandler that enqueues records as they are. The stdlib one formats
+    each record (message, exception and traceback text) on the calling
+    thread in prepare(); here the listener's handlers do it. Log arguments
+    are therefore read on the listener thread, after the call returns.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
 
 
 def setup_logging(config: Dict[str, Any] = None):
@@ -13,6 +30,11 @@ def setup_logging(config: Dict[str, Any] = None):
     1. A StreamHandler to print logs to the console (stdout).
     2. A RotatingFileHandler to write logs to a file, with automatic rotation.
 
+    Neither is attached to the logger directly. The 'bongo' logger only gets a
+    QueueHandler, and a QueueListener thread feeds the records to the real
+    handlers, so formatting and console and disk I/O never happen on the
+    render thread.
+
     The log level and file path are determined by the provided configuration,
     with sensible defaults.
 
@@ -21,7 +43,12 @@ def setup_logging(config: Dict[str, Any] = None):
                                             typically loaded from a config file.
                                             Expected keys: 'level', 'filepath'.
                                             Defaults to None.
+
+    Returns:
+        The running QueueListener. It is stopped (and the queue flushed) at
+        interpreter exit, or explicitly with stop_logging().
     """
+    global _listener
     if config is None:
         config = {}
 
@@ -37,15 +64,17 @@ def setup_logging(config: Dict[str, Any] = None):
     root_logger.setLevel(log_level)
 
     # Prevent adding duplicate handlers if this function is called multiple times
+    stop_logging()
     if root_logger.hasHandlers():
         root_logger.handlers.clear()
+    handlers = []
 
     # Create a console handler
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setLevel(log_level)
     console_formatter = logging.Formatter('%(name)s - %(levelname)s - %(message)s')
     console_handler.setFormatter(console_formatter)
-    root_logger.addHandler(console_handler)
+    handlers.append(console_handler)
 
     # Create a rotating file handler
     try:
@@ -54,9 +83,33 @@ def setup_logging(config: Dict[str, Any] = None):
         file_handler.setLevel(log_level)
         file_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
         file_handler.setFormatter(file_formatter)
-        root_logger.addHandler(file_handler)
+        handlers.append(file_handler)
+        file_error = None
     except (IOError, PermissionError) as e:
-        root_logger.error(f"Could not open log file '{log_filepath}': {e}. Logging to console only.")
+        file_error = e
+
+    # The render thread only pays for an unbounded queue put; the listener
+    # thread does the formatting and the writes.
+    log_queue = queue.SimpleQueue()
+    root_logger.addHandler(_DeferredQueueHandler(log_queue))
+    _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
 
+    if file_error is not None:
+        root_logger.error(f"Could not open log file '{log_filepath}': {file_error}. Logging to console only.")
     root_logger.info(f"Logging initialized. Level: {log_level_str}, File: '{log_filepath}'")
+    return _listener
+
+
+def stop_logging():
+    """Flushes queued log records and stops the background listener, if any."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+
+atexit.register(stop_logging)
 
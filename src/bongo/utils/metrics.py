@@ -0,0 +1,301 @@
+# src/bongo/utils/metrics.py
+"""
+Low-overhead telemetry for the render loop.
+
+Recording is kept cheap enough for the hot path: counters and gauges are plain
+attribute updates and histograms use a fixed list of bucket bounds. Nothing is
+formatted or written on the render thread. Exporters take periodic snapshots on
+their own background threads:
+
+- PrometheusTextfileExporter rewrites a Prometheus text-format file (e.g. for the
+  node_exporter textfile collector) every few seconds.
+- UnixSocketExporter serves the same text to anyone who connects to a local
+  Unix-domain socket (e.g. `socat - UNIX-CONNECT:/tmp/bongo-metrics.sock`).
+"""
+import logging
+import os
+import socket
+import threading
+from bisect import bisect_left
+from typing import Dict, List, Optional, Sequence, Tuple
+
+log = logging.getLogger("bongo.metrics")
+
+# Default histogram bounds (seconds) for per-frame phase durations at 60 FPS.
+FRAME_PHASE_BUCKETS = (0.0005, 0.001, 0.002, 0.004, 0.008, 0.0167, 0.033, 0.05, 0.1)
+
+# Bounds (seconds) for garbage-collection pauses.
+GC_PAUSE_BUCKETS = (0.0001, 0.0005, 0.001, 0.002, 0.005, 0.01, 0.02, 0.05)
+
+# A PCA9685 duty-cycle update is one I2C write: the register address plus the
+# four LEDn_ON/LEDn_OFF bytes.
+PCA9685_WRITE_BYTES = 5
+
+
+class Counter:
+    """A monotonically increasing value."""
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0
+
+    def inc(self, amount: float = 1):
+        self.value += amount
+
+
+class Gauge:
+    """A value that can go up and down."""
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0.0
+
+    def set(self, value: float):
+        self.value = value
+
+
+class Histogram:
+    """A histogram with fixed, pre-sorted bucket upper bounds."""
+    __slots__ = ("bounds", "counts", "sum", "count")
+
+    def __init__(self, bounds: Sequence[float] = FRAME_PHASE_BUCKETS):
+        self.bounds = tuple(sorted(bounds))
+        self.counts = [0] * (len(self.bounds) + 1)  # last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class MetricFamily:
+    """
+    A named metric with optional labels. Children are created on first use of
+    a label value and then cached, so repeated lookups are a dict access.
+    """
+
+    def __init__(self, name: str, help_text: str, kind: str, label: Optional[str] = None,
+                 buckets: Sequence[float] = FRAME_PHASE_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.kind = kind
+        self.label = label
+        self._buckets = buckets
+        self._children: Dict[object, object] = {}
+        self._lock = threading.Lock()
+        if label is None:
+            self._unlabelled = self._new_child()
+
+    def _new_child(self):
+        if self.kind == "counter":
+            return Counter()
+        if self.kind == "gauge":
+            return Gauge()
+        return Histogram(self._buckets)
+
+    def labels(self, value):
+        child = self._children.get(value)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(value, self._new_child())
+        return child
+
+    def children(self) -> List[Tuple[Optional[object], object]]:
+        if self.label is None:
+            return [(None, self._unlabelled)]
+        with self._lock:
+            return list(self._children.items())
+
+    # Unlabelled shortcuts.
+    def inc(self, amount: float = 1):
+        self._unlabelled.value += amount
+
+    def set(self, value: float):
+        self._unlabelled.value = value
+
+    def observe(self, value: float):
+        self._unlabelled.observe(value)
+
+    @property
+    def value(self):
+        return self._unlabelled.value
+
+
+class MetricsRegistry:
+    """A collection of metric families that can be rendered as Prometheus text."""
+
+    def __init__(self):
+        self._families: Dict[str, MetricFamily] = {}
+
+    def _register(self, family: MetricFamily) -> MetricFamily:
+        if family.name in self._families:
+            raise ValueError(f"Metric '{family.name}' is already registered.")
+        self._families[family.name] = family
+        return family
+
+    def counter(self, name: str, help_text: str, label: str = None) -> MetricFamily:
+        return self._register(MetricFamily(name, help_text, "counter", label))
+
+    def gauge(self, name: str, help_text: str, label: str = None) -> MetricFamily:
+        return self._register(MetricFamily(name, help_text, "gauge", label))
+
+    def histogram(self, name: str, help_text: str, label: str = None,
+                  buckets: Sequence[float] = FRAME_PHASE_BUCKETS) -> MetricFamily:
+        return self._register(MetricFamily(name, help_text, "histogram", label, buckets))
+
+    def get(self, name: str) -> Optional[MetricFamily]:
+        return self._families.get(name)
+
+    def render_prometheus(self) -> str:
+        """Renders every metric in the Prometheus text exposition format."""
+        lines = []
+        for family in self._families.values():
+            lines.append(f"# HELP {family.name} {family.help_text}")
+            lines.append(f"# TYPE {family.name} {family.kind}")
+            for label_value, child in family.children():
+                label = f'{family.label}="{label_value}"' if family.label is not None else ""
+                if family.kind == "histogram":
+                    cumulative = 0
+                    for bound, count in zip(list(child.bounds) + [None], child.counts):
+                        cumulative += count
+                        le = "+Inf" if bound is None else repr(bound)
+                        sep = "," if label else ""
+                        lines.append(f'{family.name}_bucket{{{label}{sep}le="{le}"}} {cumulative}')
+                    suffix = f"{{{label}}}" if label else ""
+                    lines.append(f"{family.name}_sum{suffix} {child.sum}")
+                    lines.append(f"{family.name}_count{suffix} {child.count}")
+                else:
+                    suffix = f"{{{label}}}" if label else ""
+                    lines.append(f"{family.name}{suffix} {child.value}")
+        return "\n".join(lines) + "\n"
+
+
+class RenderMetrics:
+    """
+    The metric set recorded by the AnimationManager and the runners.
+
+    Pass an instance as `metrics=` to AnimationManager / AnimationRunner. The
+    hot path only touches the attributes below; rendering and export happen
+    elsewhere.
+    """
+
+    def __init__(self, registry: Optional[MetricsRegistry] = None):
+        self.registry = registry if registry is not None else MetricsRegistry()
+        r = self.registry
+        self.tick_seconds = r.histogram(
+            "bongo_tick_phase_seconds", "Time spent per tick in each phase.", label="phase")
+        self.evaluate_seconds = self.tick_seconds.labels("evaluate")
+        self.composite_seconds = self.tick_seconds.labels("composite")
+        self.flush_seconds = self.tick_seconds.labels("flush")
+        self.total_seconds = self.tick_seconds.labels("total")
+        self.frames = r.counter("bongo_frames_total", "Frames rendered.")
+        self.frame_overruns = r.counter(
+            "bongo_frame_overruns_total", "Frames whose tick took longer than the frame period.")
+        self.i2c_transactions = r.counter(
+            "bongo_i2c_transactions_total", "I2C writes issued, per PCA9685 board.", label="board")
+        self.i2c_bytes = r.counter(
+            "bongo_i2c_bytes_total", "I2C payload bytes written, per PCA9685 board.", label="board")
+        self.gpio_writes = r.counter("bongo_gpio_writes_total", "Direct GPIO pin writes.")
+        self.active_operations = r.gauge("bongo_active_operations", "Operations currently being evaluated.")
+        self.scheduled_operations = r.gauge(
+            "bongo_scheduled_operations", "Operations waiting for their start time.")
+        self.submission_queue_depth = r.gauge(
+            "bongo_submission_queue_depth", "Submitted batches not yet admitted by tick().")
+        self.idle_percentage = r.gauge("bongo_idle_percentage", "Share of wall-clock time spent idle.")
+        self.gc_pause_seconds = r.histogram(
+            "bongo_gc_pause_seconds", "Garbage-collection pauses, per generation.", label="generation",
+            buckets=GC_PAUSE_BUCKETS)
+        self.gc_frozen_objects = r.gauge(
+            "bongo_gc_frozen_objects", "Objects moved to the permanent generation by gc.freeze().")
+
+    def record_board_write(self, board):
+        """Counts one hardware write to the given board (None for GPIO)."""
+        if board is None:
+            self.gpio_writes.inc()
+            return
+        label = hex(board) if isinstance(board, int) else board
+        self.i2c_transactions.labels(label).value += 1
+        self.i2c_bytes.labels(label).value += PCA9685_WRITE_BYTES
+
+
+class PrometheusTextfileExporter:
+    """Periodically writes a registry to a Prometheus text file."""
+
+    def __init__(self, registry: MetricsRegistry, path: str, interval: float = 10.0):
+        self.registry = registry
+        self.path = path
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def write_once(self):
+        """Writes the file atomically (via rename) so readers never see a partial file."""
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            f.write(self.registry.render_prometheus())
+        os.replace(tmp_path, self.path)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.write_once()
+            except OSError as e:
+                log.warning(f"Could not write metrics file '{self.path}': {e}")
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="bongo-metrics-textfile", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+
+class UnixSocketExporter:
+    """Serves the registry's Prometheus text to each client of a Unix socket."""
+
+    def __init__(self, registry: MetricsRegistry, path: str):
+        self.registry = registry
+        self.path = path
+        self._sock: Optional[socket.socket] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+        self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._sock.bind(self.path)
+        self._sock.listen(4)
+        self._thread = threading.Thread(target=self._serve, name="bongo-metrics-socket", daemon=True)
+        self._thread.start()
+
+    def _serve(self):
+        sock = self._sock
+        while True:
+            try:
+                conn, _ = sock.accept()
+            except OSError:
+                return  # socket closed by stop()
+            with conn:
+                try:
+                    conn.sendall(self.registry.render_prometheus().encode())
+                except OSError:
+                    pass
+
+    def stop(self):
+        if self._sock is not None:
+            try:
+                self._sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            self._sock.close()
+            self._sock = None
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+        if os.path.exists(self.path):
+            os.unlink(self.path)
@@ -0,0 +1,228 @@
+# src/bongo/utils/tracing.py
+"""
+Opt-in frame tracing, exported as Chrome trace-event JSON.
+
+When enabled, the render loop records begin/end spans for AnimationManager.tick
+and its phases, per-board flushes, pattern generation, PatternOrchestrator
+composition and (optionally) garbage collections into a preallocated ring
+buffer. The buffer can be dumped on a signal (SIGUSR1 by default) or on a frame
+overrun, and the resulting file opened in Perfetto (ui.perfetto.dev) or
+chrome://tracing to see which phase blew the frame budget.
+
+Tracing is disabled by default; every instrumentation point first checks
+get_tracer() and does nothing when it returns None.
+"""
+import contextlib
+import functools
+import gc
+import json
+import logging
+import os
+import signal
+import threading
+import time
+from typing import List, Optional
+
+log = logging.getLogger("bongo.tracing")
+
+_NULL_SPAN = contextlib.nullcontext()
+
+
+class FrameTracer:
+    """Records complete spans into a fixed-size ring buffer."""
+
+    def __init__(self, capacity: int = 65536, dump_dir: str = ".", dump_on_overrun: bool = False,
+                 min_dump_interval: float = 10.0):
+        """
+        Args:
+            capacity: Number of spans kept; older spans are overwritten.
+            dump_dir: Directory that dump_async()/overrun dumps write into.
+            dump_on_overrun: If True, note_overrun() dumps the buffer.
+            min_dump_interval: Minimum seconds between overrun dumps.
+        """
+        if capacity <= 0:
+            raise ValueError("capacity must be positive.")
+        self.capacity = capacity
+        self.dump_dir = dump_dir
+        self.dump_on_overrun = dump_on_overrun
+        self.min_dump_interval = min_dump_interval
+        # Parallel, preallocated columns; recording only overwrites slots.
+        self._names: List[Optional[str]] = [None] * capacity
+        self._cats: List[Optional[str]] = [None] * capacity
+        self._starts: List[int] = [0] * capacity
+        self._durs: List[int] = [0] * capacity
+        self._tids: List[int] = [0] * capacity
+        self._next = 0
+        # Guards slot allocation: the render loop, a render-ahead output
+        # thread and the GC callback all record.
+        self._lock = threading.Lock()
+        self._origin_ns = time.perf_counter_ns()
+        self._last_dump = float("-inf")
+        self._gc_started_ns = 0
+
+    # --- Recording ---------------------------------------------------------
+    now = staticmethod(time.perf_counter_ns)
+
+    def record(self, name: str, category: str, start_ns: int, end_ns: int):
+        """Stores one complete span (timestamps from FrameTracer.now())."""
+        with self._lock:
+            index = self._next
+            self._next = index + 1
+        slot = index % self.capacity
+        self._names[slot] = name
+        self._cats[slot] = category
+        self._starts[slot] = start_ns
+        self._durs[slot] = end_ns - start_ns
+        self._tids[slot] = threading.get_ident()
+
+    @contextlib.contextmanager
+    def span(self, name: str, category: str = "bongo"):
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            self.record(name, category, start, time.perf_counter_ns())
+
+    def trace_gc(self, enabled: bool = True):
+        """Records every garbage collection as a span in the 'gc' category."""
+        if enabled and self._on_gc not in gc.callbacks:
+            gc.callbacks.append(self._on_gc)
+        elif not enabled and self._on_gc in gc.callbacks:
+            gc.callbacks.remove(self._on_gc)
+
+    def _on_gc(self, phase, info):
+        if phase == "start":
+            self._gc_started_ns = time.perf_counter_ns()
+        elif self._gc_started_ns:
+            self.record(f"gc gen{info.get('generation')}", "gc", self._gc_started_ns, time.perf_counter_ns())
+            self._gc_started_ns = 0
+
+    # --- Export ------------------------------------------------------------
+    def __len__(self):
+        return min(self._next, self.capacity)
+
+    def snapshot(self) -> dict:
+        """Returns the buffered spans, oldest first, as a Chrome trace dict."""
+        return self._trace(self._copy_columns())
+
+    def _copy_columns(self):
+        """Copies the raw columns and the span count (cheap: no per-span objects)."""
+        with self._lock:
+            recorded = self._next
+        return (recorded, self._names[:], self._cats[:], self._starts[:], self._durs[:], self._tids[:])
+
+    def _trace(self, columns) -> dict:
+        """Builds the Chrome trace dict from _copy_columns()."""
+        recorded, names, cats, starts, durs, tids = columns
+        origin = self._origin_ns
+        pid = os.getpid()
+        events = []
+        for i in range(recorded - min(recorded, self.capacity), recorded):
+            slot = i % self.capacity
+            events.append({
+                "name": names[slot],
+                "cat": cats[slot],
+                "ph": "X",
+                "ts": (starts[slot] - origin) / 1000.0,
+                "dur": durs[slot] / 1000.0,
+                "pid": pid,
+                "tid": tids[slot],
+            })
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def dump(self, path: str) -> str:
+        """Writes the buffer to `path` as Chrome trace-event JSON."""
+        trace = self.snapshot()
+        with open(path, "w") as f:
+            json.dump(trace, f)
+        log.info(f"Wrote {len(trace['traceEvents'])} trace events to '{path}'.")
+        return path
+
+    def dump_async(self, reason: str = "manual") -> str:
+        """
+        Copies the buffer's columns and builds and writes the trace on a
+        background thread, so dumping from a signal handler or the render
+        loop costs only the copy.
+        """
+        path = os.path.join(self.dump_dir, f"bongo-trace-{reason}-{int(time.time() * 1000)}.json")
+        columns = self._copy_columns()
+
+        def _write():
+            try:
+                trace = self._trace(columns)
+                with open(path, "w") as f:
+                    json.dump(trace, f)
+                log.info(f"Wrote {len(trace['traceEvents'])} trace events to '{path}'.")
+            except OSError as e:
+                log.error(f"Could not write trace file '{path}': {e}")
+
+        threading.Thread(target=_write, name="bongo-trace-dump", daemon=True).start()
+        return path
+
+    def note_overrun(self, frame_time: float, tick_seconds: float):
+        """Marks an overrun frame and, if configured, dumps the buffer (rate-limited)."""
+        end = time.perf_counter_ns()
+        self.record("frame overrun", "overrun", end - int(tick_seconds * 1e9), end)
+        if self.dump_on_overrun and frame_time - self._last_dump >= self.min_dump_interval:
+            self._last_dump = frame_time
+            self.dump_async("overrun")
+
+
+# --- Module-level tracer ----------------------------------------------------
+_tracer: Optional[FrameTracer] = None
+
+
+def get_tracer() -> Optional[FrameTracer]:
+    """Returns the active tracer, or None when tracing is disabled."""
+    return _tracer
+
+
+def enable_tracing(capacity: int = 65536, **kwargs) -> FrameTracer:
+    """Creates and activates the process-wide tracer."""
+    global _tracer
+    _tracer = FrameTracer(capacity, **kwargs)
+    return _tracer
+
+
+def disable_tracing():
+    global _tracer
+    if _tracer is not None:
+        _tracer.trace_gc(False)
+    _tracer = None
+
+
+def traced(name: str, category: str = "bongo"):
+    """A span context manager that is a shared no-op when tracing is off."""
+    tracer = _tracer
+    if tracer is None:
+        return _NULL_SPAN
+    return tracer.span(name, category)
+
+
+def trace_calls(category: str = "bongo"):
+    """Decorator that records each call of the function as a span when tracing is on."""
+    def decorator(func):
+        name = func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            tracer = _tracer
+            if tracer is None:
+                return func(*args, **kwargs)
+            start = time.perf_counter_ns()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                tracer.record(name, category, start, time.perf_counter_ns())
+        return wrapper
+    return decorator
+
+
+def install_signal_handler(signum: int = signal.SIGUSR1):
+    """Dumps the active tracer's buffer whenever `signum` is received."""
+    def _handler(signo, frame):
+        tracer = _tracer
+        if tracer is not None:
+            tracer.dump_async("signal")
+
+    signal.signal(signum, _handler)
@@ -0,0 +1,17 @@
+#!/usr/bin/env python3
+"""
+Run the benchmark tests (startup time, tick cost, throughput budgets).
+"""
+
+import sys
+from pathlib import Path
+import pytest
+
+# Add src/ to sys.path
+project_root = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(project_root / "src"))
+
+# Run tests
+if __name__ == "__main__":
+    print("Running benchmark tests...")
+    sys.exit(pytest.main([str(Path(__file__).resolve().parent), "-x"]))
@@ -0,0 +1,38 @@
+# tests/benchmarks/test_control_latency.py
+import statistics
+import time
+from unittest.mock import MagicMock
+
+from bongo.control.client import ControlClient
+from bongo.control.server import ControlServer
+from bongo.matrix.matrix import LEDMatrix
+from bongo.operations.animation_manager import AnimationManager
+
+ROUND_TRIPS = 2000
+# manual_cli commands should feel instant and never cost the render loop a
+# frame: the median round trip, including queuing the change, stays under 1 ms.
+MAX_MEDIAN_SECONDS = 0.001
+
+
+def test_control_round_trip_latency(tmp_path):
+    matrix = LEDMatrix(config=[], hardware_manager=MagicMock())
+    matrix.leds[(0, 0)] = MagicMock()
+    manager = AnimationManager(matrix)
+    server = ControlServer(manager, path=str(tmp_path / "control.sock"))
+    server.start()
+    samples = []
+    try:
+        with ControlClient(server.path) as client:
+            for i in range(ROUND_TRIPS):
+                began = time.perf_counter()
+                client.request("set 0 0 1" if i % 2 else "ping")
+                samples.append(time.perf_counter() - began)
+                if i % 100 == 0:
+                    manager.tick()
+    finally:
+        server.stop()
+
+    median = statistics.median(samples)
+    print(f"\ncontrol round trip: median {median * 1e6:.0f} us, "
+          f"p99 {sorted(samples)[int(len(samples) * 0.99)] * 1e6:.0f} us")
+    assert median < MAX_MEDIAN_SECONDS
@@ -0,0 +1,44 @@
+# tests/benchmarks/test_dmx_packet_rate.py
+import socket
+import time
+
+from bongo.ingest.dmx_receiver import DMXMapping, DMXReceiver, artnet_packet
+
+UNIVERSES = 32
+BURST = 256
+PACKETS = 20_000
+# A 32-universe show at 44 Hz (DMX's maximum refresh) is about 1,400
+# packets/s; the receiver must keep up with several times that on one core.
+MIN_PACKETS_PER_SECOND = 10_000
+
+
+def test_artnet_packet_rate_over_loopback():
+    size = UNIVERSES * 512
+    mapping = DMXMapping(size, ((i, i // 512, 1 + i % 512) for i in range(size)))
+    receiver = DMXReceiver(mapping, host="127.0.0.1", port=0)
+    receiver.sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4 * 1024 * 1024)
+    sender = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    handling = 0.0
+    frame = 0
+    try:
+        for _ in range(PACKETS // BURST):
+            packets = []
+            for _ in range(BURST // UNIVERSES):
+                frame += 1
+                packets.extend(artnet_packet(u, bytes([u] * 512), sequence=1 + frame % 255)
+                               for u in range(UNIVERSES))
+            for packet in packets:
+                sender.sendto(packet, receiver.address)
+            began = time.perf_counter()
+            receiver.poll()
+            handling += time.perf_counter() - began
+    finally:
+        sender.close()
+        receiver.close()
+
+    rate = receiver.packets / handling
+    print(f"\n{receiver.packets} Art-Net packets ({receiver.frames} frames) received "
+          f"at {rate:,.0f} packets/s")
+    assert receiver.packets >= PACKETS * 0.9  # loopback may drop a few under load
+    assert receiver.frames >= receiver.packets // UNIVERSES - 1
+    assert rate >= MIN_PACKETS_PER_SECOND
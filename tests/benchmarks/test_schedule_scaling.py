@@ -0,0 +1,49 @@
+# tests/benchmarks/test_schedule_scaling.py
+import time
+from unittest.mock import MagicMock
+
+from bongo.operations.animation_manager import AnimationManager
+from bongo.operations.led_operation import LEDPixelOperation
+from bongo.operations.timing_wheel import TimingWheel
+
+FPS = 60
+TICKS = 600
+# Ticking with a large schedule may cost at most this much more than with a
+# small one; a schedule whose cost grew with its size would blow far past it.
+MAX_GROWTH = 2.0
+
+
+def _tick_cost(scheduled: int) -> float:
+    """Median seconds per tick over TICKS frames with about `scheduled` future operations preloaded."""
+    wheel = TimingWheel(tick_seconds=1 / FPS)
+    manager = AnimationManager(matrix=MagicMock(), timing_wheel=wheel)
+    start = wheel.origin + 1.0
+    # One operation starts every frame for the measured window; the rest of
+    # the schedule lies hours ahead, spread across the wheel's upper levels
+    # and its lazily read source.
+    near = [((0, i % 8), LEDPixelOperation(1.0, 0.05, 0.0, 0.0, start_time=start + i / FPS))
+            for i in range(TICKS)]
+    for coords, op in near:
+        manager.add_operation(coords[0], coords[1], op)
+    far_start = start + 3600.0
+    manager.add_schedule_source(
+        ((1, i % 8), LEDPixelOperation(1.0, 0.05, 0.0, 0.0, start_time=far_start + i * 0.02))
+        for i in range(scheduled))
+    for i in range(scheduled // 4):
+        op = LEDPixelOperation(1.0, 0.05, 0.0, 0.0, start_time=start + 600.0 + i * 0.05)
+        manager.add_operation(2, i % 8, op)
+
+    samples = []
+    for frame in range(TICKS):
+        t = start + frame / FPS
+        began = time.perf_counter()
+        manager.tick(t)
+        samples.append(time.perf_counter() - began)
+    samples.sort()
+    return samples[len(samples) // 2]
+
+
+def test_tick_cost_is_flat_as_the_schedule_grows():
+    small = min(_tick_cost(1_000) for _ in range(3))
+    large = min(_tick_cost(400_000) for _ in range(3))
+    assert large <= small * MAX_GROWTH
@@ -0,0 +1,60 @@
+# tests/benchmarks/test_startup_time.py
+import os
+import re
+import subprocess
+import sys
+
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Cumulative import time budget for `import bongo.app`, in milliseconds.
+# Slower boards (e.g. a Pi Zero) can raise it with BONGO_IMPORT_BUDGET_MS.
+IMPORT_BUDGET_MS = float(os.getenv("BONGO_IMPORT_BUDGET_MS", "150"))
+
+# Modules that must only be imported once a backend actually needs them.
+LAZY_MODULES = ["board", "busio", "adafruit_pca9685", "RPi", "RPi.GPIO", "unittest.mock",
+                "bongo.patterns.builtin_patterns"]
+
+_IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def _measure_import(module: str):
+    """
+    Runs `python -X importtime -c "import <module>"` in a fresh interpreter.
+
+    Returns:
+        A tuple (cumulative_us, imported_module_names).
+    """
+    env = os.environ.copy()
+    env["PYTHONPATH"] = os.path.join(PROJECT_ROOT, "src") + os.pathsep + env.get("PYTHONPATH", "")
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=PROJECT_ROOT, env=env, capture_output=True, text=True, check=True
+    )
+    cumulative_us = None
+    imported = set()
+    for line in result.stderr.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if not match:
+            continue
+        imported.add(match.group(4))
+        if match.group(4) == module:
+            cumulative_us = int(match.group(2))
+    return cumulative_us, imported
+
+
+def test_app_import_does_not_load_hardware_libraries():
+    _, imported = _measure_import("bongo.app")
+    eager = [name for name in LAZY_MODULES if name in imported]
+    assert not eager, f"bongo.app eagerly imports {eager}"
+
+
+def test_app_import_time_within_budget():
+    # Best of three runs to keep the measurement stable on a busy machine.
+    timings = [_measure_import("bongo.app")[0] for _ in range(3)]
+    assert all(t is not None for t in timings), "bongo.app did not appear in -X importtime output"
+    best_ms = min(timings) / 1000.0
+    print(f"\nimport bongo.app: {best_ms:.1f} ms (budget {IMPORT_BUDGET_MS:.0f} ms)")
+    assert best_ms <= IMPORT_BUDGET_MS, (
+        f"import bongo.app took {best_ms:.1f} ms, over the {IMPORT_BUDGET_MS:.0f} ms budget"
+    )
@@ -0,0 +1,99 @@
+# tests/operations/test_async_runner.py
+import asyncio
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.bongo.controller.hybrid_controller import HybridLEDController
+from src.bongo.operations.animation_manager import AnimationManager
+from src.bongo.operations.async_runner import AsyncAnimationRunner, FrameClock
+from src.bongo.operations.led_operation import LEDPixelOperation
+from src.bongo.patterns.builtin_patterns import create_chase_pattern
+from src.bongo.patterns.pattern_orchestrator import PatternOrchestrator
+
+
+@pytest.fixture
+def manager():
+    mock_matrix = MagicMock()
+    mock_matrix.get_led.return_value = MagicMock(spec=HybridLEDController)
+    return AnimationManager(matrix=mock_matrix)
+
+
+def test_frame_clock_produces_fixed_rate_deadlines():
+    async def collect():
+        clock = FrameClock(fps=200)
+        return [await clock.next_frame() for _ in range(5)]
+
+    deadlines = asyncio.run(collect())
+    gaps = [b - a for a, b in zip(deadlines, deadlines[1:])]
+    assert all(abs(gap - 0.005) < 1e-9 for gap in gaps)
+
+
+def test_runner_ticks_on_executor_thread(manager):
+    tick_threads = []
+    original_tick = manager.tick
+
+    def recording_tick(time_now=None):
+        import threading
+        tick_threads.append(threading.current_thread().name)
+        original_tick(time_now)
+
+    manager.tick = recording_tick
+    manager.add_operation(0, 0, LEDPixelOperation(
+        target_brightness=1.0, ramp_duration=60, hold_duration=0, fade_duration=0))
+    runner = AsyncAnimationRunner(manager, fps=200)
+    asyncio.run(runner.run(max_frames=5))
+
+    assert runner.frame_count == 5
+    assert all(name.startswith("bongo-render") for name in tick_threads)
+
+
+def test_play_handle_resolves_when_pattern_finishes(manager):
+    orchestrator = PatternOrchestrator(manager)
+
+    async def scenario():
+        runner = AsyncAnimationRunner(manager, fps=200)
+        run_task = asyncio.create_task(runner.run())
+        pattern = create_chase_pattern([(0, 0), (0, 1)], delay=0.01, hold_time=0.01,
+                                       start_time_base=time.monotonic())
+        handle = orchestrator.play(pattern)
+        result = await asyncio.wait_for(handle, timeout=2.0)
+        runner.stop()
+        await run_task
+        return handle, result
+
+    handle, result = asyncio.run(scenario())
+    assert result is handle
+    assert handle.done
+    assert handle.remaining == 0
+    assert not manager.operations
+
+
+def test_clear_operations_finishes_pending_handles(manager):
+    op = LEDPixelOperation(target_brightness=1.0, ramp_duration=60, hold_duration=0, fade_duration=0)
+    handle = manager.add_operations([((0, 0), op)])
+    manager.tick()
+    assert not handle.done
+
+    manager.clear_operations()
+    assert handle.wait(timeout=0)
+
+
+def test_idle_runner_wakes_on_submission(manager):
+    async def scenario():
+        runner = AsyncAnimationRunner(manager, fps=200)
+        run_task = asyncio.create_task(runner.run())
+        await asyncio.sleep(0.05)
+        idle_frames = runner.frame_count
+        handle = manager.add_operations([((0, 0), LEDPixelOperation(
+            target_brightness=1.0, ramp_duration=0.02, hold_duration=0, fade_duration=0))])
+        await asyncio.wait_for(handle, timeout=1.0)
+        runner.stop()
+        await run_task
+        return runner, idle_frames
+
+    runner, idle_frames = asyncio.run(scenario())
+    assert idle_frames == 0
+    assert runner.frame_count > 0
+    assert runner.idle_percentage > 0
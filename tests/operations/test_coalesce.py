@@ -0,0 +1,168 @@
+# tests/operations/test_coalesce.py
+import time
+
+import pytest
+
+from bongo.operations.animation_manager import AnimationManager
+from bongo.operations.envelope_operation import EnvelopeOperation
+from bongo.operations.led_operation import LEDPixelOperation
+from bongo.operations.operation_pool import OperationPool
+from bongo.patterns.builtin_patterns import create_chase_pattern, create_fade_all_pattern
+from bongo.patterns.coalesce import coalesce_operations
+from bongo.patterns.pattern_orchestrator import PatternOrchestrator
+
+COORDS = [(0, c) for c in range(8)]
+
+
+class _RecordingLED:
+    def __init__(self):
+        self.brightness = None
+        self.writes = 0
+
+    def set_brightness(self, value):
+        self.brightness = value
+        self.writes += 1
+
+
+class _RecordingMatrix:
+    def __init__(self):
+        self.leds = {coords: _RecordingLED() for coords in COORDS}
+
+    def get_led(self, row, col):
+        return self.leds.get((row, col))
+
+    def board_of(self, row, col):
+        return 0x40
+
+    def state(self):
+        return {coords: led.brightness for coords, led in self.leds.items()}
+
+
+def _render(pattern, coalesce, start, end, background=None):
+    matrix = _RecordingMatrix()
+    manager = AnimationManager(matrix, pool=OperationPool())
+    if background is not None:
+        for coords, op in background():
+            manager.add_operation(coords[0], coords[1], op)
+    orchestrator = PatternOrchestrator(manager)
+    orchestrator.load_pattern(pattern, coalesce=coalesce)
+    states = []
+    t = start
+    while t < end:
+        manager.tick(t)
+        states.append(matrix.state())
+        t += 0.004
+    return states, manager, orchestrator
+
+
+def test_back_to_back_cycles_coalesce_with_identical_output():
+    orchestrator = PatternOrchestrator(AnimationManager(_RecordingMatrix()))
+    pattern = orchestrator.create_repeating_pattern(
+        create_fade_all_pattern, {"led_coords": COORDS, "fade_up_duration": 0.02, "hold_duration": 0.03},
+        repeat_count=4, gap_duration=0.0)
+    end = max(op.start_time + op.total_duration for _, op in pattern) + 0.05
+
+    start = time.monotonic()
+    original, _, _ = _render(pattern, coalesce=False, start=start, end=end)
+    fused, manager, fused_orchestrator = _render(pattern, coalesce=True, start=start, end=end)
+
+    report = fused_orchestrator.last_coalesce_report
+    assert (report.input_operations, report.output_operations, report.eliminated) == (32, 8, 24)
+    assert len(fused) == len(original)
+    for before, after in zip(original, fused):
+        assert after == pytest.approx(before)
+    assert manager.operation_count == 0
+
+
+@pytest.mark.parametrize("gap", [0.5, 0.0])
+def test_repeating_chase_coalesces_with_identical_output(gap):
+    orchestrator = PatternOrchestrator(AnimationManager(_RecordingMatrix()))
+    pattern = orchestrator.create_repeating_pattern(
+        create_chase_pattern, {"led_coords": COORDS}, repeat_count=10, gap_duration=gap)
+    end = max(op.start_time + op.total_duration for _, op in pattern) + 0.05
+
+    start = time.monotonic()
+    original, _, _ = _render(pattern, coalesce=False, start=start, end=end)
+    fused, manager, fused_orchestrator = _render(pattern, coalesce=True, start=start, end=end)
+
+    report = fused_orchestrator.last_coalesce_report
+    assert (report.input_operations, report.output_operations) == (80, 8)
+    assert report.eliminated > 0
+    assert len(fused) == len(original)
+    for before, after in zip(original, fused):
+        assert after == pytest.approx(before)
+    assert manager.operation_count == 0
+
+
+def test_gaps_show_other_content_on_the_led():
+    """Across a gap the fused envelope draws nothing, so the LED shows what's underneath."""
+    orchestrator = PatternOrchestrator(AnimationManager(_RecordingMatrix()))
+    pattern = orchestrator.create_repeating_pattern(
+        create_chase_pattern, {"led_coords": COORDS, "delay": 0.02, "hold_time": 0.03},
+        repeat_count=4, gap_duration=0.05)
+    start = time.monotonic()
+    end = max(op.start_time + op.total_duration for _, op in pattern) + 0.05
+
+    def background():
+        return [(coords, LEDPixelOperation(0.3, 0.0, end - start, 0.0, start_time=start, initial_brightness=0.3))
+                for coords in COORDS]
+
+    original, _, _ = _render(pattern, coalesce=False, start=start, end=end, background=background)
+    fused, _, fused_orchestrator = _render(pattern, coalesce=True, start=start, end=end, background=background)
+
+    assert fused_orchestrator.last_coalesce_report.eliminated == 24
+    assert any(0.3 in state.values() for state in original)
+    for before, after in zip(original, fused):
+        assert after == pytest.approx(before)
+
+
+def test_patterns_are_coalesced_at_load_by_default():
+    manager = AnimationManager(_RecordingMatrix())
+    orchestrator = PatternOrchestrator(manager)
+    ops = [((0, 0), LEDPixelOperation(1.0, 0.1, 0.1, 0.1, start_time=t)) for t in (10.0, 10.5)]
+    orchestrator.load_pattern(ops)
+    assert orchestrator.last_coalesce_report.eliminated == 1
+    assert manager.operation_count == 1
+
+    orchestrator.load_pattern(ops, coalesce=False)
+    assert manager.operation_count == 3
+
+
+def test_runner_sleeps_through_gaps():
+    manager = AnimationManager(_RecordingMatrix())
+    ops = [((0, 0), LEDPixelOperation(1.0, 0.1, 0.1, 0.1, start_time=t)) for t in (10.0, 11.0)]
+    PatternOrchestrator(manager).load_pattern(ops)
+    manager.tick(10.1)
+    assert manager.seconds_until_work(10.2) == 0.0
+    manager.tick(10.5)
+    assert manager.seconds_until_work(10.5) == pytest.approx(0.5)
+
+
+def test_overlapping_operations_are_left_alone():
+    first = LEDPixelOperation(1.0, 0.1, 0.1, 0.1, start_time=10.0)
+    overlapping = LEDPixelOperation(0.5, 0.1, 0.1, 0.1, start_time=10.2)
+    other = LEDPixelOperation(1.0, 0.1, 0.1, 0.1, start_time=10.0)
+    ops, report = coalesce_operations([((0, 0), first), ((0, 0), overlapping), ((0, 1), other)])
+    assert [op for _, op in ops] == [first, overlapping, other]
+    assert report.eliminated == 0
+
+
+def test_fused_envelope_takes_the_first_position_and_releases_to_pool():
+    pool = OperationPool()
+    a = LEDPixelOperation(1.0, 0.1, 0.1, 0.1, start_time=10.3, initial_brightness=0.0)
+    b = LEDPixelOperation(1.0, 0.1, 0.1, 0.1, start_time=10.0, initial_brightness=0.2)
+    later = LEDPixelOperation(1.0, 0.1, 0.1, 0.1, start_time=12.0)  # after a gap
+    other = LEDPixelOperation(1.0, 0.1, 0.1, 0.1, start_time=10.0)
+    ops, report = coalesce_operations([((0, 0), a), ((0, 1), other), ((0, 0), later), ((0, 0), b)], pool=pool)
+
+    assert [coords for coords, _ in ops] == [(0, 0), (0, 1)]
+    envelope = ops[0][1]
+    assert isinstance(envelope, EnvelopeOperation)
+    assert envelope.start_time == 10.0
+    assert envelope.get_brightness(10.25) == pytest.approx(0.6)  # b fading back to its own level
+    assert envelope.get_brightness(10.3) == pytest.approx(0.0)  # a starts from its own level
+    assert envelope.get_brightness(10.6) == pytest.approx(0.0)  # a's final level, for one frame
+    assert envelope.get_brightness(11.0) is None  # the gap before `later`
+    assert envelope.get_brightness(12.05) == pytest.approx(0.75)
+    assert envelope.total_duration == pytest.approx(2.3)
+    assert report.fused_leds == 1 and len(pool) == 3
@@ -0,0 +1,188 @@
+# tests/operations/test_compositor.py
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from bongo.matrix.matrix import LEDMatrix
+from bongo.operations.animation_manager import AnimationManager
+from bongo.operations.compositor import Layer
+from bongo.operations.led_operation import LEDPixelOperation
+from bongo.operations.operation_batch import OperationBatch
+from bongo.patterns.pattern_orchestrator import LayeredPattern, PatternOrchestrator
+from bongo.patterns.shaders import Shader
+
+
+@pytest.fixture
+def matrix():
+    """A 2x4 matrix whose LEDs record every brightness written to them."""
+    matrix = LEDMatrix(config=[], hardware_manager=MagicMock())
+    for r in range(2):
+        for c in range(4):
+            matrix.leds[(r, c)] = MagicMock()
+    matrix.rows, matrix.cols = 2, 4
+    return matrix
+
+
+def _steady(brightness):
+    """An operation that has already reached `brightness` and holds it."""
+    return LEDPixelOperation(brightness, 0.0, 1000.0, 0.0, start_time=time.monotonic() - 1.0,
+                             initial_brightness=0.0)
+
+
+def _written(matrix):
+    return {coords: led.set_brightness.call_args[0][0]
+            for coords, led in matrix.leds.items() if led.set_brightness.called}
+
+
+@pytest.mark.parametrize("blend, opacity, expected", [
+    ("normal", 1.0, 0.8),
+    ("normal", 0.5, 0.5),       # halfway between 0.2 and 0.8
+    ("add", 1.0, 1.0),          # clamped
+    ("max", 1.0, 0.8),
+    ("multiply", 1.0, 0.16),
+    ("screen", 1.0, 0.84),
+])
+def test_layer_blend_and_opacity(matrix, blend, opacity, expected):
+    manager = AnimationManager(matrix)
+    manager.add_layer("accent", opacity=opacity, blend=blend)
+    manager.add_operation(0, 0, _steady(0.2))
+    manager.add_operation(0, 0, _steady(0.8), layer="accent")
+
+    manager.tick()
+
+    assert matrix.leds[(0, 0)].set_brightness.call_args[0][0] == pytest.approx(expected)
+
+
+def test_each_led_is_written_once_per_tick_whatever_the_layers(matrix):
+    manager = AnimationManager(matrix)
+    manager.add_layer("accent")
+    for c in range(4):
+        manager.add_operation(0, c, _steady(0.3))
+        manager.add_operation(0, c, _steady(0.6), layer="accent")
+
+    manager.tick()
+
+    for c in range(4):
+        assert matrix.leds[(0, c)].set_brightness.call_count == 1
+    assert not matrix.leds[(1, 0)].set_brightness.called
+
+
+def test_layer_without_content_below_blends_over_off(matrix):
+    manager = AnimationManager(matrix)
+    manager.add_layer("accent", opacity=0.5)
+    manager.add_operation(1, 1, _steady(0.8), layer="accent")
+
+    manager.tick()
+
+    assert _written(matrix) == {(1, 1): pytest.approx(0.4)}
+
+
+def test_layers_stack_in_z_order(matrix):
+    manager = AnimationManager(matrix)
+    manager.add_layer("top", z=5)
+    manager.add_layer("bottom", z=1)
+    manager.add_operation(0, 0, _steady(0.9), layer="top")
+    manager.add_operation(0, 0, _steady(0.1), layer="bottom")
+
+    manager.tick()
+
+    assert matrix.leds[(0, 0)].set_brightness.call_args[0][0] == pytest.approx(0.9)
+
+
+def test_idle_and_invisible_layers_are_skipped(matrix):
+    manager = AnimationManager(matrix)
+    idle = manager.add_layer("idle")
+    manager.add_layer("hidden", opacity=0.0)
+    manager.add_operation(0, 0, _steady(0.4))
+    manager.add_operation(0, 0, _steady(1.0), layer="hidden")
+
+    manager.tick()
+
+    assert matrix.leds[(0, 0)].set_brightness.call_args[0][0] == pytest.approx(0.4)
+    assert idle.values is None  # never allocated a buffer
+
+
+def test_batches_and_shaders_draw_on_layers(matrix):
+    manager = AnimationManager(matrix)
+    manager.add_layer("glow", blend="max")
+    manager.add_shader(Shader(lambda x, y, t: 0.25 + 0 * x), layer="glow")
+    batch = OperationBatch.from_coords([(0, 0), (0, 1)], time.monotonic() - 1.0, target_brightness=0.75,
+                                       ramp_durations=0.0, hold_durations=1000.0, fade_durations=0.0,
+                                       initial_brightness=0.0)
+    manager.add_batch(batch, layer="glow")
+
+    manager.tick()
+
+    written = _written(matrix)
+    assert written[(0, 0)] == pytest.approx(0.75)
+    assert written[(1, 3)] == pytest.approx(0.25)
+    assert len(written) == 8
+
+
+def test_set_layer_changes_opacity_on_next_tick(matrix):
+    manager = AnimationManager(matrix)
+    manager.add_layer("accent")
+    manager.add_operation(0, 0, _steady(0.8), layer="accent")
+    manager.tick()
+    manager.set_layer("accent", opacity=0.25)
+
+    manager.tick()
+
+    assert matrix.leds[(0, 0)].set_brightness.call_args[0][0] == pytest.approx(0.2)
+
+
+def test_layer_validation(matrix):
+    manager = AnimationManager(matrix)
+    manager.add_layer("accent")
+    with pytest.raises(ValueError):
+        manager.add_layer("accent")
+    with pytest.raises(ValueError):
+        manager.add_operations([((0, 0), _steady(0.5))], layer="missing")
+    with pytest.raises(ValueError):
+        manager.set_layer("accent", opacity=1.5)
+    with pytest.raises(ValueError):
+        Layer("x", 1, blend="dodge")
+    assert manager.layers["accent"].opacity == 1.0
+
+
+def _solid(brightness, start_time_base, leds=((0, 0), (0, 1))):
+    return [(coords, LEDPixelOperation(brightness, 0.0, 1000.0, 0.0, start_time=start_time_base - 1.0,
+                                       initial_brightness=0.0))
+            for coords in leds]
+
+
+def test_compose_layered_plays_on_separate_layers(matrix):
+    manager = AnimationManager(matrix)
+    orchestrator = PatternOrchestrator(manager)
+
+    pattern = orchestrator.compose_layered([_solid, _solid], [{"brightness": 0.4}, {"brightness": 0.6}],
+                                           opacities=[1.0, 0.5], blends=["normal", "add"])
+    assert isinstance(pattern, LayeredPattern) and len(pattern) == 4
+    handle = orchestrator.play(pattern)
+    manager.tick()
+
+    assert set(manager.layers) == {"layer1", "layer2"}
+    assert handle.remaining == 4
+    # 0.4, then 'add' 0.6 at half opacity: 0.4 + (1.0 - 0.4) * 0.5
+    assert _written(matrix) == {(0, 0): pytest.approx(0.7), (0, 1): pytest.approx(0.7)}
+
+    manager.clear_operations()
+    assert handle.done
+
+
+def test_unknown_coordinates_are_skipped_when_compositing(matrix):
+    manager = AnimationManager(matrix)
+    manager.add_layer("glow")
+    manager.add_operation(9, 9, _steady(0.5))
+    manager.add_operation(0, 0, _steady(0.5))
+    manager.add_operation(9, 9, _steady(0.5), layer="glow")
+    manager.add_operation(1, 1, _steady(0.4), layer="glow")
+    batch = OperationBatch.from_coords([(0, 2), (9, 9)], time.monotonic() - 1.0, target_brightness=0.75,
+                                       ramp_durations=0.0, hold_durations=1000.0, fade_durations=0.0,
+                                       initial_brightness=0.0)
+    manager.add_batch(batch, layer="glow")
+
+    manager.tick()
+
+    assert _written(matrix) == pytest.approx({(0, 0): 0.5, (1, 1): 0.4, (0, 2): 0.75})
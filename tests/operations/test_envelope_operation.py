@@ -0,0 +1,94 @@
+# tests/operations/test_envelope_operation.py
+from unittest.mock import MagicMock
+
+import pytest
+
+from bongo.operations.animation_manager import AnimationManager
+from bongo.operations.envelope_operation import (EASING_FUNCTIONS, EnvelopeOperation, EnvelopeSegment,
+                                                 ease, heartbeat, pulse_train)
+from bongo.operations.led_operation import LEDPixelOperation
+from bongo.operations.operation_pool import OperationPool
+
+
+def _times(start, end, steps=200):
+    return [start + (end - start) * i / steps for i in range(steps + 1)]
+
+
+@pytest.mark.parametrize("params", [
+    (1.0, 0.2, 0.3, 0.4, 0.0),
+    (0.7, 0.0, 0.5, 0.0, 0.3),
+    (1.0, 0.0, 0.0, 0.0, 0.5),
+    (0.4, 0.1, 0.0, 0.2, 0.1),
+])
+def test_matches_led_pixel_operation(params):
+    target, ramp, hold, fade, initial = params
+    op = LEDPixelOperation(target, ramp, hold, fade, start_time=10.0, initial_brightness=initial)
+    envelope = EnvelopeOperation.from_pixel_operation(op)
+    assert envelope.total_duration == pytest.approx(op.total_duration)
+    for t in _times(9.9, 11.2):
+        assert envelope.get_brightness(t) == pytest.approx(op.get_brightness(t), abs=1e-6)
+        assert envelope.is_completed(t) == op.is_completed(t)
+
+
+@pytest.mark.parametrize("easing", sorted(EASING_FUNCTIONS))
+def test_easing_tables_track_the_curves(easing):
+    for i in range(101):
+        p = i / 100
+        assert ease(easing, p) == pytest.approx(EASING_FUNCTIONS[easing](p), abs=1e-4)
+
+
+def test_segments_ease_between_levels():
+    envelope = EnvelopeOperation([(1.0, 1.0, "sine"), (1.0, 1.0), (0.5, 0.2, "step", 0.6)], start_time=0.0)
+    assert envelope.get_brightness(0.5) == pytest.approx(0.5)
+    assert envelope.get_brightness(0.25) < 0.25
+    assert envelope.get_brightness(1.5) == 1.0
+    assert envelope.get_brightness(2.0) == pytest.approx(0.6)
+    assert envelope.get_brightness(2.1) == pytest.approx(0.2)
+    assert envelope.get_brightness(3.0) == pytest.approx(0.2)
+    assert envelope.is_completed(2.5)
+
+
+def test_invalid_segments_are_rejected():
+    with pytest.raises(ValueError):
+        EnvelopeOperation([])
+    with pytest.raises(ValueError):
+        EnvelopeOperation([EnvelopeSegment(1.0, 1.0, "bounce")])
+    with pytest.raises(ValueError):
+        EnvelopeOperation([EnvelopeSegment(-1.0, 1.0)])
+    with pytest.raises(ValueError):
+        EnvelopeOperation([EnvelopeSegment(1.0, 1.5)])
+    with pytest.raises(ValueError):
+        EnvelopeOperation([EnvelopeSegment(1.0, 1.0), EnvelopeSegment(1.0, None), EnvelopeSegment(1.0, 0.0)])
+    with pytest.raises(ValueError):
+        EnvelopeOperation([EnvelopeSegment(1.0, 1.0), EnvelopeSegment(1.0, None)])
+
+
+def test_gaps_draw_nothing():
+    envelope = EnvelopeOperation([EnvelopeSegment(1.0, 1.0), EnvelopeSegment(1.0, None),
+                                  EnvelopeSegment(1.0, 0.0, start=0.5)], start_time=10.0)
+    assert envelope.get_brightness(10.5) == pytest.approx(0.5)
+    assert envelope.get_brightness(11.2) == pytest.approx(1.0)  # the first frame after the segment
+    assert envelope.get_brightness(11.4) is None
+    assert envelope.idle_until(11.5) == pytest.approx(12.0)
+    assert envelope.get_brightness(12.5) == pytest.approx(0.25)
+    assert envelope.idle_until(12.5) is None
+
+
+def test_pulse_train_and_heartbeat_are_single_operations():
+    pulses = pulse_train(3, on_time=0.1, off_time=0.2, start_time=0.0)
+    assert pulses.total_duration == pytest.approx(0.9)
+    assert [pulses.get_brightness(t) for t in (0.05, 0.15, 0.35, 0.45)] == [1.0, 0.0, 1.0, 0.0]
+
+    beat = heartbeat(period=1.0, beats=2, start_time=0.0)
+    assert beat.total_duration == pytest.approx(2.0)
+    assert beat.get_brightness(0.06) == pytest.approx(1.0)
+    assert beat.get_brightness(1.06) == pytest.approx(1.0)
+
+
+def test_manager_runs_envelopes_without_pooling_them():
+    manager = AnimationManager(matrix=MagicMock(), pool=OperationPool())
+    manager.add_operation(0, 0, pulse_train(2, 0.1, 0.1, start_time=0.0))
+    for t in _times(0.0, 0.5, 10):
+        manager.tick(t)
+    assert manager.operation_count == 0
+    assert len(manager.pool) == 0
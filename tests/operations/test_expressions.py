@@ -0,0 +1,100 @@
+# tests/operations/test_expressions.py
+import json
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+
+from bongo.matrix.matrix import LEDMatrix
+from bongo.operations.animation_manager import AnimationManager
+from bongo.patterns.expressions import ExpressionError, ExpressionShader, compile_expression
+from bongo.patterns.json_loader import load_shader
+
+DEFINITIONS = "src/bongo/patterns/pattern_definitions"
+
+
+@pytest.fixture
+def matrix():
+    matrix = LEDMatrix(config=[], hardware_manager=MagicMock())
+    for r in range(2):
+        for c in range(8):
+            matrix.leds[(r, c)] = MagicMock()
+    matrix.rows, matrix.cols = 2, 8
+    return matrix
+
+
+def test_expression_is_vectorized():
+    expr = compile_expression("brightness = 0.5 + 0.5*sin(2*pi*(t*speed - x/8))", ["speed"])
+    x = np.arange(8.0)
+    np.testing.assert_allclose(expr(x, x, 0.25, speed=1.0), 0.5 + 0.5 * np.sin(2 * np.pi * (0.25 - x / 8)))
+
+
+def test_compiled_expressions_are_cached():
+    assert compile_expression("x / 8 + t", ()) is compile_expression("x / 8 + t", ())
+
+
+def test_conditionals_and_boolean_operators_are_element_wise():
+    expr = compile_expression("1 if 2 <= x < 5 and not y > 0 else 0.25")
+    x = np.arange(6.0)
+    y = np.array([0, 0, 0, 0, 1, 0.0])
+    assert expr(x, y, 0.0).tolist() == [0.25, 0.25, 1, 1, 0.25, 0.25]
+
+
+@pytest.mark.parametrize("text", [
+    "__import__('os').system('true')",
+    "x.real",
+    "[x for x in y]",
+    "open",
+    "lambda: 1",
+    "sin(x, y)",
+    "speedy * t",
+    "clip(x, low=0)",
+    "'text'",
+    "x +",
+    "",
+])
+def test_invalid_expressions_fail_at_compile_time(text):
+    with pytest.raises(ExpressionError):
+        compile_expression(text)
+
+
+def test_expression_shader_renders_through_the_manager(matrix):
+    manager = AnimationManager(matrix)
+    manager.add_shader(ExpressionShader("index / 16 + t", {}), start_time=0.0)
+    manager.tick(0.0)
+    assert matrix.get_led(1, 0).set_brightness.call_args[0][0] == pytest.approx(0.5)
+
+
+def test_scalar_division_and_overflow_follow_numpy_rules():
+    expr = compile_expression("1/t")  # t=0 at compile time used to fail as a Python float
+    assert np.isinf(expr(np.zeros(2), np.zeros(2), 0.0)).all()
+    grid_x = np.arange(4.0)
+    shader = ExpressionShader("sin(x) + t**400 + 1/k", {"k": 0})
+    assert np.all(shader.func(grid_x, grid_x, 10.0, k=0) == np.inf)
+
+
+def test_failing_shader_is_skipped_not_raised(matrix):
+    class Broken(ExpressionShader):
+        def evaluate(self, grid, t):
+            raise RuntimeError("boom")
+
+    manager = AnimationManager(matrix)
+    manager.add_shader(Broken("x", {}), start_time=0.0)
+    manager.add_shader(ExpressionShader("t**400", {}), start_time=0.0, layer=None)
+    manager.tick(10.0)
+    manager.tick(10.1)
+    assert matrix.get_led(0, 0).set_brightness.call_args[0][0] == pytest.approx(1.0)
+
+
+def test_load_shader_definition():
+    shader, duration = load_shader(f"{DEFINITIONS}/sine_sweep.json")
+    assert isinstance(shader, ExpressionShader)
+    assert shader.params == {"speed": 0.5, "wavelength": 8}
+    assert duration is None
+
+
+def test_load_shader_reports_bad_expressions(tmp_path):
+    path = tmp_path / "broken.json"
+    path.write_text(json.dumps({"type": "shader", "expression": "sin(x"}))
+    with pytest.raises(ValueError, match="broken.json"):
+        load_shader(str(path))
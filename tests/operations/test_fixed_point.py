@@ -0,0 +1,134 @@
+# tests/operations/test_fixed_point.py
+import random
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from bongo.controller.hybrid_controller import HybridLEDController
+from bongo.matrix.matrix import LEDMatrix
+from bongo.operations.animation_manager import AnimationManager
+from bongo.operations.envelope_operation import heartbeat
+from bongo.operations.fixed_point import DUTY_MAX, compile_operation, duty_at, to_duty
+from bongo.operations.led_operation import LEDPixelOperation
+
+
+def _matrix():
+    """A 2x4 matrix whose LEDs record what is written to them."""
+    matrix = LEDMatrix(config=[], hardware_manager=MagicMock())
+    for r in range(2):
+        for c in range(4):
+            matrix.leds[(r, c)] = MagicMock()
+    matrix.rows, matrix.cols = 2, 4
+    return matrix
+
+
+@pytest.fixture
+def matrix():
+    return _matrix()
+
+
+def _duties(matrix):
+    return {coords: led.set_duty_cycle.call_args[0][0]
+            for coords, led in matrix.leds.items() if led.set_duty_cycle.called}
+
+
+def test_to_duty_rounds_and_clamps():
+    assert to_duty(0.0) == 0
+    assert to_duty(1.0) == DUTY_MAX
+    assert to_duty(1.5) == DUTY_MAX
+    assert to_duty(-0.1) == 0
+    assert to_duty(0.5) == 32768
+
+
+def test_integer_evaluation_matches_float_envelope():
+    rng = random.Random(3)
+    for _ in range(200):
+        op = LEDPixelOperation(rng.random(), rng.choice([0.0, rng.uniform(0.01, 5.0)]),
+                               rng.choice([0.0, rng.uniform(0.01, 5.0)]),
+                               rng.choice([0.0, rng.uniform(0.01, 5.0)]),
+                               start_time=1000.0 + rng.random(), initial_brightness=rng.random())
+        params = compile_operation(op, 0)
+        for _ in range(20):
+            t = op.start_time + rng.uniform(-0.5, op.total_duration + 0.5)
+            expected = to_duty(op.get_brightness(t))
+            assert abs(duty_at(params, int(t * 1_000_000)) - expected) <= 1
+
+
+def test_only_plain_scheduled_operations_compile():
+    assert compile_operation(heartbeat(start_time=0.0), 0) is None
+    assert compile_operation(LEDPixelOperation(1.0, 1.0, 0, 0), 0) is None  # no start time
+    assert compile_operation(LEDPixelOperation(1.0, 1.0, 0, 0, start_time=0.0), None) is None
+
+
+def test_manager_writes_duty_cycles_directly(matrix):
+    manager = AnimationManager(matrix, fixed_point=True)
+    now = time.monotonic()
+    manager.add_operation(0, 0, LEDPixelOperation(1.0, 2.0, 0.0, 0.0, start_time=now - 1.0,
+                                                  initial_brightness=0.0))
+    manager.add_operation(0, 1, LEDPixelOperation(0.25, 0.0, 10.0, 0.0, start_time=now - 1.0))
+
+    manager.tick(now)
+
+    assert _duties(matrix) == {(0, 0): pytest.approx(DUTY_MAX // 2, abs=1), (0, 1): to_duty(0.25)}
+    assert all(isinstance(duty, int) for duty in _duties(matrix).values())
+    assert not matrix.leds[(0, 0)].set_brightness.called
+
+
+def test_fixed_and_float_managers_agree(matrix):
+    now = time.monotonic()
+    ops = [((r, c), dict(target_brightness=0.2 + 0.1 * c, ramp_duration=0.5 * r, hold_duration=0.3,
+                         fade_duration=0.7, start_time=now + 0.1 * c, initial_brightness=0.1))
+           for r in range(2) for c in range(4)]
+    float_manager = AnimationManager(_matrix())
+    fixed_manager = AnimationManager(matrix, fixed_point=True)
+    for coords, kwargs in ops:
+        float_manager.add_operation(coords[0], coords[1], LEDPixelOperation(**kwargs))
+        fixed_manager.add_operation(coords[0], coords[1], LEDPixelOperation(**kwargs))
+
+    for step in range(1, 40):
+        t = now + step * 0.05
+        float_manager.tick(t)
+        fixed_manager.tick(t)
+        for coords, duty in _duties(matrix).items():
+            led = float_manager.matrix.get_led(*coords)
+            assert abs(duty - to_duty(led.set_brightness.call_args[0][0])) <= 1
+    assert fixed_manager.operation_count == float_manager.operation_count == 0
+
+
+def test_float_content_is_converted_into_the_buffer(matrix):
+    manager = AnimationManager(matrix, fixed_point=True)
+    manager.add_layer("accent", opacity=0.5)
+    now = time.monotonic()
+    manager.add_operation(0, 0, LEDPixelOperation(0.8, 0.0, 10.0, 0.0, start_time=now - 1.0))
+    manager.add_operation(0, 0, LEDPixelOperation(0.4, 0.0, 10.0, 0.0, start_time=now - 1.0,
+                                                  initial_brightness=0.0), layer="accent")
+    manager.add_operation(1, 1, heartbeat(start_time=now - 0.06))
+
+    manager.tick(now)
+
+    duties = _duties(matrix)
+    assert duties[(0, 0)] == pytest.approx(to_duty(0.6), abs=2)
+    assert duties[(1, 1)] == pytest.approx(DUTY_MAX, abs=2)  # peak of the first beat
+
+
+def test_cancel_in_fixed_mode(matrix):
+    manager = AnimationManager(matrix, fixed_point=True)
+    now = time.monotonic()
+    manager.add_operation(0, 0, LEDPixelOperation(1.0, 0.0, 10.0, 0.0, start_time=now - 1.0))
+    manager.cancel(0, 0)
+
+    manager.tick(now)
+
+    assert _duties(matrix) == {}
+    assert manager.operations == []
+
+
+def test_hybrid_controller_duty_cycle_on_legacy_12_bit_controller():
+    pca = MagicMock(spec=["set_pwm"])
+    controller = HybridLEDController(3, pca)
+
+    controller.set_duty_cycle(0xFFFF)
+
+    pca.set_pwm.assert_called_once_with(3, 0, 4095)
+    assert controller.current_brightness == 1.0
@@ -0,0 +1,84 @@
+# tests/operations/test_operation_batch.py
+import time
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+
+from bongo.operations.animation_manager import AnimationManager
+from bongo.operations.led_operation import LEDPixelOperation
+from bongo.operations.operation_batch import OperationBatch
+from bongo.patterns.builtin_patterns import (create_chase_batch, create_chase_pattern,
+                                             create_fade_all_batch, create_fade_all_pattern,
+                                             create_wave_row_batch, create_wave_row_pattern)
+
+COORDS = [(r, c) for r in range(3) for c in range(4)]
+ENVELOPES = [
+    (1.0, 0.1, 0.2, 0.3, 0.0),
+    (0.8, 0.0, 0.2, 0.0, 0.5),
+    (1.0, 0.0, 0.0, 0.0, 0.0),
+    (0.6, 0.2, 0.0, 0.1, 0.2),
+]
+
+
+@pytest.mark.parametrize("envelope", ENVELOPES)
+def test_brightness_matches_led_pixel_operation(envelope):
+    target, ramp, hold, fade, initial = envelope
+    batch = OperationBatch([0], [0], 10.0, target, ramp, hold, fade, initial)
+    for t in np.linspace(9.9, 10.8, 37):
+        op = LEDPixelOperation(target, ramp, hold, fade, start_time=10.0, initial_brightness=initial)
+        assert batch.brightness_at(t)[0] == pytest.approx(op.get_brightness(t))
+        assert batch.completed_at(t)[0] == op.is_completed(t)
+
+
+@pytest.mark.parametrize("list_form, batch_form, kwargs", [
+    (create_chase_pattern, create_chase_batch, {"delay": 0.05}),
+    (create_fade_all_pattern, create_fade_all_batch, {}),
+    (create_wave_row_pattern, create_wave_row_batch, {"row_delay": 0.2}),
+])
+def test_batch_generators_match_list_generators(list_form, batch_form, kwargs):
+    expected = OperationBatch.from_operations(list_form(COORDS, start_time_base=5.0, **kwargs))
+    batch = batch_form(COORDS, start_time_base=5.0, **kwargs)
+    for name in OperationBatch.__slots__:
+        np.testing.assert_allclose(getattr(batch, name), getattr(expected, name))
+
+
+def test_invalid_parameters_are_rejected():
+    with pytest.raises(ValueError):
+        OperationBatch([0], [0], 0.0, 1.5, 0.1, 0.1, 0.1)
+    with pytest.raises(ValueError):
+        OperationBatch([0], [0], 0.0, 1.0, -0.1, 0.1, 0.1)
+
+
+def test_manager_renders_batch_like_individual_operations():
+    start = time.monotonic() + 1000  # far enough ahead that both forms are scheduled
+    batch = create_chase_batch(COORDS, delay=0.05, start_time_base=start)
+    by_op, by_batch = AnimationManager(matrix=MagicMock()), AnimationManager(matrix=MagicMock())
+    by_op.add_operations(batch.to_operations())
+    handle = by_batch.add_batch(batch)
+
+    for t in start + np.arange(-0.1, 1.0, 0.01):
+        by_op.tick(t)
+        by_batch.tick(t)
+    assert by_op.matrix.get_led.return_value.set_brightness.call_args_list == \
+        by_batch.matrix.get_led.return_value.set_brightness.call_args_list
+    assert handle.done
+    assert by_batch.operation_count == 0 and not by_batch.batches
+
+
+def test_idle_until_batch_starts():
+    manager = AnimationManager(matrix=MagicMock())
+    manager.add_batch(create_fade_all_batch(COORDS, start_time_base=50.0))
+    assert manager.seconds_until_work(40.0) == 0.0  # still queued
+    manager.tick(40.0)
+    manager.matrix.get_led.assert_not_called()
+    assert manager.seconds_until_work(40.0) == pytest.approx(10.0)
+    assert manager.operation_count == len(COORDS)
+
+
+def test_clear_finishes_batch_handles():
+    manager = AnimationManager(matrix=MagicMock())
+    handle = manager.add_batch(create_chase_batch(COORDS, start_time_base=50.0))
+    manager.tick(49.0)
+    manager.clear_operations()
+    assert handle.done
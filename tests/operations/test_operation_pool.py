@@ -0,0 +1,80 @@
+# tests/operations/test_operation_pool.py
+from unittest.mock import MagicMock
+
+import pytest
+
+from bongo.operations.animation_manager import AnimationManager, _ManagedOperation
+from bongo.operations.led_operation import LEDPixelOperation
+from bongo.operations.operation_pool import OperationPool
+from bongo.patterns.builtin_patterns import create_chase_pattern
+
+COORDS = [(0, c) for c in range(8)]
+
+
+@pytest.fixture
+def manager():
+    return AnimationManager(matrix=MagicMock(), pool=OperationPool())
+
+
+def _run_to_completion(manager, start, step=0.05, limit=10.0):
+    t = start
+    while (manager.pending_submissions or manager.operation_count) and t < start + limit:
+        manager.tick(t)
+        t += step
+    return t
+
+
+def test_acquire_reuses_released_operations():
+    pool = OperationPool()
+    first = pool.acquire(1.0, 0.1, 0.1, 0.1, start_time=5.0)
+    pool.release(first)
+    second = pool.acquire(0.5, 0.2, 0, 0, start_time=9.0, initial_brightness=0.0)
+
+    assert second is first
+    assert (second.target_brightness, second.start_time, second.total_duration) == (0.5, 9.0, 0.2)
+    assert second.is_active
+    assert (pool.created, pool.reused, pool.released) == (1, 1, 1)
+
+
+def test_reset_validates_like_init():
+    op = LEDPixelOperation(1.0, 0.1, 0.1, 0.1)
+    with pytest.raises(ValueError):
+        op.reset(1.5, 0.1, 0.1, 0.1)
+
+
+def test_full_pool_drops_released_operations():
+    pool = OperationPool(max_size=1)
+    pool.release(LEDPixelOperation(1.0, 0, 0, 0))
+    pool.release(LEDPixelOperation(1.0, 0, 0, 0))
+    assert len(pool) == 1
+    assert pool.dropped == 1
+
+
+def test_steady_state_loop_allocates_nothing(manager):
+    pool = manager.pool
+    start = 1000.0
+    for cycle in range(3):
+        manager.add_operations(create_chase_pattern(COORDS, delay=0.05, start_time_base=start, pool=pool))
+        start = _run_to_completion(manager, start)
+        if cycle == 0:
+            created, wrappers = pool.created, manager.managed_allocations
+
+    assert manager.operation_count == 0
+    assert pool.created == created == len(COORDS)
+    assert manager.managed_allocations == wrappers
+    assert pool.reused == 2 * len(COORDS)
+
+
+def test_cleared_operations_return_to_pool(manager):
+    for coords, op in create_chase_pattern(COORDS, start_time_base=1e9, pool=manager.pool):
+        manager.add_operation(coords[0], coords[1], op)
+    manager.clear_operations()
+    assert len(manager.pool) == len(COORDS)
+
+
+def test_rebound_wrapper_is_not_left_scheduled():
+    managed = _ManagedOperation(0, 0, LEDPixelOperation(1.0, 0, 0, 0, start_time=1.0), MagicMock())
+    assert managed.scheduled is False
+    managed.scheduled = True
+    managed.bind(0, 1, LEDPixelOperation(1.0, 0, 0, 0, start_time=2.0))
+    assert managed.scheduled is False
@@ -1,4 +1,7 @@
 # tests/operations/test_operations_manager.py
+import threading
+import time
+
 import pytest
 from unittest.mock import MagicMock
 
@@ -97,3 +100,133 @@ def test_multiple_operations_called(manager):
     mock_led1.set_brightness.assert_called_once()
     mock_led2.set_brightness.assert_called_once()
 
+
+
+def test_submit_is_admitted_on_next_tick(manager):
+    """
+    Tests that submitted operations are queued and only admitted by tick().
+    """
+    manager.matrix.get_led.return_value = MagicMock(spec=HybridLEDController)
+    pixel_op = LEDPixelOperation(target_brightness=1.0, ramp_duration=1, hold_duration=1, fade_duration=1)
+
+    manager.submit(0, 0, pixel_op)
+    assert manager.pending_submissions == 1
+    assert len(manager.operations) == 0
+
+    manager.tick()
+    assert manager.pending_submissions == 0
+    assert len(manager.operations) == 1
+    assert manager.operations[0].pixel_op is pixel_op
+
+
+def test_add_operations_accepts_whole_pattern(manager):
+    """
+    Tests that add_operations() queues a pattern as one batch.
+    """
+    from src.bongo.patterns.builtin_patterns import create_chase_pattern
+
+    manager.matrix.get_led.return_value = MagicMock(spec=HybridLEDController)
+    pattern = create_chase_pattern([(0, 0), (0, 1), (1, 0)], start_time_base=time.monotonic() + 10)
+
+    manager.add_operations(pattern)
+    assert manager.pending_submissions == 1
+
+    manager.tick()
+    assert manager.operation_count == 3
+    assert manager.scheduled_count == 3
+
+
+def test_submit_from_threads_while_ticking(manager):
+    """
+    Tests that producers on other threads can submit while the loop ticks.
+    """
+    manager.matrix.get_led.return_value = MagicMock(spec=HybridLEDController)
+    per_thread = 200
+
+    def producer():
+        for _ in range(per_thread):
+            manager.submit(0, 0, LEDPixelOperation(
+                target_brightness=1.0, ramp_duration=60, hold_duration=0, fade_duration=0))
+
+    threads = [threading.Thread(target=producer) for _ in range(4)]
+    for t in threads:
+        t.start()
+    while any(t.is_alive() for t in threads):
+        manager.tick()
+    for t in threads:
+        t.join()
+    manager.tick()
+
+    assert manager.pending_submissions == 0
+    assert len(manager.operations) == 4 * per_thread
+
+
+def _op(start_offset=0.0, duration=60.0):
+    return LEDPixelOperation(target_brightness=1.0, ramp_duration=duration, hold_duration=0,
+                             fade_duration=0, start_time=time.monotonic() + start_offset)
+
+
+def test_cancel_only_touches_one_led(manager):
+    """
+    Tests that cancel(row, col) drops the LED's active and scheduled operations
+    and leaves every other LED alone.
+    """
+    manager.matrix.get_led.return_value = MagicMock(spec=HybridLEDController)
+    handle = manager.add_operations([((0, 0), _op()), ((0, 0), _op(start_offset=100)), ((0, 1), _op())])
+    manager.tick()
+    assert len(manager.operations_at(0, 0)) == 2
+
+    assert manager.cancel(0, 0) == 2
+    assert manager.operations_at(0, 0) == []
+    assert manager.operation_count == 1
+    assert manager.scheduled_count == 0
+    assert handle.remaining == 1
+
+    manager.matrix.get_led.reset_mock()
+    manager.tick()
+    manager.matrix.get_led.assert_called_once_with(0, 1)
+    assert len(manager.operations) == 1
+    assert manager.cancel(3, 3) == 0
+
+
+def test_replace_swaps_the_operation_on_one_led(manager):
+    manager.matrix.get_led.return_value = MagicMock(spec=HybridLEDController)
+    old = _op()
+    manager.add_operation(0, 0, old)
+    new = _op()
+
+    manager.replace(0, 0, new)
+    manager.tick()
+
+    assert manager.operations_at(0, 0) == [new]
+    assert [managed.pixel_op for managed in manager.operations] == [new]
+
+
+def test_cancel_pattern_finishes_its_handle(manager):
+    """
+    Tests that cancel_pattern() removes only that pattern's operations,
+    including ones still queued and ones still scheduled.
+    """
+    manager.matrix.get_led.return_value = MagicMock(spec=HybridLEDController)
+    keep = manager.add_operations([((1, c), _op()) for c in range(3)])
+    drop = manager.add_operations([((0, c), _op(start_offset=c * 100)) for c in range(3)])
+
+    assert manager.cancel_pattern(drop) == 3
+    assert drop.done
+    assert not keep.done
+    manager.tick()
+    assert manager.operation_count == 3
+    assert manager.scheduled_count == 0
+    assert {(managed.row, managed.col) for managed in manager.operations} == {(1, 0), (1, 1), (1, 2)}
+
+
+def test_cancelled_scheduled_operations_are_dropped_at_promotion(manager):
+    manager.matrix.get_led.return_value = MagicMock(spec=HybridLEDController)
+    manager.add_operation(0, 0, _op(start_offset=1.0))
+    manager.cancel(0, 0)
+
+    manager.tick(time.monotonic() + 2.0)
+
+    assert manager.operations == []
+    assert manager.scheduled_count == 0
+    manager.matrix.get_led.assert_not_called()
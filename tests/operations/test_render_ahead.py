@@ -0,0 +1,234 @@
+# tests/operations/test_render_ahead.py
+import threading
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from bongo.matrix.matrix import LEDMatrix
+from bongo.operations.animation_manager import AnimationManager
+from bongo.operations.fixed_point import to_duty
+from bongo.operations.led_operation import LEDPixelOperation
+from bongo.operations.render_ahead import FrameRing, RenderAheadRunner
+
+
+def _matrix():
+    """A 2x4 matrix whose LEDs record what is written to them."""
+    matrix = LEDMatrix(config=[], hardware_manager=MagicMock())
+    for r in range(2):
+        for c in range(4):
+            matrix.leds[(r, c)] = MagicMock()
+    matrix.rows, matrix.cols = 2, 4
+    return matrix
+
+
+def _op(start_time, target=1.0, ramp=0.0, hold=10.0):
+    return LEDPixelOperation(target, ramp, hold, 0.0, start_time=start_time, initial_brightness=0.0)
+
+
+def test_frame_ring_is_fifo_with_fixed_capacity():
+    ring = FrameRing(3)
+    for t in range(3):
+        ring.push(float(t), {"t": t})
+    assert ring.full
+    with pytest.raises(IndexError):
+        ring.push(3.0, {})
+
+    assert ring.pop() == (0.0, {"t": 0})
+    ring.push(3.0, {"t": 3})
+    assert [t for t, _ in ring.pending()] == [1.0, 2.0, 3.0]
+    assert ring.peek() == (1.0, {"t": 1})
+
+    ring.clear()
+    assert len(ring) == 0 and ring.peek() is None
+    with pytest.raises(IndexError):
+        ring.pop()
+
+
+def test_frame_ring_needs_a_slot():
+    with pytest.raises(ValueError):
+        FrameRing(0)
+
+
+def test_frame_ring_discards_frames_from_a_timestamp():
+    ring = FrameRing(4)
+    for t in range(4):
+        ring.push(float(t), {"t": t})
+    ring.pop()
+
+    assert ring.discard_from(2.5) == 3.0
+    assert ring.discard_from(5.0) is None
+    assert ring.last() == (2.0, {"t": 2})
+    assert ring.discard_from(float("-inf")) == 1.0
+    assert len(ring) == 0 and ring.last() is None
+    ring.push(4.0, {})
+    assert ring.peek() == (4.0, {})
+
+
+def _render_frames(manager, times):
+    frames, previous = [], float("-inf")
+    for t in times:
+        frames.append(manager.render_frame(t, previous))
+        previous = t
+    return frames
+
+
+def test_changes_invalidate_frames_from_their_start():
+    manager = AnimationManager(_matrix())
+    now = time.monotonic()
+    manager.add_operation(0, 0, _op(now - 1.0, target=0.5))
+    manager.take_invalidation()
+    _render_frames(manager, [now + i * 0.1 for i in range(4)])
+    assert manager.take_invalidation() is None
+
+    manager.submit(1, 2, _op(now + 0.15))
+    manager.admit_submissions()
+    assert manager.take_invalidation() == pytest.approx(now + 0.15)
+    assert manager.take_invalidation() is None
+
+    for change in (lambda: manager.cancel(0, 0), lambda: manager.call_soon(lambda: None),
+                   lambda: manager.add_layer("accent")):
+        change()
+        manager.admit_submissions()
+        assert manager.take_invalidation() == float("-inf")
+
+
+def test_frames_render_again_without_retiring_anything():
+    manager = AnimationManager(_matrix())
+    now = time.monotonic()
+    handle = manager.add_operations([((0, 0), LEDPixelOperation(1.0, 0.0, 0.15, 0.0, start_time=now,
+                                                                initial_brightness=0.0)),
+                                     ((0, 1), _op(now + 0.2))])
+    times = [now + i * 0.1 for i in range(4)]
+
+    first = _render_frames(manager, times)
+    # (0, 0) completes in the frame at 0.2 and is drawn there for the last time.
+    assert [frame.get((0, 0)) for frame in first] == [1.0, 1.0, 1.0, None]
+    assert [frame.get((0, 1)) for frame in first] == [None, None, 1.0, 1.0]
+    assert manager.operation_count == 2 and not handle.done
+
+    # Rendering the same timestamps again gives the same frames.
+    assert _render_frames(manager, times) == first
+
+    manager.retire_shown(times[1])
+    assert manager.operation_count == 2
+    manager.retire_shown(times[2])
+    assert manager.operation_count == 1 and handle.remaining == 1
+
+
+def test_new_operations_are_composited_when_frames_render_again():
+    manager = AnimationManager(_matrix())
+    manager.add_layer("accent", opacity=0.5)
+    now = time.monotonic()
+    manager.add_operation(0, 0, _op(now - 1.0, target=0.8))
+    assert manager.render_frame(now)[(0, 0)] == pytest.approx(0.8)
+
+    manager.submit(0, 0, _op(now - 1.0, target=0.4), layer="accent")
+    manager.admit_submissions()
+
+    assert manager.render_frame(now)[(0, 0)] == pytest.approx(0.6)
+
+
+def test_cancelled_pattern_is_gone_when_frames_render_again():
+    manager = AnimationManager(_matrix(), fixed_point=True)
+    now = time.monotonic()
+    handle = manager.add_operations([((1, 3), _op(now - 1.0, target=0.25))])
+    manager.admit_submissions()
+    assert manager.render_frame(now) == {manager._duty_frame.positions[(1, 3)]: to_duty(0.25)}
+
+    manager.cancel_pattern(handle)
+
+    assert manager.take_invalidation() == float("-inf")
+    assert manager.render_frame(now) == {}
+
+
+def test_runner_plays_frames_in_order_at_their_deadlines():
+    manager = AnimationManager(_matrix())
+    start = time.monotonic()
+    manager.add_operation(0, 0, LEDPixelOperation(1.0, 1.0, 0.0, 0.0, start_time=start, initial_brightness=0.0))
+    played = []
+    play_frame = manager.play_frame
+    manager.play_frame = lambda frame: (played.append((time.monotonic(), frame[(0, 0)])), play_frame(frame))
+    runner = RenderAheadRunner(manager, fps=50, frames_ahead=3, status_interval=None)
+
+    runner.run(max_frames=10)
+
+    assert runner.frame_count == 10
+    levels = [level for _, level in played]
+    assert levels == sorted(levels)
+    for i in range(1, len(played)):
+        # Each frame's brightness matches the moment it was shown, within a frame.
+        assert played[i][1] == pytest.approx(played[i][0] - start, abs=2 * runner.period + 0.02)
+
+
+def test_runner_shows_interactive_submission_on_buffered_frames():
+    manager = AnimationManager(_matrix())
+    led = manager.matrix.leds[(1, 1)]
+    manager.add_operation(0, 0, _op(time.monotonic(), hold=5.0))
+    runner = RenderAheadRunner(manager, fps=50, frames_ahead=8, status_interval=None)
+    thread = threading.Thread(target=runner.run)
+    thread.start()
+    try:
+        time.sleep(0.2)  # the ring is full by now
+        submitted = time.monotonic()
+        manager.submit(1, 1, _op(None))
+        deadline = submitted + 1.0
+        while not led.set_brightness.called and time.monotonic() < deadline:
+            time.sleep(0.005)
+        shown = time.monotonic()
+    finally:
+        runner.stop()
+        thread.join(timeout=2.0)
+
+    assert not thread.is_alive()
+    led.set_brightness.assert_any_call(1.0)
+    # Patched into the frames already buffered, not queued behind them.
+    assert shown - submitted < 4 * runner.period + 0.05
+
+
+def test_runner_stops_showing_a_cancelled_pattern_on_the_next_frame():
+    manager = AnimationManager(_matrix())
+    handle = manager.add_operations([((0, 0), _op(time.monotonic(), hold=5.0))])
+    manager.add_operations([((1, 1), _op(time.monotonic(), hold=5.0))])  # keeps frames coming
+    played = []
+    play_frame = manager.play_frame
+    manager.play_frame = lambda frame: (played.append((time.monotonic(), frame.get((0, 0)))),
+                                        play_frame(frame))
+    runner = RenderAheadRunner(manager, fps=50, frames_ahead=8, status_interval=None)
+    cancelled = threading.Event()
+
+    def cancel():
+        manager.cancel_pattern(handle)
+        cancelled.set()
+
+    thread = threading.Thread(target=runner.run)
+    thread.start()
+    try:
+        time.sleep(0.2)  # the ring is full by now
+        manager.call_soon(cancel)
+        assert cancelled.wait(1.0)
+        cancelled_at = time.monotonic()
+        time.sleep(0.1)
+    finally:
+        runner.stop()
+        thread.join(timeout=2.0)
+
+    assert not thread.is_alive()
+    assert [level for _, level in played[:3]] == [1.0] * 3
+    after = [level for shown, level in played if shown > cancelled_at]
+    assert after and all(level is None for level in after)
+    assert handle.done
+
+
+def test_runner_idles_without_work_and_stops():
+    manager = AnimationManager(_matrix())
+    runner = RenderAheadRunner(manager, fps=50, status_interval=None)
+    thread = threading.Thread(target=runner.run)
+    thread.start()
+    time.sleep(0.1)
+    runner.stop()
+    thread.join(timeout=2.0)
+
+    assert not thread.is_alive()
+    assert runner.frame_count == 0
+    assert runner.idle_percentage > 50
@@ -0,0 +1,140 @@
+# tests/operations/test_render_pool.py
+import pickle
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+
+from bongo.matrix.matrix import LEDMatrix
+from bongo.operations.animation_manager import AnimationManager
+from bongo.operations.render_pool import ShaderRenderPool, shard_indices
+from bongo.patterns.expressions import ExpressionShader, compile_expression
+from bongo.patterns.shaders import SHADER_LIBRARY, Shader
+
+
+def _matrix(rows=6, cols=10, boards=None):
+    """A matrix whose LEDs record the last brightness written to them."""
+    matrix = LEDMatrix(config=[], hardware_manager=MagicMock())
+    for r in range(rows):
+        for c in range(cols):
+            matrix.leds[(r, c)] = MagicMock()
+            if boards:
+                matrix.led_boards[(r, c)] = 0x40 + c % boards
+    matrix.rows, matrix.cols = rows, cols
+    return matrix
+
+
+@pytest.fixture(scope="module")
+def pool_matrix():
+    return _matrix(boards=4)
+
+
+@pytest.fixture(scope="module")
+def pool(pool_matrix):
+    with ShaderRenderPool(pool_matrix, workers=3) as pool:
+        yield pool
+
+
+def _written(matrix):
+    return {coords: led.set_brightness.call_args[0][0]
+            for coords, led in matrix.leds.items() if led.set_brightness.called}
+
+
+def test_shards_follow_boards_or_rows():
+    boarded = _matrix(boards=4)
+    shards = shard_indices(boarded, boarded.coordinate_grid(), 2)
+    grid = boarded.coordinate_grid()
+    assert len(shards) == 2
+    assert sorted(np.concatenate(shards)) == list(range(len(grid)))
+    for shard in shards:
+        assert len({boarded.led_boards[grid.coords[i]] for i in shard}) == 2
+
+    plain = _matrix()
+    bands = shard_indices(plain, plain.coordinate_grid(), 4)
+    assert [len(band) for band in bands] == [15, 15, 15, 15]
+    assert list(bands[1]) == list(range(15, 30))
+
+
+@pytest.mark.parametrize("name", sorted(SHADER_LIBRARY))
+def test_workers_match_single_process_rendering(pool, pool_matrix, name):
+    shader = Shader.from_library(name)
+    grid = pool_matrix.coordinate_grid()
+
+    background, layers = pool.evaluate([(None, shader, 1.3)])
+
+    np.testing.assert_allclose(background, shader.evaluate(grid, 1.3))
+    assert layers == {}
+
+
+def test_layers_and_blending_in_workers(pool, pool_matrix):
+    grid = pool_matrix.coordinate_grid()
+    plasma = Shader.from_library("plasma")
+    wave = Shader.from_library("wave", blend="multiply")
+    accent = object()
+    expression = ExpressionShader("fract(nx + t) * (index % 2)")
+
+    background, layers = pool.evaluate([(None, plasma, 0.5), (accent, expression, 0.25), (None, wave, 0.5)])
+
+    np.testing.assert_allclose(background, wave.composite(plasma.evaluate(grid, 0.5), wave.evaluate(grid, 0.5)))
+    np.testing.assert_allclose(layers[accent], expression.evaluate(grid, 0.25))
+
+
+def test_unpicklable_shaders_render_in_the_main_process(pool, pool_matrix):
+    shader = Shader(lambda x, y, t: x / 10.0)
+
+    background, _ = pool.evaluate([(None, shader, 0.0)])
+
+    np.testing.assert_allclose(background, pool_matrix.coordinate_grid().x / 10.0)
+
+
+def test_unsendable_shaders_are_not_retried_every_frame(pool, pool_matrix):
+    shader = Shader(lambda x, y, t: x / 10.0)
+    bind = shader.bind
+    binds = []
+    shader.bind = lambda grid: binds.append(grid) or bind(grid)
+
+    for frame in range(5):
+        background, _ = pool.evaluate([(None, shader, frame * 0.02)])
+
+    assert len(binds) == 1
+    np.testing.assert_allclose(background, pool_matrix.coordinate_grid().x / 10.0)
+    # A list the workers can take goes to them again.
+    plasma = Shader.from_library("plasma")
+    background, _ = pool.evaluate([(None, plasma, 0.0)])
+    np.testing.assert_allclose(background, plasma.evaluate(pool_matrix.coordinate_grid(), 0.0))
+
+
+def test_worker_errors_are_raised(pool):
+    with pytest.raises(RuntimeError, match="ZeroDivisionError"):
+        pool.evaluate([(None, Shader(_broken), 0.0)])
+    # The workers keep serving frames afterwards.
+    background, _ = pool.evaluate([(None, Shader.from_library("solid", level=0.5), 0.0)])
+    assert np.all(background == 0.5)
+
+
+def _broken(x, y, t):
+    return 1 / 0
+
+
+def test_compiled_expressions_pickle():
+    compiled = compile_expression("x * a", ["a"])
+    assert pickle.loads(pickle.dumps(compiled)) is compiled
+
+
+def test_manager_renders_shaders_through_the_pool(pool, pool_matrix):
+    local = _matrix(boards=4)
+    for matrix, render_pool in ((pool_matrix, pool), (local, None)):
+        manager = AnimationManager(matrix, render_pool=render_pool)
+        manager.add_shader(Shader.from_library("ripple", decay=0.1), start_time=0.0)
+        manager.tick(2.0)
+
+    assert _written(pool_matrix) == pytest.approx(_written(local))
+    assert len(_written(local)) == 60
+
+
+def test_closed_pool_rejects_frames():
+    pool = ShaderRenderPool(_matrix(rows=2, cols=2), workers=1)
+    pool.close()
+    pool.close()
+    with pytest.raises(RuntimeError):
+        pool.evaluate([(None, Shader.from_library("solid"), 0.0)])
@@ -0,0 +1,85 @@
+# tests/operations/test_runner.py
+import threading
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.bongo.controller.hybrid_controller import HybridLEDController
+from src.bongo.operations.animation_manager import AnimationManager
+from src.bongo.operations.led_operation import LEDPixelOperation
+from src.bongo.operations.runner import AnimationRunner
+
+
+@pytest.fixture
+def manager():
+    mock_matrix = MagicMock()
+    mock_matrix.get_led.return_value = MagicMock(spec=HybridLEDController)
+    return AnimationManager(matrix=mock_matrix)
+
+
+def _op(start_time=None, duration=0.02):
+    return LEDPixelOperation(target_brightness=1.0, ramp_duration=duration, hold_duration=0,
+                             fade_duration=0, start_time=start_time, initial_brightness=0.0)
+
+
+def test_future_operations_are_scheduled_not_evaluated(manager):
+    led = manager.matrix.get_led.return_value
+    start = time.monotonic() + 100
+    manager.add_operation(0, 0, _op(start_time=start))
+
+    assert manager.scheduled_count == 1
+    assert len(manager.operations) == 0
+    assert manager.seconds_until_work(start - 5) == pytest.approx(5)
+
+    manager.tick(start - 1)
+    led.set_brightness.assert_not_called()
+
+    manager.tick(start)
+    assert manager.scheduled_count == 0
+    led.set_brightness.assert_called_once_with(0.0)
+
+
+def test_seconds_until_work(manager):
+    assert manager.seconds_until_work() is None
+    manager.submit(0, 0, _op())
+    assert manager.seconds_until_work() == 0.0
+
+
+def test_runner_sleeps_until_next_scheduled_operation(manager):
+    runner = AnimationRunner(manager, fps=200, status_interval=None)
+    manager.add_operation(0, 0, _op(start_time=time.monotonic() + 0.1))
+
+    started = time.monotonic()
+    runner.run(max_frames=1)
+    elapsed = time.monotonic() - started
+
+    assert 0.09 <= elapsed < 0.5
+    assert runner.frame_count == 1
+    assert runner.idle_percentage > 50
+
+
+def test_runner_wakes_immediately_on_submission(manager):
+    runner = AnimationRunner(manager, fps=200, status_interval=None)
+    thread = threading.Thread(target=runner.run, kwargs={"max_frames": 1})
+    thread.start()
+    time.sleep(0.05)
+    assert runner.frame_count == 0
+
+    submitted = time.monotonic()
+    manager.submit(0, 0, _op())
+    thread.join(timeout=1.0)
+
+    assert not thread.is_alive()
+    assert runner.frame_count == 1
+    assert time.monotonic() - submitted < 0.1
+
+
+def test_stop_interrupts_idle_wait(manager):
+    runner = AnimationRunner(manager, fps=200, status_interval=None)
+    thread = threading.Thread(target=runner.run)
+    thread.start()
+    time.sleep(0.02)
+    runner.stop()
+    thread.join(timeout=1.0)
+    assert not thread.is_alive()
@@ -0,0 +1,99 @@
+# tests/operations/test_shaders.py
+import time
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+
+from bongo.matrix.matrix import LEDMatrix
+from bongo.operations.animation_manager import AnimationManager
+from bongo.operations.led_operation import LEDPixelOperation
+from bongo.patterns.shaders import SHADER_LIBRARY, Shader
+
+
+@pytest.fixture
+def matrix():
+    """A 4x8 matrix whose LEDs record the last brightness written to them."""
+    matrix = LEDMatrix(config=[], hardware_manager=MagicMock())
+    for r in range(4):
+        for c in range(8):
+            matrix.leds[(r, c)] = MagicMock()
+    matrix.rows, matrix.cols = 4, 8
+    return matrix
+
+
+def _written(matrix):
+    return {coords: led.set_brightness.call_args[0][0]
+            for coords, led in matrix.leds.items() if led.set_brightness.called}
+
+
+def test_coordinate_grid_is_cached_and_ordered(matrix):
+    grid = matrix.coordinate_grid()
+    assert matrix.coordinate_grid() is grid
+    assert grid.coords[:2] == ((0, 0), (0, 1))
+    assert grid.x[9] == 1 and grid.y[9] == 1
+    assert grid.nx.max() == grid.ny.max() == 1.0
+
+
+@pytest.mark.parametrize("name", sorted(SHADER_LIBRARY))
+def test_library_shaders_stay_in_range(matrix, name):
+    shader = Shader.from_library(name)
+    for t in (0.0, 0.37, 5.0):
+        values = shader.evaluate(matrix.coordinate_grid(), t)
+        assert values.shape == (32,)
+        assert values.min() >= 0.0 and values.max() <= 1.0
+
+
+def test_unknown_shader_and_blend_are_rejected():
+    with pytest.raises(ValueError):
+        Shader.from_library("nope")
+    with pytest.raises(ValueError):
+        Shader(SHADER_LIBRARY["solid"], blend="screen")
+
+
+def test_shader_renders_every_led(matrix):
+    manager = AnimationManager(matrix)
+    manager.add_shader(Shader(lambda x, y, t: x / 10 + t), start_time=100.0)
+    manager.tick(100.5)
+    written = _written(matrix)
+    assert len(written) == 32
+    assert written[(2, 3)] == pytest.approx(0.8)
+
+
+def test_operations_draw_on_top_of_shaders(matrix):
+    manager = AnimationManager(matrix)
+    manager.add_shader(Shader.from_library("solid", level=0.25))
+    manager.add_operation(1, 1, LEDPixelOperation(1.0, 0, 10, 0, start_time=time.monotonic() - 1))
+    manager.tick()
+    written = _written(matrix)
+    assert written[(1, 1)] == 1.0
+    assert written[(0, 0)] == 0.25
+
+
+def test_blend_modes_combine_shaders(matrix):
+    manager = AnimationManager(matrix)
+    manager.add_shader(Shader.from_library("solid", level=0.5), start_time=0.0)
+    manager.add_shader(Shader.from_library("solid", level=0.75, blend="multiply"), start_time=0.0)
+    manager.tick(1.0)
+    assert set(_written(matrix).values()) == {0.375}
+
+
+def test_shader_finishes_after_its_duration(matrix):
+    manager = AnimationManager(matrix)
+    handle = manager.add_shader(Shader.from_library("plasma"), start_time=10.0, duration=2.0)
+    manager.tick(9.0)
+    assert manager.seconds_until_work(9.0) == pytest.approx(1.0)
+    manager.tick(11.0)
+    assert not handle.done
+    manager.tick(12.0)
+    assert handle.done and not manager.shaders
+    assert manager.seconds_until_work(12.0) is None
+
+
+def test_per_frame_cost_does_not_depend_on_duration(matrix):
+    short, endless = AnimationManager(matrix), AnimationManager(matrix)
+    short.add_shader(Shader.from_library("ripple"), start_time=0.0, duration=1.0)
+    endless.add_shader(Shader.from_library("ripple"), start_time=0.0)
+    short.tick(0.5)
+    endless.tick(0.5)
+    assert short.operation_count == endless.operation_count == 1
@@ -0,0 +1,129 @@
+# tests/operations/test_timing_wheel.py
+import heapq
+import random
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from bongo.operations.animation_manager import AnimationManager
+from bongo.operations.led_operation import LEDPixelOperation
+from bongo.operations.timing_wheel import TimingWheel
+
+TICK = 0.01
+
+
+def _drain(wheel, times):
+    released = []
+    for t in times:
+        released.extend((t, item) for item in wheel.advance(t))
+    return released
+
+
+def test_releases_in_heap_order_across_all_levels():
+    """Entries spread over every level (and the overflow) come out exactly as a heap would release them."""
+    wheel = TimingWheel(tick_seconds=TICK, slots=(8, 4, 4), origin=0.0)
+    rng = random.Random(7)
+    heap = []
+    for sequence in range(2000):
+        start = rng.uniform(0.0, 2.0 * 8 * 4 * 4 * TICK)  # twice the wheel's span
+        wheel.insert(start, sequence, sequence)
+        heapq.heappush(heap, (start, sequence))
+
+    times = [i * 0.0137 for i in range(1, 200)]
+    expected = []
+    for t in times:
+        while heap and heap[0][0] <= t:
+            expected.append((t, heapq.heappop(heap)[1]))
+
+    assert _drain(wheel, times) == expected
+    assert len(wheel) == len(heap)
+
+
+def test_never_releases_early_within_a_frame():
+    wheel = TimingWheel(tick_seconds=1.0, origin=0.0)
+    wheel.insert(5.75, "late in frame 5")
+
+    assert wheel.advance(5.5) == []
+    assert wheel.advance(5.75) == ["late in frame 5"]
+    assert len(wheel) == 0
+
+
+def test_long_idle_jump_releases_everything_due():
+    wheel = TimingWheel(tick_seconds=TICK, origin=0.0)
+    wheel.insert(3600.0, "an hour later")
+    wheel.insert(7 * 3600.0, "past the top level")
+
+    assert wheel.advance(3599.0) == []
+    assert wheel.advance(8 * 3600.0) == ["an hour later", "past the top level"]
+
+
+def test_sources_are_pulled_lazily():
+    wheel = TimingWheel(tick_seconds=TICK, origin=0.0, load_ahead=1.0)
+    pulled = []
+
+    def source():
+        for i in range(1_000_000):
+            pulled.append(i)
+            yield i * 0.5, i
+
+    wheel.add_source(source())
+    assert len(pulled) == 1
+    assert wheel.next_start() == 0.0
+
+    assert wheel.advance(2.0) == [0, 1, 2, 3, 4]
+    # Only read about load_ahead seconds past now.
+    assert len(pulled) <= 8
+
+
+def test_next_start_and_clear():
+    wheel = TimingWheel(tick_seconds=TICK, origin=0.0)
+    assert wheel.next_start() is None
+    wheel.insert(0.055, "a")
+    assert wheel.next_start() == pytest.approx(0.055)
+    wheel.insert(500.0, "b")
+    assert sorted(wheel.clear()) == ["a", "b"]
+    assert len(wheel) == 0
+
+
+@pytest.fixture
+def manager():
+    matrix = MagicMock()
+    return AnimationManager(matrix=matrix, timing_wheel=TimingWheel(tick_seconds=TICK))
+
+
+def _op(start_time, duration=0.1):
+    return LEDPixelOperation(1.0, duration, 0.0, 0.0, start_time=start_time)
+
+
+def test_manager_schedules_through_the_wheel(manager):
+    now = time.monotonic()
+    handle = manager.add_operations([((0, 0), _op(now + 10.0)), ((0, 1), _op(now + 20.0))])
+    manager.tick(now)
+    assert manager.scheduled_count == 2
+    assert manager._scheduled == []
+    # A lower bound: the wheel wakes the loop when the entry's bucket cascades.
+    assert 0.0 < manager.seconds_until_work(now) <= 10.0
+
+    manager.cancel(0, 1)
+    manager.tick(now + 10.0)
+    assert [(op.row, op.col) for op in manager.operations] == [(0, 0)]
+    manager.tick(now + 30.0)
+    assert manager.operation_count == 0
+    assert handle.done
+
+
+def test_manager_schedule_source(manager):
+    now = time.monotonic()
+    manager.timing_wheel.load_ahead = 1.0
+    manager.add_schedule_source(((0, i % 4), _op(now + i, duration=100.0)) for i in range(100_000))
+
+    manager.tick(now + 2.5)
+
+    assert sorted((op.row, op.col) for op in manager.operations) == [(0, 0), (0, 1), (0, 2)]
+    assert manager.scheduled_count <= 2
+
+
+def test_schedule_source_requires_a_wheel():
+    with pytest.raises(RuntimeError):
+        AnimationManager(matrix=MagicMock()).add_schedule_source([])
@@ -36,6 +36,7 @@ def main():
         ('unit', 'tests/unit/run_tests.py'),
         ('matrix', 'tests/matrix/run_matrix_tests.py'),
         ('operations', 'tests/operations/run_operations_tests.py'),
+        ('benchmarks', 'tests/benchmarks/run_benchmark_tests.py'),
         ('integration', 'tests/integration/run_integration_tests.py')
     ]
 
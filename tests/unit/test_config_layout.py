@@ -0,0 +1,86 @@
+# tests/unit/test_config_layout.py
+import json
+import os
+
+import pytest
+
+from config.layout import CompiledLayout, compile_layout
+from config.loader import ConfigLoader
+from src.bongo.controller.hybrid_controller import HybridLEDController
+from src.bongo.matrix.matrix import LEDMatrix
+
+LED_CONFIG = [
+    {"row": 0, "col": 0, "type": "gpio", "pin": 12},
+    {"row": 1, "col": 1, "type": "pca9685", "pin": 6, "address": 0x41},
+    {"row": 0, "col": 1, "type": "pca9685", "pin": 1, "address": 0x40},
+    {"row": 1, "col": 0, "type": "pca9685", "pin": 5, "address": 0x41},
+]
+
+
+@pytest.fixture
+def config_file(tmp_path):
+    path = tmp_path / "config.json"
+    path.write_text(json.dumps({"logging": {}, "leds": LED_CONFIG}))
+    return str(path)
+
+
+def test_compile_layout_builds_flat_index_and_board_arrays():
+    layout = compile_layout(LED_CONFIG, led_types=("pca9685",))
+
+    assert layout.coords == ((0, 1), (1, 0), (1, 1))
+    assert layout.index[(1, 0)] == 1
+    assert layout.boards == (0x40, 0x41)
+    assert layout.board_leds == ((0,), (1, 2))
+    assert layout.board_channels == ((1,), (5, 6))
+    assert (layout.rows, layout.cols) == (2, 2)
+    assert layout.num_leds == 3
+
+
+def test_compile_layout_rejects_invalid_entries():
+    with pytest.raises(ValueError):
+        compile_layout([{"row": 0, "type": "gpio", "pin": 3}])
+    with pytest.raises(ValueError):
+        compile_layout([{"row": 0, "col": 0, "type": "pca9685", "pin": 16, "address": 0x40}])
+    with pytest.raises(ValueError):
+        compile_layout([
+            {"row": 0, "col": 0, "type": "pca9685", "pin": 2, "address": 0x40},
+            {"row": 0, "col": 1, "type": "pca9685", "pin": 2, "address": 0x40},
+        ])
+
+
+def test_layout_round_trips_through_dict():
+    layout = compile_layout(LED_CONFIG)
+    assert CompiledLayout.from_dict(json.loads(json.dumps(layout.to_dict()))) == layout
+
+
+def test_loader_caches_compiled_layout_by_config_hash(config_file, tmp_path):
+    cache_dir = str(tmp_path / "cache")
+    loader = ConfigLoader()
+    loader.load_from_file(config_file)
+
+    first = loader.get_compiled_layout(led_types=("pca9685",), cache_dir=cache_dir)
+    cached_files = os.listdir(cache_dir)
+    assert len(cached_files) == 1
+
+    second = loader.get_compiled_layout(led_types=("pca9685",), cache_dir=cache_dir)
+    assert second == first
+
+    # A different config file produces a different cache entry.
+    with open(config_file, "w") as f:
+        json.dump({"leds": LED_CONFIG[:2]}, f)
+    loader.load_from_file(config_file)
+    third = loader.get_compiled_layout(led_types=("pca9685",), cache_dir=cache_dir)
+    assert third.num_leds == 1
+    assert len(os.listdir(cache_dir)) == 2
+
+
+def test_matrix_from_layout(mock_hardware_manager):
+    layout = compile_layout(LED_CONFIG, led_types=("pca9685",))
+    matrix = LEDMatrix.from_layout(layout, mock_hardware_manager)
+
+    assert (matrix.rows, matrix.cols) == (2, 2)
+    assert len(matrix) == 3
+    led = matrix.get_led(1, 1)
+    assert isinstance(led, HybridLEDController)
+    assert led.led_channel == 6
+    assert matrix.get_led(0, 0) is None
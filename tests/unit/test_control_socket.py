@@ -0,0 +1,160 @@
+# tests/unit/test_control_socket.py
+import json
+import threading
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from bongo.control.client import ControlClient, ControlError
+from bongo.control.server import ControlServer
+from bongo.matrix.matrix import LEDMatrix
+from bongo.operations.animation_manager import AnimationManager
+
+
+@pytest.fixture
+def matrix():
+    """A 3x4 matrix whose LEDs record the last brightness written to them."""
+    matrix = LEDMatrix(config=[], hardware_manager=MagicMock())
+    for r in range(3):
+        for c in range(4):
+            matrix.leds[(r, c)] = MagicMock()
+    matrix.rows, matrix.cols = 3, 4
+    return matrix
+
+
+@pytest.fixture
+def manager(matrix):
+    return AnimationManager(matrix)
+
+
+@pytest.fixture
+def server(manager, tmp_path):
+    server = ControlServer(manager, path=str(tmp_path / "control.sock"))
+    server.start()
+    yield server
+    server.stop()
+
+
+@pytest.fixture
+def client(server):
+    with ControlClient(server.path, timeout=2.0) as client:
+        yield client
+
+
+def test_call_soon_runs_at_the_next_frame_boundary(manager):
+    calls = []
+    manager.call_soon(lambda: calls.append("first"))
+    manager.call_soon(lambda: 1 / 0)  # logged, doesn't stop the frame
+    manager.call_soon(lambda: calls.append("second"))
+    assert calls == []
+    manager.tick()
+    assert calls == ["first", "second"]
+
+
+def test_clear_operations_keeps_queued_callbacks(manager):
+    calls = []
+    manager.call_soon(lambda: calls.append(1))
+    manager.clear_operations()
+    manager.tick()
+    assert calls == [1]
+
+
+def test_set_and_fill_are_applied_on_tick(manager, matrix, client):
+    assert client.request("ping") == "pong"
+    assert client.request("set 1 2 255") == ""
+    matrix.get_led(1, 2).set_brightness.assert_not_called()
+    manager.tick()
+    matrix.get_led(1, 2).set_brightness.assert_called_with(1.0)
+
+    client.request("fill 0.25")
+    manager.tick()
+    assert matrix.get_led(0, 0).set_brightness.call_args[0][0] == pytest.approx(0.25)
+
+
+def test_errors_are_reported_to_the_client(client):
+    for request in ("bogus", "set 1 2", "set 9 9 1", "fill loud", "stop 42", "pattern nosuch",
+                    "pattern plasma scale=1 nosuch=2"):
+        with pytest.raises(ControlError):
+            client.request(request)
+    assert client.request("ping") == "pong"  # the connection survives errors
+
+
+def test_pattern_start_stop_and_stats(manager, server, client):
+    chase = int(client.request("pattern chase delay=0.05"))
+    shader = int(client.request("pattern plasma speed=0.5"))
+    assert shader == chase + 1
+    manager.tick()
+    stats = json.loads(client.request("stats"))
+    assert stats["patterns"] == [chase, shader]
+    assert stats["shaders"] == 1
+
+    client.request(f"stop {shader}")
+    manager.tick()
+    assert not manager.shaders
+    assert server.patterns.keys() == {chase}
+
+    client.request("stop")
+    manager.tick()
+    assert manager.operation_count == 0
+
+
+def test_patterns_refreeze_the_heap(manager, tmp_path):
+    gc_controller = MagicMock()
+    server = ControlServer(manager, path=str(tmp_path / "gc.sock"), gc_controller=gc_controller)
+    assert server.handle("pattern plasma").startswith("ok")
+    gc_controller.freeze_soon.assert_called_once_with(manager)
+
+
+def test_raw_writes_the_first_controller(manager, matrix, client):
+    controller = MagicMock()
+    controller.channels = [MagicMock() for _ in range(16)]
+    matrix.hardware_manager.controllers = {0x40: controller}
+    matrix.hardware_manager.get_controller.return_value = controller
+    client.request("raw 3 4096")
+    manager.tick()
+    matrix.hardware_manager.get_controller.assert_called_with(0x40)
+    assert controller.channels[3].duty_cycle == 4096
+
+    with pytest.raises(ControlError, match="channel must be 0-15"):
+        client.request("raw 99 1000")
+
+
+def test_shader_parameters_are_checked_without_rendering(manager, client, monkeypatch):
+    from bongo.patterns.shaders import Shader
+
+    monkeypatch.setattr(Shader, "evaluate", MagicMock(side_effect=AssertionError("rendered off-thread")))
+    for request in ("pattern plasma bogus=1", "pattern plasma speed=fast"):
+        with pytest.raises(ControlError):
+            client.request(request)
+    assert client.request("pattern plasma speed=0.5") == "1"
+    assert not manager.shaders  # queued, not yet admitted
+
+
+def test_sync_waits_for_the_render_loop(manager, client):
+    ticking = threading.Event()
+
+    def render_loop():
+        while not ticking.is_set():
+            manager.tick()
+            time.sleep(0.001)
+
+    thread = threading.Thread(target=render_loop)
+    thread.start()
+    try:
+        client.request("set 0 0 1")
+        assert client.request("sync") == ""
+        manager.matrix.get_led(0, 0).set_brightness.assert_called_with(1.0)
+    finally:
+        ticking.set()
+        thread.join()
+
+
+def test_stale_socket_is_replaced(manager, server):
+    second = ControlServer(manager, path=server.path)
+    second.start()
+    try:
+        with ControlClient(second.path) as client:
+            assert client.request("ping") == "pong"
+    finally:
+        second.stop()
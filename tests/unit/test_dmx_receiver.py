@@ -0,0 +1,195 @@
+# tests/unit/test_dmx_receiver.py
+import socket
+import time
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+
+from bongo.ingest.dmx_receiver import (DMXMapping, DMXReceiver, DMXShader, artnet_packet, artnet_sync,
+                                       e131_packet, e131_sync)
+from bongo.matrix.matrix import LEDMatrix
+from bongo.operations.animation_manager import AnimationManager
+
+
+@pytest.fixture
+def matrix():
+    """A 4x5 matrix whose LEDs record the last brightness written to them."""
+    matrix = LEDMatrix(config=[], hardware_manager=MagicMock())
+    for r in range(4):
+        for c in range(5):
+            matrix.leds[(r, c)] = MagicMock()
+    matrix.rows, matrix.cols = 4, 5
+    return matrix
+
+
+@pytest.fixture
+def sender():
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    yield sock
+    sock.close()
+
+
+def _receiver(mapping, protocol="artnet"):
+    return DMXReceiver(mapping, protocol=protocol, host="127.0.0.1", port=0)
+
+
+def _send(sender, receiver, *packets):
+    for packet in packets:
+        sender.sendto(packet, receiver.address)
+    deadline = time.monotonic() + 1.0
+    handled = 0
+    while handled < len(packets) and time.monotonic() < deadline:
+        handled += receiver.poll()
+    assert handled == len(packets)
+
+
+def test_linear_mapping_spans_universes(matrix):
+    mapping = DMXMapping.linear(matrix.coordinate_grid(), start_universe=1, leds_per_universe=8)
+    assert sorted(mapping.universes) == [1, 2, 3]
+    assert mapping.universes[2][0] == (8, 1)
+    with pytest.raises(ValueError):
+        DMXMapping(4, [(0, 0, 512)], channels_per_led=2)
+
+
+def test_artnet_frame_completes_when_every_universe_arrives(matrix, sender):
+    grid = matrix.coordinate_grid()
+    receiver = _receiver(DMXMapping.linear(grid, leds_per_universe=10))
+    try:
+        _send(sender, receiver, artnet_packet(0, bytes(range(0, 100, 10)), sequence=1))
+        assert receiver.acquire() is None  # universe 1 still missing
+
+        _send(sender, receiver, artnet_packet(1, [255] * 10, sequence=1))
+        frame = receiver.acquire()
+        assert frame[3] == pytest.approx(30 / 255)
+        assert frame[grid.positions[(3, 4)]] == 1.0
+        assert receiver.frames == 1
+    finally:
+        receiver.close()
+
+
+def test_frames_are_handed_over_without_copying(matrix, sender):
+    receiver = _receiver(DMXMapping.linear(matrix.coordinate_grid()))
+    try:
+        _send(sender, receiver, artnet_packet(0, [10] * 20))
+        first = receiver.acquire()
+        assert receiver.acquire() is first  # no new frame: same buffer
+
+        _send(sender, receiver, artnet_packet(0, [20] * 20))
+        assert first[0] == pytest.approx(10 / 255)  # the buffer being read is never written
+        second = receiver.acquire()
+        assert second is not first and second[0] == pytest.approx(20 / 255)
+    finally:
+        receiver.close()
+
+
+def test_sync_packet_publishes_a_partial_frame(matrix, sender):
+    receiver = _receiver(DMXMapping.linear(matrix.coordinate_grid(), leds_per_universe=10))
+    try:
+        _send(sender, receiver, artnet_packet(1, [128] * 10), artnet_sync())
+        assert receiver.acquire()[15] == pytest.approx(128 / 255)
+    finally:
+        receiver.close()
+
+
+def test_dropped_universe_keeps_its_latest_values(matrix, sender):
+    grid = matrix.coordinate_grid()
+    receiver = _receiver(DMXMapping.linear(grid, leds_per_universe=10))
+    try:
+        for frame, level in enumerate((10, 20), start=1):
+            _send(sender, receiver, artnet_packet(0, [level] * 10, sequence=frame),
+                  artnet_packet(1, [level] * 10, sequence=frame))
+            receiver.acquire()
+        # Universe 1's packet of the third frame is lost; the sync publishes anyway.
+        _send(sender, receiver, artnet_packet(0, [30] * 10, sequence=3), artnet_sync())
+        frame = receiver.acquire()
+        assert frame[:10] == pytest.approx([30 / 255] * 10)
+        assert frame[10:] == pytest.approx([20 / 255] * 10)  # not the frame before (10)
+    finally:
+        receiver.close()
+
+
+def test_e131_sixteen_bit_channels_and_sequence(matrix, sender):
+    grid = matrix.coordinate_grid()
+    receiver = _receiver(DMXMapping.linear(grid, start_universe=1, channels_per_led=2), protocol="e131")
+    try:
+        data = bytearray(40)
+        data[0:2] = b"\x80\x00"
+        data[38:40] = b"\xff\xff"
+        _send(sender, receiver, e131_packet(1, data, sequence=10))
+        frame = receiver.acquire()
+        assert frame[0] == pytest.approx(0x8000 / 0xFFFF)
+        assert frame[19] == 1.0
+
+        # A late packet from before the last one is dropped.
+        _send(sender, receiver, e131_packet(1, bytes(40), sequence=9))
+        assert receiver.out_of_order == 1
+        _send(sender, receiver, e131_packet(1, bytes(40), sequence=11), e131_sync(1))
+        assert receiver.acquire()[19] == 0.0
+    finally:
+        receiver.close()
+
+
+def test_short_packets_only_update_the_channels_they_carry(matrix, sender):
+    receiver = _receiver(DMXMapping.linear(matrix.coordinate_grid()))
+    try:
+        _send(sender, receiver, artnet_packet(0, [100] * 20), artnet_packet(0, [200] * 4))
+        receiver.acquire()
+        frame = receiver.acquire()
+        assert frame[:4] == pytest.approx([200 / 255] * 4)
+    finally:
+        receiver.close()
+
+
+def test_unknown_and_malformed_packets_are_ignored(matrix, sender):
+    receiver = _receiver(DMXMapping.linear(matrix.coordinate_grid()))
+    try:
+        _send(sender, receiver, artnet_packet(9, [1, 2]), b"not dmx", e131_packet(0, [1, 2]))
+        assert receiver.ignored == 3
+        assert receiver.acquire() is None
+    finally:
+        receiver.close()
+
+
+def test_e131_packet_without_a_start_code_is_malformed(matrix, sender):
+    grid = matrix.coordinate_grid()
+    receiver = _receiver(DMXMapping.linear(grid, start_universe=1, leds_per_universe=10), protocol="e131")
+    try:
+        empty = bytearray(e131_packet(2, bytes(10)))
+        empty[123:125] = b"\x00\x00"  # property value count 0
+        _send(sender, receiver, e131_packet(1, bytes(10)), bytes(empty))
+        assert receiver.ignored == 1
+        assert receiver.acquire() is None  # universe 2 hasn't arrived
+    finally:
+        receiver.close()
+
+
+def test_receiver_thread_feeds_the_manager(matrix, sender):
+    receiver = _receiver(DMXMapping.linear(matrix.coordinate_grid()))
+    manager = AnimationManager(matrix)
+    manager.add_layer("desk", opacity=0.5)
+    manager.add_shader(DMXShader(receiver), layer="desk")
+    receiver.start()
+    try:
+        sender.sendto(artnet_packet(0, [255] * 20), receiver.address)
+        deadline = time.monotonic() + 1.0
+        while not receiver.frames and time.monotonic() < deadline:
+            time.sleep(0.001)
+        manager.tick()
+    finally:
+        receiver.close()
+
+    assert matrix.get_led(2, 3).set_brightness.call_args[0][0] == pytest.approx(0.5)
+
+
+def test_stale_frames_go_dark(matrix, sender):
+    receiver = _receiver(DMXMapping.linear(matrix.coordinate_grid()))
+    shader = DMXShader(receiver, stale_after=0.05)
+    grid = matrix.coordinate_grid()
+    try:
+        _send(sender, receiver, artnet_packet(0, [255] * 20))
+        assert np.all(shader.evaluate(grid, 0.0) == 1.0)
+        time.sleep(0.06)
+        assert not shader.evaluate(grid, 0.0).any()
+    finally:
+        receiver.close()
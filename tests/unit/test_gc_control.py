@@ -0,0 +1,96 @@
+# tests/unit/test_gc_control.py
+import gc
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.bongo.controller.hybrid_controller import HybridLEDController
+from src.bongo.operations.animation_manager import AnimationManager
+from src.bongo.operations.led_operation import LEDPixelOperation
+from src.bongo.operations.runner import AnimationRunner
+from src.bongo.utils.gc_control import GCController
+from src.bongo.utils.metrics import RenderMetrics
+
+
+@pytest.fixture
+def controller():
+    metrics = RenderMetrics()
+    controller = GCController(metrics=metrics)
+    controller.enable()
+    yield controller
+    controller.disable()
+    gc.unfreeze()
+
+
+def _make_garbage(count):
+    for _ in range(count):
+        cycle = []
+        cycle.append(cycle)
+
+
+def test_enable_freezes_heap_and_disables_automatic_collection(controller):
+    assert not gc.isenabled()
+    assert gc.get_freeze_count() > 0
+    assert controller.metrics.gc_frozen_objects.value > 0
+
+
+def test_disable_restores_automatic_collection(controller):
+    controller.disable()
+    assert gc.isenabled()
+
+
+def test_nothing_is_collected_in_a_gap_that_is_too_short(controller):
+    _make_garbage(gc.get_threshold()[0] * 2)
+    assert controller.collect_in_gap(controller.young_gap / 2) is None
+
+
+def test_due_collection_runs_in_a_gap_and_is_reported(controller):
+    pauses = controller.metrics.gc_pause_seconds
+    before = sum(hist.count for _, hist in pauses.children())
+    _make_garbage(gc.get_threshold()[0] * 2)
+    assert controller.collect_in_gap(controller.young_gap) in (0, 1)
+
+    assert sum(hist.count for _, hist in pauses.children()) == before + 1
+    assert controller.last_pause > 0
+
+
+def test_full_collection_waits_for_a_long_gap(controller):
+    for _ in range(gc.get_threshold()[2]):
+        gc.collect(1)
+    assert controller.collect_in_gap(controller.young_gap) is None
+    assert controller.collect_in_gap(controller.full_gap) == 2
+
+
+def test_runner_collects_between_frames(controller):
+    matrix = MagicMock()
+    matrix.get_led.return_value = MagicMock(spec=HybridLEDController)
+    manager = AnimationManager(matrix=matrix)
+    manager.add_operation(0, 0, LEDPixelOperation(1.0, 10, 0, 0, start_time=time.monotonic(),
+                                                  initial_brightness=0.0))
+    controller.collect_in_gap = MagicMock(return_value=None)
+
+    AnimationRunner(manager, fps=100, status_interval=None, gc_controller=controller).run(max_frames=3)
+    assert controller.collect_in_gap.call_count == 3
+
+
+def test_freeze_soon_freezes_patterns_loaded_later(controller):
+    matrix = MagicMock()
+    matrix.get_led.return_value = MagicMock(spec=HybridLEDController)
+    manager = AnimationManager(matrix=matrix)
+    op = LEDPixelOperation(1.0, 10, 0, 0, start_time=time.monotonic(), initial_brightness=0.0)
+    manager.add_operations([((0, 0), op)])
+    controller.freeze_soon(manager)
+    frozen = gc.get_freeze_count()
+
+    manager.tick()
+    assert gc.get_freeze_count() > frozen
+
+
+def test_freeze_soon_does_nothing_once_disabled(controller):
+    manager = AnimationManager(matrix=MagicMock())
+    controller.freeze_soon(manager)
+    controller.disable()
+    controller.freeze = MagicMock()
+    manager.tick()
+    controller.freeze.assert_not_called()
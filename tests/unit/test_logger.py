@@ -0,0 +1,75 @@
+# tests/unit/test_logger.py
+import logging
+import threading
+from logging.handlers import QueueHandler
+
+import pytest
+
+from bongo.utils.logger import setup_logging, stop_logging
+
+
+@pytest.fixture
+def bongo_logger():
+    logger = logging.getLogger("bongo")
+    saved_handlers, saved_level = list(logger.handlers), logger.level
+    yield logger
+    stop_logging()
+    logger.handlers[:] = saved_handlers
+    logger.setLevel(saved_level)
+
+
+def test_only_a_queue_handler_runs_on_the_calling_thread(bongo_logger, tmp_path):
+    setup_logging({"level": "DEBUG", "filepath": str(tmp_path / "bongo.log")})
+    assert len(bongo_logger.handlers) == 1 and isinstance(bongo_logger.handlers[0], QueueHandler)
+
+
+def test_records_are_formatted_by_the_listener_thread(bongo_logger, tmp_path, monkeypatch):
+    monkeypatch.setattr(bongo_logger, "propagate", False)  # pytest's capture handler formats too
+    log_path = tmp_path / "bongo.log"
+    setup_logging({"level": "DEBUG", "filepath": str(log_path)})
+    formatted_on = []
+
+    class Recording:
+        def __str__(self):
+            formatted_on.append(threading.current_thread())
+            return "value"
+
+    try:
+        raise RuntimeError("boom")
+    except RuntimeError:
+        logging.getLogger("bongo.test").exception("failed with %s", Recording())
+    stop_logging()
+
+    text = log_path.read_text()
+    assert "failed with value" in text and "RuntimeError: boom" in text
+    assert formatted_on and threading.current_thread() not in formatted_on
+
+
+def test_records_are_written_by_the_listener_thread(bongo_logger, tmp_path):
+    log_path = tmp_path / "bongo.log"
+    listener = setup_logging({"level": "DEBUG", "filepath": str(log_path)})
+
+    writer_threads = []
+    file_handler = listener.handlers[-1]
+    original_emit = file_handler.emit
+
+    def recording_emit(record):
+        writer_threads.append(threading.current_thread())
+        original_emit(record)
+
+    file_handler.emit = recording_emit
+    logging.getLogger("bongo.test").debug("frame %d rendered", 42)
+    stop_logging()
+
+    assert "frame 42 rendered" in log_path.read_text()
+    assert writer_threads and threading.current_thread() not in writer_threads
+
+
+def test_disabled_debug_messages_are_never_formatted(bongo_logger, tmp_path):
+    setup_logging({"level": "INFO", "filepath": str(tmp_path / "bongo.log")})
+
+    class Exploding:
+        def __str__(self):
+            raise AssertionError("formatted a suppressed debug message")
+
+    logging.getLogger("bongo.test").debug("value %s", Exploding())
@@ -0,0 +1,80 @@
+# tests/unit/test_metrics.py
+import os
+import socket
+
+from src.bongo.operations.animation_manager import AnimationManager
+from src.bongo.operations.led_operation import LEDPixelOperation
+from src.bongo.utils.metrics import (Histogram, MetricsRegistry, PrometheusTextfileExporter,
+                                     RenderMetrics, UnixSocketExporter, PCA9685_WRITE_BYTES)
+
+
+def test_histogram_uses_fixed_buckets():
+    hist = Histogram(bounds=(0.001, 0.01))
+    for value in (0.0005, 0.001, 0.005, 0.5):
+        hist.observe(value)
+    assert hist.counts == [2, 1, 1]
+    assert hist.count == 4
+
+
+def test_registry_renders_prometheus_text():
+    registry = MetricsRegistry()
+    registry.counter("bongo_test_total", "A test counter.").inc(3)
+    registry.gauge("bongo_test_gauge", "A labelled gauge.", label="board").labels("0x40").set(2)
+    registry.histogram("bongo_test_seconds", "A histogram.", buckets=(0.1,)).observe(0.05)
+
+    text = registry.render_prometheus()
+    assert "# TYPE bongo_test_total counter" in text
+    assert "bongo_test_total 3" in text
+    assert 'bongo_test_gauge{board="0x40"} 2' in text
+    assert 'bongo_test_seconds_bucket{le="0.1"} 1' in text
+    assert 'bongo_test_seconds_bucket{le="+Inf"} 1' in text
+    assert "bongo_test_seconds_count 1" in text
+
+
+def test_tick_records_phases_and_board_writes(mock_matrix):
+    metrics = RenderMetrics()
+    manager = AnimationManager(mock_matrix, metrics=metrics)
+    for row, col in mock_matrix.leds:
+        manager.add_operation(row, col, LEDPixelOperation(
+            target_brightness=1.0, ramp_duration=1, hold_duration=1, fade_duration=1))
+
+    manager.tick()
+    manager.tick()
+
+    assert metrics.frames.value == 2
+    assert metrics.evaluate_seconds.count == 2
+    assert metrics.flush_seconds.count == 2
+    assert metrics.active_operations.value == 4
+    # conftest's matrix has two LEDs on each of boards 0x40 and 0x41.
+    assert metrics.i2c_transactions.labels("0x40").value == 4
+    assert metrics.i2c_bytes.labels("0x41").value == 4 * PCA9685_WRITE_BYTES
+
+
+def test_textfile_exporter_writes_atomically(tmp_path):
+    registry = MetricsRegistry()
+    registry.counter("bongo_test_total", "A test counter.").inc()
+    path = str(tmp_path / "bongo.prom")
+
+    PrometheusTextfileExporter(registry, path).write_once()
+
+    with open(path) as f:
+        assert "bongo_test_total 1" in f.read()
+    assert os.listdir(tmp_path) == ["bongo.prom"]
+
+
+def test_unix_socket_exporter_serves_metrics(tmp_path):
+    registry = MetricsRegistry()
+    registry.counter("bongo_test_total", "A test counter.").inc(7)
+    path = str(tmp_path / "metrics.sock")
+    exporter = UnixSocketExporter(registry, path)
+    exporter.start()
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.connect(path)
+            data = b""
+            while chunk := client.recv(4096):
+                data += chunk
+        assert b"bongo_test_total 7" in data
+    finally:
+        exporter.stop()
+    assert not os.path.exists(path)
@@ -0,0 +1,156 @@
+# tests/unit/test_shared_framebuffer.py
+import pickle
+import subprocess
+import sys
+import textwrap
+import time
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+
+from bongo.ingest.shared_framebuffer import (FORMAT_FLOAT32, FORMAT_UINT16, HEADER_SIZE, FramebufferShader,
+                                             SharedFramebuffer)
+from bongo.matrix.matrix import LEDMatrix
+from bongo.operations.animation_manager import AnimationManager
+from bongo.patterns.shaders import Shader
+
+
+@pytest.fixture
+def matrix():
+    """A 3x4 matrix whose LEDs record the last brightness written to them."""
+    matrix = LEDMatrix(config=[], hardware_manager=MagicMock())
+    for r in range(3):
+        for c in range(4):
+            matrix.leds[(r, c)] = MagicMock()
+    matrix.rows, matrix.cols = 3, 4
+    return matrix
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "frames")
+
+
+def _written(matrix):
+    return {coords: led.set_brightness.call_args[0][0]
+            for coords, led in matrix.leds.items() if led.set_brightness.called}
+
+
+def test_header_layout(path):
+    writer = SharedFramebuffer.create(path, 3, 4, FORMAT_UINT16)
+    writer.write(np.arange(12), timestamp_ns=123)
+
+    raw = open(path, "rb").read()
+    assert len(raw) == HEADER_SIZE + 12 * 2
+    assert raw[:4] == b"BGFB"
+    assert np.frombuffer(raw, "<u2", count=4, offset=4).tolist() == [1, 2, 3, 0]  # version, format, rows
+    assert np.frombuffer(raw, "<u8", count=2, offset=16).tolist() == [2, 123]  # sequence, timestamp
+    assert np.frombuffer(raw, "<u2", offset=HEADER_SIZE)[5] == 5
+
+
+def test_reader_sees_only_new_complete_frames(path):
+    writer = SharedFramebuffer.create(path, 2, 2)
+    reader = SharedFramebuffer(path)
+    out = np.zeros(4)
+    assert not reader.read_into(out)  # nothing written yet
+
+    writer.write([[0.1, 0.2], [0.3, 0.4]])
+    assert reader.read_into(out)
+    assert out == pytest.approx([0.1, 0.2, 0.3, 0.4])
+    assert not reader.read_into(out)
+
+    writer._sequence[0] += 1  # a writer in the middle of a frame
+    assert not reader.read_into(out)
+    assert reader.torn_reads == 1
+    with pytest.raises(RuntimeError):
+        reader.write([0, 0, 0, 0])
+
+
+def test_rejects_files_that_are_not_framebuffers(path):
+    with open(path, "wb") as f:
+        f.write(b"\0" * 128)
+    with pytest.raises(ValueError, match="magic"):
+        SharedFramebuffer(path)
+
+
+def test_open_attaches_to_an_existing_buffer(path):
+    SharedFramebuffer.create(path, 5, 6, FORMAT_UINT16)
+    reader = SharedFramebuffer.open(path, 5, 6, FORMAT_UINT16)
+    assert (reader.rows, reader.cols, reader.format) == (5, 6, FORMAT_UINT16)
+
+
+@pytest.mark.parametrize("shape", [(3, 4, FORMAT_UINT16), (5, 6, FORMAT_FLOAT32)])
+def test_open_rejects_a_buffer_of_another_shape_or_format(path, shape):
+    SharedFramebuffer.create(path, 5, 6, FORMAT_UINT16)
+    with pytest.raises(ValueError, match="expected"):
+        SharedFramebuffer.open(path, *shape)
+
+
+def test_frames_render_through_the_manager(matrix, path):
+    writer = SharedFramebuffer.create(path, 2, 8, FORMAT_UINT16)
+    manager = AnimationManager(matrix)
+    manager.add_shader(FramebufferShader(SharedFramebuffer(path)))
+
+    manager.tick()
+    assert set(_written(matrix).values()) == {0.0}  # dark until the first frame
+
+    frame = np.zeros((2, 8), dtype=np.uint16)
+    frame[1, 2] = 0xFFFF
+    frame[0, 3] = 0x8000
+    writer.write(frame)
+    manager.tick()
+    written = _written(matrix)
+    assert written[(1, 2)] == 1.0
+    assert written[(0, 3)] == pytest.approx(0.5, abs=1e-4)
+    assert written[(2, 2)] == 0.0  # outside the framebuffer
+
+
+def test_frames_as_a_layer_over_other_content(matrix, path):
+    writer = SharedFramebuffer.create(path, 3, 4)
+    manager = AnimationManager(matrix)
+    manager.add_layer("external", opacity=0.5)
+    manager.add_shader(Shader.from_library("solid", level=0.2))
+    manager.add_shader(FramebufferShader(SharedFramebuffer(path)), layer="external")
+
+    writer.write(np.full(12, 1.0))
+    manager.tick()
+
+    assert list(_written(matrix).values()) == [pytest.approx(0.6)] * 12
+
+
+def test_stale_frames_go_dark(matrix, path):
+    writer = SharedFramebuffer.create(path, 3, 4)
+    shader = FramebufferShader(SharedFramebuffer(path), stale_after=0.05)
+    grid = matrix.coordinate_grid()
+    writer.write(np.full(12, 0.7))
+
+    assert shader.evaluate(grid, 0.0) == pytest.approx(np.full(12, 0.7))
+    assert shader.evaluate(grid, 0.0) == pytest.approx(np.full(12, 0.7))  # held between frames
+    time.sleep(0.06)
+    assert not shader.evaluate(grid, 0.0).any()
+
+
+def test_framebuffer_shaders_stay_in_process(path):
+    SharedFramebuffer.create(path, 1, 1)
+    with pytest.raises(TypeError):
+        pickle.dumps(FramebufferShader(SharedFramebuffer(path)))
+
+
+def test_external_process_writer(path):
+    """A producer that only knows the documented layout, not this package."""
+    SharedFramebuffer.create(path, 2, 2)
+    producer = textwrap.dedent(f"""
+        import mmap, struct
+        with open({path!r}, "r+b") as f:
+            fb = mmap.mmap(f.fileno(), 0)
+        sequence = struct.unpack_from("<Q", fb, 16)[0]
+        struct.pack_into("<Q", fb, 16, sequence | 1)
+        struct.pack_into("<4f", fb, 64, 0.0, 0.25, 0.5, 1.0)
+        struct.pack_into("<Q", fb, 16, (sequence | 1) + 1)
+    """)
+    subprocess.run([sys.executable, "-c", producer], check=True)
+
+    out = np.zeros(4)
+    assert SharedFramebuffer(path).read_into(out)
+    assert out.tolist() == [0.0, 0.25, 0.5, 1.0]
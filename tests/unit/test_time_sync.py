@@ -0,0 +1,189 @@
+# tests/unit/test_time_sync.py
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import textwrap
+import time
+
+import pytest
+
+import bongo
+from bongo.operations.frame_clock import FrameClock
+from bongo.sync.time_sync import (REPLY, REQUEST, SHOW, ClockModel, TimeSyncFollower, TimeSyncLeader,
+                                  parse_packet, reply_packet, request_packet, show_packet)
+
+# A leader whose clock is 5 s ahead of ours and runs 80 ppm fast, standing in
+# for a second machine.
+LEADER_OFFSET = 5.0
+LEADER_SKEW = 80e-6
+
+
+def _leader_time(local: float) -> float:
+    return local * (1.0 + LEADER_SKEW) + LEADER_OFFSET
+
+
+def _leader_ns() -> int:
+    return int(_leader_time(time.monotonic_ns() / 1e9) * 1e9)
+
+
+def _exchange(model, local, out_delay, back_delay, turnaround=20e-6):
+    t2 = _leader_time(local + out_delay)
+    t3 = t2 + turnaround
+    t4 = local + out_delay + turnaround / (1.0 + LEADER_SKEW) + back_delay
+    return model.add_sample(local, t2, t3, t4)
+
+
+def test_packets_round_trip():
+    assert parse_packet(request_packet(7, 123)) == (REQUEST, 7, 123)
+    assert parse_packet(reply_packet(7, 1, -2, 3)) == (REPLY, 7, 1, -2, 3)
+    assert parse_packet(show_packet(2, 10**15, "chase")) == (SHOW, 2, 10**15, "chase")
+    for bad in (b"", b"BGTS", request_packet(1, 2)[:-1], b"XXXX" + request_packet(1, 2)[4:],
+                show_packet(1, 2, "chase") + b"!"):
+        assert parse_packet(bad) is None
+
+
+def test_model_estimates_offset_and_skew():
+    model = ClockModel()
+    rng = random.Random(1)
+    for i in range(64):
+        delay = 100e-6 + rng.random() * 20e-6
+        _exchange(model, 1000.0 + i * 0.25, delay, delay)
+    assert model.locked
+    assert model.skew == pytest.approx(LEADER_SKEW, abs=5e-6)
+    for local in (1000.0, 1016.0, 1030.0):
+        assert model.to_leader(local) == pytest.approx(_leader_time(local), abs=20e-6)
+        assert model.to_local(model.to_leader(local)) == pytest.approx(local, abs=1e-9)
+
+
+def test_model_ignores_queued_exchanges():
+    model = ClockModel()
+    rng = random.Random(2)
+    for i in range(40):
+        # Every third reply sat in a queue for milliseconds on its way back.
+        back = 5e-3 if i % 3 == 0 else 100e-6
+        _exchange(model, 50.0 + i * 0.1, 100e-6 + rng.random() * 10e-6, back)
+    assert model.to_leader(53.0) == pytest.approx(_leader_time(53.0), abs=20e-6)
+
+
+def test_model_starts_over_when_the_leader_restarts():
+    model = ClockModel()
+    for i in range(8):
+        _exchange(model, 10.0 + i * 0.1, 1e-4, 1e-4)
+    assert model.locked
+    model.add_sample(11.0, 2.0, 2.0, 11.0002)  # the leader's clock is back near zero
+    assert model.steps == 1 and not model.locked
+    assert model.to_leader(11.0001) == pytest.approx(2.0, abs=1e-6)
+
+
+def test_render_time_runs_at_the_leader_rate():
+    model = ClockModel()
+    for i in range(64):
+        _exchange(model, time.monotonic() - 20.0 + i * 0.3, 1e-4, 1e-4)
+    model.reanchor()
+    now = time.monotonic()
+    assert model.render_time(model.to_leader(now)) == pytest.approx(now, abs=1e-6)
+    # A second of leader time is a second of render time, whatever the skew.
+    assert model.render_time(1001.0) - model.render_time(1000.0) == pytest.approx(1.0, abs=1e-12)
+
+
+def test_frame_clock_lands_on_the_leader_frame_grid():
+    model = ClockModel()
+    for i in range(64):
+        _exchange(model, time.monotonic() - 20.0 + i * 0.3, 1e-4, 1e-4)
+    clock = FrameClock(fps=50, timebase=model)
+    now = time.monotonic()
+    wake_times = [clock._advance(now + i * 0.02)[0] for i in range(5)]
+    for wake in wake_times:
+        leader = _leader_time(wake)
+        assert leader / 0.02 == pytest.approx(round(leader / 0.02), abs=0.005)  # 100 us
+    assert wake_times[0] >= now - 1e-6 and wake_times[0] - now <= 0.02
+
+    clock._advance(now + 0.2)  # four frames late
+    assert clock.dropped_frames == 4
+
+
+def test_follower_locks_and_receives_the_show():
+    leader = TimeSyncLeader(host="127.0.0.1", port=0, time_source=_leader_ns)
+    shows = []
+    follower = TimeSyncFollower("127.0.0.1", leader.address[1], interval=0.05,
+                                on_show=lambda name, start: shows.append((name, start)))
+    leader.start()
+    follower.start()
+    try:
+        assert follower.wait_locked(2.0)
+        now = time.monotonic()
+        assert follower.clock.to_leader(now) == pytest.approx(_leader_time(now), abs=1e-3)
+
+        leader.announce_show("chase", start_in=0.5)
+        deadline = time.monotonic() + 2.0
+        while not shows and time.monotonic() < deadline:
+            time.sleep(0.01)
+        # Repeats of the announcement start nothing new.
+        time.sleep(leader.announce_interval * 1.5)
+    finally:
+        follower.close()
+        leader.close()
+
+    assert len(shows) == 1 and shows[0][0] == "chase"
+    assert shows[0][1] == pytest.approx(now + 0.5, abs=0.05)
+    assert len(leader.followers) == 1
+
+
+_NODE = textwrap.dedent("""
+    import json, sys, time
+    from bongo.operations.frame_clock import FrameClock
+    from bongo.sync.time_sync import TimeSyncFollower
+
+    follower = TimeSyncFollower("127.0.0.1", int(sys.argv[1]), interval=0.1)
+    follower.start()
+    assert follower.wait_locked(5.0)
+    print(json.dumps({"ready": True}), flush=True)
+    while follower.show_start is None:
+        time.sleep(0.005)
+    clock = FrameClock(fps=60, timebase=follower.clock)
+    frames = []
+    while len(frames) < 20:
+        frame_time = clock.wait_next_frame()
+        woke = time.monotonic()
+        if frame_time >= follower.show_start:
+            frames.append((round((frame_time - follower.show_start) * 60), woke))
+    follower.close()
+    print(json.dumps({"frames": frames, "offset": follower.clock.offset}), flush=True)
+""")
+
+
+def test_nodes_render_in_lockstep_on_loopback():
+    """Three follower processes render the same show frames at the same instants."""
+    leader = TimeSyncLeader(host="127.0.0.1", port=0, time_source=_leader_ns)
+    leader.start()
+    env = dict(os.environ, PYTHONPATH=os.path.dirname(os.path.dirname(bongo.__file__)))
+    nodes = [subprocess.Popen([sys.executable, "-c", _NODE, str(leader.address[1])], env=env,
+                              stdout=subprocess.PIPE, text=True) for _ in range(3)]
+    try:
+        for node in nodes:
+            assert json.loads(node.stdout.readline()) == {"ready": True}
+        leader.announce_show("chase", start_in=0.3)
+        reports = [json.loads(node.stdout.readline()) for node in nodes]
+        for node in nodes:
+            assert node.wait(10) == 0
+    finally:
+        for node in nodes:
+            node.kill()
+        leader.close()
+
+    for report in reports:
+        assert report["offset"] == pytest.approx(_leader_time(time.monotonic()) - time.monotonic(), abs=1e-3)
+    by_frame = {}
+    for report in reports:
+        frames = dict(report["frames"])
+        # The same frames, counted from the show's start.
+        assert list(frames) == [index for index, _ in reports[0]["frames"]]
+        for index, woke in frames.items():
+            by_frame.setdefault(index, []).append(woke)
+    spreads = [max(woken) - min(woken) for woken in by_frame.values()]
+    # All processes share one CPU here, so an occasional frame is delayed by
+    # the scheduler; the typical spread is what synchronization controls.
+    assert statistics.median(spreads) < 1e-3
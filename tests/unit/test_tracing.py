@@ -0,0 +1,122 @@
+# tests/unit/test_tracing.py
+import json
+import os
+import signal
+import sys
+import threading
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from bongo.operations.animation_manager import AnimationManager
+from bongo.operations.led_operation import LEDPixelOperation
+from bongo.patterns.builtin_patterns import create_chase_pattern
+from bongo.utils import tracing
+from bongo.utils.tracing import FrameTracer
+
+
+@pytest.fixture
+def tracer(tmp_path):
+    tracer = tracing.enable_tracing(capacity=256, dump_dir=str(tmp_path))
+    yield tracer
+    tracing.disable_tracing()
+
+
+def test_ring_buffer_keeps_most_recent_spans():
+    tracer = FrameTracer(capacity=3)
+    for i in range(5):
+        tracer.record(f"span{i}", "test", i * 1000, i * 1000 + 500)
+
+    events = tracer.snapshot()["traceEvents"]
+    assert [e["name"] for e in events] == ["span2", "span3", "span4"]
+    assert all(e["ph"] == "X" and e["dur"] == 0.5 for e in events)
+
+
+def test_tick_records_phase_and_board_spans(tracer, mock_matrix):
+    manager = AnimationManager(mock_matrix)
+    manager.add_operation(0, 0, LEDPixelOperation(1.0, 1, 1, 1))
+    manager.add_operation(1, 0, LEDPixelOperation(1.0, 1, 1, 1))
+    manager.tick()
+
+    names = {e["name"] for e in tracer.snapshot()["traceEvents"]}
+    assert {"AnimationManager.tick", "evaluate", "composite", "flush"} <= names
+    assert {"flush board 0x40", "flush board 0x41"} <= names
+
+
+def test_pattern_generation_is_traced(tracer):
+    create_chase_pattern([(0, 0), (0, 1)], start_time_base=0.0)
+    events = tracer.snapshot()["traceEvents"]
+    assert any(e["name"] == "create_chase_pattern" and e["cat"] == "pattern" for e in events)
+
+
+def test_dump_writes_chrome_trace_json(tracer, tmp_path):
+    with tracing.traced("work", "test"):
+        pass
+    path = tracer.dump(str(tmp_path / "trace.json"))
+
+    with open(path) as f:
+        trace = json.load(f)
+    assert trace["traceEvents"][0]["name"] == "work"
+
+
+def test_signal_dumps_trace(tracer, tmp_path):
+    with tracing.traced("before-signal"):
+        pass
+    previous = signal.getsignal(signal.SIGUSR1)
+    tracing.install_signal_handler(signal.SIGUSR1)
+    try:
+        os.kill(os.getpid(), signal.SIGUSR1)
+        deadline = time.monotonic() + 2.0
+        while not os.listdir(tmp_path) and time.monotonic() < deadline:
+            time.sleep(0.01)
+    finally:
+        signal.signal(signal.SIGUSR1, previous)
+    assert any(name.startswith("bongo-trace-signal") for name in os.listdir(tmp_path))
+
+
+def test_threads_record_into_separate_slots():
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)  # switch threads as often as possible
+    tracer = FrameTracer(capacity=20000)
+    barrier = threading.Barrier(4)
+
+    def record(worker):
+        barrier.wait()
+        for i in range(5000):
+            tracer.record(f"{worker}-{i}", "test", 0, 1)
+
+    threads = [threading.Thread(target=record, args=(worker,)) for worker in range(4)]
+    try:
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        sys.setswitchinterval(interval)
+    assert len({e["name"] for e in tracer.snapshot()["traceEvents"]}) == 20000
+
+
+def test_async_dump_builds_the_trace_off_the_caller_thread(tracer, monkeypatch):
+    built_on = []
+    build = tracer._trace
+    monkeypatch.setattr(tracer, "_trace", lambda columns: (built_on.append(threading.current_thread()),
+                                                           build(columns))[1])
+    tracer.record("span", "test", 0, 1)
+    path = tracer.dump_async("test")
+    tracer.record("later", "test", 0, 1)  # not in the dump: the columns were copied
+    deadline = time.monotonic() + 2.0
+    while not os.path.exists(path) and time.monotonic() < deadline:
+        time.sleep(0.01)
+    time.sleep(0.05)
+
+    assert built_on and built_on[0] is not threading.current_thread()
+    with open(path) as f:
+        assert [e["name"] for e in json.load(f)["traceEvents"]] == ["span"]
+
+
+def test_traced_is_noop_when_disabled():
+    tracing.disable_tracing()
+    assert tracing.get_tracer() is None
+    with tracing.traced("ignored"):
+        pass